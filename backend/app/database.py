@@ -1,11 +1,24 @@
-# Autor: Wilbert López Veras 
+# Autor: Wilbert López Veras
 # Fecha de creación: 2 de Noviembre de 2025
 # Descripción: Inicializa el cliente de Supabase usando las varialbes de entorno en .env
+# Los clientes se crean una sola vez por proceso (registro con pool de conexiones
+# keep-alive) y se cierran al apagar la aplicación.
 
+import asyncio
 import os
+import threading
+from typing import Dict
 
+import httpx
 from dotenv import load_dotenv
-from supabase import Client, create_client
+from supabase import (
+    AsyncClient,
+    AsyncClientOptions,
+    Client,
+    ClientOptions,
+    acreate_client,
+    create_client,
+)
 
 load_dotenv()
 
@@ -13,13 +26,338 @@ SUPABASE_URL = os.environ["SUPABASE_URL"]
 SUPABASE_SERVICE_ROLE_KEY = os.environ["SUPABASE_SERVICE_ROLE_KEY"]
 SUPABASE_KEY = os.environ["SUPABASE_KEY"]
 
+# Configuracion del pool HTTP compartido por cada cliente del registro
+SUPABASE_POOL_MAX_CONNECTIONS = int(os.environ.get("SUPABASE_POOL_MAX_CONNECTIONS", "20"))
+SUPABASE_POOL_MAX_KEEPALIVE = int(os.environ.get("SUPABASE_POOL_MAX_KEEPALIVE", "10"))
+SUPABASE_POOL_KEEPALIVE_EXPIRY = float(os.environ.get("SUPABASE_POOL_KEEPALIVE_EXPIRY", "30"))
+SUPABASE_HTTP_TIMEOUT = float(os.environ.get("SUPABASE_HTTP_TIMEOUT", "10"))
+SUPABASE_HTTP_CONNECT_TIMEOUT = float(os.environ.get("SUPABASE_HTTP_CONNECT_TIMEOUT", "5"))
+
+# Backend alternativo: "memory" usa el sustituto en memoria (tests y benchmarks)
+SUPABASE_BACKEND = os.environ.get("SUPABASE_BACKEND", "supabase")
+MEMORY_BACKEND_LATENCY_MS = float(os.environ.get("MEMORY_BACKEND_LATENCY_MS", "0"))
+
+
+class ClientRegistry:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Mantiene un cliente Supabase por clave (publica / service_role)
+    durante toda la vida del proceso, cada uno con su propio pool httpx keep-alive.
+    Lleva un contador de reutilizaciones por cliente para diagnostico.
+    """
+
+    def __init__(self, keys: Dict[str, str]):
+        self._keys = keys
+        self._clients: Dict[str, Client] = {}
+        self._http_clients: Dict[str, httpx.Client] = {}
+        self._created: Dict[str, int] = {name: 0 for name in keys}
+        self._reused: Dict[str, int] = {name: 0 for name in keys}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Crea todos los clientes por adelantado (arranque de la app).
+        """
+        for name in self._keys:
+            self.get(name)
+
+    def get(self, name: str) -> Client:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Retorna el cliente registrado, creandolo la primera vez.
+        """
+        with self._lock:
+            client = self._clients.get(name)
+            if client is not None:
+                self._reused[name] += 1
+                return client
+
+            http_client = _build_http_client()
+            client = create_client(
+                SUPABASE_URL,
+                self._keys[name],
+                options=ClientOptions(
+                    auto_refresh_token=False,
+                    persist_session=False,
+                    httpx_client=http_client,
+                    postgrest_client_timeout=SUPABASE_HTTP_TIMEOUT,
+                    storage_client_timeout=int(SUPABASE_HTTP_TIMEOUT),
+                ),
+            )
+            self._clients[name] = client
+            self._http_clients[name] = http_client
+            self._created[name] += 1
+            return client
+
+    def close(self) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Cierra los pools HTTP y descarta los clientes registrados.
+        """
+        with self._lock:
+            for http_client in self._http_clients.values():
+                try:
+                    http_client.close()
+                except Exception as exc:
+                    print(f"No se pudo cerrar el pool HTTP de Supabase: {exc}")
+            self._http_clients.clear()
+            self._clients.clear()
+
+    def stats(self) -> dict:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Contadores de creacion y reutilizacion de este proceso.
+        """
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "clients": {
+                    name: {
+                        "active": name in self._clients,
+                        "created": self._created[name],
+                        "reused": self._reused[name],
+                    }
+                    for name in self._keys
+                },
+                "pool": {
+                    "max_connections": SUPABASE_POOL_MAX_CONNECTIONS,
+                    "max_keepalive_connections": SUPABASE_POOL_MAX_KEEPALIVE,
+                    "keepalive_expiry": SUPABASE_POOL_KEEPALIVE_EXPIRY,
+                    "timeout": SUPABASE_HTTP_TIMEOUT,
+                },
+            }
+
+
+class AsyncClientRegistry:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Version asincrona del registro. Los clientes usan httpx.AsyncClient
+    y se crean dentro del event loop del worker, para que las rutas async no
+    bloqueen el loop mientras esperan a PostgREST.
+    """
+
+    def __init__(self, keys: Dict[str, str]):
+        self._keys = keys
+        self._clients: Dict[str, AsyncClient] = {}
+        self._http_clients: Dict[str, httpx.AsyncClient] = {}
+        self._created: Dict[str, int] = {name: 0 for name in keys}
+        self._reused: Dict[str, int] = {name: 0 for name in keys}
+        self._lock: asyncio.Lock | None = None
+
+    async def start(self) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Crea todos los clientes asincronos por adelantado.
+        """
+        for name in self._keys:
+            await self.get(name)
+
+    async def get(self, name: str) -> AsyncClient:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Retorna el cliente asincrono registrado, creandolo la primera vez.
+        """
+        client = self._clients.get(name)
+        if client is not None:
+            self._reused[name] += 1
+            return client
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            client = self._clients.get(name)
+            if client is not None:
+                self._reused[name] += 1
+                return client
+
+            http_client = _build_async_http_client()
+            client = await acreate_client(
+                SUPABASE_URL,
+                self._keys[name],
+                options=AsyncClientOptions(
+                    auto_refresh_token=False,
+                    persist_session=False,
+                    httpx_client=http_client,
+                    postgrest_client_timeout=SUPABASE_HTTP_TIMEOUT,
+                    storage_client_timeout=int(SUPABASE_HTTP_TIMEOUT),
+                ),
+            )
+            self._clients[name] = client
+            self._http_clients[name] = http_client
+            self._created[name] += 1
+            return client
+
+    async def close(self) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Cierra los pools HTTP asincronos.
+        """
+        for http_client in self._http_clients.values():
+            try:
+                await http_client.aclose()
+            except Exception as exc:
+                print(f"No se pudo cerrar el pool HTTP async de Supabase: {exc}")
+        self._http_clients.clear()
+        self._clients.clear()
+        self._lock = None
+
+    def stats(self) -> dict:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Contadores de creacion y reutilizacion de los clientes async.
+        """
+        return {
+            name: {
+                "active": name in self._clients,
+                "created": self._created[name],
+                "reused": self._reused[name],
+            }
+            for name in self._keys
+        }
+
+
+def _build_http_client() -> httpx.Client:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Crea el cliente httpx con limites de pool y timeouts configurables.
+    """
+    return httpx.Client(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=SUPABASE_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=SUPABASE_POOL_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            SUPABASE_HTTP_TIMEOUT, connect=SUPABASE_HTTP_CONNECT_TIMEOUT
+        ),
+    )
+
+
+def _build_async_http_client() -> httpx.AsyncClient:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Crea el cliente httpx asincrono con los mismos limites que el sincrono.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=SUPABASE_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=SUPABASE_POOL_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            SUPABASE_HTTP_TIMEOUT, connect=SUPABASE_HTTP_CONNECT_TIMEOUT
+        ),
+    )
+
+
+_registry = ClientRegistry(
+    {"public": SUPABASE_KEY, "service": SUPABASE_SERVICE_ROLE_KEY}
+)
+_async_registry = AsyncClientRegistry(
+    {"public": SUPABASE_KEY, "service": SUPABASE_SERVICE_ROLE_KEY}
+)
+_memory_backend = None
+
+
+def use_memory_backend(backend) -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Sustituye Supabase por un MemoryBackend (None vuelve a Supabase).
+    Todos los get_*_client pasan a devolver clientes de ese backend.
+    """
+    global _memory_backend
+    _memory_backend = backend
+
+
+def get_memory_backend():
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Retorna el MemoryBackend activo o None si se usa Supabase.
+    """
+    return _memory_backend
+
+
+if SUPABASE_BACKEND == "memory":
+    from .memory_backend import MemoryBackend
+
+    use_memory_backend(MemoryBackend(latency=MEMORY_BACKEND_LATENCY_MS / 1000))
+
+
+def init_clients() -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Inicializa el registro de clientes al arrancar la aplicacion.
+    """
+    if _memory_backend is None:
+        _registry.start()
+
+
+def close_clients() -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Libera los pools de conexiones al apagar la aplicacion.
+    """
+    _registry.close()
+
+
+async def init_async_clients() -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Inicializa los clientes asincronos dentro del event loop del worker.
+    """
+    if _memory_backend is None:
+        await _async_registry.start()
+
+
+async def close_async_clients() -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Libera los pools asincronos al apagar la aplicacion.
+    """
+    await _async_registry.close()
+
+
+def get_client_stats() -> dict:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Expone los contadores del registro para diagnostico.
+    """
+    stats = _registry.stats()
+    stats["async_clients"] = _async_registry.stats()
+    return stats
+
+
 def get_supabase_client() -> Client:
     """
     Autor: Wilbert Lopez Veras
     Fecha: 02-11-2025
     Descripcion: Retorna el cliente Supabase inicializado.
     """
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+    if _memory_backend is not None:
+        return _memory_backend.client()
+    return _registry.get("public")
 
 def get_service_client() -> Client:
     """
@@ -28,4 +366,54 @@ def get_service_client() -> Client:
     Descripcion: Retorna un cliente Supabase inicializado con la clave service_role.
     Este cliente tiene permisos administrativos y no debe usarse fuera del backend.
     """
-    return create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+    if _memory_backend is not None:
+        return _memory_backend.client()
+    return _registry.get("service")
+
+async def get_async_supabase_client() -> AsyncClient:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Retorna el cliente Supabase publico asincrono.
+    """
+    if _memory_backend is not None:
+        return _memory_backend.async_client()
+    return await _async_registry.get("public")
+
+async def get_async_service_client() -> AsyncClient:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Retorna el cliente Supabase asincrono con la clave service_role.
+    """
+    if _memory_backend is not None:
+        return _memory_backend.async_client()
+    return await _async_registry.get("service")
+
+def get_auth_client() -> Client:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Retorna un cliente publico nuevo para sign_up / sign_in.
+    Estas llamadas guardan la sesion del usuario en el cliente, por lo que
+    no se pueden hacer sobre el cliente compartido del registro.
+    """
+    if _memory_backend is not None:
+        return _memory_backend.client()
+    return create_client(
+        SUPABASE_URL,
+        SUPABASE_KEY,
+        options=ClientOptions(auto_refresh_token=False, persist_session=False),
+    )
+
+
+def escape_like(value: str) -> str:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Escapa los comodines de LIKE/ILIKE (\\, %, _ y el * que
+    PostgREST traduce a %) para comparar un texto del usuario de forma literal.
+    """
+    for char in ("\\", "%", "_", "*"):
+        value = value.replace(char, "\\" + char)
+    return value
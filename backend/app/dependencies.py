@@ -1,18 +1,125 @@
-# Autor: Wilbert López Veras 
+# Autor: Wilbert López Veras
 # Fecha de creación: 2 de Noviembre de 2025
 # Descripción: Archivo con dependencias comunes para la aplicación FastAPI,
 # incluyendo la verificación de tokens JWT y obtención del usuario actual.
 
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 
 from .routers.auth import JWT_ALGORITHM, JWT_SECRET
 
+logger = logging.getLogger(__name__)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", "4096"))
+# Vida maxima de una entrada (el "exp" del token puede acortarla)
+TOKEN_CACHE_MAX_TTL_SECONDS = float(os.environ.get("TOKEN_CACHE_MAX_TTL_SECONDS", "300"))
+AUTH_LOG_SAMPLE_RATE = float(os.environ.get("AUTH_LOG_SAMPLE_RATE", "0.01"))
+
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+class TokenCache:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Cache LRU acotada de claims ya verificados, indexada por el
+    SHA-256 del token. Cada entrada caduca en el "exp" del propio token.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, tuple[dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            user, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(user)
+
+    def put(self, key: bytes, user: dict, expires_at: float) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (user, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
+
+def decode_token(token: str) -> Optional[dict]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Verifica el JWT y retorna {"id", "role"}, o None si es invalido.
+    Compartido por la autenticacion HTTP y la del WebSocket.
+    """
+    if not token:
+        return None
+
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    cached = token_cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    except JWTError:
+        return None
+
+    user_id: str | None = payload.get("sub")
+    # Los refresh tokens solo sirven en /auth/refresh, nunca como access token
+    if user_id is None or payload.get("type") == "refresh":
+        return None
+
+    user = {"id": user_id, "role": payload.get("role", "user")}
+    now = time.time()
+    expires_at = now + TOKEN_CACHE_MAX_TTL_SECONDS
+    if payload.get("exp") is not None:
+        expires_at = min(expires_at, float(payload["exp"]))
+    token_cache.put(key, user, expires_at)
+    return user
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
     """
     Autor: Wilbert Lopez Veras
     Fecha: 02-11-2025
@@ -24,23 +131,14 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
             detail="Token requerido",
         )
 
-    try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-    except JWTError:
+    user = decode_token(token)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token invalido",
         )
 
-    user_id: str | None = payload.get("sub")
-    role: str | None = payload.get("role", "user")
+    if AUTH_LOG_SAMPLE_RATE > 0 and random.random() < AUTH_LOG_SAMPLE_RATE:
+        logger.debug("USER: %s %s", user["id"], user["role"])
 
-    if user_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token invalido",
-        )
-    
-    print("USER:", user_id, role)
-    
-    return {"id": user_id, "role": role}
+    return user
@@ -0,0 +1,360 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Nomenclator offline de codigos postales y municipios de España
+# con sus centroides. Se guarda en un fichero binario de arrays ordenados que
+# se abre con mmap, de modo que las busquedas no hacen llamadas de red ni
+# cargan el fichero entero en memoria.
+#
+# Formato (little-endian, secciones alineadas a 8 bytes):
+#   cabecera  "<4sHHIII": magic, version, reservado, n_postales, n_municipios, bytes_nombres
+#   postales       n_postales x uint32 (ordenados)
+#   lat, lon       n_postales x float32 cada uno
+#   claves         n_municipios x uint64 (hash del nombre normalizado, ordenadas)
+#   lat, lon       n_municipios x float32 cada uno
+#   offsets        (n_municipios + 1) x uint32 dentro del bloque de nombres
+#   nombres        UTF-8 concatenados (para descartar colisiones del hash)
+#
+# El fichero no se versiona: el buildCommand de render.yaml lo genera en cada
+# despliegue a partir de ES.zip de GeoNames. Para generarlo a mano (desde backend/):
+#   python -m app.gazetteer build ES.zip app/data/gazetteer_es.bin --geonames
+#   python -m app.gazetteer build codigos.csv app/data/gazetteer_es.bin
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import csv
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import zipfile
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .geocode_cache import normalize_place
+
+logger = logging.getLogger(__name__)
+
+GAZETTEER_PATH = os.environ.get(
+    "GAZETTEER_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "gazetteer_es.bin"),
+)
+# Paises (normalizados) que cubre el nomenclator
+GAZETTEER_COUNTRIES = {"espana", "spain", "es"}
+
+MAGIC = b"PCGZ"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIII")
+
+
+def postal_key(postal_code: Optional[str]) -> Optional[int]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Codigo postal español como entero ("08001" -> 8001), o None
+    si no tiene el formato de cinco digitos.
+    """
+    if not postal_code:
+        return None
+    digits = "".join(postal_code.split())
+    if not digits.isdigit() or len(digits) > 5:
+        return None
+    return int(digits)
+
+
+def city_key(city: str) -> int:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Hash de 64 bits del nombre de municipio ya normalizado.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(city.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class Gazetteer:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Vista de solo lectura sobre el fichero binario. Las busquedas
+    son binarias sobre memoryviews del mmap; el sistema operativo solo carga
+    las paginas que se consultan.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, version, _, postal_count, city_count, names_size = HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Fichero de nomenclator no valido: {path}")
+
+        offset = _align(HEADER.size)
+
+        def section(fmt: str, count: int, size: int) -> memoryview:
+            nonlocal offset
+            part = view[offset : offset + count * size].cast(fmt)
+            offset = _align(offset + count * size)
+            return part
+
+        self._postal_codes = section("I", postal_count, 4)
+        self._postal_lat = section("f", postal_count, 4)
+        self._postal_lon = section("f", postal_count, 4)
+        self._city_keys = section("Q", city_count, 8)
+        self._city_lat = section("f", city_count, 4)
+        self._city_lon = section("f", city_count, 4)
+        self._name_offsets = section("I", city_count + 1, 4)
+        self._names = view[offset : offset + names_size]
+        self.postal_count = postal_count
+        self.city_count = city_count
+
+    def lookup_postal_code(self, postal_code: Optional[str]) -> Optional[Tuple[float, float]]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Centroide del codigo postal o None si no esta.
+        """
+        key = postal_key(postal_code)
+        if key is None:
+            return None
+        index = bisect.bisect_left(self._postal_codes, key)
+        if index == self.postal_count or self._postal_codes[index] != key:
+            return None
+        return float(self._postal_lat[index]), float(self._postal_lon[index])
+
+    def lookup_city(self, city: Optional[str]) -> Optional[Tuple[float, float]]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Centroide del municipio o None si no esta.
+        """
+        name = normalize_place(city)
+        if not name:
+            return None
+        key = city_key(name)
+        encoded = name.encode("utf-8")
+        index = bisect.bisect_left(self._city_keys, key)
+        while index < self.city_count and self._city_keys[index] == key:
+            start, end = self._name_offsets[index], self._name_offsets[index + 1]
+            if self._names[start:end] == encoded:
+                return float(self._city_lat[index]), float(self._city_lon[index])
+            index += 1
+        return None
+
+    def lookup(
+        self, city: Optional[str], postal_code: Optional[str]
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: El codigo postal es mas preciso; si no esta se usa la ciudad.
+        """
+        return self.lookup_postal_code(postal_code) or self.lookup_city(city)
+
+    def close(self) -> None:
+        for name in (
+            "_postal_codes", "_postal_lat", "_postal_lon", "_city_keys",
+            "_city_lat", "_city_lon", "_name_offsets", "_names",
+        ):
+            getattr(self, name).release()
+        self._mmap.close()
+
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_loaded = False
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Optional[Gazetteer]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Abre el nomenclator la primera vez que se necesita. Retorna
+    None si no hay fichero; en ese caso se geocodifica con Nominatim.
+    """
+    global _gazetteer, _gazetteer_loaded
+    if _gazetteer_loaded:
+        return _gazetteer
+    with _gazetteer_lock:
+        if not _gazetteer_loaded:
+            if GAZETTEER_PATH and os.path.exists(GAZETTEER_PATH):
+                try:
+                    _gazetteer = Gazetteer(GAZETTEER_PATH)
+                except (OSError, ValueError) as exc:
+                    logger.warning("Gazetteer unavailable at '%s': %s", GAZETTEER_PATH, exc)
+            elif GAZETTEER_PATH:
+                # Sin nomenclator todo el registro depende de Nominatim
+                logger.warning(
+                    "Gazetteer file '%s' not found; geocoding falls back to Nominatim",
+                    GAZETTEER_PATH,
+                )
+            _gazetteer_loaded = True
+    return _gazetteer
+
+
+def use_gazetteer(gazetteer: Optional[Gazetteer]) -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Sustituye el nomenclator del proceso (tests y benchmarks).
+    """
+    global _gazetteer, _gazetteer_loaded
+    with _gazetteer_lock:
+        _gazetteer = gazetteer
+        _gazetteer_loaded = True
+
+
+def lookup_centroid(
+    city: Optional[str], postal_code: Optional[str], country: Optional[str]
+) -> Optional[Tuple[float, float]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Centroide desde el nomenclator si el pais esta cubierto.
+    """
+    if country and normalize_place(country) not in GAZETTEER_COUNTRIES:
+        return None
+    gazetteer = get_gazetteer()
+    if gazetteer is None:
+        return None
+    return gazetteer.lookup(city, postal_code)
+
+
+# Construccion del fichero
+def _read_csv(path: str) -> Iterator[Tuple[str, str, str, float, float]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Lee un CSV con columnas postal_code, city, latitude, longitude
+    y opcionalmente province.
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            yield (
+                row.get("postal_code", ""),
+                row.get("city", ""),
+                row.get("province", ""),
+                float(row["latitude"]),
+                float(row["longitude"]),
+            )
+
+
+def _read_geonames(path: str) -> Iterator[Tuple[str, str, str, float, float]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Lee el volcado de codigos postales de GeoNames (ES.txt o el
+    ES.zip tal cual se descarga, separado por tabuladores).
+    """
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            name = os.path.splitext(os.path.basename(path))[0] + ".txt"
+            lines = archive.read(name).decode("utf-8").splitlines()
+    else:
+        with open(path, encoding="utf-8") as handle:
+            lines = handle.read().splitlines()
+
+    for line in lines:
+        fields = line.split("\t")
+        if len(fields) < 11:
+            continue
+        yield fields[1], fields[2], fields[6], float(fields[9]), float(fields[10])
+
+
+def _mean(points: List[Tuple[float, float]]) -> Tuple[float, float]:
+    return (
+        sum(point[0] for point in points) / len(points),
+        sum(point[1] for point in points) / len(points),
+    )
+
+
+def build_gazetteer(rows: Iterable[Tuple[str, str, str, float, float]], output_path: str) -> Dict[str, int]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Escribe el fichero binario a partir de filas
+    (codigo postal, ciudad, provincia, latitud, longitud). Un codigo postal con
+    varias filas usa la media; un nombre de municipio repetido en varias
+    provincias se queda con la provincia que tiene mas codigos postales.
+    """
+    postal_points: Dict[int, List[Tuple[float, float]]] = defaultdict(list)
+    city_points: Dict[str, Dict[str, List[Tuple[float, float]]]] = defaultdict(
+        lambda: defaultdict(list)
+    )
+    for postal_code, city, province, latitude, longitude in rows:
+        key = postal_key(postal_code)
+        if key is not None:
+            postal_points[key].append((latitude, longitude))
+        name = normalize_place(city)
+        if name:
+            city_points[name][normalize_place(province)].append((latitude, longitude))
+
+    postal_codes = sorted(postal_points)
+    postal_centroids = [_mean(postal_points[code]) for code in postal_codes]
+
+    cities = []
+    for name, provinces in city_points.items():
+        points = max(provinces.values(), key=len)
+        cities.append((city_key(name), name.encode("utf-8"), _mean(points)))
+    cities.sort()
+
+    names = bytearray()
+    name_offsets = array("I", [0])
+    for _, encoded, _ in cities:
+        names += encoded
+        name_offsets.append(len(names))
+
+    sections = [
+        array("I", postal_codes),
+        array("f", [centroid[0] for centroid in postal_centroids]),
+        array("f", [centroid[1] for centroid in postal_centroids]),
+        array("Q", [city[0] for city in cities]),
+        array("f", [city[2][0] for city in cities]),
+        array("f", [city[2][1] for city in cities]),
+        name_offsets,
+    ]
+
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+    temporary_path = f"{output_path}.tmp"
+    with open(temporary_path, "wb") as handle:
+        handle.write(HEADER.pack(MAGIC, VERSION, 0, len(postal_codes), len(cities), len(names)))
+        for part in sections:
+            handle.write(b"\0" * (_align(handle.tell()) - handle.tell()))
+            part.tofile(handle)
+        handle.write(b"\0" * (_align(handle.tell()) - handle.tell()))
+        handle.write(names)
+    # Reemplazo atomico: un worker con el fichero abierto sigue viendo el anterior
+    os.replace(temporary_path, output_path)
+    return {"postal_codes": len(postal_codes), "cities": len(cities)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Nomenclator offline de PetConnect")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    build = subcommands.add_parser("build", help="Genera el fichero binario")
+    build.add_argument("source")
+    build.add_argument("output", nargs="?", default=GAZETTEER_PATH)
+    build.add_argument("--geonames", action="store_true", help="Entrada en formato GeoNames")
+    args = parser.parse_args()
+
+    rows = _read_geonames(args.source) if args.geonames else _read_csv(args.source)
+    counts = build_gazetteer(rows, args.output)
+    print(
+        f"{args.output}: {counts['postal_codes']} codigos postales, "
+        f"{counts['cities']} municipios ({os.path.getsize(args.output)} bytes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
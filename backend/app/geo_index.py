@@ -0,0 +1,653 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Indice espacial en rejilla para /profile/nearby. Las
+# coordenadas de los perfiles se reparten en celdas de tamaño fijo en grados y
+# una busqueda solo recorre las celdas que cubren el radio pedido, en vez de
+# calcular la distancia a todos los perfiles. El indice vive en memoria en
+# cada worker y se actualiza con los avisos de profile_events (live_index).
+
+from __future__ import annotations
+
+import itertools
+import math
+import os
+import sys
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from . import profile_events
+from .database import escape_like, get_service_client
+from .geo_kernel import EARTH_RADIUS_KM, haversine_batch
+from .live_index import LiveIndex, fetch_all_rows
+from .pagination import InvalidCursor, cursor_id
+
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+GEO_INDEX_ENABLED = os.environ.get("GEO_INDEX_ENABLED", "true").lower() == "true"
+# 0.1 grados son unos 11 km de latitud
+GEO_INDEX_CELL_DEGREES = float(os.environ.get("GEO_INDEX_CELL_DEGREES", "0.1"))
+GEO_INDEX_RECONCILE_SECONDS = float(os.environ.get("GEO_INDEX_RECONCILE_SECONDS", "900"))
+GEO_INDEX_PAGE_SIZE = int(os.environ.get("GEO_INDEX_PAGE_SIZE", "1000"))
+# Celdas de agrupacion por tesela de 256 px del mapa (grupos de unos 64 px)
+CLUSTERS_PER_TILE = int(os.environ.get("GEO_CLUSTERS_PER_TILE", "4"))
+MAX_CLUSTER_ZOOM = 20
+
+NEARBY_COLUMNS = (
+    "id, username, pet_name, pet_type, city, postal_code, avatar_url, latitude, longitude"
+)
+# Columnas que devuelve /profile/nearby ademas de id y coordenadas
+DETAIL_COLUMNS = ("username", "pet_name", "city", "postal_code", "avatar_url")
+# Valores muy repetidos entre perfiles: se guarda una sola copia de cada uno
+SHARED_COLUMNS = ("city", "postal_code")
+
+# Clave de orden de /profile/nearby: (distancia en KM, id del perfil)
+NearbyKey = Tuple[float, str]
+
+
+def nearby_key(cursor_key: List[Any]) -> NearbyKey:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Valida la clave (distancia, id) guardada en un cursor de
+    /profile/nearby: distancia finita no negativa e id UUID.
+    """
+    if not isinstance(cursor_key, (list, tuple)) or len(cursor_key) != 2:
+        raise InvalidCursor("Cursor no valido")
+    distance, profile_id = cursor_key
+    if (
+        isinstance(distance, bool)
+        or not isinstance(distance, (int, float))
+        or not math.isfinite(distance)
+        or distance < 0
+    ):
+        raise InvalidCursor("Cursor no valido")
+    return float(distance), cursor_id(profile_id)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Distancia en KM entre dos puntos usando Haversine. Para
+    muchos puntos a la vez usar geo_kernel.haversine_batch.
+    """
+    lat1_rad, lat2_rad = math.radians(lat1), math.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> Tuple[float, float, Optional[float]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Semiancho en grados del rectangulo que contiene el circulo:
+    (latitud minima, latitud maxima, semiancho de longitud). El semiancho es
+    None si el circulo toca un polo y hay que cubrir todas las longitudes.
+    """
+    delta_lat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = lat - delta_lat, lat + delta_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), None
+    # Semiancho exacto en la latitud del punto de tangencia
+    ratio = math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat))
+    if ratio >= 1:
+        return min_lat, max_lat, None
+    return min_lat, max_lat, math.degrees(math.asin(ratio))
+
+
+def keyset_page(
+    distances: np.ndarray,
+    id_at: Callable[[int], str],
+    radius_km: float,
+    limit: int,
+    after: Optional[NearbyKey] = None,
+    exclude_id: Optional[str] = None,
+) -> List[Tuple[int, float]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Posiciones y distancias de los `limit` candidatos siguientes
+    a `after` en orden (distancia, id), dentro del radio. Los anteriores al
+    cursor se descartan con una mascara sobre el array, sin construir sus
+    filas. Los empates de distancia (perfiles con el mismo centroide de codigo
+    postal) se desempatan por id para que ninguna pagina repita ni pierda
+    perfiles.
+    """
+    if limit <= 0:
+        return []
+    mask = distances <= radius_km
+    if after is not None:
+        mask &= distances >= after[0]
+    candidates = np.flatnonzero(mask)
+    if after is not None:
+        tied = distances[candidates] == after[0]
+        if tied.any():
+            keep = np.fromiter(
+                (not tie or id_at(int(position)) > after[1] for position, tie in zip(candidates, tied)),
+                dtype=bool,
+                count=candidates.size,
+            )
+            candidates = candidates[keep]
+    # Un hueco extra por si el propio usuario esta entre los elegidos
+    k = limit + 1
+    if candidates.size > k:
+        # Se conservan todos los empatados con el k-esimo para ordenarlos por id
+        kth = np.partition(distances[candidates], k - 1)[k - 1]
+        candidates = candidates[distances[candidates] <= kth]
+    ordered = sorted(
+        (float(distances[position]), id_at(int(position)), int(position))
+        for position in candidates
+    )
+    page = []
+    for distance, profile_id, position in ordered:
+        if profile_id == exclude_id:
+            continue
+        page.append((position, distance))
+        if len(page) == limit:
+            break
+    return page
+
+
+class GeoGridIndex:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Indice mutable de ubicaciones de perfil. Cada perfil ocupa
+    una posicion ("slot") en arrays NumPy de latitud, longitud y tipo de
+    mascota; la rejilla guarda por celda el conjunto de slots que contiene.
+    Altas, cambios y bajas cuestan O(1); los slots libres se reutilizan.
+    """
+
+    def __init__(self, cell_degrees: float = GEO_INDEX_CELL_DEGREES, capacity: int = 1024):
+        self.cell_degrees = cell_degrees
+        self.columns = math.ceil(360 / cell_degrees)
+        capacity = max(capacity, 16)
+        self._latitudes = np.zeros(capacity, dtype=np.float64)
+        self._longitudes = np.zeros(capacity, dtype=np.float64)
+        # 0 = sin tipo de mascota
+        self._pet_types = np.zeros(capacity, dtype=np.int32)
+        self._pet_type_codes: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._details: List[Optional[tuple]] = []
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        # Suma de latitudes y longitudes por celda, para los centroides de
+        # /profile/nearby/clusters sin recorrer los perfiles
+        self._cell_sums: Dict[Tuple[int, int], List[float]] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_rows(
+        cls, rows: List[Dict[str, Any]], cell_degrees: float = GEO_INDEX_CELL_DEGREES
+    ) -> "GeoGridIndex":
+        index = cls(cell_degrees, capacity=len(rows))
+        for row in rows:
+            index.apply(row.get("id"), row)
+        return index
+
+    @property
+    def size(self) -> int:
+        return len(self._slots)
+
+    @property
+    def cell_count(self) -> int:
+        return len(self._cells)
+
+    @property
+    def array_bytes(self) -> int:
+        return self._latitudes.nbytes + self._longitudes.nbytes + self._pet_types.nbytes
+
+    def _row(self, latitude: float) -> int:
+        return math.floor((latitude + 90) / self.cell_degrees)
+
+    def _column(self, longitude: float) -> int:
+        return math.floor(((longitude + 180) % 360) / self.cell_degrees) % self.columns
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return self._row(latitude), self._column(longitude)
+
+    def _columns_for(self, lng: float, half_width: Optional[float]) -> Iterable[int]:
+        if half_width is None or 2 * half_width >= 360 - self.cell_degrees:
+            return range(self.columns)
+        first = self._column(lng - half_width)
+        count = (self._column(lng + half_width) - first) % self.columns + 1
+        # Cruza el antimeridiano cuando la columna final es menor que la inicial
+        return [(first + offset) % self.columns for offset in range(count)]
+
+    def _pet_type_code(self, pet_type: Optional[str], create: bool) -> Optional[int]:
+        name = (pet_type or "").strip().casefold()
+        if not name:
+            return 0
+        code = self._pet_type_codes.get(name)
+        if code is None and create:
+            code = len(self._pet_type_codes) + 1
+            self._pet_type_codes[name] = code
+        return code
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        slot = len(self._ids)
+        if slot == len(self._latitudes):
+            capacity = 2 * slot
+            self._latitudes = np.resize(self._latitudes, capacity)
+            self._longitudes = np.resize(self._longitudes, capacity)
+            self._pet_types = np.resize(self._pet_types, capacity)
+        self._ids.append(None)
+        self._details.append(None)
+        return slot
+
+    def _slot_cell(self, slot: int) -> Tuple[int, int]:
+        return self._cell(float(self._latitudes[slot]), float(self._longitudes[slot]))
+
+    def _attach(self, slot: int) -> None:
+        latitude, longitude = float(self._latitudes[slot]), float(self._longitudes[slot])
+        cell = self._cell(latitude, longitude)
+        self._cells.setdefault(cell, set()).add(slot)
+        sums = self._cell_sums.setdefault(cell, [0.0, 0.0])
+        sums[0] += latitude
+        sums[1] += longitude
+
+    def _detach(self, slot: int) -> None:
+        cell = self._slot_cell(slot)
+        members = self._cells[cell]
+        members.discard(slot)
+        if not members:
+            del self._cells[cell]
+            del self._cell_sums[cell]
+            return
+        sums = self._cell_sums[cell]
+        sums[0] -= float(self._latitudes[slot])
+        sums[1] -= float(self._longitudes[slot])
+
+    def apply(self, profile_id: Optional[str], profile: Optional[Dict[str, Any]]) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Alta o cambio con la fila del perfil; un perfil borrado
+        (None) o sin coordenadas sale del indice.
+        """
+        if not profile_id:
+            return
+        latitude = profile.get("latitude") if profile else None
+        longitude = profile.get("longitude") if profile else None
+        with self._lock:
+            slot = self._slots.get(profile_id)
+            if latitude is None or longitude is None:
+                if slot is not None:
+                    self._detach(slot)
+                    del self._slots[profile_id]
+                    self._ids[slot] = None
+                    self._details[slot] = None
+                    self._free.append(slot)
+                return
+
+            latitude, longitude = float(latitude), float(longitude)
+            if slot is None:
+                slot = self._allocate()
+                self._slots[profile_id] = slot
+                self._ids[slot] = profile_id
+            else:
+                self._detach(slot)
+            self._latitudes[slot] = latitude
+            self._longitudes[slot] = longitude
+            self._pet_types[slot] = self._pet_type_code(profile.get("pet_type"), create=True)
+            self._details[slot] = tuple(
+                sys.intern(value) if column in SHARED_COLUMNS and isinstance(value, str) else value
+                for column, value in ((column, profile.get(column)) for column in DETAIL_COLUMNS)
+            )
+            self._attach(slot)
+
+    def query(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        limit: int,
+        exclude_id: Optional[str] = None,
+        pet_type: Optional[str] = None,
+        after: Optional[NearbyKey] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Perfiles a menos de radius_km (opcionalmente de un tipo
+        de mascota) ordenados por distancia exacta y id, con "distance_km".
+        Con `after` empieza despues de esa clave (pagina siguiente).
+        """
+        min_lat, max_lat, half_width = bounding_box(lat, lng, radius_km)
+        columns = self._columns_for(lng, half_width)
+        with self._lock:
+            code = self._pet_type_code(pet_type, create=False) if pet_type else None
+            if code is None and pet_type:
+                return []
+            members = []
+            for row_index in range(self._row(min_lat), self._row(max_lat) + 1):
+                for column_index in columns:
+                    cell = self._cells.get((row_index, column_index))
+                    if cell:
+                        members.append(cell)
+            if not members:
+                return []
+
+            slots = np.fromiter(itertools.chain.from_iterable(members), dtype=np.int64)
+            if code:
+                slots = slots[self._pet_types[slots] == code]
+            distances = haversine_batch(lat, lng, self._latitudes[slots], self._longitudes[slots])
+            page = keyset_page(
+                distances,
+                lambda position: self._ids[slots[position]],
+                radius_km,
+                limit,
+                after,
+                exclude_id,
+            )
+            return [self._as_row(int(slots[position]), distance) for position, distance in page]
+
+    def _as_row(self, slot: int, distance: Optional[float] = None) -> Dict[str, Any]:
+        row: Dict[str, Any] = {"id": self._ids[slot]}
+        row.update(zip(DETAIL_COLUMNS, self._details[slot]))
+        row["latitude"] = float(self._latitudes[slot])
+        row["longitude"] = float(self._longitudes[slot])
+        if distance is not None:
+            row["distance_km"] = distance
+        return row
+
+    def _viewport_cells(
+        self, min_lat: float, max_lat: float, min_lng: float, max_lng: float
+    ) -> List[Tuple[int, int]]:
+        width = (max_lng - min_lng) % 360 or (360.0 if max_lng != min_lng else 0.0)
+        columns = self._columns_for(min_lng + width / 2, width / 2)
+        first_row, last_row = self._row(min_lat), self._row(max_lat)
+        if (last_row - first_row + 1) * len(columns) > len(self._cells):
+            # Vista muy amplia: es mas barato mirar solo las celdas ocupadas
+            wanted = set(columns)
+            return [
+                cell for cell in self._cells
+                if first_row <= cell[0] <= last_row and cell[1] in wanted
+            ]
+        return [
+            (row_index, column_index)
+            for row_index in range(first_row, last_row + 1)
+            for column_index in columns
+            if (row_index, column_index) in self._cells
+        ]
+
+    def clusters(
+        self, min_lat: float, max_lat: float, min_lng: float, max_lng: float, zoom: int
+    ) -> Tuple[float, List[Dict[str, Any]]]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Agrupa los perfiles de la vista del mapa en una rejilla
+        cuyo tamaño depende del zoom. Retorna (tamaño de celda en grados,
+        grupos con centroide y numero de perfiles); un grupo de un solo
+        perfil trae ademas sus datos en "profile". Si la celda de agrupacion
+        es mayor que la del indice se suman los totales guardados por celda,
+        sin tocar los perfiles; si es menor (zoom cercano, vista pequeña) se
+        agrupan los perfiles de la vista con NumPy. Una vista que cruza el
+        antimeridiano se indica con min_lng > max_lng.
+        """
+        target = 360 / (2 ** zoom) / CLUSTERS_PER_TILE
+        with self._lock:
+            cells = self._viewport_cells(min_lat, max_lat, min_lng, max_lng)
+            if not cells:
+                return target, []
+            if target >= self.cell_degrees:
+                factor = 2 ** int(math.log2(target / self.cell_degrees))
+                return factor * self.cell_degrees, self._merge_cells(cells, factor)
+            return target, self._group_profiles(cells, min_lat, max_lat, min_lng, max_lng, target)
+
+    def _merge_cells(self, cells: List[Tuple[int, int]], factor: int) -> List[Dict[str, Any]]:
+        # Los grupos contienen celdas enteras: pueden asomar un poco fuera de la vista
+        groups: Dict[Tuple[int, int], List[Any]] = {}
+        for cell in cells:
+            members = self._cells[cell]
+            sums = self._cell_sums[cell]
+            group = groups.get((cell[0] // factor, cell[1] // factor))
+            if group is None:
+                groups[(cell[0] // factor, cell[1] // factor)] = [len(members), sums[0], sums[1], members]
+            else:
+                group[0] += len(members)
+                group[1] += sums[0]
+                group[2] += sums[1]
+        result = []
+        for count, sum_lat, sum_lng, members in groups.values():
+            if count == 1:
+                slot = next(iter(members))
+                result.append(self._single_cluster(slot))
+            else:
+                result.append({"latitude": sum_lat / count, "longitude": sum_lng / count, "count": count})
+        return result
+
+    def _group_profiles(
+        self,
+        cells: List[Tuple[int, int]],
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+        cluster_degrees: float,
+    ) -> List[Dict[str, Any]]:
+        slots = np.fromiter(
+            itertools.chain.from_iterable(self._cells[cell] for cell in cells), dtype=np.int64
+        )
+        latitudes, longitudes = self._latitudes[slots], self._longitudes[slots]
+        inside = (latitudes >= min_lat) & (latitudes <= max_lat)
+        if min_lng <= max_lng:
+            inside &= (longitudes >= min_lng) & (longitudes <= max_lng)
+        else:
+            inside &= (longitudes >= min_lng) | (longitudes <= max_lng)
+        slots, latitudes, longitudes = slots[inside], latitudes[inside], longitudes[inside]
+        if not slots.size:
+            return []
+        keys = np.stack(
+            (np.floor(latitudes / cluster_degrees), np.floor(longitudes / cluster_degrees)), axis=1
+        )
+        _, first, inverse, counts = np.unique(
+            keys, axis=0, return_index=True, return_inverse=True, return_counts=True
+        )
+        inverse = inverse.reshape(-1)
+        centroid_lat = np.bincount(inverse, weights=latitudes) / counts
+        centroid_lng = np.bincount(inverse, weights=longitudes) / counts
+        result = []
+        for group, count in enumerate(counts.tolist()):
+            if count == 1:
+                result.append(self._single_cluster(int(slots[first[group]])))
+            else:
+                result.append({
+                    "latitude": float(centroid_lat[group]),
+                    "longitude": float(centroid_lng[group]),
+                    "count": count,
+                })
+        return result
+
+    def _single_cluster(self, slot: int) -> Dict[str, Any]:
+        return {
+            "latitude": float(self._latitudes[slot]),
+            "longitude": float(self._longitudes[slot]),
+            "count": 1,
+            "profile": self._as_row(slot),
+        }
+
+
+def rank_by_distance(
+    rows: List[Dict[str, Any]],
+    lat: float,
+    lng: float,
+    radius_km: float,
+    limit: int,
+    exclude_id: Optional[str] = None,
+    after: Optional[NearbyKey] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Version sin indice: filas de perfil sueltas (las que no
+    tienen coordenadas se ignoran) ordenadas por distancia e id con
+    geo_kernel, empezando despues de `after`.
+    """
+    located = [
+        row for row in rows
+        if row.get("latitude") is not None and row.get("longitude") is not None
+    ]
+    if not located:
+        return []
+    latitudes = np.fromiter((float(row["latitude"]) for row in located), np.float64, len(located))
+    longitudes = np.fromiter((float(row["longitude"]) for row in located), np.float64, len(located))
+    distances = haversine_batch(lat, lng, latitudes, longitudes)
+    page = keyset_page(
+        distances, lambda position: located[position]["id"], radius_km, limit, after, exclude_id
+    )
+    return [{**located[position], "distance_km": distance} for position, distance in page]
+
+
+def longitude_ranges(lng: float, half_width: Optional[float]) -> Optional[List[Tuple[float, float]]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Rangos [min, max] de longitud que cubren lng +- half_width.
+    Son dos si el rectangulo cruza el antimeridiano y None si abarca todas
+    las longitudes.
+    """
+    if half_width is None or half_width >= 180:
+        return None
+    lng = (lng + 180) % 360 - 180
+    low, high = lng - half_width, lng + half_width
+    if low < -180:
+        return [(low + 360, 180.0), (-180.0, high)]
+    if high > 180:
+        return [(low, 180.0), (-180.0, high - 360)]
+    return [(low, high)]
+
+
+def apply_bounding_box(query, lat: float, lng: float, radius_km: float):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Añade a una consulta de profiles los filtros de rango del
+    rectangulo que contiene el radio. Los filtros sobre latitude descartan
+    ademas las filas sin coordenadas.
+    """
+    min_lat, max_lat, half_width = bounding_box(lat, lng, radius_km)
+    query = query.gte("latitude", round(min_lat, 6)).lte("latitude", round(max_lat, 6))
+    ranges = longitude_ranges(lng, half_width)
+    if ranges is None:
+        return query
+    if len(ranges) == 1:
+        low, high = ranges[0]
+        return query.gte("longitude", round(low, 6)).lte("longitude", round(high, 6))
+    # [low, 180] o [-180, high]: basta con una condicion por lado
+    return query.or_(
+        f"longitude.gte.{ranges[0][0]:.6f},longitude.lte.{ranges[1][1]:.6f}"
+    )
+
+
+def _fetch_pages(build_query, page_size: int) -> List[Dict[str, Any]]:
+    return [
+        row for row in fetch_all_rows(build_query, page_size)
+        if row.get("latitude") is not None and row.get("longitude") is not None
+    ]
+
+
+def load_profile_locations(page_size: int = GEO_INDEX_PAGE_SIZE) -> List[Dict[str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Lee las columnas de /profile/nearby de todos los perfiles
+    con coordenadas, paginando (PostgREST corta cada respuesta en 1000 filas).
+    """
+    service = get_service_client()
+    return _fetch_pages(
+        lambda: service.table("profiles").select(NEARBY_COLUMNS).not_.is_("latitude", "null"),
+        page_size,
+    )
+
+
+def fetch_profiles_near(
+    client,
+    lat: float,
+    lng: float,
+    radius_km: float,
+    pet_type: Optional[str] = None,
+    page_size: int = GEO_INDEX_PAGE_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Perfiles dentro del rectangulo del radio, filtrados por
+    PostgREST. Incluye las esquinas del rectangulo: hay que refinar despues
+    con la distancia exacta (rank_by_distance).
+    """
+
+    def build_query():
+        query = apply_bounding_box(
+            client.table("profiles").select(NEARBY_COLUMNS), lat, lng, radius_km
+        )
+        # ilike sin comodines: igualdad sin distinguir mayusculas
+        return query.ilike("pet_type", escape_like(pet_type)) if pet_type else query
+
+    return _fetch_pages(build_query, page_size)
+
+
+def fetch_profiles_in_viewport(
+    client,
+    min_lat: float,
+    max_lat: float,
+    min_lng: float,
+    max_lng: float,
+    page_size: int = GEO_INDEX_PAGE_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Perfiles dentro de la vista del mapa, filtrados por
+    PostgREST. Una vista con min_lng > max_lng cruza el antimeridiano.
+    """
+
+    def build_query():
+        query = (
+            client.table("profiles")
+            .select(NEARBY_COLUMNS)
+            .gte("latitude", min_lat)
+            .lte("latitude", max_lat)
+        )
+        if min_lng <= max_lng:
+            return query.gte("longitude", min_lng).lte("longitude", max_lng)
+        return query.or_(f"longitude.gte.{min_lng},longitude.lte.{max_lng}")
+
+    return _fetch_pages(build_query, page_size)
+
+
+class LiveGeoIndex(LiveIndex[GeoGridIndex]):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Indice geografico del worker (ver LiveIndex).
+    """
+
+    def __init__(self):
+        super().__init__(
+            lambda: GeoGridIndex.from_rows(load_profile_locations()),
+            "geografico",
+            GEO_INDEX_RECONCILE_SECONDS,
+        )
+
+    def stats(self) -> dict:
+        index = self._index
+        return {
+            "enabled": GEO_INDEX_ENABLED,
+            "profiles": index.size if index else 0,
+            "cells": index.cell_count if index else 0,
+            "array_bytes": index.array_bytes if index else 0,
+            **super().stats(),
+        }
+
+
+geo_index = LiveGeoIndex()
+profile_events.subscribe(geo_index.apply_profile)
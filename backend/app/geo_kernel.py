@@ -0,0 +1,30 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Calculo vectorizado de distancias con NumPy. Calcula la
+# distancia Haversine de un punto a un array completo de candidatos en una
+# sola llamada. La seleccion de los k mas cercanos (con np.partition, sin
+# ordenar todos los candidatos) la hace geo_index.keyset_page. Lo usan
+# /profile/nearby y las demas funciones geo.
+
+from __future__ import annotations
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_batch(
+    lat: float, lng: float, latitudes: np.ndarray, longitudes: np.ndarray
+) -> np.ndarray:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Distancias en KM desde (lat, lng) a cada par de los arrays
+    de latitudes y longitudes (en grados).
+    """
+    origin_lat = np.radians(lat)
+    target_lat = np.radians(latitudes)
+    half_dlat = (target_lat - origin_lat) * 0.5
+    half_dlng = np.radians(longitudes - lng) * 0.5
+    a = np.sin(half_dlat) ** 2 + np.cos(origin_lat) * np.cos(target_lat) * np.sin(half_dlng) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
@@ -8,20 +8,71 @@ from __future__ import annotations
 
 import json
 import logging
-import os
 import urllib.parse
 import urllib.request
 from typing import Optional, Tuple
 
-logger = logging.getLogger(__name__)
+from anyio import from_thread
 
-GEOCODING_BASE_URL = os.environ.get(
-    "GEOCODING_BASE_URL", "https://nominatim.openstreetmap.org/search"
-)
-GEOCODING_USER_AGENT = os.environ.get(
-    "GEOCODING_USER_AGENT", "petconnect-backend-geocoder/1.0"
+from .gazetteer import lookup_centroid
+from .geocode_cache import geocode_cache, normalize_key
+from .geocoder import (
+    GEOCODING_BASE_URL,
+    GEOCODING_DEADLINE_SECONDS,
+    GEOCODING_USER_AGENT,
+    geocoder,
+    parse_nominatim,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _local_lookup(
+    city: Optional[str], postal_code: Optional[str], country: str
+) -> Tuple[str, Optional[Tuple[Optional[float], Optional[float]]]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Resuelve sin red (nomenclator y cache). Retorna la clave de
+    cache y las coordenadas, o None si hay que preguntar a Nominatim.
+    """
+    key = normalize_key(postal_code, city, country)
+    centroid = lookup_centroid(city, postal_code, country)
+    if centroid is not None:
+        return key, centroid
+    return key, geocode_cache.get(key)
+
+
+def _build_query(city: Optional[str], postal_code: Optional[str], country: str) -> str:
+    return " ".join(part for part in (postal_code, city, country) if part)
+
+
+async def geocode_address_async(
+    city: Optional[str],
+    postal_code: Optional[str],
+    country: str = "España",
+    timeout: Optional[float] = GEOCODING_DEADLINE_SECONDS,
+) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Version asincrona de geocode_address. Si Nominatim no
+    responde dentro de `timeout` segundos retorna (None, None); None espera
+    el resultado (tareas en segundo plano).
+    """
+    if not city and not postal_code:
+        return None, None
+
+    # El nomenclator (mmap) y la LRU se consultan en el bucle; solo los fallos
+    # que llegan al SQLite de la cache pasan a un hilo
+    key = normalize_key(postal_code, city, country)
+    coordinates = lookup_centroid(city, postal_code, country)
+    if coordinates is None:
+        coordinates = await geocode_cache.get_async(key)
+    if coordinates is not None:
+        return coordinates
+    return await geocoder.lookup(key, _build_query(city, postal_code, country), timeout)
+
 
 def geocode_address(
     city: Optional[str], postal_code: Optional[str], country: str = "España"
@@ -31,14 +82,35 @@ def geocode_address(
     Fecha: 09-12-2025
     Descripcion: Convierte direccion (ciudad + codigo postal) en coordenadas
     usando el servicio publico de Nominatim. Retorna (latitud, longitud) o
-    (None, None) si no se pudo geocodificar.
+    (None, None) si no se pudo geocodificar. Primero se consulta el
+    nomenclator offline y la cache; desde las rutas sincronas la peticion se
+    delega al geocodificador asincrono del event loop.
     """
 
     if not city and not postal_code:
         return None, None
 
-    query_parts = [part for part in (postal_code, city, country) if part]
-    query = " ".join(query_parts)
+    key, coordinates = _local_lookup(city, postal_code, country)
+    if coordinates is not None:
+        return coordinates
+
+    query = _build_query(city, postal_code, country)
+    try:
+        return from_thread.run(geocoder.lookup, key, query, GEOCODING_DEADLINE_SECONDS)
+    except RuntimeError:
+        # Fuera de un worker de la aplicacion (scripts): peticion directa
+        coordinates, error = _query_nominatim(query)
+        geocode_cache.put(key, coordinates, error=error)
+        return coordinates
+
+
+def _query_nominatim(query: str) -> Tuple[Tuple[Optional[float], Optional[float]], bool]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Consulta Nominatim sin cache. Retorna (coordenadas, error):
+    error es True cuando fallo la peticion y no se debe persistir el resultado.
+    """
     params = urllib.parse.urlencode({"q": query, "format": "json", "limit": 1})
     url = f"{GEOCODING_BASE_URL}?{params}"
     request = urllib.request.Request(url, headers={"User-Agent": GEOCODING_USER_AGENT})
@@ -49,16 +121,6 @@ def geocode_address(
             data = json.loads(payload)
     except Exception as exc:
         logger.warning("Geocoding failed for query '%s': %s", query, exc)
-        return None, None
-
-    if not data:
-        return None, None
-
-    entry = data[0]
-    try:
-        latitude = float(entry["lat"])
-        longitude = float(entry["lon"])
-    except (KeyError, TypeError, ValueError):
-        return None, None
+        return (None, None), True
 
-    return latitude, longitude
+    return parse_nominatim(data), False
@@ -0,0 +1,313 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Cache de geocodificacion en dos niveles: LRU en memoria delante
+# de un almacen SQLite local. Las claves se normalizan a partir de
+# (codigo postal, ciudad, pais) y las busquedas fallidas tambien se guardan
+# (cache negativa) para no repetir consultas a Nominatim. El fichero SQLite
+# solo se usa si GEOCODE_CACHE_PATH lo indica y se abre con la primera
+# busqueda, no al importar el modulo.
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Coordinates = Tuple[Optional[float], Optional[float]]
+
+# Ruta absoluta del almacen SQLite; "" (por defecto) deja solo la LRU
+GEOCODE_CACHE_PATH = os.environ.get("GEOCODE_CACHE_PATH", "")
+GEOCODE_CACHE_SIZE = int(os.environ.get("GEOCODE_CACHE_SIZE", "4096"))
+GEOCODE_CACHE_TTL_SECONDS = float(
+    os.environ.get("GEOCODE_CACHE_TTL_SECONDS", str(30 * 24 * 3600))
+)
+# Direcciones que Nominatim no reconoce
+GEOCODE_NEGATIVE_TTL_SECONDS = float(
+    os.environ.get("GEOCODE_NEGATIVE_TTL_SECONDS", str(24 * 3600))
+)
+# Errores de red o del servicio: solo en memoria y durante poco tiempo
+GEOCODE_ERROR_TTL_SECONDS = float(os.environ.get("GEOCODE_ERROR_TTL_SECONDS", "60"))
+
+
+def normalize_place(value: Optional[str]) -> str:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Minusculas, sin tildes y con los espacios colapsados.
+    """
+    if not value:
+        return ""
+    text = unicodedata.normalize("NFKD", value)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.casefold().split())
+
+
+def normalize_key(
+    postal_code: Optional[str], city: Optional[str], country: Optional[str]
+) -> str:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Clave de cache para una direccion. "28013 ", "28 013" y
+    "Málaga"/"malaga" producen la misma clave.
+    """
+    postal = "".join((postal_code or "").split()).upper()
+    return "|".join((postal, normalize_place(city), normalize_place(country)))
+
+
+class GeocodeCache:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: LRU acotada con caducidad por entrada respaldada por SQLite.
+    Una entrada con coordenadas None es negativa. Seguro entre hilos: la
+    geocodificacion se ejecuta desde el threadpool de FastAPI. La LRU y el
+    fichero tienen candados distintos, asi que una consulta a memoria nunca
+    espera a una escritura en disco; desde el bucle de eventos se usan
+    get_async y put_async, que llevan el SQLite a un hilo.
+    """
+
+    def __init__(
+        self,
+        path: str = "",
+        max_size: int = 4096,
+        ttl: float = 30 * 24 * 3600,
+        negative_ttl: float = 24 * 3600,
+        error_ttl: float = 60,
+    ):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.error_ttl = error_ttl
+        self._entries: "OrderedDict[str, tuple[Coordinates, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Conexion SQLite (apertura, lecturas y escrituras)
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._opened = False
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def _store(self) -> Optional[sqlite3.Connection]:
+        # Con _db_lock tomado; el fichero se crea con el primer uso
+        if not self._opened:
+            self._opened = True
+            if self.path:
+                self._open(self.path)
+        return self._db
+
+    def _open(self, path: str) -> None:
+        try:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS geocode_cache ("
+                " key TEXT PRIMARY KEY,"
+                " latitude REAL,"
+                " longitude REAL,"
+                " expires_at REAL NOT NULL)"
+            )
+        except sqlite3.Error as exc:
+            # Sin disco seguimos con la LRU
+            logger.warning("Geocode cache store unavailable at '%s': %s", path, exc)
+            self._db = None
+
+    def _get_memory(self, key: str, now: float) -> Optional[Coordinates]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return self._count_negative(entry[0])
+            if entry is not None:
+                del self._entries[key]
+            if not self.path:
+                self.misses += 1
+            return None
+
+    def _get_stored(self, key: str, now: float) -> Optional[Coordinates]:
+        row = None
+        with self._db_lock:
+            store = self._store()
+            if store is not None:
+                try:
+                    row = store.execute(
+                        "SELECT latitude, longitude, expires_at FROM geocode_cache WHERE key = ?",
+                        (key,),
+                    ).fetchone()
+                except sqlite3.Error as exc:
+                    logger.warning("Geocode cache read failed: %s", exc)
+        with self._lock:
+            if row is None or row[2] <= now:
+                self.misses += 1
+                return None
+            coordinates = (row[0], row[1])
+            self._remember(key, coordinates, row[2])
+            self.disk_hits += 1
+            return self._count_negative(coordinates)
+
+    def get(self, key: str) -> Optional[Coordinates]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Retorna las coordenadas guardadas (posiblemente (None, None)
+        si la entrada es negativa) o None si no hay entrada vigente.
+        """
+        now = time.time()
+        coordinates = self._get_memory(key, now)
+        if coordinates is not None or not self.path:
+            return coordinates
+        return self._get_stored(key, now)
+
+    async def get_async(self, key: str) -> Optional[Coordinates]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: get para el bucle de eventos: la LRU se consulta en el
+        momento y solo los fallos que van a SQLite pasan a un hilo.
+        """
+        now = time.time()
+        coordinates = self._get_memory(key, now)
+        if coordinates is not None or not self.path:
+            return coordinates
+        return await asyncio.to_thread(self._get_stored, key, now)
+
+    def _remember_result(
+        self, key: str, coordinates: Coordinates, error: bool
+    ) -> Optional[float]:
+        # Guarda en la LRU; retorna la caducidad si hay que persistirlo
+        if error:
+            ttl = self.error_ttl
+        elif coordinates[0] is None:
+            ttl = self.negative_ttl
+        else:
+            ttl = self.ttl
+        if ttl <= 0:
+            return None
+
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, coordinates, expires_at)
+            self.stores += 1
+        return None if error or not self.path else expires_at
+
+    def _write(self, key: str, coordinates: Coordinates, expires_at: float) -> None:
+        with self._db_lock:
+            store = self._store()
+            if store is None:
+                return
+            try:
+                store.execute(
+                    "INSERT OR REPLACE INTO geocode_cache (key, latitude, longitude, expires_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, coordinates[0], coordinates[1], expires_at),
+                )
+            except sqlite3.Error as exc:
+                logger.warning("Geocode cache write failed: %s", exc)
+
+    def put(self, key: str, coordinates: Coordinates, error: bool = False) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Guarda un resultado. Los errores del servicio solo se
+        recuerdan en memoria durante error_ttl; el resto se persiste.
+        """
+        expires_at = self._remember_result(key, coordinates, error)
+        if expires_at is not None:
+            self._write(key, coordinates, expires_at)
+
+    async def put_async(self, key: str, coordinates: Coordinates, error: bool = False) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: put para el bucle de eventos: la LRU se actualiza en el
+        momento y la escritura en SQLite (commit WAL) se hace en un hilo.
+        """
+        expires_at = self._remember_result(key, coordinates, error)
+        if expires_at is not None:
+            await asyncio.to_thread(self._write, key, coordinates, expires_at)
+
+    def purge_expired(self) -> int:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Borra del almacen SQLite las entradas caducadas.
+        """
+        with self._db_lock:
+            store = self._store()
+            if store is None:
+                return 0
+            cursor = store.execute(
+                "DELETE FROM geocode_cache WHERE expires_at <= ?", (time.time(),)
+            )
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        with self._db_lock:
+            store = self._store()
+            if store is not None:
+                store.execute("DELETE FROM geocode_cache")
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> dict:
+        stored = None
+        with self._db_lock:
+            if self._db is not None:
+                try:
+                    stored = self._db.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()[0]
+                except sqlite3.Error:
+                    stored = None
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "stored": stored,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+            }
+
+    def _remember(self, key: str, coordinates: Coordinates, expires_at: float) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (coordinates, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _count_negative(self, coordinates: Coordinates) -> Coordinates:
+        if coordinates[0] is None:
+            self.negative_hits += 1
+        return coordinates
+
+
+geocode_cache = GeocodeCache(
+    path=GEOCODE_CACHE_PATH,
+    max_size=GEOCODE_CACHE_SIZE,
+    ttl=GEOCODE_CACHE_TTL_SECONDS,
+    negative_ttl=GEOCODE_NEGATIVE_TTL_SECONDS,
+    error_ttl=GEOCODE_ERROR_TTL_SECONDS,
+)
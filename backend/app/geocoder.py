@@ -0,0 +1,213 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Cliente asincrono de Nominatim compartido por todo el proceso.
+# Usa una conexion keep-alive, un limitador token bucket global (la politica de
+# Nominatim permite 1 peticion por segundo) y agrupa las busquedas simultaneas
+# de la misma direccion en una sola peticion. Quien espera lo hace con un
+# plazo acotado en lugar de bloquearse hasta el timeout HTTP.
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from .geocode_cache import geocode_cache
+
+logger = logging.getLogger(__name__)
+
+Coordinates = Tuple[Optional[float], Optional[float]]
+
+GEOCODING_BASE_URL = os.environ.get(
+    "GEOCODING_BASE_URL", "https://nominatim.openstreetmap.org/search"
+)
+GEOCODING_USER_AGENT = os.environ.get(
+    "GEOCODING_USER_AGENT", "petconnect-backend-geocoder/1.0"
+)
+GEOCODING_RATE_PER_SECOND = float(os.environ.get("GEOCODING_RATE_PER_SECOND", "1"))
+GEOCODING_BURST = float(os.environ.get("GEOCODING_BURST", "1"))
+GEOCODING_HTTP_TIMEOUT = float(os.environ.get("GEOCODING_HTTP_TIMEOUT", "5"))
+# Espera maxima de quien llama desde una peticion HTTP
+GEOCODING_DEADLINE_SECONDS = float(os.environ.get("GEOCODING_DEADLINE_SECONDS", "3"))
+# Una busqueda que tendria que esperar mas turno que esto se descarta
+GEOCODING_MAX_QUEUE_SECONDS = float(os.environ.get("GEOCODING_MAX_QUEUE_SECONDS", "30"))
+
+
+def parse_nominatim(data: Any) -> Coordinates:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Extrae (latitud, longitud) del primer resultado de Nominatim.
+    """
+    if not data:
+        return None, None
+    entry = data[0]
+    try:
+        return float(entry["lat"]), float(entry["lon"])
+    except (KeyError, TypeError, ValueError):
+        return None, None
+
+
+class TokenBucket:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Limitador token bucket con reservas: cada llamada reserva su
+    turno al instante y espera lo que le corresponda. Solo se usa desde el
+    event loop, asi que no necesita lock.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Retorna los segundos a esperar, o None si superan max_wait
+        (en ese caso no se consume ningun turno).
+        """
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+        if wait > max_wait:
+            return None
+        self._tokens -= 1
+        return wait
+
+    async def acquire(self, max_wait: float) -> bool:
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+
+class AsyncGeocoder:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Servicio de geocodificacion sobre httpx.AsyncClient. El
+    cliente se crea con el primer uso y se cierra al apagar la aplicacion.
+    """
+
+    def __init__(
+        self,
+        base_url: str = GEOCODING_BASE_URL,
+        user_agent: str = GEOCODING_USER_AGENT,
+        rate: float = GEOCODING_RATE_PER_SECOND,
+        burst: float = GEOCODING_BURST,
+        http_timeout: float = GEOCODING_HTTP_TIMEOUT,
+        max_queue_wait: float = GEOCODING_MAX_QUEUE_SECONDS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url
+        self.user_agent = user_agent
+        self.http_timeout = http_timeout
+        self.max_queue_wait = max_queue_wait
+        self._bucket = TokenBucket(rate, burst)
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.requests = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+        self.deadline_exceeded = 0
+        self.upstream_errors = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers={"User-Agent": self.user_agent},
+                timeout=httpx.Timeout(self.http_timeout),
+                limits=httpx.Limits(max_connections=2, max_keepalive_connections=1),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Cierra la conexion keep-alive y abandona las busquedas pendientes.
+        """
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def lookup(self, key: str, query: str, timeout: Optional[float] = None) -> Coordinates:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Resuelve la consulta esperando como mucho `timeout`
+        segundos (None espera el resultado). Las llamadas con la misma clave
+        comparten la peticion en curso, que sigue adelante aunque alguien deje
+        de esperar, para dejar el resultado en la cache.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._resolve(key, query))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            self.deadline_exceeded += 1
+            return None, None
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _resolve(self, key: str, query: str) -> Coordinates:
+        if not await self._bucket.acquire(self.max_queue_wait):
+            self.rate_limited += 1
+            logger.warning("Geocoding queue full, skipping query '%s'", query)
+            return None, None
+
+        self.requests += 1
+        try:
+            response = await self._get_client().get(
+                self.base_url, params={"q": query, "format": "json", "limit": 1}
+            )
+            response.raise_for_status()
+            data = response.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            self.upstream_errors += 1
+            logger.warning("Geocoding failed for query '%s': %s", query, exc)
+            await geocode_cache.put_async(key, (None, None), error=True)
+            return None, None
+
+        coordinates = parse_nominatim(data)
+        await geocode_cache.put_async(key, coordinates)
+        return coordinates
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "rate_limited": self.rate_limited,
+            "deadline_exceeded": self.deadline_exceeded,
+            "upstream_errors": self.upstream_errors,
+            "in_flight": len(self._inflight),
+        }
+
+
+geocoder = AsyncGeocoder()
@@ -0,0 +1,272 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Procesado de las imagenes subidas (publicaciones y avatares).
+# Cada imagen se decodifica, se orienta segun su EXIF, se pasa a sRGB sin
+# metadatos y se guarda en varios tamanos (renditions) en WebP. El trabajo de
+# CPU va a un pool de procesos para no ocupar los hilos de las rutas. Los
+# archivos se llaman <base>_<rendition>.webp, asi que las URLs de todos los
+# tamanos se deducen de la URL de "full" que se guarda en la base de datos.
+
+from __future__ import annotations
+
+import io
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Optional, Union
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+try:
+    from PIL import ImageCms
+except ImportError:  # Pillow sin littlecms: se conservan los pixeles tal cual
+    ImageCms = None
+
+logger = logging.getLogger(__name__)
+
+# 0 procesa en el propio hilo (pruebas y benchmarks)
+IMAGE_WORKERS = int(os.environ.get("IMAGE_WORKERS", str(min(2, os.cpu_count() or 1))))
+IMAGE_TIMEOUT_SECONDS = float(os.environ.get("IMAGE_TIMEOUT_SECONDS", "30"))
+IMAGE_QUALITY = int(os.environ.get("IMAGE_QUALITY", "80"))
+# Proteccion frente a imagenes que ocupan poco comprimidas y mucho en memoria
+IMAGE_MAX_PIXELS = int(os.environ.get("IMAGE_MAX_PIXELS", str(40_000_000)))
+IMAGE_FORMATS = ("JPEG", "PNG", "WEBP")
+IMAGE_EXTENSION = "webp"
+IMAGE_CONTENT_TYPE = "image/webp"
+
+# Lado mayor de cada tamano, en pixeles. "full" es la que se guarda como URL
+POST_RENDITIONS = {"thumb": 320, "feed": 1080, "full": 2048}
+AVATAR_RENDITIONS = {"thumb": 128, "full": 512}
+FULL_RENDITION = "full"
+
+
+class ProcessedImage:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Resultado del procesado: bytes WebP de cada tamano, bytes de
+    la imagen original y milisegundos de CPU del proceso que la trato.
+    """
+
+    __slots__ = ("renditions", "original_bytes", "cpu_ms")
+
+    def __init__(self, renditions: Dict[str, bytes], original_bytes: int, cpu_ms: float):
+        self.renditions = renditions
+        self.original_bytes = original_bytes
+        self.cpu_ms = cpu_ms
+
+    def sizes(self) -> Dict[str, int]:
+        return {name: len(data) for name, data in self.renditions.items()}
+
+
+def _to_srgb(image: Image.Image) -> Image.Image:
+    icc = image.info.get("icc_profile")
+    if not icc or ImageCms is None:
+        return image
+    try:
+        source = ImageCms.ImageCmsProfile(io.BytesIO(icc))
+        return ImageCms.profileToProfile(
+            image, source, ImageCms.createProfile("sRGB"), outputMode=image.mode
+        )
+    except Exception:
+        # Perfil roto: mejor los colores sin convertir que rechazar la imagen
+        return image
+
+
+def process_image(source: Union[bytes, str], renditions: Dict[str, int]) -> ProcessedImage:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Genera los tamanos indicados ({nombre: lado mayor}) de una
+    imagen JPEG, PNG o WebP, dada en bytes o por la ruta de un archivo. Nunca
+    amplia la imagen. Los JPEG se decodifican directamente a la escala mas
+    pequena que sirve para el tamano mayor y cada tamano se reduce a partir
+    del anterior. Lanza ValueError si no es una imagen admitida.
+    """
+    started = time.process_time()
+    is_path = isinstance(source, str)
+    try:
+        with Image.open(source if is_path else io.BytesIO(source)) as opened:
+            if opened.format not in IMAGE_FORMATS:
+                raise ValueError("Formato de imagen no soportado")
+            width, height = opened.size
+            if width * height > IMAGE_MAX_PIXELS:
+                raise ValueError("La imagen es demasiado grande")
+
+            largest = max(renditions.values())
+            scale = min(1.0, largest / max(width, height))
+            opened.draft("RGB", (math.ceil(width * scale), math.ceil(height * scale)))
+            image = _to_srgb(ImageOps.exif_transpose(opened))
+            image.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        raise ValueError("Imagen inválida")
+
+    has_alpha = image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
+    current = image.convert("RGBA" if has_alpha else "RGB")
+    output: Dict[str, bytes] = {}
+    for name, side in sorted(renditions.items(), key=lambda item: -item[1]):
+        if max(current.size) > side:
+            current = current.copy()
+            current.thumbnail((side, side), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        buffer = io.BytesIO()
+        # Sin exif, xmp ni icc: solo se escriben los que se pasan aqui
+        current.save(buffer, "WEBP", quality=IMAGE_QUALITY, method=4)
+        output[name] = buffer.getvalue()
+    original_bytes = os.path.getsize(source) if is_path else len(source)
+    return ProcessedImage(output, original_bytes, (time.process_time() - started) * 1000)
+
+
+class ImagePipeline:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Pool de procesos para process_image, creado con la primera
+    subida, con contadores de bytes ahorrados y CPU por subida. Las rutas
+    (sincronas) esperan el resultado en su hilo del threadpool.
+    """
+
+    def __init__(self, workers: int = IMAGE_WORKERS, timeout: float = IMAGE_TIMEOUT_SECONDS):
+        self.workers = workers
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.uploads = 0
+        self.original_bytes = 0
+        self.rendition_bytes: Dict[str, int] = {}
+        self.cpu_ms = 0.0
+        self.wall_ms = 0.0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: el proceso de la app tiene hilos y fork no es seguro
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def process(
+        self, source: Union[bytes, str], renditions: Dict[str, int], label: str = ""
+    ) -> ProcessedImage:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Procesa la imagen (bytes o ruta de archivo) en el pool, o
+        en el hilo si no hay workers, y registra lo que pesa cada tamano
+        frente al original.
+        """
+        started = time.perf_counter()
+        if self.workers <= 0:
+            processed = process_image(source, renditions)
+        else:
+            try:
+                processed = self._pool().submit(process_image, source, renditions).result(
+                    timeout=self.timeout
+                )
+            except BrokenProcessPool:
+                # Un worker murio (por ejemplo por memoria): se crea otro pool
+                self.shutdown()
+                raise
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        sizes = processed.sizes()
+        with self._lock:
+            self.uploads += 1
+            self.original_bytes += processed.original_bytes
+            for name, size in sizes.items():
+                self.rendition_bytes[name] = self.rendition_bytes.get(name, 0) + size
+            self.cpu_ms += processed.cpu_ms
+            self.wall_ms += wall_ms
+        logger.info(
+            "Imagen %s: original %d B, %s, CPU %.1f ms, total %.1f ms",
+            label,
+            processed.original_bytes,
+            ", ".join(f"{name} {size} B" for name, size in sizes.items()),
+            processed.cpu_ms,
+            wall_ms,
+        )
+        return processed
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            uploads = self.uploads
+            return {
+                "workers": self.workers,
+                "uploads": uploads,
+                "avg_original_bytes": round(self.original_bytes / uploads) if uploads else None,
+                # Lo que se deja de descargar al pedir cada tamano en vez del original
+                "avg_bytes_saved": {
+                    name: round((self.original_bytes - total) / uploads)
+                    for name, total in self.rendition_bytes.items()
+                } if uploads else {},
+                "avg_cpu_ms": round(self.cpu_ms / uploads, 1) if uploads else None,
+                "avg_wall_ms": round(self.wall_ms / uploads, 1) if uploads else None,
+            }
+
+
+def rendition_path(base: str, name: str) -> str:
+    return f"{base}_{name}.{IMAGE_EXTENSION}"
+
+
+def upload_renditions(storage, base: str, processed: ProcessedImage) -> str:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Sube cada tamano al bucket y retorna la URL publica de "full".
+    """
+    for name, data in processed.renditions.items():
+        storage.upload(
+            rendition_path(base, name),
+            data,
+            {"content-type": IMAGE_CONTENT_TYPE, "upsert": "true"},
+        )
+    public_url = storage.get_public_url(rendition_path(base, FULL_RENDITION))
+    return public_url.get("publicUrl") if isinstance(public_url, dict) else public_url
+
+
+def _split_full(path: str) -> Optional[str]:
+    suffix = f"_{FULL_RENDITION}.{IMAGE_EXTENSION}"
+    return path[: -len(suffix)] if path.endswith(suffix) else None
+
+
+def rendition_urls(url: Optional[str], names: Iterable[str]) -> Optional[Dict[str, str]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: URLs de cada tamano a partir de la URL de "full". Las imagenes
+    subidas antes del procesado solo tienen el original, que sirve para todos.
+    """
+    if not url:
+        return None
+    path, mark, query = url.partition("?")
+    base = _split_full(path)
+    if base is None:
+        return {name: url for name in names}
+    return {name: f"{rendition_path(base, name)}{mark}{query}" for name in names}
+
+
+def rendition_paths(path: str, names: Iterable[str]) -> List[str]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Rutas del bucket de todos los tamanos de una imagen, para
+    borrarlos juntos.
+    """
+    base = _split_full(path)
+    return [path] if base is None else [rendition_path(base, name) for name in names]
+
+
+image_pipeline = ImagePipeline()
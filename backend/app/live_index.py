@@ -0,0 +1,233 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Ciclo de vida comun de las estructuras en memoria que se
+# construyen desde la tabla profiles (indice geografico, indice de busqueda,
+# etc.): carga perezosa, avisos de profile_events y reconstruccion periodica.
+# Las estructuras que necesitan las mismas filas se agrupan en un
+# LiveIndexGroup para leer la tabla una sola vez.
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import ExitStack
+from typing import (
+    Any, Callable, Dict, Generic, List, Optional, Protocol, Sequence, Tuple, TypeVar
+)
+
+
+class ProfileStructure(Protocol):
+    def apply(self, profile_id: Optional[str], profile: Optional[Dict[str, Any]]) -> None: ...
+
+
+T = TypeVar("T", bound=ProfileStructure)
+Rows = List[Dict[str, Any]]
+
+
+async def _reconcile_forever(target, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(target.reconcile)
+        except Exception as exc:
+            print(f"No se pudo reconciliar el indice {target.label}: {exc}")
+
+
+def fetch_all_rows(build_query, page_size: int) -> Rows:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Lee todas las filas de una consulta paginando por id
+    (PostgREST corta cada respuesta en 1000 filas).
+    """
+    rows: Rows = []
+    start = 0
+    while True:
+        page = build_query().order("id").range(start, start + page_size - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+
+class LiveIndex(Generic[T]):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Estructura del worker. Se carga una vez con `build` (al
+    arrancar o con la primera consulta), se mantiene con los avisos de
+    profile_events y cada `reconcile_seconds` se reconstruye desde la base de
+    datos para corregir cambios hechos fuera de la API. Los avisos que llegan
+    durante una reconstruccion se vuelven a aplicar sobre la estructura nueva
+    antes de usarla. `from_rows` construye la estructura con filas ya leidas
+    (ver LiveIndexGroup).
+    """
+
+    def __init__(
+        self,
+        build: Callable[[], T],
+        label: str,
+        reconcile_seconds: float,
+        from_rows: Optional[Callable[[Rows], T]] = None,
+    ):
+        self._build = build
+        self._from_rows = from_rows
+        self.label = label
+        self.reconcile_seconds = reconcile_seconds
+        self._index: Optional[T] = None
+        self._load_lock = threading.Lock()
+        self._events_lock = threading.Lock()
+        self._pending: Optional[List[Tuple[str, Optional[Dict[str, Any]]]]] = None
+        self._loaded_at = 0.0
+        self._rebuild_started = 0.0
+        self.loads = 0
+        self.events = 0
+        self.last_load_seconds = 0.0
+
+    def get(self) -> T:
+        index = self._index
+        if index is not None:
+            return index
+        with self._load_lock:
+            if self._index is None:
+                self._rebuild()
+            return self._index
+
+    def reconcile(self) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Reconstruye la estructura desde la tabla profiles.
+        """
+        with self._load_lock:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        self._begin_rebuild()
+        self._finish_rebuild(self._build)
+
+    def _begin_rebuild(self) -> None:
+        # Desde aqui los avisos se guardan para aplicarlos a la estructura nueva
+        with self._events_lock:
+            self._pending = []
+        self._rebuild_started = time.perf_counter()
+
+    def _cancel_rebuild(self) -> None:
+        with self._events_lock:
+            self._pending = None
+
+    def _finish_rebuild(self, build: Callable[[], T]) -> None:
+        try:
+            fresh = build()
+        except Exception:
+            self._cancel_rebuild()
+            raise
+        with self._events_lock:
+            for profile_id, profile in self._pending:
+                fresh.apply(profile_id, profile)
+            self._pending = None
+            self._index = fresh
+        self._loaded_at = time.monotonic()
+        self.last_load_seconds = time.perf_counter() - self._rebuild_started
+        self.loads += 1
+
+    def apply_profile(self, profile_id: str, profile: Optional[Dict[str, Any]]) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Listener de profile_events.
+        """
+        with self._events_lock:
+            self.events += 1
+            if self._pending is not None:
+                self._pending.append((profile_id, profile))
+            if self._index is not None:
+                self._index.apply(profile_id, profile)
+
+    async def reconcile_forever(self, interval: Optional[float] = None) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Barrido periodico; se lanza como tarea en el lifespan.
+        """
+        await _reconcile_forever(self, interval or self.reconcile_seconds)
+
+    def invalidate(self) -> None:
+        with self._load_lock, self._events_lock:
+            self._index = None
+
+    def stats(self) -> dict:
+        return {
+            "age_seconds": (
+                round(time.monotonic() - self._loaded_at, 1) if self._index is not None else None
+            ),
+            "loads": self.loads,
+            "events": self.events,
+            "last_load_seconds": round(self.last_load_seconds, 4),
+        }
+
+
+class LiveIndexGroup:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Estructuras del worker que se construyen con las mismas filas
+    de profiles. Al arrancar y en cada reconciliacion se hace una sola lectura
+    con `load_rows` y cada estructura se reconstruye con su `from_rows`. Los
+    avisos de profile_events se guardan desde antes de la lectura, igual que
+    en LiveIndex. Cada estructura puede seguir cargandose sola con su get().
+    """
+
+    def __init__(self, indexes: Sequence[LiveIndex], load_rows: Callable[[], Rows], label: str):
+        self.indexes = list(indexes)
+        self._load_rows = load_rows
+        self.label = label
+        self.reconcile_seconds = min(index.reconcile_seconds for index in self.indexes)
+        self.loads = 0
+
+    def _rebuild(self, indexes: List[LiveIndex]) -> None:
+        with ExitStack() as stack:
+            # Siempre en el mismo orden: las estructuras solo toman su propio candado
+            for index in indexes:
+                stack.enter_context(index._load_lock)
+            for index in indexes:
+                index._begin_rebuild()
+            try:
+                rows = self._load_rows()
+            except Exception:
+                for index in indexes:
+                    index._cancel_rebuild()
+                raise
+            self.loads += 1
+            failure: Optional[Exception] = None
+            for index in indexes:
+                try:
+                    index._finish_rebuild(lambda index=index: index._from_rows(rows))
+                except Exception as exc:
+                    # Un fallo no deja a las demas sin reconstruir
+                    failure = failure or exc
+            if failure is not None:
+                raise failure
+
+    def get(self) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Carga con una sola lectura las estructuras que aun no
+        estan cargadas.
+        """
+        missing = [index for index in self.indexes if index._index is None]
+        if missing:
+            self._rebuild(missing)
+
+    def reconcile(self) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Reconstruye todas las estructuras con una sola lectura.
+        """
+        self._rebuild(self.indexes)
+
+    async def reconcile_forever(self, interval: Optional[float] = None) -> None:
+        await _reconcile_forever(self, interval or self.reconcile_seconds)
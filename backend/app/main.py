@@ -2,26 +2,105 @@
 # Fecha de creación: 2 de Noviembre de 2025
 # Descripción: Archivo principal de FastAPI que configura la aplicación e incluye los routers necesarios.
 
+import asyncio
+import logging
+import os
+import queue
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+
 from fastapi import Depends, FastAPI
 
+from .database import (
+    close_async_clients,
+    close_clients,
+    init_async_clients,
+    init_clients,
+)
 from .routers.auth import router as auth_router
 from .dependencies import get_current_user
 from .routers.profile import router as profile_router
 from .routers.posts import router as posts_router
+from .routers.feed import router as feed_router
 from .routers.post_likes import router as post_likes_router
 from .routers.conversations import router as conversations_router
 from .routers.reports import router as reports_router
 from .routers.moderation import router as moderation_router
 from .routers.notifications import router as notifications_router
+from .routers.diagnostics import router as diagnostics_router
+from .geocoder import geocoder
+from .images import image_pipeline
+from .geo_index import GEO_INDEX_ENABLED, geo_index
+from .search_index import SEARCH_INDEX_ENABLED
+from .suggest_index import SUGGEST_INDEX_ENABLED, text_indexes
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "WARNING").upper()
+
+
+def _start_log_listener() -> QueueListener:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Envia los logs del paquete app a una cola que escribe un hilo
+    aparte, para que las rutas no se bloqueen escribiendo en stderr.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(log_queue, handler)
+
+    app_logger = logging.getLogger("app")
+    app_logger.handlers = [QueueHandler(log_queue)]
+    app_logger.setLevel(LOG_LEVEL)
+    app_logger.propagate = False
+    listener.start()
+    return listener
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Crea los clientes compartidos al arrancar y los cierra al apagar.
+    Carga los indices en memoria (geografico, busqueda y autocompletado) y lanza sus
+    barridos periodicos. Busqueda y autocompletado comparten cada lectura de profiles.
+    """
+    log_listener = _start_log_listener()
+    init_clients()
+    await init_async_clients()
+    live_indexes = [geo_index] if GEO_INDEX_ENABLED else []
+    text = text_indexes(SEARCH_INDEX_ENABLED, SUGGEST_INDEX_ENABLED)
+    if text is not None:
+        live_indexes.append(text)
+    reconciliations = []
+    for index in live_indexes:
+        try:
+            await asyncio.to_thread(index.get)
+        except Exception as exc:
+            # Se reintenta con la primera consulta que lo necesite
+            print(f"No se pudo cargar el indice {index.label}: {exc}")
+        reconciliations.append(asyncio.create_task(index.reconcile_forever()))
+    yield
+    for task in reconciliations:
+        task.cancel()
+    await geocoder.close()
+    image_pipeline.shutdown()
+    await close_async_clients()
+    close_clients()
+    log_listener.stop()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.include_router(auth_router)
 app.include_router(profile_router)
 app.include_router(posts_router)
+app.include_router(feed_router)
 app.include_router(post_likes_router)
 app.include_router(conversations_router)
 app.include_router(reports_router)
 app.include_router(moderation_router)
 app.include_router(notifications_router)
+app.include_router(diagnostics_router)
 
 
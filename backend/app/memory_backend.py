@@ -0,0 +1,996 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Sustituto en memoria de Supabase (PostgREST, Storage y Auth) con
+# el subconjunto de la API que usan los routers. Permite ejecutar tests de rutas
+# con datos y benchmarks reproducibles sin un proyecto Supabase real. La latencia
+# de cada llamada se puede inyectar para simular la red.
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import itertools
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from postgrest.exceptions import APIError
+from supabase_auth.errors import AuthApiError
+
+MEMORY_PUBLIC_URL = "http://memory.local"
+
+# Restricciones unique equivalentes a las del esquema de Supabase
+DEFAULT_UNIQUE_CONSTRAINTS: Dict[str, List[Tuple[str, ...]]] = {
+    # email: indice unico sobre lower(email); los correos se guardan en minusculas
+    "profiles": [("username",), ("email",)],
+    "post_likes": [("post_id", "user_id")],
+    "user_follows": [("follower_id", "followed_id")],
+    "post_reports": [("post_id", "reporter_id")],
+    "comment_reports": [("comment_id", "reporter_id")],
+}
+
+# Columnas con valor por defecto (NULL o default de la tabla) del esquema real
+DEFAULT_COLUMNS: Dict[str, Dict[str, Any]] = {
+    "profiles": {
+        "email": None,
+        "username": None,
+        "postal_code": None,
+        "city": None,
+        "latitude": None,
+        "longitude": None,
+        "pet_name": None,
+        "pet_type": None,
+        "pet_gender": None,
+        "avatar_url": None,
+        "bio": None,
+        "updated_at": None,
+        "role": "user",
+    },
+    "posts": {
+        "description": None,
+        "image_url": None,
+        "likes_count": 0,
+        "comments_count": 0,
+        "updated_at": None,
+    },
+    "conversations": {"last_message_at": None},
+    "notifications": {
+        "post_id": None,
+        "conversation_id": None,
+        "message_id": None,
+        "author_id": None,
+        "read_at": None,
+    },
+}
+
+# Columnas con indice por igualdad (equivalentes a PK / indices btree)
+DEFAULT_INDEXES: Dict[str, Tuple[str, ...]] = {
+    "profiles": ("id", "email", "username"),
+    "posts": ("id", "user_id"),
+    "post_likes": ("post_id",),
+    "post_comments": ("id", "post_id"),
+    "conversations": ("id",),
+    "messages": ("conversation_id",),
+    "notifications": ("receiver_id",),
+    "user_follows": ("follower_id", "followed_id"),
+    "refresh_tokens": ("id", "family_id", "user_id"),
+}
+
+
+@dataclass
+class MemoryResponse:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Respuesta con la misma forma que APIResponse de postgrest.
+    """
+
+    data: Any
+    count: Optional[int] = None
+
+
+@dataclass
+class MemoryUser:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Usuario de Auth con los atributos que leen los routers.
+    """
+
+    id: str
+    email: str
+    password: str = field(repr=False, default="")
+    email_confirmed_at: Optional[str] = None
+    created_at: Optional[str] = None
+
+
+@dataclass
+class MemoryAuthResponse:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Respuesta de sign_up / sign_in / get_user_by_id.
+    """
+
+    user: Optional[MemoryUser]
+    session: Optional[dict] = None
+
+
+class MemoryBackend:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Estado compartido del sustituto: tablas, buckets, usuarios de
+    Auth y funciones RPC. `latency` (segundos) y `jitter` se aplican a cada
+    llamada que en Supabase seria una peticion HTTP.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        auto_confirm: bool = True,
+        unique_constraints: Optional[Dict[str, List[Tuple[str, ...]]]] = None,
+        default_columns: Optional[Dict[str, Dict[str, Any]]] = None,
+        indexes: Optional[Dict[str, Tuple[str, ...]]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.auto_confirm = auto_confirm
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.buckets: Dict[str, Dict[str, bytes]] = {}
+        self.users: Dict[str, MemoryUser] = {}
+        self.unique_constraints = (
+            DEFAULT_UNIQUE_CONSTRAINTS if unique_constraints is None else unique_constraints
+        )
+        self.default_columns = (
+            DEFAULT_COLUMNS if default_columns is None else default_columns
+        )
+        self.indexes = DEFAULT_INDEXES if indexes is None else indexes
+        self._index_cache: Dict[Tuple[str, str], Tuple[int, Dict[str, List[dict]]]] = {}
+        self._versions: Dict[str, int] = {}
+        self.users_by_email: Dict[str, MemoryUser] = {}
+        self.rpcs: Dict[str, Callable[["MemoryBackend", dict], Any]] = {
+            "increment_likes": _rpc_increment_likes,
+            "decrement_likes": _rpc_decrement_likes,
+        }
+        self.calls: Dict[str, int] = {}
+        self.lock = threading.RLock()
+        self._random = random.Random(seed)
+        self._clock = itertools.count()
+        self._epoch = datetime.now(timezone.utc)
+
+    # Clientes
+    def client(self) -> "MemoryClient":
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Cliente sincrono (equivalente a supabase.Client).
+        """
+        return MemoryClient(self)
+
+    def async_client(self) -> "AsyncMemoryClient":
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Cliente asincrono (equivalente a supabase.AsyncClient).
+        """
+        return AsyncMemoryClient(self)
+
+    # Utilidades para sembrar datos y simular red
+    def seed_rows(self, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Inserta filas directamente, sin latencia ni restricciones.
+        """
+        with self.lock:
+            stored = [self._with_defaults(table, dict(row)) for row in rows]
+            self.tables.setdefault(table, []).extend(stored)
+            self.touch(table)
+            return stored
+
+    def create_user(self, email: str, password: str, confirmed: bool = True) -> MemoryUser:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Registra un usuario de Auth sin pasar por sign_up.
+        """
+        with self.lock:
+            now = self.now()
+            user = MemoryUser(
+                id=str(uuid.uuid4()),
+                email=email,
+                password=password,
+                email_confirmed_at=now if confirmed else None,
+                created_at=now,
+            )
+            self.users[user.id] = user
+            self.users_by_email[email.lower()] = user
+            return user
+
+    def now(self) -> str:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Timestamp ISO estrictamente creciente para ordenar filas nuevas.
+        """
+        tick = next(self._clock)
+        return (self._epoch + timedelta(microseconds=tick)).isoformat()
+
+    def delay(self) -> float:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Latencia a inyectar en la siguiente llamada.
+        """
+        if not self.latency and not self.jitter:
+            return 0.0
+        return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def touch(self, table: str) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Marca la tabla como modificada para invalidar sus indices.
+        """
+        self._versions[table] = self._versions.get(table, 0) + 1
+
+    def lookup(self, table: str, column: str, value: Any) -> Optional[List[Dict[str, Any]]]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Filas con column == value usando el indice hash de la
+        columna (se reconstruye tras escrituras). None si no hay indice.
+        """
+        if column not in self.indexes.get(table, ()):
+            return None
+        version = self._versions.get(table, 0)
+        cached = self._index_cache.get((table, column))
+        if cached is None or cached[0] != version:
+            index: Dict[str, List[dict]] = {}
+            for row in self.tables.get(table, []):
+                value_key = row.get(column)
+                if value_key is not None:
+                    index.setdefault(str(value_key), []).append(row)
+            cached = (version, index)
+            self._index_cache[(table, column)] = cached
+        return cached[1].get(str(value), [])
+
+    def count_call(self, kind: str) -> None:
+        with self.lock:
+            self.calls[kind] = self.calls.get(kind, 0) + 1
+
+    def _with_defaults(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        row.setdefault("id", str(uuid.uuid4()))
+        row.setdefault("created_at", self.now())
+        for column, value in self.default_columns.get(table, {}).items():
+            row.setdefault(column, value)
+        return row
+
+    def _check_unique(self, table: str, row: Dict[str, Any], ignore: Optional[dict] = None) -> None:
+        for columns in self.unique_constraints.get(table, []):
+            if any(row.get(column) is None for column in columns):
+                continue
+            for existing in self.tables.get(table, []):
+                if existing is ignore:
+                    continue
+                if all(existing.get(column) == row.get(column) for column in columns):
+                    raise APIError(
+                        {
+                            "code": "23505",
+                            "message": f"duplicate key value violates unique constraint on {table}",
+                            "details": f"Key ({', '.join(columns)}) already exists.",
+                            "hint": None,
+                        }
+                    )
+
+
+def _rpc_increment_likes(backend: MemoryBackend, params: dict) -> Any:
+    for row in backend.tables.get("posts", []):
+        if row.get("id") == params.get("post_id_input"):
+            row["likes_count"] = (row.get("likes_count") or 0) + 1
+    return None
+
+
+def _rpc_decrement_likes(backend: MemoryBackend, params: dict) -> Any:
+    for row in backend.tables.get("posts", []):
+        if row.get("id") == params.get("post_id_input"):
+            row["likes_count"] = max(0, (row.get("likes_count") or 0) - 1)
+    return None
+
+
+# Parsing de filtros y select
+def _split_top_level(text: str, separator: str = ",") -> List[str]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Divide por `separator` ignorando lo que hay entre parentesis.
+    """
+    parts: List[str] = []
+    depth = 0
+    current: List[str] = []
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == separator and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _like_to_regex(pattern: str, case_insensitive: bool) -> re.Pattern:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Traduce un patron LIKE (% _ y * de PostgREST) a expresion regular.
+    """
+    regex: List[str] = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\" and index + 1 < len(pattern):
+            regex.append(re.escape(pattern[index + 1]))
+            index += 2
+            continue
+        if char in ("%", "*"):
+            regex.append(".*")
+        elif char == "_":
+            regex.append(".")
+        else:
+            regex.append(re.escape(char))
+        index += 1
+    flags = re.DOTALL | (re.IGNORECASE if case_insensitive else 0)
+    return re.compile("^" + "".join(regex) + "$", flags)
+
+
+def _equals(left: Any, right: Any) -> bool:
+    if left == right:
+        return True
+    if left is None or right is None:
+        return False
+    if isinstance(left, bool) or isinstance(right, bool):
+        return str(left).lower() == str(right).lower()
+    return str(left) == str(right)
+
+
+def _compare(left: Any, right: Any) -> Optional[int]:
+    if left is None or right is None:
+        return None
+    if isinstance(left, (int, float)) and not isinstance(right, (int, float)):
+        try:
+            right = float(right)
+        except (TypeError, ValueError):
+            return None
+    if isinstance(left, str) and not isinstance(right, str):
+        right = str(right)
+    try:
+        return (left > right) - (left < right)
+    except TypeError:
+        return None
+
+
+def _matches(row: Dict[str, Any], column: str, operator: str, value: Any) -> bool:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Evalua un filtro PostgREST sobre una fila.
+    """
+    if operator.startswith("not."):
+        return not _matches(row, column, operator[4:], value)
+    if operator == "and":
+        return all(_matches(row, *condition) for condition in value)
+    current = row.get(column)
+    if operator == "eq":
+        return _equals(current, value)
+    if operator == "neq":
+        return current is not None and not _equals(current, value)
+    if operator in ("gt", "gte", "lt", "lte"):
+        result = _compare(current, value)
+        if result is None:
+            return False
+        return {
+            "gt": result > 0,
+            "gte": result >= 0,
+            "lt": result < 0,
+            "lte": result <= 0,
+        }[operator]
+    if operator in ("like", "ilike"):
+        if current is None:
+            return False
+        return bool(_like_to_regex(str(value), operator == "ilike").match(str(current)))
+    if operator == "in":
+        return any(_equals(current, item) for item in value)
+    if operator == "is":
+        if value in (None, "null"):
+            return current is None
+        return _equals(current, value)
+    raise ValueError(f"Operador no soportado en el backend en memoria: {operator}")
+
+
+def _parse_or(expression: str) -> List[Tuple[str, str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Parsea la sintaxis de or_ ("col.op.valor,col.op.valor"),
+    con grupos "and(...)" anidados y valores entre comillas dobles.
+    """
+    conditions = []
+    for clause in _split_top_level(expression):
+        clause = clause.strip()
+        if clause.startswith("and(") and clause.endswith(")"):
+            conditions.append(("", "and", _parse_or(clause[4:-1])))
+            continue
+        column, operator, value = clause.split(".", 2)
+        if operator == "in":
+            value = [item.strip().strip('"') for item in value.strip("()").split(",")]
+        elif len(value) >= 2 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        conditions.append((column, operator, value))
+    return conditions
+
+
+@dataclass
+class _Embed:
+    alias: str
+    table: str
+    hint: Optional[str]
+    columns: List[Any]
+
+
+def _parse_select(columns: str) -> List[Any]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Parsea la lista de columnas, incluidos recursos embebidos
+    como "alias:tabla!fk(col1, col2)".
+    """
+    parsed: List[Any] = []
+    for item in _split_top_level(" ".join(columns.split())):
+        if "(" not in item:
+            parsed.append(item)
+            continue
+        head, _, inner = item.partition("(")
+        inner = inner[: inner.rfind(")")]
+        alias = None
+        if ":" in head:
+            alias, head = head.split(":", 1)
+        table, _, hint = head.partition("!")
+        parsed.append(
+            _Embed(
+                alias=(alias or table).strip(),
+                table=table.strip(),
+                hint=hint.strip() or None,
+                columns=_parse_select(inner),
+            )
+        )
+    return parsed
+
+
+def _foreign_key_candidates(source_table: str, embed: _Embed) -> List[str]:
+    candidates: List[str] = []
+    if embed.hint:
+        hint = embed.hint
+        prefix = f"{source_table}_"
+        if hint.startswith(prefix) and hint.endswith("_fkey"):
+            candidates.append(hint[len(prefix) : -len("_fkey")])
+        else:
+            candidates.append(hint)
+    candidates.append(f"{embed.alias}_id")
+    candidates.append(f"{embed.table.rstrip('s')}_id")
+    candidates.append("user_id")
+    return candidates
+
+
+class MemoryQuery:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Query builder con la interfaz encadenable de postgrest-py.
+    """
+
+    def __init__(self, backend: MemoryBackend, table: str):
+        self._backend = backend
+        self._table = table
+        self._action = "select"
+        self._columns: List[Any] = ["*"]
+        self._count: Optional[str] = None
+        self._payload: Any = None
+        self._filters: List[Tuple[str, str, Any]] = []
+        self._or_groups: List[List[Tuple[str, str, Any]]] = []
+        self._orders: List[Tuple[str, bool, Optional[bool]]] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._single = False
+        self._negate_next = False
+
+    # Acciones
+    def select(self, *columns: str, count: Optional[str] = None) -> "MemoryQuery":
+        self._action = "select"
+        self._columns = _parse_select(",".join(columns) or "*")
+        self._count = count
+        return self
+
+    def insert(self, payload: Any, returning: str = "representation", **_: Any) -> "MemoryQuery":
+        self._action = "insert"
+        self._payload = payload
+        return self
+
+    def upsert(self, payload: Any, on_conflict: str = "", **_: Any) -> "MemoryQuery":
+        self._action = "upsert"
+        self._payload = (payload, [c.strip() for c in on_conflict.split(",") if c.strip()])
+        return self
+
+    def update(self, payload: Dict[str, Any], returning: str = "representation", **_: Any) -> "MemoryQuery":
+        self._action = "update"
+        self._payload = payload
+        return self
+
+    def delete(self, returning: str = "representation", **_: Any) -> "MemoryQuery":
+        self._action = "delete"
+        return self
+
+    # Filtros
+    @property
+    def not_(self) -> "MemoryQuery":
+        self._negate_next = True
+        return self
+
+    def _filter(self, column: str, operator: str, value: Any) -> "MemoryQuery":
+        if self._negate_next:
+            operator = f"not.{operator}"
+            self._negate_next = False
+        self._filters.append((column, operator, value))
+        return self
+
+    def eq(self, column: str, value: Any) -> "MemoryQuery":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "MemoryQuery":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "MemoryQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "MemoryQuery":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "MemoryQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "MemoryQuery":
+        return self._filter(column, "lte", value)
+
+    def like(self, column: str, pattern: str) -> "MemoryQuery":
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column: str, pattern: str) -> "MemoryQuery":
+        return self._filter(column, "ilike", pattern)
+
+    def is_(self, column: str, value: Any) -> "MemoryQuery":
+        return self._filter(column, "is", value)
+
+    def in_(self, column: str, values: Any) -> "MemoryQuery":
+        return self._filter(column, "in", list(values))
+
+    def or_(self, filters: str, reference_table: Optional[str] = None) -> "MemoryQuery":
+        self._or_groups.append(_parse_or(filters))
+        return self
+
+    # Modificadores
+    def order(
+        self, column: str, desc: bool = False, nullsfirst: Optional[bool] = None, **_: Any
+    ) -> "MemoryQuery":
+        self._orders.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size: int, **_: Any) -> "MemoryQuery":
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int, **_: Any) -> "MemoryQuery":
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def single(self) -> "MemoryQuery":
+        self._single = True
+        return self
+
+    # Ejecucion
+    def execute(self) -> MemoryResponse:
+        delay = self._backend.delay()
+        if delay:
+            time.sleep(delay)
+        return self._run()
+
+    def _run(self) -> MemoryResponse:
+        backend = self._backend
+        backend.count_call(f"{self._action}:{self._table}")
+        with backend.lock:
+            if self._action == "insert":
+                return self._finish(self._insert())
+            if self._action == "upsert":
+                return self._finish(self._upsert())
+            rows = [row for row in self._candidates() if self._keep(row)]
+            if self._action in ("update", "delete"):
+                backend.touch(self._table)
+            if self._action == "update":
+                for row in rows:
+                    candidate = {**row, **self._payload}
+                    backend._check_unique(self._table, candidate, ignore=row)
+                for row in rows:
+                    row.update(copy.deepcopy(self._payload))
+                return self._finish([dict(row) for row in rows])
+            if self._action == "delete":
+                table = backend.tables.get(self._table, [])
+                removed_ids = {id(row) for row in rows}
+                backend.tables[self._table] = [row for row in table if id(row) not in removed_ids]
+                return self._finish([dict(row) for row in rows])
+
+            total = len(rows)
+            rows = self._sorted(rows)
+            if self._offset:
+                rows = rows[self._offset :]
+            if self._limit is not None:
+                rows = rows[: self._limit]
+            projected = [self._project(self._table, row, self._columns) for row in rows]
+            return self._finish(projected, total if self._count else None)
+
+    def _candidates(self) -> List[Dict[str, Any]]:
+        for column, operator, value in self._filters:
+            if operator == "eq":
+                indexed = self._backend.lookup(self._table, column, value)
+                if indexed is not None:
+                    return indexed
+        return self._backend.tables.get(self._table, [])
+
+    def _insert(self) -> List[Dict[str, Any]]:
+        backend = self._backend
+        backend.touch(self._table)
+        payload = self._payload if isinstance(self._payload, list) else [self._payload]
+        created = []
+        for item in payload:
+            row = backend._with_defaults(self._table, copy.deepcopy(item))
+            backend._check_unique(self._table, row)
+            backend.tables.setdefault(self._table, []).append(row)
+            created.append(dict(row))
+        return created
+
+    def _upsert(self) -> List[Dict[str, Any]]:
+        backend = self._backend
+        backend.touch(self._table)
+        payload, conflict = self._payload
+        items = payload if isinstance(payload, list) else [payload]
+        conflict = conflict or ["id"]
+        saved = []
+        for item in items:
+            existing = next(
+                (
+                    row
+                    for row in backend.tables.get(self._table, [])
+                    if all(_equals(row.get(column), item.get(column)) for column in conflict)
+                ),
+                None,
+            )
+            if existing is not None:
+                existing.update(copy.deepcopy(item))
+                saved.append(dict(existing))
+            else:
+                row = backend._with_defaults(self._table, copy.deepcopy(item))
+                backend.tables.setdefault(self._table, []).append(row)
+                saved.append(dict(row))
+        return saved
+
+    def _keep(self, row: Dict[str, Any]) -> bool:
+        if not all(_matches(row, *condition) for condition in self._filters):
+            return False
+        return all(
+            any(_matches(row, *condition) for condition in group)
+            for group in self._or_groups
+        )
+
+    def _sorted(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        ordered = list(rows)
+        for column, desc, nullsfirst in reversed(self._orders):
+            # Postgres: NULLS LAST en ASC y NULLS FIRST en DESC por defecto
+            nulls_first = desc if nullsfirst is None else nullsfirst
+            present = [row for row in ordered if row.get(column) is not None]
+            missing = [row for row in ordered if row.get(column) is None]
+            present.sort(key=lambda row: row[column], reverse=desc)
+            ordered = missing + present if nulls_first else present + missing
+        return ordered
+
+    def _project(self, table: str, row: Dict[str, Any], columns: List[Any]) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for column in columns:
+            if isinstance(column, _Embed):
+                result[column.alias] = self._embed(table, row, column)
+            elif column == "*":
+                result.update(copy.deepcopy(row))
+            else:
+                name, _, alias = column.partition(":")
+                if alias:
+                    name, alias = alias, name
+                result[alias or name] = copy.deepcopy(row.get(name))
+        return result
+
+    def _embed(self, table: str, row: Dict[str, Any], embed: _Embed) -> Optional[Dict[str, Any]]:
+        for key in _foreign_key_candidates(table, embed):
+            if key in row:
+                target_id = row.get(key)
+                if target_id is None:
+                    return None
+                targets = self._backend.lookup(embed.table, "id", target_id)
+                if targets is None:
+                    targets = self._backend.tables.get(embed.table, [])
+                for target in targets:
+                    if _equals(target.get("id"), target_id):
+                        return self._project(embed.table, target, embed.columns)
+                return None
+        return None
+
+    def _finish(self, rows: List[Dict[str, Any]], count: Optional[int] = None) -> MemoryResponse:
+        if self._single:
+            if len(rows) != 1:
+                raise APIError(
+                    {
+                        "code": "PGRST116",
+                        "message": "JSON object requested, multiple (or no) rows returned",
+                        "details": f"The result contains {len(rows)} rows",
+                        "hint": None,
+                    }
+                )
+            return MemoryResponse(data=rows[0], count=count)
+        return MemoryResponse(data=rows, count=count)
+
+
+class AsyncMemoryQuery(MemoryQuery):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Variante con execute awaitable (latencia con asyncio.sleep).
+    """
+
+    async def execute(self) -> MemoryResponse:  # type: ignore[override]
+        delay = self._backend.delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self._run()
+
+
+class MemoryRpc:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Llamada a una funcion registrada en backend.rpcs.
+    """
+
+    def __init__(self, backend: MemoryBackend, name: str, params: dict):
+        self._backend = backend
+        self._name = name
+        self._params = params or {}
+
+    def _run(self) -> MemoryResponse:
+        backend = self._backend
+        backend.count_call(f"rpc:{self._name}")
+        function = backend.rpcs.get(self._name)
+        if function is None:
+            raise APIError(
+                {
+                    "code": "PGRST202",
+                    "message": f"Could not find the function {self._name}",
+                    "details": None,
+                    "hint": None,
+                }
+            )
+        with backend.lock:
+            return MemoryResponse(data=function(backend, self._params))
+
+    def execute(self) -> MemoryResponse:
+        delay = self._backend.delay()
+        if delay:
+            time.sleep(delay)
+        return self._run()
+
+
+class AsyncMemoryRpc(MemoryRpc):
+    async def execute(self) -> MemoryResponse:  # type: ignore[override]
+        delay = self._backend.delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self._run()
+
+
+class MemoryBucket:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Bucket de Storage (upload / remove / download / get_public_url).
+    """
+
+    def __init__(self, backend: MemoryBackend, bucket: str):
+        self._backend = backend
+        self._bucket = bucket
+
+    def _files(self) -> Dict[str, bytes]:
+        return self._backend.buckets.setdefault(self._bucket, {})
+
+    def _wait(self) -> None:
+        delay = self._backend.delay()
+        if delay:
+            time.sleep(delay)
+
+    def upload(self, path: str, file: Any, file_options: Optional[dict] = None) -> dict:
+        self._wait()
+        self._backend.count_call(f"storage:upload:{self._bucket}")
+        options = file_options or {}
+        data = file if isinstance(file, (bytes, bytearray)) else file.read()
+        with self._backend.lock:
+            files = self._files()
+            if path in files and str(options.get("upsert", "false")).lower() != "true":
+                raise Exception(f"The resource already exists: {path}")
+            files[path] = bytes(data)
+        return {"path": path, "Key": f"{self._bucket}/{path}"}
+
+    def remove(self, paths: List[str]) -> List[dict]:
+        self._wait()
+        self._backend.count_call(f"storage:remove:{self._bucket}")
+        removed = []
+        with self._backend.lock:
+            files = self._files()
+            for path in paths:
+                if files.pop(path, None) is not None:
+                    removed.append({"name": path})
+        return removed
+
+    def download(self, path: str) -> bytes:
+        self._wait()
+        with self._backend.lock:
+            files = self._files()
+            if path not in files:
+                raise Exception(f"Object not found: {path}")
+            return files[path]
+
+    def get_public_url(self, path: str, options: Optional[dict] = None) -> str:
+        return f"{MEMORY_PUBLIC_URL}/storage/v1/object/public/{self._bucket}/{path}"
+
+
+class MemoryStorage:
+    def __init__(self, backend: MemoryBackend):
+        self._backend = backend
+
+    def from_(self, bucket: str) -> MemoryBucket:
+        return MemoryBucket(self._backend, bucket)
+
+
+class MemoryAuthAdmin:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Subconjunto de auth.admin usado por el backend.
+    """
+
+    def __init__(self, backend: MemoryBackend):
+        self._backend = backend
+
+    def _wait(self) -> None:
+        delay = self._backend.delay()
+        if delay:
+            time.sleep(delay)
+
+    def list_users(self, page: Optional[int] = None, per_page: Optional[int] = None) -> List[MemoryUser]:
+        self._wait()
+        self._backend.count_call("auth:list_users")
+        with self._backend.lock:
+            users = list(self._backend.users.values())
+        if per_page:
+            start = ((page or 1) - 1) * per_page
+            users = users[start : start + per_page]
+        return users
+
+    def get_user_by_id(self, uid: str) -> MemoryAuthResponse:
+        self._wait()
+        self._backend.count_call("auth:get_user_by_id")
+        user = self._backend.users.get(uid)
+        if user is None:
+            raise AuthApiError("User not found", 404, "user_not_found")
+        return MemoryAuthResponse(user=user)
+
+    def delete_user(self, uid: str, should_soft_delete: bool = False) -> None:
+        self._wait()
+        self._backend.count_call("auth:delete_user")
+        with self._backend.lock:
+            user = self._backend.users.pop(uid, None)
+            if user is None:
+                raise AuthApiError("User not found", 404, "user_not_found")
+            self._backend.users_by_email.pop(user.email.lower(), None)
+
+
+class MemoryAuth:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Subconjunto de auth (sign_up / sign_in_with_password / admin).
+    """
+
+    def __init__(self, backend: MemoryBackend):
+        self._backend = backend
+        self.admin = MemoryAuthAdmin(backend)
+
+    def _wait(self) -> None:
+        delay = self._backend.delay()
+        if delay:
+            time.sleep(delay)
+
+    def sign_up(self, credentials: dict) -> MemoryAuthResponse:
+        self._wait()
+        backend = self._backend
+        backend.count_call("auth:sign_up")
+        email = credentials["email"]
+        with backend.lock:
+            if email.lower() in backend.users_by_email:
+                raise AuthApiError("User already registered", 422, "user_already_exists")
+            user = backend.create_user(email, credentials["password"], backend.auto_confirm)
+        return MemoryAuthResponse(user=user)
+
+    def sign_in_with_password(self, credentials: dict) -> MemoryAuthResponse:
+        self._wait()
+        backend = self._backend
+        backend.count_call("auth:sign_in_with_password")
+        email = credentials["email"].lower()
+        with backend.lock:
+            user = backend.users_by_email.get(email)
+        if user is None or user.password != credentials["password"]:
+            raise AuthApiError("Invalid login credentials", 400, "invalid_credentials")
+        if user.email_confirmed_at is None:
+            raise AuthApiError("Email not confirmed", 400, "email_not_confirmed")
+        return MemoryAuthResponse(
+            user=user, session={"access_token": f"memory-{user.id}", "token_type": "bearer"}
+        )
+
+
+class MemoryClient:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Equivalente en memoria de supabase.Client.
+    """
+
+    _query_class = MemoryQuery
+    _rpc_class = MemoryRpc
+
+    def __init__(self, backend: MemoryBackend):
+        self.backend = backend
+        self.auth = MemoryAuth(backend)
+        self.storage = MemoryStorage(backend)
+
+    def table(self, name: str) -> MemoryQuery:
+        return self._query_class(self.backend, name)
+
+    from_ = table
+
+    def rpc(self, name: str, params: Optional[dict] = None) -> MemoryRpc:
+        return self._rpc_class(self.backend, name, params or {})
+
+
+class AsyncMemoryClient(MemoryClient):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Equivalente en memoria de supabase.AsyncClient (execute awaitable).
+    """
+
+    _query_class = AsyncMemoryQuery
+    _rpc_class = AsyncMemoryRpc
@@ -4,9 +4,11 @@
 
 from __future__ import annotations
 from typing import Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, computed_field
 from datetime import datetime
 
+from .images import AVATAR_RENDITIONS, POST_RENDITIONS, rendition_urls
+
 
 # Esquemas para autenticación
 class SignUpRequest(BaseModel):
@@ -51,6 +53,17 @@ class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     user: UserResponse
+    refresh_token: Optional[str] = None
+
+
+class RefreshRequest(BaseModel):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Peticion para renovar la sesion o cerrarla con el refresh token.
+    """
+
+    refresh_token: str
 
 # Esquemas para el perfil de usuario
 class Profile(BaseModel):
@@ -69,7 +82,14 @@ class Profile(BaseModel):
     created_at: Optional[str]
     updated_at: Optional[str]
     role: str
-    posts: Optional[list["PostResponse"]] = None
+    posts: Optional[list["PostSummary"]] = None
+    posts_cursor: Optional[str] = None
+
+    @computed_field
+    @property
+    def avatar_renditions(self) -> Optional[dict[str, str]]:
+        # URLs del avatar por tamano (thumb, full)
+        return rendition_urls(self.avatar_url, AVATAR_RENDITIONS)
 
     class Config:
         orm_mode = True
@@ -100,9 +120,44 @@ class PostResponse(PostBase):
     updated_at: datetime | None = None
     liked_by_me: bool = False
 
+    @computed_field
+    @property
+    def image_renditions(self) -> Optional[dict[str, str]]:
+        # URLs de la imagen por tamano (thumb, feed, full)
+        return rendition_urls(self.image_url, POST_RENDITIONS)
+
     class Config:
         from_orm = True
 
+class FeedPost(PostResponse):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Publicacion del feed con el perfil basico de su autor.
+    """
+
+    author: Optional[dict] = None
+
+
+class PostSummary(BaseModel):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Datos de una publicacion para la cuadricula del perfil.
+    """
+
+    id: str
+    image_url: str
+    likes_count: int = 0
+    comments_count: int = 0
+    created_at: datetime | None = None
+
+    @computed_field
+    @property
+    def image_renditions(self) -> Optional[dict[str, str]]:
+        return rendition_urls(self.image_url, POST_RENDITIONS)
+
+
 class PostCreate(BaseModel):
     description: str | None = None
     image_base64: str
@@ -0,0 +1,231 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Cache de candidatos de /profile/nearby para la ruta sin indice
+# en memoria. La clave es la celda geohash del punto consultado y el radio
+# redondeado hacia arriba a un escalon fijo, asi que los usuarios de un mismo
+# barrio comparten la consulta a PostgREST. Cada peticion vuelve a ordenar los
+# candidatos por su distancia exacta; los avisos de profile_events invalidan
+# las entradas cuyo area contiene al perfil que cambia.
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import profile_events
+from .geo_index import (
+    NearbyKey,
+    fetch_profiles_near,
+    haversine_km,
+    keyset_page,
+    rank_by_distance,
+)
+from .geo_kernel import haversine_batch
+
+NEARBY_CACHE_ENABLED = os.environ.get("NEARBY_CACHE_ENABLED", "true").lower() == "true"
+NEARBY_CACHE_SIZE = int(os.environ.get("NEARBY_CACHE_SIZE", "1024"))
+NEARBY_CACHE_TTL_SECONDS = float(os.environ.get("NEARBY_CACHE_TTL_SECONDS", "60"))
+# 6 caracteres son celdas de 1,2 x 0,6 km
+NEARBY_CACHE_PRECISION = int(os.environ.get("NEARBY_CACHE_PRECISION", "6"))
+# Escalones de radio; un radio mayor que el ultimo no se cachea
+RADIUS_BUCKETS_KM = (1, 2, 5, 10, 25, 50, 100)
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_cell(
+    lat: float, lng: float, precision: int
+) -> Tuple[str, Tuple[float, float, float, float]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Geohash del punto y limites de su celda
+    (latitud minima, latitud maxima, longitud minima, longitud maxima).
+    """
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    code, bits, value, even = [], 0, 0, True
+    while len(code) < precision:
+        interval, coordinate = (lng_range, lng) if even else (lat_range, lat)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            code.append(_GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return "".join(code), (lat_range[0], lat_range[1], lng_range[0], lng_range[1])
+
+
+def radius_bucket(radius_km: float, buckets: Sequence[float] = RADIUS_BUCKETS_KM) -> Optional[float]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Primer escalon mayor o igual que el radio, o None.
+    """
+    for bucket in buckets:
+        if radius_km <= bucket:
+            return bucket
+    return None
+
+
+class _Entry:
+    __slots__ = (
+        "expires_at", "latitude", "longitude", "cover_km",
+        "latitudes", "longitudes", "rows", "ids",
+    )
+
+    def __init__(self, latitude: float, longitude: float, cover_km: float, rows: List[Dict[str, Any]], ttl: float):
+        self.expires_at = time.monotonic() + ttl
+        self.latitude = latitude
+        self.longitude = longitude
+        self.cover_km = cover_km
+        self.rows = rows
+        self.latitudes = np.fromiter((float(row["latitude"]) for row in rows), np.float64, len(rows))
+        self.longitudes = np.fromiter((float(row["longitude"]) for row in rows), np.float64, len(rows))
+        self.ids = {row["id"] for row in rows}
+
+
+class NearbyCache:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: LRU con caducidad de conjuntos de candidatos. Una entrada
+    guarda los perfiles a menos de (escalon + media diagonal de la celda) del
+    centro de la celda, que incluyen los de cualquier punto de la celda con un
+    radio hasta el escalon. Seguro entre hilos: /profile/nearby es una ruta
+    sincrona del threadpool.
+    """
+
+    def __init__(
+        self,
+        max_size: int = NEARBY_CACHE_SIZE,
+        ttl: float = NEARBY_CACHE_TTL_SECONDS,
+        precision: int = NEARBY_CACHE_PRECISION,
+        enabled: bool = NEARBY_CACHE_ENABLED,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.precision = precision
+        self.enabled = enabled
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Cambia con cada aviso: una lectura que empezo antes no se guarda
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self.invalidations = 0
+
+    def query(
+        self,
+        client,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        limit: int,
+        exclude_id: Optional[str] = None,
+        pet_type: Optional[str] = None,
+        after: Optional[NearbyKey] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Mismo resultado que fetch_profiles_near + rank_by_distance,
+        leyendo los candidatos de la cache cuando es posible.
+        """
+        bucket = radius_bucket(radius_km)
+        if not self.enabled or bucket is None:
+            self.uncached += 1
+            candidates = fetch_profiles_near(client, lat, lng, radius_km, pet_type)
+            return rank_by_distance(candidates, lat, lng, radius_km, limit, exclude_id, after)
+
+        entry = self._entry(client, lat, lng, bucket, (pet_type or "").strip().casefold())
+        distances = haversine_batch(lat, lng, entry.latitudes, entry.longitudes)
+        page = keyset_page(
+            distances, lambda position: entry.rows[position]["id"], radius_km, limit, after, exclude_id
+        )
+        return [{**entry.rows[position], "distance_km": distance} for position, distance in page]
+
+    def _entry(self, client, lat: float, lng: float, bucket: float, pet_type: str) -> _Entry:
+        cell, (min_lat, max_lat, min_lng, max_lng) = geohash_cell(lat, lng, self.precision)
+        key = (cell, bucket, pet_type)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            generation = self._generation
+
+        center_lat, center_lng = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+        # Margen del 1% sobre la media diagonal por la curvatura
+        cover_km = bucket + 1.01 * haversine_km(center_lat, center_lng, max_lat, max_lng)
+        rows = fetch_profiles_near(client, center_lat, center_lng, cover_km, pet_type or None)
+        entry = _Entry(center_lat, center_lng, cover_km, rows, self.ttl)
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def apply_profile(self, profile_id: str, profile: Optional[Dict[str, Any]]) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Listener de profile_events. Invalida las entradas que
+        contenian al perfil (posicion anterior) y las que cubren su posicion
+        nueva.
+        """
+        latitude = profile.get("latitude") if profile else None
+        longitude = profile.get("longitude") if profile else None
+        with self._lock:
+            self._generation += 1
+            stale = [
+                key for key, entry in self._entries.items()
+                if profile_id in entry.ids
+                or (
+                    latitude is not None
+                    and longitude is not None
+                    and haversine_km(entry.latitude, entry.longitude, float(latitude), float(longitude))
+                    <= entry.cover_km
+                )
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "uncached": self.uncached,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+nearby_cache = NearbyCache()
+profile_events.subscribe(nearby_cache.apply_profile)
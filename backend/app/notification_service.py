@@ -4,14 +4,18 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+from typing import List
 
+from . import repositories
 
-def notify_followers_about_post(service_client, author_id: str, post_id: str) -> None:
+
+def notify_followers_about_post(service_client, author_id: str, post_id: str) -> List[str]:
     """
     Autor: Wilbert Lopez Veras
     Fecha: 09-12-2025
-    Descripcion: Inserta una notificacion para cada seguidor cuando el autor publica.
+    Descripcion: Inserta una notificacion para cada seguidor cuando el autor
+    publica. Retorna los ids de los seguidores para repartir la publicacion
+    en sus timelines.
     """
 
     followers_result = (
@@ -20,7 +24,7 @@ def notify_followers_about_post(service_client, author_id: str, post_id: str) ->
         .eq("followed_id", author_id)
         .execute()
     )
-    follower_ids: Iterable[str] = [
+    follower_ids: List[str] = [
         row["follower_id"] for row in (followers_result.data or [])
         if row.get("follower_id")
     ]
@@ -36,16 +40,16 @@ def notify_followers_about_post(service_client, author_id: str, post_id: str) ->
     ]
 
     if not events:
-        return
+        return follower_ids
 
     try:
         service_client.table("notifications").insert(events).execute()
     except Exception as exc:  
         print(f"No se pudieron generar eventos para post {post_id}: {exc}")
+    return follower_ids
 
 
-def notify_user_about_message(
-    service_client,
+async def notify_user_about_message(
     receiver_id: str,
     author_id: str,
     conversation_id: str,
@@ -58,7 +62,7 @@ def notify_user_about_message(
     """
 
     try:
-        service_client.table("notifications").insert(
+        await repositories.insert_notification(
             {
                 "receiver_id": receiver_id,
                 "author_id": author_id,
@@ -66,6 +70,6 @@ def notify_user_about_message(
                 "conversation_id": conversation_id,
                 "message_id": message_id,
             }
-        ).execute()
-    except Exception as exc:  
+        )
+    except Exception as exc:
         print(f"No se pudo notificar mensaje {message_id}: {exc}")
@@ -0,0 +1,143 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Cursores opacos para paginar por clave ("keyset") en lugar de
+# por offset. El cursor guarda la clave de orden del ultimo elemento entregado
+# y una huella de los filtros de la consulta, de modo que la pagina siguiente
+# empieza justo despues sin volver a leer las anteriores.
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Cursor corrupto o emitido para otra consulta.
+    """
+
+
+def query_fingerprint(*parts: Any) -> str:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Huella corta de los parametros que fijan el orden y el
+    conjunto de resultados (no del limite, que puede cambiar entre paginas).
+    """
+    raw = json.dumps(parts, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(key: Tuple[Any, ...], fingerprint: str) -> str:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Serializa la clave del ultimo elemento en base64 url-safe.
+    Los float se guardan con repr de JSON, que conserva el valor exacto.
+    """
+    raw = json.dumps({"k": list(key), "q": fingerprint}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> List[Any]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Retorna la clave guardada en el cursor. Lanza InvalidCursor
+    si no se puede leer o no corresponde a la misma consulta.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key, cursor_fingerprint = payload["k"], payload["q"]
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursor("Cursor no valido") from exc
+    if cursor_fingerprint != fingerprint or not isinstance(key, list):
+        raise InvalidCursor("El cursor pertenece a otra consulta")
+    return key
+
+
+def cursor_id(value: Any) -> str:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Id (UUID) guardado en un cursor, en su forma canonica. Lanza
+    InvalidCursor si no es un UUID.
+    """
+    try:
+        return str(uuid.UUID(value))
+    except (TypeError, ValueError, AttributeError) as exc:
+        raise InvalidCursor("Cursor no valido") from exc
+
+
+def created_key(key: List[Any]) -> Tuple[str, str]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Valida una clave (created_at, id): fecha ISO 8601 e id UUID.
+    El cursor no va firmado, asi que nada de el llega a un filtro de PostgREST
+    sin pasar por aqui. Lanza InvalidCursor si la clave no tiene esa forma.
+    """
+    if not isinstance(key, (list, tuple)) or len(key) != 2:
+        raise InvalidCursor("Cursor no valido")
+    created_at, row_id = key
+    try:
+        datetime.fromisoformat(created_at)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor("Cursor no valido") from exc
+    return created_at, cursor_id(row_id)
+
+
+def created_before(query, key: List[Any]):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Filtra una consulta ordenada por (created_at, id) descendente
+    a las filas posteriores a la clave del cursor. Lanza InvalidCursor si la
+    clave no tiene esa forma.
+    """
+    created_at, row_id = created_key(key)
+    return query.or_(
+        f'created_at.lt."{created_at}",'
+        f'and(created_at.eq."{created_at}",id.lt."{row_id}")'
+    )
+
+
+def split_page(rows: List[dict], limit: int, fingerprint: str) -> Tuple[List[dict], Optional[str]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Recibe hasta limit + 1 filas ordenadas por (created_at, id)
+    descendente y retorna la pagina y el cursor de la siguiente (None si no
+    hay mas).
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor((page[-1]["created_at"], page[-1]["id"]), fingerprint)
+
+
+def newest_first_page(
+    query, limit: int, cursor: Optional[str], fingerprint: str
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Ejecuta una consulta sincrona ya filtrada como una pagina
+    por (created_at, id) descendente: ordena, aplica el cursor y pide una
+    fila de mas para saber si hay pagina siguiente. Lanza InvalidCursor.
+    """
+    query = query.order("created_at", desc=True).order("id", desc=True)
+    if cursor:
+        query = created_before(query, decode_cursor(cursor, fingerprint))
+    rows = query.limit(limit + 1).execute().data or []
+    return split_page(rows, limit, fingerprint)
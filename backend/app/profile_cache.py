@@ -0,0 +1,186 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Cache de lectura de perfiles por id compartida por las rutas que
+# leen los mismos perfiles una y otra vez (perfil propio y ajeno, autores de
+# notificaciones, reportes y conversaciones). Los fallos de varios ids se leen
+# en una sola consulta y los avisos de profile_events invalidan las entradas
+# de los perfiles que se editan o se borran.
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import profile_events, repositories
+from .database import get_service_client
+
+PROFILE_CACHE_ENABLED = os.environ.get("PROFILE_CACHE_ENABLED", "true").lower() == "true"
+PROFILE_CACHE_SIZE = int(os.environ.get("PROFILE_CACHE_SIZE", "4096"))
+PROFILE_CACHE_TTL_SECONDS = float(os.environ.get("PROFILE_CACHE_TTL_SECONDS", "60"))
+
+# Columnas de la tabla profiles que se guardan (las del modelo Profile)
+PROFILE_FIELDS = (
+    "id", "email", "username", "postal_code", "city", "latitude", "longitude",
+    "pet_name", "pet_type", "pet_gender", "avatar_url", "bio", "created_at",
+    "updated_at", "role",
+)
+
+
+class CachedProfile:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Fila de un perfil con atributos fijos en lugar de un dict.
+    """
+
+    __slots__ = PROFILE_FIELDS + ("expires_at",)
+
+    def __init__(self, row: Dict[str, Any], ttl: float):
+        for field in PROFILE_FIELDS:
+            setattr(self, field, row.get(field))
+        self.expires_at = time.monotonic() + ttl
+
+    def as_dict(self, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in columns or PROFILE_FIELDS}
+
+
+class ProfileCache:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: LRU con caducidad de perfiles por id. Cada lectura devuelve
+    dicts nuevos, que la ruta puede modificar. Seguro entre hilos; tiene
+    variantes sincronas (cliente service) y asincronas (repositories).
+    """
+
+    def __init__(
+        self,
+        max_size: int = PROFILE_CACHE_SIZE,
+        ttl: float = PROFILE_CACHE_TTL_SECONDS,
+        enabled: bool = PROFILE_CACHE_ENABLED,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, CachedProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Cambia con cada aviso: una lectura que empezo antes no se guarda
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.invalidations = 0
+
+    def _lookup(
+        self, ids: Iterable[Optional[str]], columns: Optional[Sequence[str]]
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[str], int]:
+        found: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        now = time.monotonic()
+        with self._lock:
+            for profile_id in dict.fromkeys(profile_id for profile_id in ids if profile_id):
+                entry = self._entries.get(profile_id) if self.enabled else None
+                if entry is not None and entry.expires_at > now:
+                    self._entries.move_to_end(profile_id)
+                    found[profile_id] = entry.as_dict(columns)
+                else:
+                    missing.append(profile_id)
+            self.hits += len(found)
+            self.misses += len(missing)
+            return found, missing, self._generation
+
+    def _store(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        generation: int,
+        found: Dict[str, Dict[str, Any]],
+        columns: Optional[Sequence[str]],
+    ) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            self.loads += 1
+            for row in rows:
+                entry = CachedProfile(row, self.ttl)
+                found[entry.id] = entry.as_dict(columns)
+                if self.enabled and generation == self._generation:
+                    self._entries[entry.id] = entry
+                    self._entries.move_to_end(entry.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return found
+
+    def get_many(
+        self, ids: Iterable[Optional[str]], columns: Optional[Sequence[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Perfiles por id (solo `columns` si se indican). Los que no
+        estan en la cache se leen en una sola consulta; los que no existen no
+        aparecen en el resultado.
+        """
+        found, missing, generation = self._lookup(ids, columns)
+        if not missing:
+            return found
+        rows = (
+            get_service_client().table("profiles").select("*").in_("id", missing).execute().data
+            or []
+        )
+        return self._store(rows, generation, found, columns)
+
+    async def get_many_async(
+        self, ids: Iterable[Optional[str]], columns: Optional[Sequence[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Igual que get_many con el cliente asincrono.
+        """
+        found, missing, generation = self._lookup(ids, columns)
+        if not missing:
+            return found
+        rows = await repositories.fetch_profiles_by_ids(missing, columns="*")
+        return self._store(rows.values(), generation, found, columns)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return self.get_many([profile_id]).get(profile_id)
+
+    async def get_async(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return (await self.get_many_async([profile_id])).get(profile_id)
+
+    def apply_profile(self, profile_id: str, profile: Optional[Dict[str, Any]]) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Listener de profile_events. Olvida el perfil; la
+        siguiente lectura trae la fila completa de la base de datos.
+        """
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop(profile_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+profile_cache = ProfileCache()
+profile_events.subscribe(profile_cache.apply_profile)
@@ -0,0 +1,58 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Avisos de cambios en perfiles para las estructuras en memoria
+# del worker (indice geografico, etc.). Las rutas que crean, editan o borran
+# un perfil publican el cambio y cada estructura se actualiza sin volver a
+# leer la tabla entera.
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# listener(profile_id, fila del perfil tras el cambio o None si se borro)
+ProfileListener = Callable[[str, Optional[Dict[str, Any]]], None]
+
+_listeners: List[ProfileListener] = []
+
+
+def subscribe(listener: ProfileListener) -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Registra una funcion que recibira cada cambio de perfil.
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _publish(profile_id: str, profile: Optional[Dict[str, Any]]) -> None:
+    for listener in list(_listeners):
+        try:
+            listener(profile_id, profile)
+        except Exception:
+            # Un listener roto no debe tumbar la peticion; el barrido
+            # periodico de cada estructura corrige lo que se pierda.
+            logger.exception("Profile listener %r failed for %s", listener, profile_id)
+
+
+def profile_changed(profile: Optional[Dict[str, Any]]) -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Publica la fila de un perfil creado o actualizado (tal como
+    la devuelve PostgREST con returning="representation").
+    """
+    if profile and profile.get("id"):
+        _publish(profile["id"], profile)
+
+
+def profile_deleted(profile_id: str) -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Publica que un perfil ya no existe.
+    """
+    _publish(profile_id, None)
@@ -0,0 +1,333 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Capa de acceso a datos asincrona sobre los clientes Supabase async.
+# La usan las rutas mas consultadas para no ocupar el threadpool de FastAPI
+# mientras esperan respuesta de PostgREST.
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from .database import get_async_service_client, get_async_supabase_client
+from .pagination import created_before
+
+NOTIFICATION_COLUMNS = (
+    "id, event_type, post_id, conversation_id, message_id, author_id, created_at, read_at"
+)
+POST_SUMMARY_COLUMNS = "id, image_url, likes_count, comments_count, created_at"
+
+
+# Publicaciones y likes
+async def fetch_post(post_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Obtiene una publicacion por id (lanza APIError si no existe).
+    """
+    client = await get_async_supabase_client()
+    result = await (
+        client.table("posts")
+        .select("*")
+        .eq("id", post_id)
+        .single()
+        .execute()
+    )
+    return result.data
+
+
+async def has_liked_post(post_id: str, user_id: str) -> bool:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Indica si el usuario ya dio like a la publicacion.
+    """
+    client = await get_async_supabase_client()
+    result = await (
+        client.table("post_likes")
+        .select("id")
+        .eq("post_id", post_id)
+        .eq("user_id", user_id)
+        .limit(1)
+        .execute()
+    )
+    return bool(result.data)
+
+
+async def fetch_post_summaries(
+    user_id: str, limit: int, after: Optional[List[Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Hasta `limit` resumenes de publicaciones del usuario (id,
+    imagen y contadores), de la mas reciente a la mas antigua, empezando
+    despues de la clave (created_at, id) de `after`.
+    """
+    client = await get_async_supabase_client()
+    query = (
+        client.table("posts")
+        .select(POST_SUMMARY_COLUMNS)
+        .eq("user_id", user_id)
+        .order("created_at", desc=True)
+        .order("id", desc=True)
+    )
+    if after is not None:
+        query = created_before(query, after)
+    result = await query.limit(limit).execute()
+    return result.data or []
+
+
+async def fetch_likes_count(post_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Obtiene el contador de likes guardado en la publicacion.
+    """
+    client = await get_async_supabase_client()
+    result = await (
+        client.table("posts")
+        .select("likes_count")
+        .eq("id", post_id)
+        .single()
+        .execute()
+    )
+    return result.data
+
+
+async def add_post_like(post_id: str, user_id: str) -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Registra el like e incrementa el contador de la publicacion.
+    """
+    service = await get_async_service_client()
+    await service.table("post_likes").insert(
+        {"post_id": post_id, "user_id": user_id}
+    ).execute()
+    await service.rpc("increment_likes", {"post_id_input": post_id}).execute()
+
+
+async def remove_post_like(post_id: str, user_id: str) -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Elimina el like y decrementa el contador de la publicacion.
+    """
+    service = await get_async_service_client()
+    await (
+        service.table("post_likes")
+        .delete()
+        .eq("post_id", post_id)
+        .eq("user_id", user_id)
+        .execute()
+    )
+    await service.rpc("decrement_likes", {"post_id_input": post_id}).execute()
+
+
+# Perfiles
+async def fetch_profile(profile_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Obtiene el perfil completo por id (lanza APIError si no existe).
+    """
+    client = await get_async_supabase_client()
+    result = await (
+        client.table("profiles")
+        .select("*")
+        .eq("id", profile_id)
+        .single()
+        .execute()
+    )
+    return result.data
+
+
+async def email_registered(email: str) -> bool:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Indica si ya hay un perfil con ese correo (igualdad indexada
+    sobre el indice unico de lower(email); el correo debe llegar normalizado y
+    los perfiles lo guardan en minusculas, ver README).
+    """
+    service = await get_async_service_client()
+    result = await (
+        service.table("profiles")
+        .select("id")
+        .eq("email", email)
+        .limit(1)
+        .execute()
+    )
+    return bool(result.data)
+
+
+async def username_taken(username: str) -> bool:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Indica si el nombre de usuario ya esta en uso.
+    """
+    service = await get_async_service_client()
+    result = await (
+        service.table("profiles")
+        .select("username")
+        .eq("username", username)
+        .limit(1)
+        .execute()
+    )
+    return bool(result.data)
+
+
+async def insert_profile(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Crea el perfil de un usuario recien registrado.
+    """
+    service = await get_async_service_client()
+    result = await service.table("profiles").insert(row).execute()
+    return result.data[0] if result.data else row
+
+
+async def backfill_profile_coordinates(
+    profile_id: str,
+    city: Optional[str],
+    postal_code: Optional[str],
+    latitude: float,
+    longitude: float,
+) -> List[Dict[str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Guarda las coordenadas calculadas tras el registro solo si la
+    ciudad y el codigo postal no han cambiado mientras tanto.
+    """
+    service = await get_async_service_client()
+    query = (
+        service.table("profiles")
+        .update({"latitude": latitude, "longitude": longitude})
+        .eq("id", profile_id)
+    )
+    query = query.eq("city", city) if city is not None else query.is_("city", "null")
+    query = (
+        query.eq("postal_code", postal_code)
+        if postal_code is not None
+        else query.is_("postal_code", "null")
+    )
+    result = await query.execute()
+    return result.data or []
+
+
+async def fetch_profiles_by_ids(
+    ids: Iterable[str], columns: str = "id, username, avatar_url, pet_name"
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Obtiene varios perfiles en una sola consulta, indexados por id.
+    """
+    unique_ids = list({profile_id for profile_id in ids if profile_id})
+    if not unique_ids:
+        return {}
+
+    service = await get_async_service_client()
+    result = await (
+        service.table("profiles")
+        .select(columns)
+        .in_("id", unique_ids)
+        .execute()
+    )
+    return {row["id"]: row for row in result.data or []}
+
+
+# Conversaciones y mensajes
+async def fetch_conversation_members(conversation_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Obtiene los participantes de una conversacion.
+    """
+    service = await get_async_service_client()
+    result = await (
+        service.table("conversations")
+        .select("id, user_a, user_b")
+        .eq("id", conversation_id)
+        .single()
+        .execute()
+    )
+    return result.data
+
+
+async def insert_message(
+    conversation_id: str, sender_id: str, content: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Guarda un mensaje y retorna la fila creada.
+    """
+    service = await get_async_service_client()
+    result = await (
+        service.table("messages")
+        .insert(
+            {
+                "conversation_id": conversation_id,
+                "sender_id": sender_id,
+                "content": content,
+            }
+        )
+        .execute()
+    )
+    return result.data[0] if result.data else None
+
+
+async def touch_conversation(conversation_id: str, timestamp: str) -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Actualiza la fecha del ultimo mensaje de la conversacion.
+    """
+    service = await get_async_service_client()
+    await (
+        service.table("conversations")
+        .update({"last_message_at": timestamp})
+        .eq("id", conversation_id)
+        .execute()
+    )
+
+
+# Notificaciones
+async def fetch_notifications(
+    receiver_id: str,
+    limit: int,
+    newest_first: bool = True,
+    after: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Lista notificaciones del receptor; `after` filtra por created_at.
+    """
+    service = await get_async_service_client()
+    query = (
+        service.table("notifications")
+        .select(NOTIFICATION_COLUMNS)
+        .eq("receiver_id", receiver_id)
+        .order("created_at", desc=newest_first)
+        .limit(limit)
+    )
+    if after:
+        query = query.gt("created_at", after)
+
+    result = await query.execute()
+    return result.data or []
+
+
+async def insert_notification(event: Dict[str, Any]) -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Inserta un evento de notificacion.
+    """
+    service = await get_async_service_client()
+    await service.table("notifications").insert(event).execute()
@@ -3,18 +3,28 @@
 # Descripción: Archiv con los endpoints de autenticación login y signup 
 # y funciones relacionadas con la creación de tokens JWT.
 
+import asyncio
 import os
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
 from dotenv import load_dotenv
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 
-from ..database import get_supabase_client, get_service_client
-from ..geocode import geocode_address
-from ..models import LoginRequest, SignUpRequest, TokenResponse, UserResponse
+from .. import profile_events, repositories
+from ..database import get_auth_client, get_service_client
+from ..geocode import geocode_address_async
+from ..models import (
+    LoginRequest,
+    RefreshRequest,
+    SignUpRequest,
+    TokenResponse,
+    UserResponse,
+)
 from supabase_auth.errors import AuthApiError
 
 
@@ -23,6 +33,8 @@ load_dotenv()
 JWT_SECRET = os.environ["JWT_SECRET"]
 JWT_ALGORITHM = os.environ.get("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.environ.get("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+REFRESH_TOKENS_TABLE = "refresh_tokens"
 SUPABASE_PUBLIC_ASSETS_URL = os.environ.get("SUPABASE_PUBLIC_ASSETS", "")
 USER_CONTENT_BUCKET = os.environ.get("SUPABASE_USER_BUCKET", "user-content")
 USER_CONTENT_ROOT = os.environ.get("SUPABASE_USER_FOLDER", "")
@@ -56,42 +68,149 @@ def verify_access_token(token: str) -> dict:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
 
+def create_refresh_token(
+    service_client,
+    user_id: str,
+    email: str,
+    role: str,
+    family_id: Optional[str] = None,
+    jti: Optional[str] = None,
+) -> str:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Emite un refresh token firmado y registra su jti para poder
+    rotarlo y revocarlo.
+    """
+    jti = jti or str(uuid.uuid4())
+    family = family_id or jti
+    expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+
+    service_client.table(REFRESH_TOKENS_TABLE).insert({
+        "id": jti,
+        "user_id": user_id,
+        "family_id": family,
+        "expires_at": expire.isoformat(),
+    }).execute()
+
+    return jwt.encode(
+        {
+            "sub": user_id,
+            "email": email,
+            "role": role,
+            "type": "refresh",
+            "jti": jti,
+            "fam": family,
+            "exp": expire,
+        },
+        JWT_SECRET,
+        algorithm=JWT_ALGORITHM,
+    )
+
+
+def revoke_refresh_family(service_client, family_id: str) -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Revoca todos los refresh tokens vivos de una misma sesion.
+    """
+    service_client.table(REFRESH_TOKENS_TABLE)\
+        .update({"revoked_at": datetime.utcnow().isoformat()})\
+        .eq("family_id", family_id)\
+        .is_("revoked_at", "null")\
+        .execute()
+
+
+def revoke_user_refresh_tokens(service_client, user_id: str) -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Revoca todas las sesiones renovables de un usuario.
+    """
+    service_client.table(REFRESH_TOKENS_TABLE)\
+        .update({"revoked_at": datetime.utcnow().isoformat()})\
+        .eq("user_id", user_id)\
+        .is_("revoked_at", "null")\
+        .execute()
+
+
+def _decode_refresh_token(token: str) -> dict:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Verifica firma, expiracion y tipo del refresh token (sin red).
+    """
+    try:
+        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token inválido")
+
+    if payload.get("type") != "refresh" or not payload.get("sub") or not payload.get("jti"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token inválido")
+    return payload
+
+
+def _issue_session(service_client, user_id: str, email: str, role: str) -> TokenResponse:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Genera access token + refresh token para una sesion nueva.
+    """
+    token = create_access_token({"sub": user_id, "role": role})
+    refresh_token = None
+    try:
+        refresh_token = create_refresh_token(service_client, user_id, email, role)
+    except Exception as exc:
+        # Sin refresh token el cliente sigue pudiendo iniciar sesión normalmente
+        print(f"No se pudo emitir el refresh token de {user_id}: {exc}")
+
+    return TokenResponse(
+        access_token=token,
+        token_type="bearer",
+        refresh_token=refresh_token,
+        user=UserResponse(
+            id=user_id,
+            email=email,
+            role=role
+        )
+    )
+
+
 @router.post("/signup", response_model=TokenResponse)
-def signup(payload: SignUpRequest):
+async def signup(payload: SignUpRequest, background_tasks: BackgroundTasks):
     """
     Autor: Wilbert Lopez Veras
     Fecha: 02-11-2025
     Descripcion: Registra un usuario en Supabase y crea su perfil local.
+    Las validaciones de email y username se hacen en paralelo; la
+    geocodificacion y las carpetas de storage se completan despues de responder.
     """
-    client = get_supabase_client() # cliente publico
+    client = get_auth_client() # cliente publico (sesion propia)
     service = get_service_client()  # cliente admin
+    email = _normalize_email(payload.email)
 
-    # 1. Validar email único
-    users = service.auth.admin.list_users()
-    for u in users:
-        if u.email and u.email.lower() == payload.email.lower():
-            raise HTTPException(
-                status_code=400,
-                detail="Este correo ya está registrado."
-            )
-        
-    # 2. Validar username único 
-    existing_username = service.table("profiles")\
-        .select("username")\
-        .eq("username", payload.username)\
-        .execute()
+    # 1 y 2. Validar email y username únicos a la vez
+    email_taken, username_taken = await asyncio.gather(
+        repositories.email_registered(email),
+        repositories.username_taken(payload.username),
+    )
+    if email_taken:
+        raise HTTPException(
+            status_code=400,
+            detail="Este correo ya está registrado."
+        )
 
-    if existing_username.data:
+    if username_taken:
         raise HTTPException(
             status_code=400,
             detail="Este nombre de usuario ya está en uso."
         )
 
     try:
-        result = client.auth.sign_up({
-            "email": payload.email,
-            "password": payload.password
-        })
+        result = await run_in_threadpool(
+            client.auth.sign_up,
+            {"email": email, "password": payload.password},
+        )
     except AuthApiError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -101,46 +220,71 @@ def signup(payload: SignUpRequest):
     if user is None:
         raise HTTPException(status_code=400, detail="No se pudo crear la cuenta.")
 
-    latitude, longitude = geocode_address(payload.city, payload.postal_code)
-
+    # Las coordenadas se rellenan en segundo plano (_complete_signup)
     try:
-        service.table("profiles").insert({
+        profile = await repositories.insert_profile({
             "id": user.id,
-            "email": payload.email,
+            "email": email,
             "username": payload.username,
             "postal_code": payload.postal_code,
             "city": payload.city,
-            "latitude": latitude,
-            "longitude": longitude,
+            "latitude": None,
+            "longitude": None,
             "pet_name": payload.pet_name,
             "pet_type": payload.pet_type,
             "pet_gender": payload.pet_gender,
             "avatar_url": SUPABASE_PUBLIC_ASSETS_URL + "/avatars/default-avatar.jpg",
             "role": "user"
-        }).execute()
+        })
     except Exception:
-        service.auth.admin.delete_user(user.id)
+        await run_in_threadpool(service.auth.admin.delete_user, user.id)
         raise HTTPException(
             status_code=400,
             detail="No se pudo crear el perfil del usuario."
         )
+    profile_events.profile_changed(profile)
+
+    background_tasks.add_task(
+        _complete_signup, user.id, payload.city, payload.postal_code
+    )
+
+    return await run_in_threadpool(_issue_session, service, user.id, email, "user")
+
+
+async def _complete_signup(user_id: str, city: Optional[str], postal_code: Optional[str]):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Pasos del registro que no bloquean la respuesta: coordenadas
+    del perfil y carpeta inicial en storage. Si fallan, el perfil queda valido
+    (sin coordenadas, como cuando Nominatim no encuentra la direccion).
+    """
+    if city or postal_code:
+        try:
+            latitude, longitude = await geocode_address_async(city, postal_code, timeout=None)
+            if latitude is not None and longitude is not None:
+                updated = await repositories.backfill_profile_coordinates(
+                    user_id, city, postal_code, latitude, longitude
+                )
+                for profile in updated:
+                    profile_events.profile_changed(profile)
+        except Exception as exc:
+            print(f"No se pudieron guardar las coordenadas del usuario {user_id}: {exc}")
 
     try:
-        _create_user_storage(service, user.id)
+        await run_in_threadpool(_create_user_storage, get_service_client(), user_id)
     except Exception as exc:
         # No interrumpimos el registro si falla la creación de carpetas.
-        print(f"No se pudo preparar el almacenamiento del usuario {user.id}: {exc}")
+        print(f"No se pudo preparar el almacenamiento del usuario {user_id}: {exc}")
 
-    token = create_access_token({"sub": user.id, "role": "user"})
-    return TokenResponse(
-        access_token=token,
-        token_type="bearer",
-        user=UserResponse(
-            id=user.id,
-            email=payload.email,
-            role="user"
-        )
-    )
+
+def _normalize_email(email: str) -> str:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Normaliza el correo igual que Supabase Auth (minusculas, sin espacios).
+    """
+    return email.strip().lower()
 
 
 def _create_user_storage(service_client, user_id: str):
@@ -173,28 +317,20 @@ def login(payload: LoginRequest):
     Fecha: 02-11-2025
     Descripcion: Autentica al usuario y emite un token nuevo.
     """
-    client = get_supabase_client()
-    service = get_service_client()
-    all_users = service.auth.admin.list_users()
-
-    user_match = None
-    for u in all_users:
-        if u.email and u.email.lower() == payload.email.lower():
-            user_match = u
-            break
-
-    # Verificar si el email está confirmado
-    if user_match and user_match.email_confirmed_at is None:
-        raise HTTPException(
-            status_code=400,
-            detail="Debes confirmar tu correo antes de iniciar sesión."
-        )
+    client = get_auth_client()
 
     try:
         result = client.auth.sign_in_with_password(
-            {"email": payload.email, "password": payload.password}
+            {"email": _normalize_email(payload.email), "password": payload.password}
         )
-    except AuthApiError:
+    except AuthApiError as exc:
+        # Supabase Auth informa si el correo no está confirmado, así no hace
+        # falta buscar al usuario antes de iniciar sesión
+        if getattr(exc, "code", None) == "email_not_confirmed":
+            raise HTTPException(
+                status_code=400,
+                detail="Debes confirmar tu correo antes de iniciar sesión."
+            )
         # Supabase rechaz las credenciales
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -230,13 +366,78 @@ def login(payload: LoginRequest):
 
     
 
-    token = create_access_token({"sub": user.id, "role": role}) 
+    return _issue_session(get_service_client(), user.id, user.email, role)
+
+
+@router.post("/refresh", response_model=TokenResponse)
+def refresh(payload: RefreshRequest):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Renueva la sesion con un refresh token. La firma se valida en
+    local y el token se rota: el anterior queda revocado y, si alguien intenta
+    reutilizarlo, se revoca toda la sesion. El rol se lee de nuevo del perfil
+    para que un cambio de rol llegue a los tokens renovados.
+    """
+    claims = _decode_refresh_token(payload.refresh_token)
+    service = get_service_client()
+    user_id = claims["sub"]
+    family = claims.get("fam") or claims["jti"]
+
+    new_jti = str(uuid.uuid4())
+    # Marcar como usado solo si seguia vivo (operacion atomica en PostgREST)
+    rotated = service.table(REFRESH_TOKENS_TABLE)\
+        .update({"revoked_at": datetime.utcnow().isoformat(), "replaced_by": new_jti})\
+        .eq("id", claims["jti"])\
+        .is_("revoked_at", "null")\
+        .execute()
+
+    if not rotated.data:
+        revoke_refresh_family(service, family)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token revocado",
+        )
+
+    # El rol del token viejo puede estar desactualizado
+    profile = service.table("profiles")\
+        .select("role")\
+        .eq("id", user_id)\
+        .limit(1)\
+        .execute()
+    if not profile.data:
+        # Perfil borrado: la sesion no puede seguir renovandose
+        revoke_refresh_family(service, family)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuario no encontrado",
+        )
+    role = profile.data[0].get("role") or "user"
+
+    email = claims.get("email") or ""
+    refresh_token = create_refresh_token(
+        service, user_id, email, role, family_id=family, jti=new_jti
+    )
+
     return TokenResponse(
-        access_token=token,
+        access_token=create_access_token({"sub": user_id, "role": role}),
         token_type="bearer",
+        refresh_token=refresh_token,
         user=UserResponse(
-            id=user.id,
-            email=user.email,
+            id=user_id,
+            email=email,
             role=role
         )
     )
+
+
+@router.post("/logout")
+def logout(payload: RefreshRequest):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Cierra la sesion revocando el refresh token y sus rotaciones.
+    """
+    claims = _decode_refresh_token(payload.refresh_token)
+    revoke_refresh_family(get_service_client(), claims.get("fam") or claims["jti"])
+    return {"message": "Sesión cerrada"}
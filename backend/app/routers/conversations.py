@@ -6,8 +6,9 @@ from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
+from app import repositories
 from app.dependencies import get_current_user
-from app.database import get_supabase_client, get_service_client
+from app.database import get_service_client
 from app.models import (
     ConversationCreate,
     ConversationResponse,
@@ -15,8 +16,10 @@ from app.models import (
     MessageResponse,
 )
 from app.notification_service import notify_user_about_message
+from app.profile_cache import profile_cache
 
 router = APIRouter(prefix="/conversations", tags=["conversations"])
+MEMBER_COLUMNS = ("pet_name", "username", "avatar_url")
 
 
 @router.get("", response_model=list[ConversationResponse])
@@ -35,9 +38,7 @@ def list_conversations(current_user: dict = Depends(get_current_user)):
             user_a,
             user_b,
             created_at,
-            last_message_at,
-            user_a_profile:profiles!conversations_user_a_fkey(pet_name,username,avatar_url),
-            user_b_profile:profiles!conversations_user_b_fkey(pet_name,username,avatar_url)
+            last_message_at
             """
         )
         .or_(f"user_a.eq.{current_user['id']},user_b.eq.{current_user['id']}")
@@ -45,7 +46,17 @@ def list_conversations(current_user: dict = Depends(get_current_user)):
         .order("created_at", desc=True)
         .execute()
     )
-    return result.data or []
+    conversations = result.data or []
+
+    # Perfiles de los participantes desde la cache de perfiles
+    profiles = profile_cache.get_many(
+        [item["user_a"] for item in conversations] + [item["user_b"] for item in conversations],
+        MEMBER_COLUMNS,
+    )
+    for item in conversations:
+        item["user_a_profile"] = profiles.get(item["user_a"])
+        item["user_b_profile"] = profiles.get(item["user_b"])
+    return conversations
 
 
 @router.post("", response_model=ConversationResponse, status_code=status.HTTP_201_CREATED)
@@ -116,7 +127,7 @@ def list_messages(conversation_id: str, current_user: dict = Depends(get_current
     response_model=MessageResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def send_message(
+async def send_message(
     conversation_id: str,
     payload: MessageCreate,
     current_user: dict = Depends(get_current_user),
@@ -126,48 +137,29 @@ def send_message(
     Fecha: 08-12-2025
     Descripcion: Permite enviar un mensaje dentro de una conversacion.
     """
-    client = get_service_client()
-    _ensure_conversation_access(client, conversation_id, current_user["id"])
+    convo = await _ensure_conversation_access_async(conversation_id, current_user["id"])
 
-    insert_result = (
-        client.table("messages")
-        .insert(
-            {
-                "conversation_id": conversation_id,
-                "sender_id": current_user["id"],
-                "content": payload.content,
-            }
-        )
-        .execute()
+    message = await repositories.insert_message(
+        conversation_id, current_user["id"], payload.content
     )
-    if not insert_result.data:
+    if not message:
         raise HTTPException(status_code=500, detail="No se pudo enviar el mensaje")
 
-    get_service_client().table("conversations").update(
-        {"last_message_at": datetime.utcnow().isoformat()}
-    ).eq("id", conversation_id).execute()
+    await repositories.touch_conversation(
+        conversation_id, datetime.utcnow().isoformat()
+    )
 
-    message = insert_result.data[0]
-    convo = (
-        client.table("conversations")
-        .select("user_a, user_b")
-        .eq("id", conversation_id)
-        .single()
-        .execute()
-    ).data
-    if convo:
-        receiver = (
-            convo["user_a"]
-            if convo["user_a"] != current_user["id"]
-            else convo["user_b"]
-        )
-        notify_user_about_message(
-            client,
-            receiver_id=receiver,
-            author_id=current_user["id"],
-            conversation_id=conversation_id,
-            message_id=message["id"],
-        )
+    receiver = (
+        convo["user_a"]
+        if convo["user_a"] != current_user["id"]
+        else convo["user_b"]
+    )
+    await notify_user_about_message(
+        receiver_id=receiver,
+        author_id=current_user["id"],
+        conversation_id=conversation_id,
+        message_id=message["id"],
+    )
 
     return message
 
@@ -191,3 +183,19 @@ def _ensure_conversation_access(client, conversation_id: str, user_id: str):
 
     if user_id not in (data["user_a"], data["user_b"]):
         raise HTTPException(status_code=403, detail="No tienes acceso a esta conversacion")
+
+
+async def _ensure_conversation_access_async(conversation_id: str, user_id: str) -> dict:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Version async de la verificacion de acceso; retorna los participantes.
+    """
+    data = await repositories.fetch_conversation_members(conversation_id)
+    if not data:
+        raise HTTPException(status_code=404, detail="Conversacion no encontrada")
+
+    if user_id not in (data["user_a"], data["user_b"]):
+        raise HTTPException(status_code=403, detail="No tienes acceso a esta conversacion")
+
+    return data
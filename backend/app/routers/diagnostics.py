@@ -0,0 +1,128 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Endpoints de diagnostico del proceso (clientes, caches, indices).
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.database import get_client_stats
+from app.dependencies import get_current_user, token_cache
+from app.geo_index import geo_index
+from app.geocode_cache import geocode_cache
+from app.geocoder import geocoder
+from app.images import image_pipeline
+from app.nearby_cache import nearby_cache
+from app.profile_cache import profile_cache
+from app.search_index import search_index
+from app.suggest_index import suggest_index
+from app.timeline import timelines
+
+router = APIRouter(prefix="/diagnostics", tags=["Diagnostics"])
+
+
+def _ensure_moderator(user: dict):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Restringe los diagnosticos a moderadores y administradores.
+    """
+    if user.get("role") not in ("moderator", "admin"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No autorizado para esta operación",
+        )
+
+
+@router.get("/clients")
+def clients_stats(user=Depends(get_current_user)):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Retorna los contadores de reutilizacion de clientes Supabase del worker.
+    """
+    _ensure_moderator(user)
+    return get_client_stats()
+
+
+@router.get("/auth")
+def auth_stats(user=Depends(get_current_user)):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Retorna el estado de la cache de tokens verificados del worker.
+    """
+    _ensure_moderator(user)
+    return {"token_cache": token_cache.stats()}
+
+
+@router.get("/geocode")
+def geocode_stats(user=Depends(get_current_user)):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Retorna los aciertos y fallos de la cache de geocodificacion
+    y los contadores del cliente de Nominatim.
+    """
+    _ensure_moderator(user)
+    return {"geocode_cache": geocode_cache.stats(), "geocoder": geocoder.stats()}
+
+
+@router.get("/geo")
+def geo_stats(user=Depends(get_current_user)):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Retorna el estado del indice espacial de /profile/nearby y
+    de la cache de candidatos de la ruta sin indice.
+    """
+    _ensure_moderator(user)
+    return {"geo_index": geo_index.stats(), "nearby_cache": nearby_cache.stats()}
+
+
+@router.get("/search")
+def search_stats(user=Depends(get_current_user)):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Retorna el estado del indice de trigramas de /profile/search
+    y del autocompletado, con su consumo de memoria frente al presupuesto.
+    """
+    _ensure_moderator(user)
+    return {
+        "search_index": search_index.stats(),
+        "suggest_index": suggest_index.stats(memory=True),
+    }
+
+
+@router.get("/profiles")
+def profile_cache_stats(user=Depends(get_current_user)):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Retorna los aciertos y fallos de la cache de perfiles.
+    """
+    _ensure_moderator(user)
+    return {"profile_cache": profile_cache.stats()}
+
+
+@router.get("/feed")
+def feed_stats(user=Depends(get_current_user)):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Retorna el estado de los timelines del feed: cuantos hay
+    cargados, lecturas, construcciones y escrituras por publicacion.
+    """
+    _ensure_moderator(user)
+    return {"timelines": timelines.stats()}
+
+
+@router.get("/images")
+def image_stats(user=Depends(get_current_user)):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Retorna el estado del procesado de imagenes: subidas, bytes
+    que se ahorra cada tamano frente al original y CPU media por subida.
+    """
+    _ensure_moderator(user)
+    return {"images": image_pipeline.stats()}
@@ -0,0 +1,91 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Endpoint del feed de inicio: publicaciones propias y de las
+# cuentas seguidas, de la mas reciente a la mas antigua, paginadas por cursor.
+
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+
+from app.database import get_service_client
+from app.dependencies import get_current_user
+from app.models import FeedPost
+from app.pagination import NEXT_CURSOR_HEADER, InvalidCursor, decode_cursor, encode_cursor, query_fingerprint
+from app.profile_cache import profile_cache
+from app.timeline import feed_key, timelines
+
+router = APIRouter(prefix="/feed", tags=["Feed"])
+FEED_PAGE_SIZE = int(os.environ.get("FEED_PAGE_SIZE", "20"))
+FEED_MAX_PAGE_SIZE = int(os.environ.get("FEED_MAX_PAGE_SIZE", "50"))
+AUTHOR_COLUMNS = ("id", "username", "avatar_url", "pet_name")
+
+
+@router.get("", response_model=list[FeedPost])
+def get_feed(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = FEED_PAGE_SIZE,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Retorna una pagina del feed del usuario autenticado con el
+    perfil basico del autor de cada publicacion. La cabecera X-Next-Cursor
+    trae el cursor de la pagina siguiente y falta en la ultima.
+    """
+    if not 1 <= limit <= FEED_MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=400, detail=f"El límite debe estar entre 1 y {FEED_MAX_PAGE_SIZE}"
+        )
+    user_id = current_user["id"]
+    fingerprint = query_fingerprint("feed", user_id)
+    service = get_service_client()
+    try:
+        after = feed_key(decode_cursor(cursor, fingerprint)) if cursor else None
+        keys = timelines.page(service, user_id, limit + 1, after)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Cursor de paginación no válido")
+
+    page = keys[:limit]
+    if len(keys) > limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page[-1], fingerprint)
+    return _hydrate(service, user_id, [post_id for _, post_id in page])
+
+
+def _hydrate(service, user_id: str, post_ids: list) -> list:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Lee las publicaciones de la pagina, los likes del usuario y
+    los autores con una consulta cada uno, respetando el orden del feed. Las
+    publicaciones borradas mientras tanto se omiten.
+    """
+    if not post_ids:
+        return []
+    posts = {
+        row["id"]: row
+        for row in service.table("posts").select("*").in_("id", post_ids).execute().data or []
+    }
+    liked = {
+        row["post_id"]
+        for row in (
+            service.table("post_likes")
+            .select("post_id")
+            .eq("user_id", user_id)
+            .in_("post_id", list(posts))
+            .execute()
+            .data
+            or []
+        )
+    } if posts else set()
+    authors = profile_cache.get_many((row["user_id"] for row in posts.values()), AUTHOR_COLUMNS)
+    return [
+        {
+            **posts[post_id],
+            "liked_by_me": post_id in liked,
+            "author": authors.get(posts[post_id]["user_id"]),
+        }
+        for post_id in post_ids
+        if post_id in posts
+    ]
@@ -8,17 +8,18 @@ import json
 from typing import List, Dict, Any
 
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, HTTPException
-from jose import JWTError, jwt
 
+from app import repositories
 from app.database import get_service_client
-from app.dependencies import get_current_user
-from app.routers.auth import JWT_SECRET, JWT_ALGORITHM
+from app.dependencies import decode_token, get_current_user
+from app.profile_cache import profile_cache
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
+AUTHOR_COLUMNS = ("id", "username", "avatar_url", "pet_name")
 
 
 @router.get("")
-def list_notifications(
+async def list_notifications(
     limit: int = 50,
     current_user: dict = Depends(get_current_user),
 ):
@@ -28,20 +29,8 @@ def list_notifications(
     Descripcion: Retorna las notificaciones recientes del usuario autenticado.
     """
 
-    service = get_service_client()
-    result = (
-        service.table("notifications")
-        .select(
-            "id, event_type, post_id, conversation_id, message_id, author_id, created_at, read_at"
-        )
-        .eq("receiver_id", current_user["id"])
-        .order("created_at", desc=True)
-        .limit(limit)
-        .execute()
-    )
-
-    data = result.data or []
-    return _attach_author_profiles(service, data)
+    data = await repositories.fetch_notifications(current_user["id"], limit)
+    return await _attach_author_profiles(data)
 
 
 @router.websocket("/ws")
@@ -57,43 +46,26 @@ async def notifications_ws(websocket: WebSocket, token: str | None = None):
         await websocket.close(code=4403)
         return
 
-    try:
-        payload = jwt.decode(auth_token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("sub")
-    except JWTError:
-        await websocket.close(code=4403)
-        return
-
-    if not user_id:
+    user = decode_token(auth_token)
+    if user is None:
         await websocket.close(code=4403)
         return
+    user_id = user["id"]
 
     await websocket.accept()
-    service = get_service_client()
     last_timestamp: str | None = None
     seen_ids: set[str] = set()
 
     try:
         while True:
-            query = (
-                service.table("notifications")
-                .select(
-                    "id, event_type, post_id, conversation_id, message_id, author_id, created_at, read_at"
-                )
-                .eq("receiver_id", user_id)
-                .order("created_at", desc=False)
-                .limit(20)
+            data = await repositories.fetch_notifications(
+                user_id, 20, newest_first=False, after=last_timestamp
             )
-            if last_timestamp:
-                query = query.gt("created_at", last_timestamp)
-
-            result = query.execute()
-            data = result.data or []
             new_items = [
                 item for item in data if item.get("id") not in seen_ids
             ]
             if new_items:
-                enriched = _attach_author_profiles(service, new_items)
+                enriched = await _attach_author_profiles(new_items)
                 last_timestamp = new_items[-1]["created_at"]
                 for item in new_items:
                     if item.get("id"):
@@ -109,26 +81,16 @@ async def notifications_ws(websocket: WebSocket, token: str | None = None):
         await websocket.close()
 
 
-def _attach_author_profiles(service, notifications: List[Dict[str, Any]]):
+async def _attach_author_profiles(notifications: List[Dict[str, Any]]):
     """
     Autor: Wilbert Lopez Veras
     Fecha: 09-12-2025
     Descripcion: Complementa cada notificacion con el perfil del autor para simplificar la respuesta.
     """
 
-    author_ids = {
-        item.get("author_id") for item in notifications if item.get("author_id")
-    }
-    profiles_map: Dict[str, Dict[str, Any]] = {}
-    if author_ids:
-        profile_rows = (
-            service.table("profiles")
-            .select("id, username, avatar_url, pet_name")
-            .in_("id", list(author_ids))
-            .execute()
-        )
-        for row in profile_rows.data or []:
-            profiles_map[row["id"]] = row
+    profiles_map = await profile_cache.get_many_async(
+        (item.get("author_id") for item in notifications), AUTHOR_COLUMNS
+    )
 
     for item in notifications:
         author = profiles_map.get(item.get("author_id"))
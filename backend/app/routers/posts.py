@@ -2,21 +2,28 @@
 # Fecha de creación: 6 de diciembre de 2025
 # Descripción: archivo de endpoints para crear, listar y eliminar publicaciones.
 
-import base64
-import binascii
+import asyncio
 import os
 import time
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
+from app import repositories
 from app.dependencies import get_current_user
 from app.database import get_supabase_client, get_service_client
+from app.images import POST_RENDITIONS, image_pipeline, rendition_paths, upload_renditions
 from app.models import PostBase, PostCreate, PostResponse, PostCommentCreate
 from app.notification_service import notify_followers_about_post
+from app.timeline import timelines
+from app.pagination import NEXT_CURSOR_HEADER, InvalidCursor, newest_first_page, query_fingerprint
+from app.uploads import ImageSource, decode_base64_image, receive_image
 from .moderation import moderate_text_with_gemini
 
 USER_CONTENT_BUCKET = os.environ.get("SUPABASE_USER_BUCKET", "user-content")
 POSTS_FOLDER = os.environ.get("SUPABASE_POSTS_FOLDER", "posts")
+POSTS_PAGE_SIZE = int(os.environ.get("POSTS_PAGE_SIZE", "20"))
+COMMENTS_PAGE_SIZE = int(os.environ.get("COMMENTS_PAGE_SIZE", "20"))
+MAX_PAGE_SIZE = int(os.environ.get("POSTS_MAX_PAGE_SIZE", "100"))
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
@@ -26,15 +33,47 @@ def create_post(payload: PostCreate, current_user: dict = Depends(get_current_us
     """
     Autor: Wilbert Lopez Veras
     Fecha: 06-12-2025
-    Descripcion: Crea un nuevo post para el usuario autenticado.
+    Descripcion: Crea un nuevo post para el usuario autenticado con la imagen
+    en base64 dentro del JSON. Las apps nuevas usan POST /posts/upload.
     """
     if not payload.image_base64:
         raise HTTPException(status_code=400, detail="La imagen es requerida.")
+    try:
+        binary = decode_base64_image(payload.image_base64, "Imagen inválida")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return _publish_post(current_user, payload.description, binary)
+
+
+@router.post("/upload", response_model=PostResponse)
+async def upload_post(request: Request, current_user: dict = Depends(get_current_user)):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Crea un nuevo post a partir de un formulario multipart con
+    la imagen en "image" y la descripcion opcional en "description". La
+    imagen se lee por trozos sin pasar por base64.
+    """
+    upload = await receive_image(request, "image")
+    try:
+        return await asyncio.to_thread(
+            _publish_post, current_user, upload.fields.get("description"), upload.buffer.source()
+        )
+    finally:
+        upload.close()
 
+
+def _publish_post(current_user: dict, description: str | None, image: ImageSource) -> dict:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Modera la descripcion, procesa y sube la imagen, guarda el
+    post y avisa a los seguidores. Comun a las dos formas de subir un post.
+    """
     auto_report_reason = None
-    if payload.description:
+    if description:
         try:
-            moderation = moderate_text_with_gemini(payload.description)
+            moderation = moderate_text_with_gemini(description)
             if moderation["decision"] == "bloquear":
                 raise HTTPException(status_code=400, detail=moderation["reason"])
         except HTTPException as exc:
@@ -48,7 +87,7 @@ def create_post(payload: PostCreate, current_user: dict = Depends(get_current_us
 
     service = get_service_client()
     try:
-        image_url = _upload_post_image(service, current_user["id"], payload.image_base64)
+        image_url = _upload_post_image(service, current_user["id"], image)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
     except Exception:
@@ -59,7 +98,7 @@ def create_post(payload: PostCreate, current_user: dict = Depends(get_current_us
 
     data = {
         "user_id": current_user["id"],
-        "description": payload.description,
+        "description": description,
         "image_url": image_url,
         "likes_count": 0,
         "comments_count": 0,
@@ -86,7 +125,8 @@ def create_post(payload: PostCreate, current_user: dict = Depends(get_current_us
     )
 
     created_post = post_result.data
-    notify_followers_about_post(service, current_user["id"], created_post["id"])
+    follower_ids = notify_followers_about_post(service, current_user["id"], created_post["id"])
+    timelines.fan_out(current_user["id"], created_post, follower_ids)
     if auto_report_reason:
         _report_post_for_manual_review(service, created_post["id"], current_user["id"], auto_report_reason)
 
@@ -94,22 +134,23 @@ def create_post(payload: PostCreate, current_user: dict = Depends(get_current_us
 
 
 @router.get("/user/{user_id}", response_model=list[PostResponse])
-def get_posts_by_user(user_id: str, current_user: dict = Depends(get_current_user)):
+def get_posts_by_user(
+    user_id: str,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = POSTS_PAGE_SIZE,
+    current_user: dict = Depends(get_current_user),
+):
     """
     Autor: Wilbert Lopez Veras
     Fecha: 06-12-2025
-    Descripcion: Retorna las publicaciones asociadas a un usuario.
+    Descripcion: Retorna una pagina de publicaciones de un usuario, de la mas
+    reciente a la mas antigua. La cabecera X-Next-Cursor trae el cursor de la
+    pagina siguiente y falta en la ultima.
     """
     client = get_supabase_client()
-    result = (
-        client.table("posts")
-        .select("*")
-        .eq("user_id", user_id)
-        .order("created_at", desc=True)
-        .execute()
-    )
-
-    return result.data or []
+    query = client.table("posts").select("*").eq("user_id", user_id)
+    return _newest_first_page(query, response, cursor, limit, ("user-posts", user_id))
 
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -122,7 +163,7 @@ def delete_post(post_id: str, current_user: dict = Depends(get_current_user)):
     service = get_service_client()
     existing = (
         service.table("posts")
-        .select("id,user_id,image_url")
+        .select("id,user_id,image_url,created_at")
         .eq("id", post_id)
         .single()
         .execute()
@@ -140,6 +181,7 @@ def delete_post(post_id: str, current_user: dict = Depends(get_current_user)):
 
     _delete_post_image(service, data.get("image_url"))
     service.table("posts").delete().eq("id", post_id).execute()
+    timelines.remove(post_id, data.get("created_at"))
 
 
 @router.delete("/{post_id}/moderate", status_code=status.HTTP_204_NO_CONTENT)
@@ -159,7 +201,7 @@ def delete_post_as_moderator(post_id: str, current_user: dict = Depends(get_curr
     service = get_service_client()
     existing = (
         service.table("posts")
-        .select("id,image_url")
+        .select("id,image_url,created_at")
         .eq("id", post_id)
         .single()
         .execute()
@@ -170,40 +212,25 @@ def delete_post_as_moderator(post_id: str, current_user: dict = Depends(get_curr
 
     _delete_post_image(service, data.get("image_url"))
     service.table("posts").delete().eq("id", post_id).execute()
+    timelines.remove(post_id, data.get("created_at"))
 
 
 @router.get("/{post_id}", response_model=PostResponse)
-def get_post(post_id: str, current_user: dict = Depends(get_current_user)):
+async def get_post(post_id: str, current_user: dict = Depends(get_current_user)):
     """
     Autor: Wilbert Lopez Veras
     Fecha: 06-12-2025
     Descripcion: Obtiene la información de una publicación.
     """
-    client = get_supabase_client()
     try:
-        result = (
-            client.table("posts")
-            .select("*")
-            .eq("id", post_id)
-            .single()
-            .execute()
-        )
+        data = await repositories.fetch_post(post_id)
     except Exception:
         raise HTTPException(status_code=404, detail="Post no encontrado")
 
-    data = result.data
     if not data:
         raise HTTPException(status_code=404, detail="Post no encontrado")
 
-    liked = (
-        client.table("post_likes")
-        .select("id")
-        .eq("post_id", post_id)
-        .eq("user_id", current_user["id"])
-        .limit(1)
-        .execute()
-    )
-    data["liked_by_me"] = bool(liked.data)
+    data["liked_by_me"] = await repositories.has_liked_post(post_id, current_user["id"])
 
     return data
 
@@ -261,21 +288,26 @@ def add_comment(post_id: str, payload: PostCommentCreate, current_user: dict = D
 
 
 @router.get("/{post_id}/comments")
-def get_comments(post_id: str, current_user: dict = Depends(get_current_user)):
+def get_comments(
+    post_id: str,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = COMMENTS_PAGE_SIZE,
+    current_user: dict = Depends(get_current_user),
+):
     """
     Autor: Wilbert Lopez Veras
     Fecha: 06-12-2025
-    Descripcion: Devuelve los comentarios del post con el perfil básico del autor.
+    Descripcion: Devuelve una pagina de comentarios del post con el perfil
+    básico del autor, paginada igual que las publicaciones.
     """
     client = get_supabase_client()
-    result = (
+    query = (
         client.table("post_comments")
         .select("id, content, created_at, user_id, profiles(username, avatar_url)")
         .eq("post_id", post_id)
-        .order("created_at", desc=True)
-        .execute()
     )
-    return result.data or []
+    return _newest_first_page(query, response, cursor, limit, ("post-comments", post_id))
 
 
 @router.delete("/{post_id}/comments/{comment_id}")
@@ -343,51 +375,49 @@ def delete_comment_as_moderator(post_id: str, comment_id: str, current_user: dic
     return {"detail": "Comentario eliminado"}
 
 
-def _upload_post_image(service_client, user_id: str, image_base64: str) -> str:
+def _newest_first_page(query, response: Response, cursor: str | None, limit: int, scope: tuple) -> list:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Pagina por (created_at, id) con cursor opaco: cada pagina
+    empieza justo despues de la anterior sin recorrer las ya entregadas.
+    """
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=400, detail=f"El límite debe estar entre 1 y {MAX_PAGE_SIZE}"
+        )
+    try:
+        rows, next_cursor = newest_first_page(query, limit, cursor, query_fingerprint(*scope))
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Cursor de paginación no válido")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
+
+def _upload_post_image(service_client, user_id: str, image: ImageSource) -> str:
     """
     Autor: Wilbert Lopez Veras
     Fecha: 06-12-2025
-    Descripcion: Sube la imagen convertida a base64 y devuelve la URL pública.
+    Descripcion: Procesa la imagen (miniatura, feed y completa en WebP, sin
+    metadatos), la sube y devuelve la URL pública de la version completa.
     """
     if not USER_CONTENT_BUCKET:
         raise ValueError("No hay bucket configurado para guardar imágenes.")
 
-    header, _, data = image_base64.partition(",")
-    payload = data or header
-
-    try:
-        binary = base64.b64decode(payload)
-    except (binascii.Error, ValueError):
-        raise ValueError("Imagen inválida")
-
-    mime = "image/jpeg"
-    ext = "jpg"
-    header_lower = header.lower()
-    if "png" in header_lower:
-        mime = "image/png"
-        ext = "png"
-    elif "webp" in header_lower:
-        mime = "image/webp"
-        ext = "webp"
+    processed = image_pipeline.process(image, POST_RENDITIONS, label=f"post de {user_id}")
 
     folder = POSTS_FOLDER.strip("/")
     timestamp = int(time.time())
-    filename = f"{user_id}/{folder}/post_{timestamp}.{ext}" if folder else f"{user_id}/post_{timestamp}.{ext}"
-    path = filename.strip("/")
+    base = f"{user_id}/{folder}/post_{timestamp}" if folder else f"{user_id}/post_{timestamp}"
 
     storage = service_client.storage.from_(USER_CONTENT_BUCKET)
     try:
-        storage.upload(
-            path,
-            binary,
-            {"content-type": mime, "upsert": "true"},
-        )
+        url = upload_renditions(storage, base.strip("/"), processed)
     except Exception as exc:
         print(f"Error subiendo imagen del post: {exc}")
         raise
 
-    public_url = storage.get_public_url(path)
-    url = public_url.get("publicUrl") if isinstance(public_url, dict) else public_url
     return f"{url}?v={timestamp}"
 
 
@@ -406,7 +436,9 @@ def _delete_post_image(service_client, image_url: str | None):
             return
         relative = image_url[start + len(USER_CONTENT_BUCKET) + 1 :]
         relative = relative.split("?v=", 1)[0]
-        service_client.storage.from_(USER_CONTENT_BUCKET).remove([relative])
+        service_client.storage.from_(USER_CONTENT_BUCKET).remove(
+            rendition_paths(relative, POST_RENDITIONS)
+        )
     except Exception as exc:
         print(f"No se pudo eliminar la imagen del post: {exc}")
 
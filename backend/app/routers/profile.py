@@ -1,14 +1,37 @@
-import base64
-import binascii
+import asyncio
 import os
 import time
-from math import atan2, cos, radians, sin, sqrt
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from app import profile_events, repositories
 from app.dependencies import get_current_user
-from app.models import Profile, ProfileUpdate
+from app.images import AVATAR_RENDITIONS, image_pipeline, upload_renditions
+from app.models import PostSummary, Profile, ProfileUpdate
 from app.database import get_supabase_client, get_service_client
-from app.geocode import geocode_address
+from app.geo_index import (
+    GEO_INDEX_ENABLED,
+    MAX_CLUSTER_ZOOM,
+    GeoGridIndex,
+    fetch_profiles_in_viewport,
+    geo_index,
+    nearby_key,
+)
+from app.geocode import geocode_address, geocode_address_async
+from app.nearby_cache import nearby_cache
+from app.profile_cache import profile_cache
+from app.search_index import SEARCH_INDEX_ENABLED, search_index
+from app.timeline import timelines
+from app.uploads import ImageSource, decode_base64_image, receive_image
+from app.suggest_index import SUGGEST_INDEX_ENABLED, SUGGEST_MAX_LIMIT, suggest_index
+from app.pagination import (
+    NEXT_CURSOR_HEADER,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    query_fingerprint,
+    split_page,
+)
+from app.routers.auth import revoke_user_refresh_tokens
 from postgrest.exceptions import APIError
 
 router = APIRouter(prefix="/profile", tags=["Profile"])
@@ -16,41 +39,25 @@ AVATAR_BUCKET = os.environ.get("SUPABASE_AVATAR_BUCKET")
 AVATAR_FOLDER = os.environ.get("SUPABASE_AVATAR_FOLDER")
 USER_CONTENT_BUCKET = os.environ.get("SUPABASE_USER_BUCKET", "user-content")
 USER_CONTENT_ROOT = os.environ.get("SUPABASE_USER_FOLDER", "")
-EARTH_RADIUS_KM = 6371.0
+# Publicaciones que viajan con el perfil y tamano maximo de las paginas siguientes
+PROFILE_POSTS_PAGE_SIZE = int(os.environ.get("PROFILE_POSTS_PAGE_SIZE", "12"))
+PROFILE_POSTS_MAX_PAGE_SIZE = int(os.environ.get("PROFILE_POSTS_MAX_PAGE_SIZE", "60"))
 
 
 @router.get("/me", response_model=Profile)
-def get_my_profile(user = Depends(get_current_user)):
+async def get_my_profile(user = Depends(get_current_user)):
     """
     Autor: Wilbert Lopez Veras
     Fecha: 18-11-2025
-    Descripcion: Obtiene el perfil del usuario autenticado.
+    Descripcion: Obtiene el perfil del usuario autenticado con la primera
+    pagina de sus publicaciones.
     """
-    client = get_supabase_client()
-
-    # Consultar el perfil del usuario actual a Supabase
-    result = (
-        client.table("profiles")
-        .select("*")
-        .eq("id", user["id"])
-        .single()
-        .execute()
-    )
-
-    data = result.data
+    # Perfil del usuario actual desde la cache de perfiles
+    data = await profile_cache.get_async(user["id"])
     if not data:
         raise HTTPException(404, "Perfil no encontrado")
 
-    posts = (
-        client.table("posts")
-        .select("*")
-        .eq("user_id", user["id"])
-        .order("created_at", desc=True)
-        .execute()
-    )
-    data["posts"] = posts.data or []
-
-    return data
+    return await _with_first_posts_page(data)
 
 
 
@@ -86,7 +93,8 @@ def update_my_profile(payload: ProfileUpdate, user = Depends(get_current_user)):
 
     if avatar_base64:
         try:
-            avatar_url = _upload_avatar(service, user_id, avatar_base64)
+            avatar = decode_base64_image(avatar_base64, "Imagen de avatar inválida")
+            avatar_url = _upload_avatar(service, user_id, avatar)
             update_data["avatar_url"] = avatar_url
         except ValueError as exc:
             raise HTTPException(status_code=400, detail=str(exc))
@@ -125,6 +133,7 @@ def update_my_profile(payload: ProfileUpdate, user = Depends(get_current_user)):
     if not update_result.data:
         raise HTTPException(404, "Perfil no encontrado")
 
+    profile_events.profile_changed(update_result.data[0])
     return update_result.data[0]
 
 
@@ -166,7 +175,8 @@ def update_profile_by_admin(
 
     if avatar_base64:
         try:
-            avatar_url = _upload_avatar(service, user_id, avatar_base64)
+            avatar = decode_base64_image(avatar_base64, "Imagen de avatar inválida")
+            avatar_url = _upload_avatar(service, user_id, avatar)
             update_data["avatar_url"] = avatar_url
         except ValueError as exc:
             raise HTTPException(status_code=400, detail=str(exc))
@@ -202,9 +212,78 @@ def update_profile_by_admin(
     if not update_result.data:
         raise HTTPException(404, "Perfil no encontrado")
 
+    profile_events.profile_changed(update_result.data[0])
     return update_result.data[0]
 
 
+@router.put("/me/avatar", response_model=Profile)
+async def upload_my_avatar(request: Request, user=Depends(get_current_user)):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Cambia el avatar del usuario autenticado con la imagen de un
+    formulario multipart (campo "image"), leida por trozos sin base64.
+    """
+    upload = await receive_image(request, "image")
+    try:
+        return await asyncio.to_thread(_replace_avatar, user["id"], upload.buffer.source())
+    finally:
+        upload.close()
+
+
+@router.put("/{user_id}/avatar", response_model=Profile)
+async def upload_avatar_by_admin(user_id: str, request: Request, user=Depends(get_current_user)):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Permite a moderadores cambiar el avatar de cualquier usuario
+    con un formulario multipart.
+    """
+    if user.get("role") not in ("moderator", "admin"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No autorizado para editar otros perfiles",
+        )
+    upload = await receive_image(request, "image")
+    try:
+        return await asyncio.to_thread(_replace_avatar, user_id, upload.buffer.source())
+    finally:
+        upload.close()
+
+
+def _replace_avatar(user_id: str, image: ImageSource) -> dict:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Procesa y sube el avatar y guarda su URL en el perfil.
+    """
+    service = get_service_client()
+    existing = service.table("profiles").select("id").eq("id", user_id).execute()
+    if not existing.data:
+        raise HTTPException(404, "Perfil no encontrado")
+
+    try:
+        avatar_url = _upload_avatar(service, user_id, image)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception:
+        raise HTTPException(
+            status_code=500,
+            detail="No se pudo actualizar la imagen de perfil",
+        )
+
+    result = (
+        service.table("profiles")
+        .update({"avatar_url": avatar_url}, returning="representation")
+        .eq("id", user_id)
+        .execute()
+    )
+    if not result.data:
+        raise HTTPException(404, "Perfil no encontrado")
+    profile_events.profile_changed(result.data[0])
+    return result.data[0]
+
+
 @router.delete("/{user_id}")
 def delete_profile_by_admin(
     user_id: str,
@@ -235,6 +314,12 @@ def delete_profile_by_admin(
         service.table("profiles").delete().eq("id", user_id).execute()
     except Exception:
         pass
+    profile_events.profile_deleted(user_id)
+
+    try:
+        revoke_user_refresh_tokens(service, user_id)
+    except Exception as exc:
+        print(f"No se pudieron revocar las sesiones de {user_id}: {exc}")
 
     return {"message": "Perfil eliminado"}
 
@@ -245,7 +330,12 @@ def search_profiles(query: str, limit: int = 20):
     Autor: Wilbert Lopez Veras
     Fecha: 02-12-2025
     Descripcion: Busca perfiles por nombre de usuario o nombre de mascota.
+    Con el indice de trigramas los resultados vienen ordenados por calidad de
+    coincidencia y no distinguen tildes.
     """
+    if SEARCH_INDEX_ENABLED:
+        return search_index.get().search(query, limit)
+
     client = get_supabase_client()
     normalized_query = f"%{query.lower()}%"
 
@@ -260,54 +350,127 @@ def search_profiles(query: str, limit: int = 20):
     return result.data or []
 
 
+@router.get("/search/suggest")
+def suggest_profiles(prefix: str, limit: int = 8):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Autocompletado para el buscador: nombres de usuario y de
+    mascota que empiezan por el texto escrito, los mas usados primero. Se
+    resuelve en memoria, sin consultar la base de datos en cada pulsacion.
+    """
+    if not SUGGEST_INDEX_ENABLED:
+        raise HTTPException(status_code=503, detail="Autocompletado no disponible")
+    if not 1 <= limit <= SUGGEST_MAX_LIMIT:
+        raise HTTPException(
+            status_code=400, detail=f"El límite debe estar entre 1 y {SUGGEST_MAX_LIMIT}"
+        )
+    return suggest_index.get().suggest(prefix, limit)
+
+
 @router.get("/nearby")
 def get_nearby_profiles(
+    response: Response,
     lat: float | None = None,
     lng: float | None = None,
     radius_km: float = 25,
     limit: int = 50,
+    pet_type: str | None = None,
+    cursor: str | None = None,
     user = Depends(get_current_user),
 ):
     """
     Autor: Wilbert Lopez Veras
     Fecha: 09-12-2025
-    Descripcion: Obtiene perfiles cercanos dentro de un radio en kilometros.
+    Descripcion: Obtiene perfiles cercanos dentro de un radio en kilometros,
+    opcionalmente solo los de un tipo de mascota. Si quedan mas resultados,
+    la cabecera X-Next-Cursor trae el cursor de la pagina siguiente, que se
+    pide repitiendo la consulta con `cursor`.
     """
-    client = get_supabase_client()
-    result = (
-        client.table("profiles")
-        .select(
-            "id, username, pet_name, city, postal_code, avatar_url, latitude, longitude"
-        )
-        .execute()
-    )
-
     if lat is None or lng is None:
         raise HTTPException(
             status_code=400, detail="Se requieren coordenadas para la búsqueda"
         )
     lat = float(lat)
     lng = float(lng)
-    profiles = result.data or []
-    filtered = []
-    for profile in profiles:
-        if profile.get("id") == user["id"]:
-            continue
-        target_lat = profile.get("latitude")
-        target_lng = profile.get("longitude")
-        if target_lat is None or target_lng is None:
-            continue
-        distance = _haversine_distance(lat, lng, float(target_lat), float(target_lng))
-        if distance <= radius_km:
-            profile["distance_km"] = distance
-            filtered.append(profile)
-
-    filtered.sort(key=lambda item: item.get("distance_km", radius_km))
-    return filtered[:limit]
+
+    fingerprint = query_fingerprint(lat, lng, radius_km, (pet_type or "").casefold(), user["id"])
+    after = None
+    if cursor:
+        try:
+            after = nearby_key(decode_cursor(cursor, fingerprint))
+        except InvalidCursor:
+            raise HTTPException(status_code=400, detail="Cursor de paginación no válido")
+
+    # Se pide uno mas para saber si existe pagina siguiente
+    if GEO_INDEX_ENABLED:
+        rows = geo_index.get().query(
+            lat, lng, radius_km, limit + 1, exclude_id=user["id"], pet_type=pet_type, after=after
+        )
+    else:
+        # Sin indice: PostgREST filtra por el rectangulo del radio (con cache
+        # por celda y radio) y aqui se refina con la distancia exacta
+        rows = nearby_cache.query(
+            get_supabase_client(),
+            lat,
+            lng,
+            radius_km,
+            limit + 1,
+            exclude_id=user["id"],
+            pet_type=pet_type,
+            after=after,
+        )
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if rows:
+            last = rows[-1]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+                (last["distance_km"], last["id"]), fingerprint
+            )
+    return rows
+
+
+@router.get("/nearby/clusters")
+def get_nearby_clusters(
+    min_lat: float,
+    max_lat: float,
+    min_lng: float,
+    max_lng: float,
+    zoom: int,
+    user = Depends(get_current_user),
+):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Grupos de perfiles para la vista del mapa (rectangulo y
+    nivel de zoom): centroide y numero de perfiles por grupo, en lugar de un
+    marcador por perfil. Si la vista cruza el antimeridiano, min_lng > max_lng.
+    """
+    if not (-90 <= min_lat <= max_lat <= 90) or not (-180 <= min_lng <= 180 and -180 <= max_lng <= 180):
+        raise HTTPException(status_code=400, detail="La vista del mapa no es válida")
+    if not 0 <= zoom <= MAX_CLUSTER_ZOOM:
+        raise HTTPException(
+            status_code=400, detail=f"El zoom debe estar entre 0 y {MAX_CLUSTER_ZOOM}"
+        )
+
+    if GEO_INDEX_ENABLED:
+        index = geo_index.get()
+    else:
+        index = GeoGridIndex.from_rows(
+            fetch_profiles_in_viewport(get_supabase_client(), min_lat, max_lat, min_lng, max_lng)
+        )
+    cell_degrees, clusters = index.clusters(min_lat, max_lat, min_lng, max_lng, zoom)
+    return {
+        "zoom": zoom,
+        "cell_degrees": cell_degrees,
+        "total": sum(cluster["count"] for cluster in clusters),
+        "clusters": clusters,
+    }
 
 
 @router.get("/geocode")
-def resolve_location(
+async def resolve_location(
     postal_code: str | None = None,
     city: str | None = None,
     user = Depends(get_current_user),
@@ -324,7 +487,7 @@ def resolve_location(
             detail="Debe proporcionar código postal, ciudad o ambos.",
         )
 
-    latitude, longitude = geocode_address(city, postal_code)
+    latitude, longitude = await geocode_address_async(city, postal_code)
     if latitude is None or longitude is None:
         raise HTTPException(
             status_code=404, detail="No se pudo localizar esa dirección."
@@ -334,36 +497,61 @@ def resolve_location(
 
 
 @router.get("/{id}", response_model=Profile)
-def get_profile(id: str):
+async def get_profile(id: str):
     """
     Autor: Wilbert Lopez Veras
     Fecha: 18-11-2025
     Descripcion: Obtiene el perfil de un usuario por su ID.
     """
-    client = get_supabase_client()
-
-    result = (
-        client.table("profiles")
-        .select("*")
-        .eq("id", id)
-        .single()
-        .execute()
-    )
-
-    data = result.data
+    data = await profile_cache.get_async(id)
     if not data:
         raise HTTPException(404, "Perfil no encontrado")
 
-    posts = (
-        client.table("posts")
-        .select("*")
-        .eq("user_id", id)
-        .order("created_at", desc=True)
-        .execute()
-    )
-    data["posts"] = posts.data or []
+    return await _with_first_posts_page(data)
 
-    return data
+
+@router.get("/{id}/posts", response_model=list[PostSummary])
+async def get_profile_posts(
+    id: str,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = PROFILE_POSTS_PAGE_SIZE,
+):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Paginas siguientes de la cuadricula del perfil. Se empieza
+    con el cursor `posts_cursor` del perfil; la cabecera X-Next-Cursor trae
+    el de la pagina siguiente y falta en la ultima.
+    """
+    if not 1 <= limit <= PROFILE_POSTS_MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El límite debe estar entre 1 y {PROFILE_POSTS_MAX_PAGE_SIZE}",
+        )
+    fingerprint = query_fingerprint("profile-posts", id)
+    try:
+        after = decode_cursor(cursor, fingerprint) if cursor else None
+        rows = await repositories.fetch_post_summaries(id, limit + 1, after)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Cursor de paginación no válido")
+    page, next_cursor = split_page(rows, limit, fingerprint)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return page
+
+
+async def _with_first_posts_page(profile: dict) -> dict:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Agrega al perfil la primera pagina de resumenes de sus
+    publicaciones y el cursor para pedir el resto a /profile/{id}/posts.
+    """
+    fingerprint = query_fingerprint("profile-posts", profile["id"])
+    rows = await repositories.fetch_post_summaries(profile["id"], PROFILE_POSTS_PAGE_SIZE + 1)
+    profile["posts"], profile["posts_cursor"] = split_page(rows, PROFILE_POSTS_PAGE_SIZE, fingerprint)
+    return profile
 
 
 @router.post("/{target_id}/follow")
@@ -405,6 +593,7 @@ def follow_user(
             raise HTTPException(status_code=400, detail="Ya sigues a este usuario")
         raise
 
+    timelines.invalidate(follower_id)
     return {"message": "Ahora sigues a este usuario"}
 
 
@@ -432,6 +621,8 @@ def unfollow_user(
     if not result.data:
         raise HTTPException(status_code=404, detail="No seguías a este usuario")
 
+    timelines.invalidate(follower_id)
+
     return {"message": "Has dejado de seguir a este usuario"}
 
 
@@ -503,70 +694,29 @@ def list_followers(user_id: str):
     return [item["follower"] for item in result.data or []]
 
 
-def _haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """
-    Autor: Wilbert Lopez Veras
-    Fecha: 09-12-2025
-    Descripcion: Calcula la distancia en KM entre dos puntos usando Haversine.
-    """
-
-    lat1_rad, lon1_rad = radians(lat1), radians(lon1)
-    lat2_rad, lon2_rad = radians(lat2), radians(lon2)
-
-    dlat = lat2_rad - lat1_rad
-    dlon = lon2_rad - lon1_rad
-
-    a = sin(dlat / 2) ** 2 + cos(lat1_rad) * cos(lat2_rad) * sin(dlon / 2) ** 2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    return EARTH_RADIUS_KM * c
-
-
-def _upload_avatar(service_client, user_id: str, avatar_base64: str) -> str:
+def _upload_avatar(service_client, user_id: str, image: ImageSource) -> str:
     """
     Autor: Wilbert Lopez Veras
     Fecha: 18-11-2025
-    Descripcion: Sube la imagen de avatar del usuario y retorna la URL pública.
+    Descripcion: Procesa la imagen de avatar (miniatura y completa en WebP,
+    sin metadatos), la sube y retorna la URL pública de la version completa.
     """
 
     bucket = USER_CONTENT_BUCKET
     if not bucket:
         raise ValueError("No hay bucket configurado para guardar avatares")
 
-    header, _, data = avatar_base64.partition(",")
-    payload = data or header
-
-    try:
-        binary = base64.b64decode(payload)
-    except (binascii.Error, ValueError):
-        raise ValueError("Imagen de avatar inválida")
-
-    mime = "image/jpeg"
-    ext = "jpg"
-    header_lower = header.lower()
-    if "png" in header_lower:
-        mime = "image/png"
-        ext = "png"
-    elif "webp" in header_lower:
-        mime = "image/webp"
-        ext = "webp"
+    processed = image_pipeline.process(image, AVATAR_RENDITIONS, label=f"avatar de {user_id}")
 
     base_path = USER_CONTENT_ROOT or ""
     folder = f"{base_path}/{user_id}".strip("/")
     storage = service_client.storage.from_(bucket)
 
-    # Eliminar posibles versiones anteriores del avatar
+    # Eliminar avatares anteriores al procesado de imagenes
     posibles_ext = ["jpg", "png", "webp"]
     storage.remove([f"{folder}/avatar.{previous}" for previous in posibles_ext])
 
-    path = f"{folder}/avatar.{ext}"
-    storage.upload(
-        path,
-        binary,
-        {"content-type": mime, "upsert": "true"},
-    )
-
-    public_url = storage.get_public_url(path)
-    url = public_url.get("publicUrl") if isinstance(public_url, dict) else public_url
+    url = upload_renditions(storage, f"{folder}/avatar", processed)
     # Obtener el ultimo avatar subido (evitar cache)
     cache_buster = int(time.time())
     return f"{url}?v={cache_buster}"
@@ -10,8 +10,11 @@ from postgrest.exceptions import APIError
 from app.database import get_service_client
 from app.dependencies import get_current_user
 from app.models import ReportRequest
+from app.profile_cache import profile_cache
 
 router = APIRouter(tags=["Reports"])
+REPORTER_COLUMNS = ("id", "username", "email", "avatar_url")
+AUTHOR_COLUMNS = ("id", "username", "email")
 
 
 def _ensure_moderator(user: dict):
@@ -27,6 +30,31 @@ def _ensure_moderator(user: dict):
         )
 
 
+def _attach_report_profiles(reports: list, target_key: str) -> list:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Completa cada reporte con el perfil de quien reporta y el del
+    autor del contenido reportado, leidos de la cache de perfiles en una sola
+    pasada (mismo formato que los embeds de PostgREST que sustituye).
+    """
+    targets = [report.get(target_key) or {} for report in reports]
+    profiles = profile_cache.get_many(
+        [report.get("reporter_id") for report in reports]
+        + [target.get("user_id") for target in targets]
+    )
+
+    def project(profile_id, columns):
+        profile = profiles.get(profile_id)
+        return {column: profile[column] for column in columns} if profile else None
+
+    for report, target in zip(reports, targets):
+        report["reporter"] = project(report.pop("reporter_id", None), REPORTER_COLUMNS)
+        if target:
+            target["profiles"] = project(target.get("user_id"), AUTHOR_COLUMNS)
+    return reports
+
+
 @router.post("/posts/{post_id}/report")
 def report_post(
     post_id: str,
@@ -73,13 +101,13 @@ def list_post_reports(user=Depends(get_current_user)):
         service.table("post_reports")
         .select(
             "id, reason, created_at, "
-            "reporter:profiles(id, username, email, avatar_url), "
-            "post:posts(id, description, image_url, user_id, profiles(id, username, email))"
+            "reporter_id, "
+            "post:posts(id, description, image_url, user_id)"
         )
         .order("created_at", desc=True)
         .execute()
     )
-    return result.data or []
+    return _attach_report_profiles(result.data or [], "post")
 
 
 @router.delete("/reports/posts/{report_id}")
@@ -149,13 +177,13 @@ def list_comment_reports(user=Depends(get_current_user)):
         service.table("comment_reports")
         .select(
             "id, reason, created_at, "
-            "reporter:profiles(id, username, email, avatar_url), "
-            "comment:post_comments(id, content, post_id, user_id, profiles(id, username, email))"
+            "reporter_id, "
+            "comment:post_comments(id, content, post_id, user_id)"
         )
         .order("created_at", desc=True)
         .execute()
     )
-    return result.data or []
+    return _attach_report_profiles(result.data or [], "comment")
 
 
 @router.delete("/reports/comments/{report_id}")
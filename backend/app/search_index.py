@@ -0,0 +1,375 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Indice invertido de trigramas para /profile/search. Los
+# nombres de usuario y de mascota se normalizan (minusculas y sin tildes) y se
+# parten en trigramas; una busqueda intersecta las listas de los trigramas de
+# la consulta en lugar de recorrer la tabla con ilike '%q%', y los resultados
+# se ordenan por calidad de coincidencia. El indice vive en memoria en cada
+# worker y se actualiza con los avisos de profile_events (live_index).
+
+from __future__ import annotations
+
+import heapq
+import os
+import re
+import sys
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from . import profile_events
+from .database import get_service_client
+from .geocode_cache import normalize_place
+from .live_index import LiveIndex, fetch_all_rows
+
+SEARCH_INDEX_ENABLED = os.environ.get("SEARCH_INDEX_ENABLED", "true").lower() == "true"
+SEARCH_INDEX_RECONCILE_SECONDS = float(os.environ.get("SEARCH_INDEX_RECONCILE_SECONDS", "900"))
+SEARCH_INDEX_PAGE_SIZE = int(os.environ.get("SEARCH_INDEX_PAGE_SIZE", "1000"))
+# Parte minima de los trigramas de la consulta que debe tener un nombre para
+# contar como coincidencia aproximada (como word_similarity de pg_trgm)
+SEARCH_FUZZY_THRESHOLD = float(os.environ.get("SEARCH_FUZZY_THRESHOLD", "0.5"))
+
+SEARCH_COLUMNS = "id, username, city, postal_code, avatar_url, pet_name, latitude, longitude"
+RESULT_COLUMNS = tuple(column.strip() for column in SEARCH_COLUMNS.split(","))
+SEARCH_FIELDS = ("username", "pet_name")
+SHARED_COLUMNS = ("city", "postal_code")
+
+# Orden de calidad: igual, empieza por, palabra que empieza por, contiene, parecido
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING, FUZZY = range(5)
+
+_WORD_SEPARATORS = re.compile(r"[\W_]+")
+_NO_MATCH = FUZZY + 1
+
+
+def _as_numpy(values: array, dtype) -> np.ndarray:
+    # Copia: una vista impediria crecer al array mientras exista
+    return np.frombuffer(values, dtype=dtype).copy()
+
+
+def _head(text: str) -> int:
+    # Dos primeras letras en un entero, para comparar prefijos cortos con NumPy
+    first = ord(text[0]) if text else 0
+    second = ord(text[1]) if len(text) > 1 else 0
+    return (first << 21) | second
+
+
+def text_trigrams(text: str) -> Set[str]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Trigramas de un texto ya normalizado, con relleno al estilo
+    pg_trgm. Incluye el comienzo de cada palabra ("  p", " pe") para poder
+    buscar prefijos de una o dos letras.
+    """
+    if not text:
+        return set()
+    padded = f"  {text} "
+    grams = {padded[start:start + 3] for start in range(len(padded) - 2)}
+    for word in _WORD_SEPARATORS.split(text):
+        if word:
+            grams.add("  " + word[0])
+            grams.add(" " + word[:2])
+    return grams
+
+
+def match_rank(query: str, text: str) -> Optional[int]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Calidad de la coincidencia de la consulta con un texto
+    normalizado, o None si el texto no la contiene.
+    """
+    if not text:
+        return None
+    if text == query:
+        return EXACT
+    if text.startswith(query):
+        return PREFIX
+    if query not in text:
+        return None
+    if any(word.startswith(query) for word in _WORD_SEPARATORS.split(text)):
+        return WORD_PREFIX
+    return SUBSTRING
+
+
+class ProfileSearchIndex:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Indice de trigramas de perfiles. Cada version de un perfil
+    ocupa una posicion nueva ("slot") y las listas de cada trigrama guardan
+    posiciones crecientes en arrays int32, asi que se intersectan con NumPy
+    sin ordenar. Al cambiar o borrar un perfil su posicion anterior se marca
+    como muerta y se filtra al buscar; cuando las muertas pasan de un cuarto
+    del total las listas se compactan.
+    """
+
+    def __init__(self):
+        self._ids: List[Optional[str]] = []
+        self._rows: List[Optional[tuple]] = []
+        self._texts: List[Optional[Tuple[str, str]]] = []
+        self._alive = bytearray()
+        # Por posicion y campo (usuario, mascota): dos primeras letras y longitud
+        self._heads = (array("q"), array("q"))
+        self._lengths = (array("i"), array("i"))
+        self._slots: Dict[str, int] = {}
+        self._postings: Dict[str, array] = {}
+        self._dead = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> "ProfileSearchIndex":
+        index = cls()
+        for row in rows:
+            index.apply(row.get("id"), row)
+        return index
+
+    @property
+    def size(self) -> int:
+        return len(self._slots)
+
+    @property
+    def gram_count(self) -> int:
+        return len(self._postings)
+
+    @property
+    def posting_bytes(self) -> int:
+        return sum(len(posting) * posting.itemsize for posting in self._postings.values())
+
+    def apply(self, profile_id: Optional[str], profile: Optional[Dict[str, Any]]) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Alta o cambio con la fila del perfil; None lo quita.
+        """
+        if not profile_id:
+            return
+        with self._lock:
+            previous = self._slots.pop(profile_id, None)
+            if previous is not None:
+                self._retire(previous)
+            if profile is None:
+                self._maybe_compact()
+                return
+
+            texts = tuple(normalize_place(profile.get(field)) for field in SEARCH_FIELDS)
+            grams = set().union(*(text_trigrams(text) for text in texts))
+            slot = len(self._ids)
+            self._ids.append(profile_id)
+            self._rows.append(tuple(
+                sys.intern(value) if column in SHARED_COLUMNS and isinstance(value, str) else value
+                for column, value in ((column, profile.get(column)) for column in RESULT_COLUMNS)
+            ))
+            self._texts.append(texts)
+            for heads, lengths, text in zip(self._heads, self._lengths, texts):
+                heads.append(_head(text))
+                lengths.append(len(text))
+            self._alive.append(1)
+            self._slots[profile_id] = slot
+            for gram in grams:
+                posting = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[gram] = array("i")
+                posting.append(slot)
+            self._maybe_compact()
+
+    def _retire(self, slot: int) -> None:
+        self._alive[slot] = 0
+        self._rows[slot] = None
+        self._texts[slot] = None
+        self._dead += 1
+
+    def _maybe_compact(self) -> None:
+        if self._dead < 1024 or self._dead * 4 <= len(self._ids):
+            return
+        kept = np.flatnonzero(self._alive_mask())
+        remap = np.full(len(self._ids), -1, dtype=np.int32)
+        remap[kept] = np.arange(kept.size, dtype=np.int32)
+        postings = {}
+        for gram, posting in self._postings.items():
+            moved = remap[np.frombuffer(posting, dtype=np.int32)]
+            moved = moved[moved >= 0]
+            if moved.size:
+                postings[gram] = array("i", moved.tobytes())
+        self._postings = postings
+        self._ids = [self._ids[slot] for slot in kept]
+        self._rows = [self._rows[slot] for slot in kept]
+        self._texts = [self._texts[slot] for slot in kept]
+        self._heads = tuple(
+            array("q", _as_numpy(heads, np.int64)[kept].tobytes()) for heads in self._heads
+        )
+        self._lengths = tuple(
+            array("i", _as_numpy(lengths, np.int32)[kept].tobytes()) for lengths in self._lengths
+        )
+        self._alive = bytearray(b"\x01" * kept.size)
+        self._slots = {profile_id: slot for slot, profile_id in enumerate(self._ids)}
+        self._dead = 0
+
+    def _alive_mask(self) -> np.ndarray:
+        return np.frombuffer(bytes(self._alive), dtype=np.uint8).astype(bool)
+
+    def _posting(self, gram: str) -> np.ndarray:
+        posting = self._postings.get(gram)
+        if posting is None:
+            return np.empty(0, dtype=np.int32)
+        return _as_numpy(posting, np.int32)
+
+    def _candidates(self, query: str) -> np.ndarray:
+        if len(query) < 3:
+            # Solo palabras que empiezan por la consulta
+            return self._posting(("  " + query) if len(query) == 1 else (" " + query))
+        grams = sorted(
+            {query[start:start + 3] for start in range(len(query) - 2)},
+            key=lambda gram: len(self._postings.get(gram, ())),
+        )
+        result = self._posting(grams[0])
+        for gram in grams[1:]:
+            if not result.size:
+                break
+            result = np.intersect1d(result, self._posting(gram), assume_unique=True)
+        return result
+
+    def _fuzzy(self, query: str, exclude: Set[int]) -> List[Tuple[int, float]]:
+        grams = text_trigrams(query)
+        postings = [self._posting(gram) for gram in grams if gram in self._postings]
+        if not postings:
+            return []
+        shared = np.bincount(np.concatenate(postings), minlength=len(self._ids))
+        similarity = shared / len(grams)
+        chosen = np.flatnonzero((similarity >= SEARCH_FUZZY_THRESHOLD) & self._alive_mask())
+        return [(int(slot), float(similarity[slot])) for slot in chosen if int(slot) not in exclude]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Perfiles cuyo nombre de usuario o de mascota contiene la
+        consulta, sin distinguir mayusculas ni tildes, ordenados por calidad
+        (igual, empieza por, palabra que empieza por, contiene), por campo
+        (usuario antes que mascota), longitud y antiguedad en el indice. Si no llegan a `limit` se completan con nombres parecidos
+        (trigramas compartidos), utiles con faltas de ortografia.
+        """
+        normalized = normalize_place(query)
+        if not normalized or limit <= 0:
+            return []
+        with self._lock:
+            if len(normalized) < 3:
+                slots = self._short_prefix_matches(normalized, limit)
+                if slots is not None:
+                    return [dict(zip(RESULT_COLUMNS, self._rows[slot])) for slot in slots]
+            ranked: List[Tuple[tuple, int]] = []
+            matched: Set[int] = set()
+            for slot in self._candidates(normalized).tolist():
+                if not self._alive[slot]:
+                    continue
+                key = self._rank_key(normalized, slot)
+                if key is not None:
+                    ranked.append((key, slot))
+                    matched.add(slot)
+
+            if len(normalized) < 3 and len(ranked) < limit:
+                # Una o dos letras en mitad de una palabra: no hay trigrama
+                # que las contenga, se recorren los textos
+                for slot, texts in enumerate(self._texts):
+                    if texts is None or slot in matched:
+                        continue
+                    key = self._rank_key(normalized, slot)
+                    if key is not None:
+                        ranked.append((key, slot))
+                        matched.add(slot)
+
+            if len(normalized) >= 3 and len(ranked) < limit:
+                for slot, similarity in self._fuzzy(normalized, matched):
+                    ranked.append(((FUZZY, -similarity, len(self._texts[slot][0]), slot), slot))
+
+            best = heapq.nsmallest(limit, ranked)
+            return [dict(zip(RESULT_COLUMNS, self._rows[slot])) for _, slot in best]
+
+    def _short_prefix_matches(self, query: str, limit: int) -> Optional[List[int]]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Para consultas de una o dos letras (cada pulsacion del
+        buscador) clasifica con NumPy los nombres que empiezan por ellas, sin
+        recorrer los textos. Retorna las posiciones elegidas, o None si no llegan a `limit` y hay que
+        buscar tambien palabras intermedias y subcadenas.
+        """
+        code = _head(query)
+        alive = self._alive_mask()
+        ranks = []
+        for heads, lengths in zip(self._heads, self._lengths):
+            heads = _as_numpy(heads, np.int64)
+            starts = (heads >> 21) == (code >> 21) if len(query) == 1 else heads == code
+            starts &= alive
+            exact = starts & (_as_numpy(lengths, np.int32) == len(query))
+            ranks.append(np.where(exact, EXACT, np.where(starts, PREFIX, _NO_MATCH)))
+        pet_first = ranks[1] < ranks[0]
+        best = np.minimum(ranks[0], ranks[1])
+        length = np.where(
+            pet_first, _as_numpy(self._lengths[1], np.int32), _as_numpy(self._lengths[0], np.int32)
+        ).astype(np.int64)
+        chosen = np.flatnonzero(best < _NO_MATCH)
+        if chosen.size < limit:
+            return None
+        # Misma clave que _rank_key: calidad, campo, longitud y posicion
+        keys = (
+            (best[chosen] << 50)
+            | (pet_first[chosen].astype(np.int64) << 49)
+            | (np.minimum(length[chosen], 2**17 - 1) << 32)
+            | chosen
+        )
+        top = np.sort(np.partition(keys, limit - 1)[:limit])
+        return (top & 0xFFFFFFFF).tolist()
+
+    def _rank_key(self, query: str, slot: int) -> Optional[tuple]:
+        best = None
+        for field, text in enumerate(self._texts[slot]):
+            rank = match_rank(query, text)
+            if rank is not None:
+                key = (rank, field, len(text), slot)
+                if best is None or key < best:
+                    best = key
+        return best
+
+
+def load_search_rows(page_size: int = SEARCH_INDEX_PAGE_SIZE) -> List[Dict[str, Any]]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Lee las columnas de /profile/search de todos los perfiles.
+    Incluyen las del autocompletado, que se construye con las mismas filas.
+    """
+    service = get_service_client()
+    return fetch_all_rows(lambda: service.table("profiles").select(SEARCH_COLUMNS), page_size)
+
+
+class LiveSearchIndex(LiveIndex[ProfileSearchIndex]):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Indice de busqueda del worker (ver LiveIndex).
+    """
+
+    def __init__(self):
+        super().__init__(
+            lambda: ProfileSearchIndex.from_rows(load_search_rows()),
+            "de busqueda",
+            SEARCH_INDEX_RECONCILE_SECONDS,
+            from_rows=ProfileSearchIndex.from_rows,
+        )
+
+    def stats(self) -> dict:
+        index = self._index
+        return {
+            "enabled": SEARCH_INDEX_ENABLED,
+            "profiles": index.size if index else 0,
+            "trigrams": index.gram_count if index else 0,
+            "posting_bytes": index.posting_bytes if index else 0,
+            **super().stats(),
+        }
+
+
+search_index = LiveSearchIndex()
+profile_events.subscribe(search_index.apply_profile)
@@ -0,0 +1,288 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Autocompletado de /profile/search/suggest. Los nombres de
+# usuario y de mascota normalizados se guardan en una lista ordenada; las
+# completaciones de un prefijo son un rango contiguo que se localiza con
+# busqueda binaria. Los prefijos con muchas completaciones guardan sus mejores
+# resultados para responder cada pulsacion en microsegundos. La lista vive en
+# memoria en cada worker y se actualiza con los avisos de profile_events. Se
+# construye con las filas que lee el indice de busqueda (load_search_rows),
+# de modo que ambos comparten una sola lectura de profiles (text_indexes).
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import profile_events
+from .geocode_cache import normalize_place
+from .live_index import LiveIndex, LiveIndexGroup
+from .search_index import load_search_rows, search_index
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_INDEX_ENABLED = os.environ.get("SUGGEST_INDEX_ENABLED", "true").lower() == "true"
+SUGGEST_INDEX_RECONCILE_SECONDS = float(os.environ.get("SUGGEST_INDEX_RECONCILE_SECONDS", "900"))
+SUGGEST_MAX_LIMIT = int(os.environ.get("SUGGEST_MAX_LIMIT", "20"))
+# Un prefijo con mas completaciones que esto guarda sus mejores resultados
+SUGGEST_SCAN_LIMIT = int(os.environ.get("SUGGEST_SCAN_LIMIT", "256"))
+SUGGEST_CACHE_SIZE = int(os.environ.get("SUGGEST_CACHE_SIZE", "4096"))
+SUGGEST_MEMORY_BUDGET_MB = float(os.environ.get("SUGGEST_MEMORY_BUDGET_MB", "32"))
+
+USERNAME, PET_NAME = "username", "pet_name"
+
+
+class _Term:
+    __slots__ = ("display", "count", "usernames")
+
+    def __init__(self, display: str):
+        self.display = display
+        # Perfiles que usan el termino como nombre de usuario o de mascota y
+        # los que lo usan como nombre de usuario (casi siempre uno o ninguno)
+        self.count = 0
+        self.usernames: Tuple[str, ...] = ()
+
+
+class SuggestIndex:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Terminos normalizados en orden alfabetico con el numero de
+    perfiles que los usan. Las completaciones se ordenan por numero de
+    perfiles, longitud y orden alfabetico. Seguro entre hilos.
+    """
+
+    def __init__(self):
+        self._terms: List[str] = []
+        self._entries: Dict[str, _Term] = {}
+        # Por perfil: (termino del nombre de usuario, termino de la mascota)
+        self._profile_terms: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._top: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.scans = 0
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> "SuggestIndex":
+        index = cls()
+        with index._lock:
+            for row in rows:
+                if row.get("id"):
+                    index._add(row["id"], row)
+            index._terms = sorted(index._entries)
+        return index
+
+    @property
+    def size(self) -> int:
+        return len(self._terms)
+
+    def _add(self, profile_id: str, profile: Dict[str, Any]) -> List[str]:
+        created = []
+        terms = []
+        for field in (USERNAME, PET_NAME):
+            display = (profile.get(field) or "").strip()
+            # Internado: la lista, el diccionario y los perfiles comparten la cadena
+            term = sys.intern(normalize_place(display)) or None
+            terms.append(term)
+            if term is None:
+                continue
+            entry = self._entries.get(term)
+            shown = display if display != term else term
+            if entry is None:
+                entry = self._entries[term] = _Term(shown)
+                created.append(term)
+            if field == USERNAME:
+                entry.usernames += (profile_id,)
+                # El nombre de usuario manda sobre la forma que se muestra
+                entry.display = shown
+            # Un perfil cuenta una vez aunque la mascota se llame como el usuario
+            if field == USERNAME or term != terms[0]:
+                entry.count += 1
+        self._profile_terms[profile_id] = (terms[0], terms[1])
+        return created
+
+    def _remove(self, profile_id: str) -> List[str]:
+        emptied = []
+        username, pet_name = self._profile_terms.pop(profile_id, (None, None))
+        for term in {username, pet_name} - {None}:
+            entry = self._entries[term]
+            entry.count -= 1
+            if term == username:
+                entry.usernames = tuple(owner for owner in entry.usernames if owner != profile_id)
+            if not entry.count:
+                del self._entries[term]
+                emptied.append(term)
+        return emptied
+
+    def apply(self, profile_id: Optional[str], profile: Optional[Dict[str, Any]]) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Alta o cambio con la fila del perfil; None lo quita. Solo
+        se olvidan los resultados guardados de los prefijos afectados.
+        """
+        if not profile_id:
+            return
+        with self._lock:
+            touched = list(self._profile_terms.get(profile_id, ()))
+            for term in self._remove(profile_id):
+                position = bisect.bisect_left(self._terms, term)
+                if position < len(self._terms) and self._terms[position] == term:
+                    del self._terms[position]
+            if profile is not None:
+                for term in self._add(profile_id, profile):
+                    bisect.insort(self._terms, term)
+                touched.extend(self._profile_terms[profile_id])
+            for term in set(touched) - {None}:
+                for end in range(1, len(term) + 1):
+                    self._top.pop(term[:end], None)
+
+    def _rank(self, term: str) -> Tuple[int, int, str]:
+        return (-self._entries[term].count, len(term), term)
+
+    def _best(self, prefix: str, limit: int) -> List[str]:
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + "\uffff", lo=start)
+        if end - start <= SUGGEST_SCAN_LIMIT:
+            self.scans += 1
+            return heapq.nsmallest(limit, self._terms[start:end], key=self._rank)
+
+        cached = self._top.get(prefix)
+        if cached is not None:
+            self._top.move_to_end(prefix)
+            self.cache_hits += 1
+            return cached[:limit]
+        self.scans += 1
+        cached = heapq.nsmallest(SUGGEST_MAX_LIMIT, self._terms[start:end], key=self._rank)
+        self._top[prefix] = cached
+        while len(self._top) > SUGGEST_CACHE_SIZE:
+            self._top.popitem(last=False)
+        return cached[:limit]
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Hasta `limit` completaciones del prefijo (sin distinguir
+        mayusculas ni tildes). Cada una trae el texto a mostrar, cuantos
+        perfiles la usan y, si es el nombre de usuario de un unico perfil,
+        su id.
+        """
+        normalized = normalize_place(prefix)
+        if not normalized:
+            return []
+        limit = max(0, min(limit, SUGGEST_MAX_LIMIT))
+        with self._lock:
+            result = []
+            for term in self._best(normalized, limit):
+                entry = self._entries[term]
+                item = {
+                    "text": entry.display,
+                    "kind": USERNAME if entry.usernames else PET_NAME,
+                    "count": entry.count,
+                }
+                if entry.count == 1 and len(entry.usernames) == 1:
+                    item["profile_id"] = entry.usernames[0]
+                result.append(item)
+            return result
+
+    def memory_report(self) -> Dict[str, int]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Bytes aproximados por componente (sys.getsizeof de los
+        contenedores y de su contenido propio). Recorre todo el indice: solo
+        para diagnostico.
+        """
+        with self._lock:
+            terms = sys.getsizeof(self._terms) + sum(sys.getsizeof(term) for term in self._terms)
+            entries = sys.getsizeof(self._entries) + sum(
+                sys.getsizeof(entry)
+                + (sys.getsizeof(entry.usernames) if entry.usernames else 0)
+                + (sys.getsizeof(entry.display) if entry.display is not term else 0)
+                for term, entry in self._entries.items()
+            )
+            profiles = sys.getsizeof(self._profile_terms) + sum(
+                sys.getsizeof(terms_of) for terms_of in self._profile_terms.values()
+            )
+            cache = sys.getsizeof(self._top) + sum(
+                sys.getsizeof(prefix) + sys.getsizeof(best) for prefix, best in self._top.items()
+            )
+            return {
+                "terms": terms,
+                "entries": entries,
+                "profiles": profiles,
+                "prefix_cache": cache,
+                "total": terms + entries + profiles + cache,
+            }
+
+
+def _from_rows(rows: List[Dict[str, Any]]) -> SuggestIndex:
+    index = SuggestIndex.from_rows(rows)
+    used = index.memory_report()["total"]
+    if used > SUGGEST_MEMORY_BUDGET_MB * 2**20:
+        logger.warning(
+            "Suggest index uses %.1f MiB, over its %.1f MiB budget",
+            used / 2**20,
+            SUGGEST_MEMORY_BUDGET_MB,
+        )
+    return index
+
+
+class LiveSuggestIndex(LiveIndex[SuggestIndex]):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Autocompletado del worker (ver LiveIndex).
+    """
+
+    def __init__(self):
+        super().__init__(
+            lambda: _from_rows(load_search_rows()),
+            "de autocompletado",
+            SUGGEST_INDEX_RECONCILE_SECONDS,
+            from_rows=_from_rows,
+        )
+
+    def stats(self, memory: bool = False) -> dict:
+        index = self._index
+        stats = {
+            "enabled": SUGGEST_INDEX_ENABLED,
+            "terms": index.size if index else 0,
+            "cache_hits": index.cache_hits if index else 0,
+            "scans": index.scans if index else 0,
+            **super().stats(),
+        }
+        if memory and index is not None:
+            report = index.memory_report()
+            stats["memory"] = {
+                **report,
+                "budget": int(SUGGEST_MEMORY_BUDGET_MB * 2**20),
+                "within_budget": report["total"] <= SUGGEST_MEMORY_BUDGET_MB * 2**20,
+            }
+        return stats
+
+
+suggest_index = LiveSuggestIndex()
+profile_events.subscribe(suggest_index.apply_profile)
+
+
+def text_indexes(search: bool = True, suggest: bool = True) -> Optional[LiveIndexGroup]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Busqueda y autocompletado activos, cargados y reconciliados
+    con una sola lectura de profiles. None si ninguno esta activo.
+    """
+    indexes = [
+        index for index, enabled in ((search_index, search), (suggest_index, suggest)) if enabled
+    ]
+    if not indexes:
+        return None
+    return LiveIndexGroup(indexes, load_search_rows, "de busqueda y autocompletado")
@@ -0,0 +1,280 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Timeline de inicio (/feed) con reparto en escritura. Cada
+# usuario con el feed cargado tiene en memoria las claves (created_at, id) de
+# las publicaciones recientes de quienes sigue; crear una publicacion agrega
+# su clave a los timelines cargados de los seguidores y borrarla la quita. Las
+# cuentas con demasiados seguidores no se reparten: sus publicaciones se leen
+# al pedir el feed. Un timeline se construye desde la base de datos la primera
+# vez que se pide y caduca pasado un tiempo para recoger lo que publiquen
+# otros workers.
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from . import profile_events
+from .pagination import created_before, created_key
+
+FEED_TIMELINE_SIZE = int(os.environ.get("FEED_TIMELINE_SIZE", "800"))
+FEED_MAX_TIMELINES = int(os.environ.get("FEED_MAX_TIMELINES", "10000"))
+FEED_TIMELINE_TTL_SECONDS = float(os.environ.get("FEED_TIMELINE_TTL_SECONDS", "300"))
+# Por encima de estos seguidores una publicacion no se reparte al escribirla
+FEED_FANOUT_LIMIT = int(os.environ.get("FEED_FANOUT_LIMIT", "5000"))
+# Autores por consulta in_ al construir o completar un timeline
+FEED_AUTHORS_PER_QUERY = int(os.environ.get("FEED_AUTHORS_PER_QUERY", "200"))
+
+FeedKey = Tuple[str, str]
+
+
+class _Timeline:
+    __slots__ = ("keys", "following", "complete", "expires_at")
+
+    def __init__(self, keys: List[FeedKey], following: Set[str], complete: bool, ttl: float):
+        # Orden ascendente: las publicaciones nuevas se agregan al final
+        self.keys = keys
+        self.following = following
+        # False si se han descartado claves antiguas por el limite de tamano
+        self.complete = complete
+        self.expires_at = time.monotonic() + ttl
+
+
+def feed_key(cursor_key: List[Any]) -> FeedKey:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Valida la clave (created_at, id) guardada en un cursor.
+    """
+    return created_key(cursor_key)
+
+
+def fetch_recent_keys(
+    client, author_ids: Iterable[str], limit: int, after: Optional[FeedKey] = None
+) -> List[FeedKey]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Hasta `limit` claves (created_at, id) de las publicaciones mas
+    recientes de los autores, de la mas nueva a la mas antigua y anteriores a
+    `after`. Reparto en lectura: una consulta por cada FEED_AUTHORS_PER_QUERY
+    autores, mezcladas en orden.
+    """
+    authors = sorted(set(author_ids))
+    chunks = []
+    for start in range(0, len(authors), FEED_AUTHORS_PER_QUERY):
+        query = (
+            client.table("posts")
+            .select("id, created_at")
+            .in_("user_id", authors[start:start + FEED_AUTHORS_PER_QUERY])
+            .order("created_at", desc=True)
+            .order("id", desc=True)
+        )
+        if after is not None:
+            query = created_before(query, list(after))
+        rows = query.limit(limit).execute().data or []
+        chunks.append([(row["created_at"], row["id"]) for row in rows])
+    return list(heapq.merge(*chunks, reverse=True))[:limit]
+
+
+def fetch_following(client, user_id: str) -> Set[str]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Ids de las cuentas que sigue el usuario.
+    """
+    rows = (
+        client.table("user_follows").select("followed_id").eq("follower_id", user_id).execute().data
+        or []
+    )
+    return {row["followed_id"] for row in rows if row.get("followed_id")}
+
+
+class TimelineStore:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Timelines acotados por usuario (LRU de FEED_MAX_TIMELINES con
+    caducidad). El feed de un usuario incluye sus propias publicaciones y las
+    de quienes sigue. Seguro entre hilos: las rutas son sincronas.
+    """
+
+    def __init__(
+        self,
+        size: int = FEED_TIMELINE_SIZE,
+        max_timelines: int = FEED_MAX_TIMELINES,
+        ttl: float = FEED_TIMELINE_TTL_SECONDS,
+        fanout_limit: int = FEED_FANOUT_LIMIT,
+    ):
+        self.size = size
+        self.max_timelines = max_timelines
+        self.ttl = ttl
+        self.fanout_limit = fanout_limit
+        self._timelines: "OrderedDict[str, _Timeline]" = OrderedDict()
+        # Autores cuyas publicaciones no se reparten al escribirlas
+        self._big_authors: Set[str] = set()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.builds = 0
+        self.reads = 0
+        self.read_fallbacks = 0
+        self.posts_fanned_out = 0
+        self.timeline_writes = 0
+        self.skipped_fanouts = 0
+
+    def _timeline(self, client, user_id: str) -> _Timeline:
+        now = time.monotonic()
+        with self._lock:
+            timeline = self._timelines.get(user_id)
+            if timeline is not None and timeline.expires_at > now:
+                self._timelines.move_to_end(user_id)
+                return timeline
+            generation = self._generation
+
+        following = fetch_following(client, user_id) | {user_id}
+        keys = fetch_recent_keys(client, following, self.size + 1)
+        complete = len(keys) <= self.size
+        timeline = _Timeline(sorted(keys[: self.size]), following, complete, self.ttl)
+        with self._lock:
+            self.builds += 1
+            # Un reparto o borrado durante la construccion la deja vieja
+            if generation == self._generation:
+                self._timelines[user_id] = timeline
+                self._timelines.move_to_end(user_id)
+                while len(self._timelines) > self.max_timelines:
+                    self._timelines.popitem(last=False)
+        return timeline
+
+    def fan_out(self, author_id: str, post: Dict[str, Any], follower_ids: Iterable[str]) -> int:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Agrega la publicacion nueva al timeline del autor y de sus
+        seguidores que esten cargados. Retorna cuantos timelines se tocaron.
+        """
+        followers = list(follower_ids)
+        key = (post["created_at"], post["id"])
+        with self._lock:
+            self._generation += 1
+            self.posts_fanned_out += 1
+            targets = [author_id]
+            if len(followers) > self.fanout_limit:
+                self._big_authors.add(author_id)
+                self.skipped_fanouts += 1
+            else:
+                targets += followers
+            written = 0
+            for user_id in targets:
+                timeline = self._timelines.get(user_id)
+                if timeline is None:
+                    continue
+                bisect.insort(timeline.keys, key)
+                if len(timeline.keys) > self.size:
+                    del timeline.keys[0]
+                    timeline.complete = False
+                written += 1
+            self.timeline_writes += written
+            return written
+
+    def remove(self, post_id: str, created_at: Optional[str]) -> int:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Quita una publicacion borrada de los timelines cargados.
+        """
+        if not created_at:
+            return 0
+        key = (created_at, post_id)
+        removed = 0
+        with self._lock:
+            self._generation += 1
+            for timeline in self._timelines.values():
+                position = bisect.bisect_left(timeline.keys, key)
+                if position < len(timeline.keys) and timeline.keys[position] == key:
+                    del timeline.keys[position]
+                    removed += 1
+            self.timeline_writes += removed
+        return removed
+
+    def invalidate(self, user_id: str) -> None:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Olvida el timeline de un usuario (por ejemplo al seguir o
+        dejar de seguir a alguien); se reconstruye en la siguiente lectura.
+        """
+        with self._lock:
+            self._generation += 1
+            self._timelines.pop(user_id, None)
+
+    def apply_profile(self, profile_id: str, profile: Optional[Dict[str, Any]]) -> None:
+        # Listener de profile_events: solo importan los perfiles borrados
+        if profile is None:
+            self.invalidate(profile_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._timelines.clear()
+            self._big_authors.clear()
+
+    def page(self, client, user_id: str, limit: int, after: Optional[FeedKey] = None) -> List[FeedKey]:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Hasta `limit` claves del feed posteriores a `after`. Mezcla
+        el timeline con las publicaciones de las cuentas grandes que sigue el
+        usuario y, si el timeline se queda corto porque descarto claves
+        antiguas, sigue leyendo de la base de datos.
+        """
+        timeline = self._timeline(client, user_id)
+        with self._lock:
+            self.reads += 1
+            end = bisect.bisect_left(timeline.keys, after) if after else len(timeline.keys)
+            candidates = timeline.keys[max(0, end - limit):end][::-1]
+            big = timeline.following & self._big_authors
+            complete = timeline.complete
+            # Lo anterior a la clave mas antigua guardada solo sale de la base de datos
+            floor = timeline.keys[0] if timeline.keys and not complete else None
+
+        if big:
+            candidates = list(heapq.merge(
+                candidates, fetch_recent_keys(client, big, limit, after), reverse=True
+            ))
+        if floor is not None:
+            candidates = [key for key in candidates if key >= floor]
+        if len(candidates) < limit and not complete:
+            with self._lock:
+                self.read_fallbacks += 1
+            oldest = candidates[-1] if candidates else after
+            candidates += fetch_recent_keys(
+                client, timeline.following, limit - len(candidates), oldest
+            )
+        return list(dict.fromkeys(candidates))[:limit]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "timelines": len(self._timelines),
+                "entries": sum(len(timeline.keys) for timeline in self._timelines.values()),
+                "big_authors": len(self._big_authors),
+                "builds": self.builds,
+                "reads": self.reads,
+                "read_fallbacks": self.read_fallbacks,
+                "posts_fanned_out": self.posts_fanned_out,
+                "timeline_writes": self.timeline_writes,
+                "skipped_fanouts": self.skipped_fanouts,
+                "write_amplification": (
+                    round(self.timeline_writes / self.posts_fanned_out, 2)
+                    if self.posts_fanned_out else None
+                ),
+            }
+
+
+timelines = TimelineStore()
+profile_events.subscribe(timelines.apply_profile)
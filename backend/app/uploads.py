@@ -0,0 +1,282 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Lectura de imagenes subidas como multipart/form-data sin cargar
+# el cuerpo entero. El formulario se procesa a medida que llegan los trozos:
+# el tamano declarado se comprueba antes de leer nada, el tipo real de la
+# imagen por sus primeros bytes y el limite de tamano con cada trozo. La
+# imagen se guarda en memoria hasta UPLOAD_SPOOL_BYTES y despues en un
+# archivo temporal que el pool de imagenes abre por su ruta.
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import io
+import os
+import tempfile
+from typing import Dict, List, Optional, Union
+
+from fastapi import HTTPException, Request, status
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_SPOOL_BYTES = int(os.environ.get("UPLOAD_SPOOL_BYTES", str(256 * 1024)))
+# Campos de texto del formulario (la descripcion de una publicacion)
+UPLOAD_MAX_FIELD_BYTES = int(os.environ.get("UPLOAD_MAX_FIELD_BYTES", "8192"))
+# Cabeceras y separadores del multipart ademas de la imagen
+UPLOAD_FORM_OVERHEAD_BYTES = 64 * 1024
+SNIFF_BYTES = 12
+
+ImageSource = Union[bytes, str]
+
+
+def sniff_image(head: bytes) -> Optional[str]:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Tipo de imagen segun sus primeros bytes (JPEG, PNG o WebP),
+    sin fiarse del content-type que declara el cliente.
+    """
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def decode_base64_image(value: str, invalid_message: str) -> bytes:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Bytes de una imagen enviada como base64 o data URI dentro de
+    JSON (la forma anterior a las subidas multipart).
+    """
+    header, _, data = value.partition(",")
+    try:
+        return base64.b64decode(data or header)
+    except (binascii.Error, ValueError):
+        raise ValueError(invalid_message)
+
+
+class UploadBuffer:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Bytes de la imagen en memoria hasta `spool_bytes`; a partir
+    de ahi, en un archivo temporal con nombre que se borra al cerrar.
+    """
+
+    __slots__ = ("spool_bytes", "size", "_memory", "_file")
+
+    def __init__(self, spool_bytes: int = UPLOAD_SPOOL_BYTES):
+        self.spool_bytes = spool_bytes
+        self.size = 0
+        self._memory: Optional[io.BytesIO] = io.BytesIO()
+        self._file = None
+
+    def _write_to_file(self, data: bytes) -> None:
+        if self._file is None:
+            self._file = tempfile.NamedTemporaryFile(prefix="petconnect-upload-", delete=False)
+            self._file.write(self._memory.getbuffer())
+            self._memory = None
+        self._file.write(data)
+
+    async def write(self, data: bytes) -> None:
+        if self._memory is not None and self.size + len(data) <= self.spool_bytes:
+            self._memory.write(data)
+        else:
+            # Escritura a disco fuera del bucle de eventos
+            await asyncio.to_thread(self._write_to_file, data)
+        self.size += len(data)
+
+    def source(self) -> ImageSource:
+        """
+        Autor: Wilbert Lopez Veras
+        Fecha: 18-10-2026
+        Descripcion: Bytes si la imagen cabe en memoria; si no, la ruta del
+        archivo temporal, que se pasa al pool de procesos sin copiarla.
+        """
+        if self._file is None:
+            return self._memory.getvalue()
+        self._file.flush()
+        return self._file.name
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.unlink(self._file.name)
+            except OSError:
+                pass
+            self._file = None
+        self._memory = None
+
+
+class ImageUpload:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Imagen recibida (ya con el tipo comprobado) y los campos de
+    texto del formulario.
+    """
+
+    __slots__ = ("buffer", "content_type", "fields")
+
+    def __init__(self, buffer: UploadBuffer, content_type: str, fields: Dict[str, str]):
+        self.buffer = buffer
+        self.content_type = content_type
+        self.fields = fields
+
+    def close(self) -> None:
+        self.buffer.close()
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"La imagen supera el máximo de {max_bytes // (1024 * 1024)} MB",
+    )
+
+
+def _unsupported() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Formato de imagen no soportado (JPEG, PNG o WebP)",
+    )
+
+
+class _FormReader:
+    # Callbacks de MultipartParser: guardan lo recibido de cada parte; los
+    # trozos de la imagen se escriben despues de cada write, con await
+    def __init__(self, image_field: str, max_bytes: int):
+        self.image_field = image_field
+        self.max_bytes = max_bytes
+        self.fields: Dict[str, str] = {}
+        self.pending: List[bytes] = []
+        self.head = b""
+        self.image_bytes = 0
+        self.content_type: Optional[str] = None
+        self.has_image = False
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._name: Optional[str] = None
+        self._is_image = False
+        self._text = bytearray()
+
+    def on_part_begin(self) -> None:
+        self._disposition = b""
+        self._name = None
+        self._is_image = False
+        self._text = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        name = options.get(b"name")
+        if name is None:
+            raise HTTPException(status_code=400, detail="Formulario inválido")
+        self._name = name.decode("utf-8", "replace")
+        if self._name == self.image_field:
+            if self.has_image:
+                raise HTTPException(status_code=400, detail="Solo se admite una imagen")
+            self._is_image = self.has_image = True
+        elif b"filename" in options:
+            raise HTTPException(status_code=400, detail=f"Campo de archivo inesperado: {self._name}")
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        chunk = data[start:end]
+        if not self._is_image:
+            if len(self._text) + len(chunk) > UPLOAD_MAX_FIELD_BYTES:
+                raise HTTPException(status_code=413, detail=f"El campo {self._name} es demasiado largo")
+            self._text += chunk
+            return
+        self.image_bytes += len(chunk)
+        if self.image_bytes > self.max_bytes:
+            raise _too_large(self.max_bytes)
+        if self.content_type is None:
+            self.head += chunk[: SNIFF_BYTES - len(self.head)]
+            if len(self.head) >= SNIFF_BYTES:
+                self.content_type = sniff_image(self.head)
+                if self.content_type is None:
+                    raise _unsupported()
+        self.pending.append(chunk)
+
+    def on_part_end(self) -> None:
+        if self._is_image:
+            if self.content_type is None:
+                # Imagen de menos de SNIFF_BYTES
+                self.content_type = sniff_image(self.head)
+                if self.content_type is None:
+                    raise _unsupported()
+        elif self._name is not None:
+            self.fields[self._name] = self._text.decode("utf-8", "replace")
+
+
+async def receive_image(
+    request: Request, image_field: str = "image", max_bytes: Optional[int] = None
+) -> ImageUpload:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Lee un formulario multipart con una imagen en `image_field`
+    y campos de texto opcionales. Responde 413 si el cuerpo declarado o la
+    imagen superan `max_bytes` y 415 si los primeros bytes no son de una
+    imagen JPEG, PNG o WebP, en ambos casos sin leer el resto del cuerpo.
+    """
+    max_bytes = max_bytes or UPLOAD_MAX_BYTES
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Se esperaba un formulario multipart/form-data",
+        )
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes + UPLOAD_FORM_OVERHEAD_BYTES:
+        raise _too_large(max_bytes)
+
+    reader = _FormReader(image_field, max_bytes)
+    parser = MultipartParser(boundary, {
+        "on_part_begin": reader.on_part_begin,
+        "on_part_data": reader.on_part_data,
+        "on_part_end": reader.on_part_end,
+        "on_header_field": reader.on_header_field,
+        "on_header_value": reader.on_header_value,
+        "on_header_end": reader.on_header_end,
+        "on_headers_finished": reader.on_headers_finished,
+    })
+    buffer = UploadBuffer()
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for data in reader.pending:
+                await buffer.write(data)
+            reader.pending.clear()
+        parser.finalize()
+    except FormParserError:
+        buffer.close()
+        raise HTTPException(status_code=400, detail="Formulario inválido")
+    except BaseException:
+        buffer.close()
+        raise
+
+    if not reader.has_image or buffer.size == 0:
+        buffer.close()
+        raise HTTPException(status_code=400, detail="Falta la imagen")
+    return ImageUpload(buffer, reader.content_type, reader.fields)
@@ -0,0 +1,3 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Paquete con los scripts de benchmark del backend.
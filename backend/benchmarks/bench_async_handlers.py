@@ -0,0 +1,74 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Compara el throughput de rutas sync (threadpool) frente a rutas
+# async cuando aumenta el numero de llamadas lentas concurrentes al upstream.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_async_handlers --delay 0.2 --levels 1,10,40,80,160
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+
+def build_app(delay: float) -> FastAPI:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: App minima con el mismo patron de las rutas reales: una
+    llamada bloqueante (como el cliente sync de PostgREST) y una awaitable.
+    """
+    app = FastAPI()
+
+    @app.get("/sync")
+    def sync_route():
+        time.sleep(delay)
+        return {"ok": True}
+
+    @app.get("/async")
+    async def async_route():
+        await asyncio.sleep(delay)
+        return {"ok": True}
+
+    return app
+
+
+async def _run_level(app: FastAPI, path: str, concurrency: int) -> float:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Lanza `concurrency` peticiones a la vez y retorna peticiones/segundo.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.get(path) for _ in range(concurrency))
+        )
+        elapsed = time.perf_counter() - started
+
+    assert all(response.status_code == 200 for response in responses)
+    return concurrency / elapsed
+
+
+async def main(delay: float, levels: list[int]) -> None:
+    app = build_app(delay)
+    print(f"upstream delay: {delay * 1000:.0f} ms")
+    print(f"{'concurrencia':>12} {'sync req/s':>12} {'async req/s':>12}")
+    for level in levels:
+        sync_rps = await _run_level(app, "/sync", level)
+        async_rps = await _run_level(app, "/async", level)
+        print(f"{level:>12} {sync_rps:>12.1f} {async_rps:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--levels", default="1,10,40,80,160")
+    args = parser.parse_args()
+    asyncio.run(main(args.delay, [int(level) for level in args.levels.split(",")]))
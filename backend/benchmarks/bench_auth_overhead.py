@@ -0,0 +1,56 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Micro-benchmark del coste de autenticar una peticion: decode
+# completo con python-jose (antes) frente a la cache de claims verificados.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_auth_overhead --iterations 20000 --tokens 100
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from jose import jwt  # noqa: E402
+
+from app.dependencies import decode_token, token_cache  # noqa: E402
+from app.routers.auth import JWT_ALGORITHM, JWT_SECRET, create_access_token  # noqa: E402
+
+
+def _legacy(token: str) -> dict:
+    payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    return {"id": payload.get("sub"), "role": payload.get("role", "user")}
+
+
+def main(iterations: int, tokens: int) -> None:
+    pool = [create_access_token({"sub": f"user-{index}", "role": "user"}) for index in range(tokens)]
+
+    started = time.perf_counter()
+    for index in range(iterations):
+        _legacy(pool[index % tokens])
+    legacy = (time.perf_counter() - started) / iterations
+
+    token_cache.clear()
+    started = time.perf_counter()
+    for index in range(iterations):
+        decode_token(pool[index % tokens])
+    cached = (time.perf_counter() - started) / iterations
+
+    print(f"tokens distintos: {tokens}, iteraciones: {iterations}")
+    print(f"jose.decode por peticion : {legacy * 1e6:8.2f} us")
+    print(f"decode_token con cache   : {cached * 1e6:8.2f} us")
+    print(f"cache: {token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Coste de autenticacion por peticion")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--tokens", type=int, default=100)
+    args = parser.parse_args()
+    main(args.iterations, args.tokens)
@@ -0,0 +1,111 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Coste del feed con reparto en escritura frente a reparto en
+# lectura. Escritura: milisegundos y timelines tocados por publicacion segun
+# los seguidores del autor (con todos sus timelines cargados). Lectura:
+# milisegundos por pagina de /feed segun las cuentas que sigue el lector,
+# desde el timeline en memoria y mezclando en cada lectura las publicaciones
+# de todas las cuentas seguidas (lo que hace el feed con las cuentas grandes).
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_feed --followers 10,100,1000,10000 --following 10,100,1000
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from app.memory_backend import MemoryBackend  # noqa: E402
+from app.timeline import TimelineStore, fetch_recent_keys  # noqa: E402
+
+AUTHOR_ID = "author"
+READER_ID = "reader"
+
+
+def _post(number: int, user_id: str) -> dict:
+    seconds = 1_000_000 + number
+    return {
+        "id": f"post-{number:07d}", "user_id": user_id, "image_url": "x",
+        "created_at": f"2026-10-{seconds // 86400 % 28 + 1:02d}T"
+                      f"{seconds // 3600 % 24:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}+00:00",
+    }
+
+
+def _median_ms(function, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def bench_writes(counts: list[int], fanout_limit: int, posts: int) -> None:
+    print(f"escritura: {posts} publicaciones, limite de reparto {fanout_limit} seguidores")
+    print(f"{'seguidores':>11} {'ms/publicacion':>15} {'timelines/publicacion':>22}")
+    for count in counts:
+        followers = [f"follower-{number}" for number in range(count)]
+        backend = MemoryBackend()
+        backend.seed_rows("user_follows", [
+            {"follower_id": follower, "followed_id": AUTHOR_ID} for follower in followers
+        ])
+        client = backend.client()
+        store = TimelineStore(max_timelines=count + 1, fanout_limit=fanout_limit)
+        # Todos los seguidores con el feed abierto: el peor caso del reparto
+        for follower in followers:
+            store._timeline(client, follower)
+        started = time.perf_counter()
+        for number in range(posts):
+            store.fan_out(AUTHOR_ID, _post(number, AUTHOR_ID), followers)
+        elapsed = (time.perf_counter() - started) * 1000 / posts
+        print(f"{count:>11} {elapsed:>15.3f} {store.stats()['write_amplification']:>22}")
+
+
+def bench_reads(counts: list[int], posts_per_author: int, page_size: int, repeat: int) -> None:
+    print(f"lectura: {posts_per_author} publicaciones por cuenta, paginas de {page_size}")
+    print(f"{'seguidas':>9} {'timeline ms':>12} {'en lectura ms':>14} {'construir ms':>13}")
+    for count in counts:
+        authors = [f"author-{number}" for number in range(count)]
+        backend = MemoryBackend()
+        backend.seed_rows("user_follows", [
+            {"follower_id": READER_ID, "followed_id": author} for author in authors
+        ])
+        backend.seed_rows("posts", [
+            _post(number * count + index, author)
+            for number in range(posts_per_author)
+            for index, author in enumerate(authors)
+        ])
+        client = backend.client()
+        store = TimelineStore()
+        build_ms = _median_ms(
+            lambda: (store.invalidate(READER_ID), store.page(client, READER_ID, page_size)), 3
+        )
+        timeline_ms = _median_ms(lambda: store.page(client, READER_ID, page_size), repeat)
+        following = set(authors) | {READER_ID}
+        on_read_ms = _median_ms(lambda: fetch_recent_keys(client, following, page_size), repeat)
+        print(f"{count:>9} {timeline_ms:>12.3f} {on_read_ms:>14.2f} {build_ms:>13.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Feed con reparto en escritura")
+    parser.add_argument("--followers", default="10,100,1000,10000")
+    parser.add_argument("--following", default="10,100,1000")
+    parser.add_argument("--fanout-limit", type=int, default=5000)
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--posts-per-author", type=int, default=5)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    bench_writes([int(part) for part in args.followers.split(",")], args.fanout_limit, args.posts)
+    print()
+    bench_reads(
+        [int(part) for part in args.following.split(",")],
+        args.posts_per_author, args.page_size, args.repeat,
+    )
@@ -0,0 +1,88 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Busquedas por segundo y memoria residente del nomenclator
+# offline. Sin --path genera uno sintetico del tamaño de España (unos 11.000
+# codigos postales y 8.100 municipios).
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_gazetteer
+#   python -m benchmarks.bench_gazetteer --path app/data/gazetteer_es.bin
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.gazetteer import Gazetteer, build_gazetteer
+
+
+def _rss_kb() -> int:
+    try:
+        with open("/proc/self/status", encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _synthetic_rows(postal_codes: int, cities: int):
+    rng = random.Random(7)
+    codes = rng.sample(range(1000, 53000), postal_codes)
+    for index, code in enumerate(codes):
+        yield (
+            f"{code:05d}",
+            f"Municipio {index % cities}",
+            f"Provincia {code // 1000}",
+            rng.uniform(36.0, 43.8),
+            rng.uniform(-9.3, 3.3),
+        )
+
+
+def _rate(lookup, queries: list) -> float:
+    started = time.perf_counter()
+    for query in queries:
+        lookup(query)
+    return len(queries) / (time.perf_counter() - started)
+
+
+def main(path: str | None, queries: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        if path is None:
+            path = os.path.join(directory, "gazetteer.bin")
+            build_gazetteer(_synthetic_rows(11000, 8100), path)
+
+        rng = random.Random(11)
+        postal_queries = [f"{rng.randrange(1000, 53000):05d}" for _ in range(queries)]
+        city_queries = [f"Municipio {rng.randrange(0, 9000)}" for _ in range(queries)]
+
+        rss_before = _rss_kb()
+        gazetteer = Gazetteer(path)
+        rss_open = _rss_kb()
+        postal_rate = _rate(gazetteer.lookup_postal_code, postal_queries)
+        city_rate = _rate(gazetteer.lookup_city, city_queries)
+        rss_after = _rss_kb()
+
+        print(f"fichero: {os.path.getsize(path) / 1024:.1f} KiB")
+        print(f"codigos postales: {gazetteer.postal_count}, municipios: {gazetteer.city_count}")
+        print(f"busquedas por codigo postal: {postal_rate:,.0f}/s")
+        print(f"busquedas por municipio:     {city_rate:,.0f}/s")
+        print(
+            f"RSS: +{rss_open - rss_before} KiB al abrir, "
+            f"+{rss_after - rss_before} KiB tras {2 * queries} busquedas"
+        )
+        gazetteer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rendimiento del nomenclator offline")
+    parser.add_argument("--path", default=None)
+    parser.add_argument("--queries", type=int, default=200000)
+    args = parser.parse_args()
+    main(args.path, args.queries)
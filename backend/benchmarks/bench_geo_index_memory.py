@@ -0,0 +1,99 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Memoria del indice geografico en memoria por cada 100k
+# perfiles, coste de mantenerlo con avisos de cambio y latencia de consulta.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_geo_index_memory --profiles 100000
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import random
+import statistics
+import time
+import tracemalloc
+import uuid
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+
+from app.geo_index import GeoGridIndex  # noqa: E402
+from benchmarks.bench_nearby import CITIES  # noqa: E402
+
+PET_TYPES = ["perro", "gato", "conejo", "ave", "reptil", "otro"]
+
+
+def make_rows(total: int) -> list[dict]:
+    rng = random.Random(8)
+    rows = []
+    for index in range(total):
+        lat, lng = rng.choice(CITIES)
+        profile_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        rows.append(
+            {
+                "id": profile_id,
+                "username": f"usuario_{index}",
+                "pet_name": f"Mascota {index % 5000}",
+                "pet_type": rng.choice(PET_TYPES),
+                # Cadena nueva en cada fila, como al decodificar el JSON de PostgREST
+                "city": "".join(["Mad", "rid"]),
+                "postal_code": f"{28000 + index % 100:05d}",
+                "avatar_url": f"https://cdn.petconnect.dev/avatars/{profile_id}.jpg",
+                "latitude": lat + rng.gauss(0, 0.6),
+                "longitude": lng + rng.gauss(0, 0.6),
+            }
+        )
+    return rows
+
+
+def main(total: int, updates: int) -> None:
+    started = time.perf_counter()
+    index = GeoGridIndex.from_rows(make_rows(total))
+    load_seconds = time.perf_counter() - started
+
+    # Memoria retenida: filas creadas y descartadas como tras leer PostgREST
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    measured = GeoGridIndex.from_rows(make_rows(total))
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del measured
+    rows = make_rows(total)
+
+    rng = random.Random(3)
+    started = time.perf_counter()
+    for _ in range(updates):
+        row = dict(rng.choice(rows))
+        row["latitude"] += rng.gauss(0, 0.05)
+        index.apply(row["id"], row)
+    update_us = (time.perf_counter() - started) / updates * 1_000_000
+
+    samples = []
+    for _ in range(500):
+        lat, lng = rng.choice(CITIES)
+        started = time.perf_counter()
+        index.query(lat, lng, 25, 50, pet_type=rng.choice([None, "perro"]))
+        samples.append(time.perf_counter() - started)
+
+    print(f"perfiles: {total}")
+    print(f"carga (incluye generar las filas): {load_seconds:.2f} s")
+    print(f"memoria del indice: {allocated / 1024 / 1024:.1f} MiB "
+          f"({allocated / total:.0f} bytes/perfil, arrays NumPy {index.array_bytes / 1024 / 1024:.1f} MiB)")
+    print(f"memoria por 100k perfiles: {allocated / total * 100000 / 1024 / 1024:.1f} MiB")
+    print(f"aviso de cambio: {update_us:.1f} us")
+    print(f"consulta 25 km p50: {statistics.median(samples) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memoria del indice geografico")
+    parser.add_argument("--profiles", type=int, default=100000)
+    parser.add_argument("--updates", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.profiles, args.updates)
@@ -0,0 +1,70 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Haversine escalar en bucle (con orden completo) frente al
+# camino de /profile/nearby: haversine_batch de geo_kernel y la seleccion
+# top-k de geo_index.keyset_page (np.partition), para el numero de
+# candidatos que ve una consulta.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_geo_kernel --candidates 100,1000,10000,100000
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+
+import numpy as np  # noqa: E402
+
+from app.geo_index import haversine_km, keyset_page  # noqa: E402
+from app.geo_kernel import haversine_batch  # noqa: E402
+
+
+def _best_of(function, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(counts: list[int], radius_km: float, limit: int) -> None:
+    rng = random.Random(2)
+    print(f"{'candidatos':>10} {'escalar ms':>11} {'kernel ms':>10} {'x':>7}")
+    for count in counts:
+        points = [(40.4 + rng.gauss(0, 0.3), -3.7 + rng.gauss(0, 0.3)) for _ in range(count)]
+        latitudes = np.array([point[0] for point in points])
+        longitudes = np.array([point[1] for point in points])
+        ids = [f"p{position:07d}" for position in range(count)]
+
+        def scalar():
+            distances = [
+                (haversine_km(40.4168, -3.7038, lat, lng), position)
+                for position, (lat, lng) in enumerate(points)
+            ]
+            inside = [item for item in distances if item[0] <= radius_km]
+            inside.sort()
+            return inside[:limit]
+
+        def vectorized():
+            distances = haversine_batch(40.4168, -3.7038, latitudes, longitudes)
+            return keyset_page(distances, ids.__getitem__, radius_km, limit)
+
+        scalar_ms = _best_of(scalar)
+        kernel_ms = _best_of(vectorized)
+        print(f"{count:>10} {scalar_ms:>11.3f} {kernel_ms:>10.3f} {scalar_ms / kernel_ms:>7.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kernel Haversine vectorizado")
+    parser.add_argument("--candidates", default="100,1000,10000,100000")
+    parser.add_argument("--radius-km", type=float, default=25)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+    main([int(count) for count in args.candidates.split(",")], args.radius_km, args.limit)
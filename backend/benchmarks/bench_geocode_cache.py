@@ -0,0 +1,49 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Coste de una busqueda en la cache de geocodificacion por nivel
+# (LRU en memoria, SQLite y fallo) sobre un conjunto de codigos postales.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_geocode_cache --keys 5000
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from app.geocode_cache import GeocodeCache, normalize_key
+
+
+def _timed(cache: GeocodeCache, keys: list[str]) -> float:
+    started = time.perf_counter()
+    for key in keys:
+        cache.get(key)
+    return (time.perf_counter() - started) / len(keys) * 1_000_000
+
+
+def main(total: int) -> None:
+    keys = [normalize_key(f"{28000 + index:05d}", "Madrid", "España") for index in range(total)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "geocode.sqlite3")
+        cache = GeocodeCache(path=path, max_size=total)
+        for index, key in enumerate(keys):
+            cache.put(key, (40.0 + index / 1e5, -3.7) if index % 10 else (None, None))
+
+        memory = _timed(cache, keys)
+        cache.close()
+        disk = _timed(GeocodeCache(path=path, max_size=0), keys)
+        miss = _timed(GeocodeCache(path=path, max_size=total), [key + "?" for key in keys])
+
+    print(f"{'nivel':>8} {'us/busqueda':>12}")
+    print(f"{'memoria':>8} {memory:>12.2f}")
+    print(f"{'sqlite':>8} {disk:>12.2f}")
+    print(f"{'fallo':>8} {miss:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Coste de la cache de geocodificacion")
+    parser.add_argument("--keys", type=int, default=5000)
+    args = parser.parse_args()
+    main(args.keys)
@@ -0,0 +1,87 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Rafaga de geocodificaciones simultaneas contra un Nominatim
+# falso local. Cuenta cuantas peticiones llegan al servicio, a que ritmo y
+# cuanto espera cada llamada con el plazo configurado.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_geocoder --callers 200 --addresses 5
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("GEOCODE_CACHE_PATH", "")
+
+from app.geocoder import AsyncGeocoder  # noqa: E402
+
+ARRIVALS: list[float] = []
+
+
+class FakeNominatim(BaseHTTPRequestHandler):
+    delay = 0.2
+
+    def do_GET(self):
+        ARRIVALS.append(time.perf_counter())
+        time.sleep(self.delay)
+        body = b'[{"lat": "40.4168", "lon": "-3.7038"}]'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        return
+
+
+async def _burst(base_url: str, callers: int, addresses: int, deadline: float) -> None:
+    geocoder = AsyncGeocoder(base_url=base_url)
+
+    async def call(index: int) -> float:
+        started = time.perf_counter()
+        address = f"{28000 + index % addresses}"
+        await geocoder.lookup(address, f"{address} Madrid España", timeout=deadline)
+        return time.perf_counter() - started
+
+    waits = await asyncio.gather(*[call(index) for index in range(callers)])
+    # Deja terminar las busquedas que siguieron tras el plazo
+    while geocoder.stats()["in_flight"]:
+        await asyncio.sleep(0.05)
+    await geocoder.close()
+
+    gaps = [later - earlier for earlier, later in zip(ARRIVALS, ARRIVALS[1:])]
+    print(f"llamadas: {callers}, direcciones distintas: {addresses}, plazo: {deadline}s")
+    print(f"peticiones a Nominatim: {len(ARRIVALS)}")
+    if gaps:
+        print(f"separacion minima entre peticiones: {min(gaps):.3f}s")
+    print(f"espera p50: {statistics.median(waits):.3f}s, max: {max(waits):.3f}s")
+    print(geocoder.stats())
+
+
+def main(callers: int, addresses: int, deadline: float, delay: float) -> None:
+    FakeNominatim.delay = delay
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeNominatim)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    asyncio.run(_burst(f"http://127.0.0.1:{port}/search", callers, addresses, deadline))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rafaga contra el geocodificador")
+    parser.add_argument("--callers", type=int, default=200)
+    parser.add_argument("--addresses", type=int, default=5)
+    parser.add_argument("--deadline", type=float, default=3.0)
+    parser.add_argument("--delay", type=float, default=0.2)
+    args = parser.parse_args()
+    main(args.callers, args.addresses, args.deadline, args.delay)
@@ -0,0 +1,92 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Coste y ahorro del procesado de imagenes. Para fotos sinteticas
+# del tamano de una camara de movil imprime KiB del original y de cada tamano,
+# lo que se ahorra cada peticion que pide un tamano en vez del original y los
+# milisegundos de CPU por subida. Despues compara varias subidas a la vez
+# procesadas en los hilos de las rutas frente al pool de procesos.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_images --sizes 4032x3024,1920x1080,1080x1080 --uploads 8
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from PIL import Image, ImageFilter  # noqa: E402
+
+from app.images import POST_RENDITIONS, ImagePipeline, process_image  # noqa: E402
+
+
+def make_photo(width: int, height: int, quality: int = 92) -> bytes:
+    # Detalle a varias escalas con algo de ruido: se comprime como una foto
+    detail = Image.effect_mandelbrot((width, height), (-2.0, -1.25, 0.75, 1.25), 64)
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), 24).filter(ImageFilter.GaussianBlur(0.8))
+    image = Image.merge("RGB", (detail, Image.blend(gradient, noise, 0.5), noise))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def bench_renditions(sizes: list[tuple[int, int]], repeat: int) -> None:
+    names = list(POST_RENDITIONS)
+    print(f"{'foto':>10} {'original KiB':>13} " + " ".join(f"{name + ' KiB':>10}" for name in names)
+          + f" {'ahorro thumb':>13} {'ahorro feed':>12} {'CPU ms':>8}")
+    for width, height in sizes:
+        photo = make_photo(width, height)
+        runs = [process_image(photo, POST_RENDITIONS) for _ in range(repeat)]
+        sizes_kib = {name: len(runs[0].renditions[name]) / 1024 for name in names}
+        original = len(photo) / 1024
+        cpu = statistics.median(run.cpu_ms for run in runs)
+        print(
+            f"{f'{width}x{height}':>10} {original:>13.0f} "
+            + " ".join(f"{sizes_kib[name]:>10.1f}" for name in names)
+            + f" {1 - sizes_kib['thumb'] / original:>12.1%} {1 - sizes_kib['feed'] / original:>11.1%}"
+            + f" {cpu:>8.0f}"
+        )
+
+
+def bench_concurrency(photo: bytes, uploads: int, workers: int) -> None:
+    # Las rutas son sincronas: cada subida ocupa un hilo del threadpool
+    print(f"{uploads} subidas a la vez de {len(photo) // 1024} KiB")
+    for label, pipeline in (
+        ("hilos de las rutas", ImagePipeline(workers=0)),
+        (f"pool de {workers} procesos", ImagePipeline(workers=workers)),
+    ):
+        if pipeline.workers:
+            pipeline.process(photo, POST_RENDITIONS)  # arranque de los procesos
+        started, cpu_started = time.perf_counter(), time.process_time()
+        with ThreadPoolExecutor(max_workers=uploads) as threads:
+            list(threads.map(lambda _: pipeline.process(photo, POST_RENDITIONS), range(uploads)))
+        elapsed = (time.perf_counter() - started) * 1000
+        # CPU que se queda en el proceso de la API (y compite con las rutas)
+        api_cpu = (time.process_time() - cpu_started) * 1000
+        pipeline.shutdown()
+        print(
+            f"  {label:>20}: {elapsed:.0f} ms en total, {elapsed / uploads:.0f} ms por subida, "
+            f"{api_cpu:.0f} ms de CPU en el proceso de la API"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Procesado de imagenes subidas")
+    parser.add_argument("--sizes", default="4032x3024,1920x1080,1080x1080")
+    parser.add_argument("--uploads", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    parsed = [tuple(int(part) for part in size.split("x")) for size in args.sizes.split(",")]
+    bench_renditions(parsed, args.repeat)
+    print()
+    bench_concurrency(make_photo(*parsed[0]), args.uploads, args.workers)
@@ -0,0 +1,108 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Mide la latencia de /auth/login y /auth/signup al crecer el
+# numero de usuarios (1k -> 100k) y la compara con el recorrido completo de
+# auth.admin.list_users() que se hacia antes en cada login.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_login_lookup --sizes 1000,10000,100000 --latency-ms 2
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("SUPABASE_USER_BUCKET", "")
+
+import httpx  # noqa: E402
+
+from app import database  # noqa: E402
+from app.main import app  # noqa: E402
+from app.memory_backend import MemoryBackend  # noqa: E402
+
+PASSWORD = "bench-password"
+
+
+def _seed(backend: MemoryBackend, size: int) -> None:
+    rows = []
+    for index in range(size):
+        user = backend.create_user(f"user{index}@petconnect.dev", PASSWORD)
+        rows.append({"id": user.id, "email": user.email, "username": f"user{index}"})
+    backend.seed_rows("profiles", rows)
+
+
+def _legacy_scan(backend: MemoryBackend, email: str):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Busqueda anterior: listar todos los usuarios y comparar en Python.
+    """
+    for user in backend.client().auth.admin.list_users():
+        if user.email and user.email.lower() == email.lower():
+            return user
+    return None
+
+
+async def _measure(size: int, iterations: int, latency: float) -> dict:
+    backend = MemoryBackend()
+    _seed(backend, size)
+    backend.latency = latency
+    database.use_memory_backend(backend)
+
+    transport = httpx.ASGITransport(app=app)
+    login_samples = []
+    signup_samples = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for index in range(iterations):
+            email = f"user{(index * 7919) % size}@petconnect.dev"
+            started = time.perf_counter()
+            response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+            login_samples.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.text
+
+            started = time.perf_counter()
+            response = await client.post(
+                "/auth/signup",
+                json={"email": f"new{index}@petconnect.dev", "password": PASSWORD, "username": f"new{index}"},
+            )
+            signup_samples.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.text
+
+    started = time.perf_counter()
+    for index in range(min(iterations, 20)):
+        _legacy_scan(backend, f"user{(index * 7919) % size}@petconnect.dev")
+    legacy = (time.perf_counter() - started) / min(iterations, 20)
+
+    database.use_memory_backend(None)
+    return {
+        "login": statistics.median(login_samples),
+        "signup": statistics.median(signup_samples),
+        "legacy_scan": legacy,
+    }
+
+
+async def main(sizes: list[int], iterations: int, latency_ms: float) -> None:
+    print(f"latencia inyectada por llamada: {latency_ms} ms")
+    print(f"{'usuarios':>10} {'login p50 ms':>14} {'signup p50 ms':>14} {'scan list_users ms':>19}")
+    for size in sizes:
+        result = await _measure(size, iterations, latency_ms / 1000)
+        print(
+            f"{size:>10} {result['login'] * 1000:>14.2f} {result['signup'] * 1000:>14.2f} "
+            f"{result['legacy_scan'] * 1000:>19.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latencia de login segun numero de usuarios")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    asyncio.run(main([int(size) for size in args.sizes.split(",")], args.iterations, args.latency_ms))
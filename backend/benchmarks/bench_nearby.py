@@ -0,0 +1,101 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: /profile/nearby con recorrido completo frente al indice en
+# rejilla, de 10k a 1M perfiles repartidos alrededor de ciudades españolas.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_nearby --sizes 10000,100000,1000000
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from app.geo_index import GeoGridIndex, haversine_km  # noqa: E402
+
+CITIES = [
+    (40.4168, -3.7038), (41.3874, 2.1686), (39.4699, -0.3763), (37.3891, -5.9845),
+    (43.2630, -2.9350), (36.7213, -4.4214), (41.6488, -0.8891), (28.1235, -15.4363),
+    (39.5696, 2.6502), (42.8782, -8.5448), (43.3623, -8.4115), (37.9922, -1.1307),
+]
+
+
+def make_profiles(total: int, seed: int = 5) -> list[dict]:
+    rng = random.Random(seed)
+    profiles = []
+    for index in range(total):
+        lat, lng = rng.choice(CITIES)
+        profiles.append(
+            {
+                "id": f"user-{index}",
+                "username": f"user{index}",
+                "latitude": lat + rng.gauss(0, 0.6),
+                "longitude": lng + rng.gauss(0, 0.6),
+            }
+        )
+    return profiles
+
+
+def full_scan(profiles: list[dict], lat: float, lng: float, radius_km: float, limit: int) -> list:
+    # Algoritmo anterior: distancia a todos los perfiles y orden completo
+    filtered = []
+    for profile in profiles:
+        distance = haversine_km(lat, lng, profile["latitude"], profile["longitude"])
+        if distance <= radius_km:
+            filtered.append({**profile, "distance_km": distance})
+    filtered.sort(key=lambda item: item["distance_km"])
+    return filtered[:limit]
+
+
+def _median_ms(function, queries: list, repeat: int) -> float:
+    samples = []
+    for lat, lng in queries[:repeat]:
+        started = time.perf_counter()
+        function(lat, lng)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main(sizes: list[int], radii: list[float], limit: int) -> None:
+    rng = random.Random(9)
+    queries = []
+    for _ in range(200):
+        lat, lng = rng.choice(CITIES)
+        queries.append((lat + rng.gauss(0, 0.2), lng + rng.gauss(0, 0.2)))
+
+    print(f"{'perfiles':>9} {'radio km':>9} {'scan ms':>9} {'indice ms':>10} {'construir s':>12}")
+    for size in sizes:
+        profiles = make_profiles(size)
+        started = time.perf_counter()
+        index = GeoGridIndex.from_rows(profiles)
+        build_seconds = time.perf_counter() - started
+        scan_repeat = max(3, min(50, 2_000_000 // size))
+        for radius_km in radii:
+            scan = _median_ms(
+                lambda lat, lng: full_scan(profiles, lat, lng, radius_km, limit), queries, scan_repeat
+            )
+            grid = _median_ms(
+                lambda lat, lng: index.query(lat, lng, radius_km, limit), queries, len(queries)
+            )
+            print(f"{size:>9} {radius_km:>9.0f} {scan:>9.2f} {grid:>10.3f} {build_seconds:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Busqueda de perfiles cercanos")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--radii", default="5,25")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+    main(
+        [int(size) for size in args.sizes.split(",")],
+        [float(radius) for radius in args.radii.split(",")],
+        args.limit,
+    )
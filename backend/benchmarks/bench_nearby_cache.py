@@ -0,0 +1,110 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Reproduce un registro de consultas a /profile/nearby (ruta sin
+# indice) con y sin nearby_cache sobre el backend en memoria con latencia por
+# llamada. Entre consultas se mueven perfiles para que las invalidaciones
+# cuenten. Imprime la tasa de aciertos y los percentiles de latencia.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_nearby_cache --queries 1000 --latency-ms 20
+#   python -m benchmarks.bench_nearby_cache --log consultas.csv
+#
+# El registro opcional es un CSV con columnas lat,lng,radius_km.
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from app.memory_backend import MemoryBackend  # noqa: E402
+from app.nearby_cache import NearbyCache  # noqa: E402
+from benchmarks.bench_nearby import CITIES, make_profiles  # noqa: E402
+
+
+def synthetic_log(total: int, users: int, seed: int = 11) -> list[tuple[float, float, float]]:
+    # Cada usuario consulta desde su casa con unos metros de ruido de GPS;
+    # la mayoria deja el radio por defecto
+    rng = random.Random(seed)
+    homes = []
+    for _ in range(users):
+        lat, lng = rng.choice(CITIES)
+        homes.append((lat + rng.gauss(0, 0.05), lng + rng.gauss(0, 0.05)))
+    log = []
+    for _ in range(total):
+        lat, lng = rng.choice(homes)
+        radius_km = rng.choices([25, 10, 50], weights=[8, 1, 1])[0]
+        log.append((lat + rng.gauss(0, 0.0003), lng + rng.gauss(0, 0.0003), radius_km))
+    return log
+
+
+def read_log(path: str) -> list[tuple[float, float, float]]:
+    with open(path, newline="", encoding="utf-8") as handle:
+        return [
+            (float(row["lat"]), float(row["lng"]), float(row["radius_km"]))
+            for row in csv.DictReader(handle)
+        ]
+
+
+def replay(client, backend, log, cache, moves_every: int, seed: int = 12) -> list[float]:
+    rng = random.Random(seed)
+    samples = []
+    for number, (lat, lng, radius_km) in enumerate(log):
+        if moves_every and number % moves_every == 0:
+            row = rng.choice(backend.tables["profiles"])
+            profile_id = row["id"]
+            city_lat, city_lng = rng.choice(CITIES)
+            moved = {"latitude": city_lat + rng.gauss(0, 0.3), "longitude": city_lng + rng.gauss(0, 0.3)}
+            row.update(moved)
+            backend.touch("profiles")
+            if cache is not None:
+                cache.apply_profile(profile_id, {"id": profile_id, **moved})
+        started = time.perf_counter()
+        if cache is None:
+            NearbyCache(enabled=False).query(client, lat, lng, radius_km, 50)
+        else:
+            cache.query(client, lat, lng, radius_km, 50)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main(profiles: int, queries: int, users: int, latency_ms: float, moves_every: int, log_path: str) -> None:
+    log = read_log(log_path) if log_path else synthetic_log(queries, users)
+    backend = MemoryBackend(latency=latency_ms / 1000)
+    backend.seed_rows("profiles", make_profiles(profiles))
+    client = backend.client()
+
+    print(f"perfiles: {profiles}, consultas: {len(log)}, latencia {latency_ms} ms, un movimiento cada {moves_every}")
+    print(f"{'modo':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'aciertos':>9}")
+    for label, cache in (("sin cache", None), ("cache", NearbyCache(max_size=1024, ttl=60))):
+        samples = replay(client, backend, log, cache, moves_every)
+        ratio = f"{cache.stats()['hit_ratio']:.1%}" if cache is not None else "-"
+        print(
+            f"{label:>10} {statistics.median(samples):>8.2f} {_percentile(samples, 0.95):>8.2f} "
+            f"{_percentile(samples, 0.99):>8.2f} {ratio:>9}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cache de candidatos de nearby")
+    parser.add_argument("--profiles", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--moves-every", type=int, default=50)
+    parser.add_argument("--log", default="")
+    args = parser.parse_args()
+    main(args.profiles, args.queries, args.users, args.latency_ms, args.moves_every, args.log)
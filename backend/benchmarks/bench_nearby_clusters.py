@@ -0,0 +1,81 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Tamaño de la respuesta y latencia de /profile/nearby/clusters
+# por nivel de zoom, frente a enviar un marcador por perfil de la vista. La
+# vista es la de un movil (412 x 800 px) centrado en Madrid.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_nearby_clusters --profiles 200000 --zooms 5,7,9,11,13,15
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import statistics
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from app.geo_index import GeoGridIndex  # noqa: E402
+from benchmarks.bench_nearby import make_profiles  # noqa: E402
+
+
+def viewport(lat: float, lng: float, zoom: int, width_px: int, height_px: int) -> tuple:
+    # Web Mercator: 256 px por tesela, 2^zoom teselas en 360 grados
+    degrees_per_px = 360 / (256 * 2 ** zoom)
+    half_width = min(180.0, width_px / 2 * degrees_per_px)
+    half_height = min(85.0, height_px / 2 * degrees_per_px * math.cos(math.radians(lat)))
+    return (
+        max(-90.0, lat - half_height),
+        min(90.0, lat + half_height),
+        max(-180.0, lng - half_width),
+        min(180.0, lng + half_width),
+    )
+
+
+def _median_ms(function, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(total: int, zooms: list[int], repeat: int) -> None:
+    profiles = make_profiles(total)
+    index = GeoGridIndex.from_rows(profiles)
+    lat, lng = 40.4168, -3.7038
+
+    print(f"perfiles: {total}, vista 412x800 px en Madrid")
+    print(
+        f"{'zoom':>5} {'perfiles':>9} {'marcadores KiB':>15} {'grupos':>7} "
+        f"{'grupos KiB':>11} {'grupos ms':>10}"
+    )
+    for zoom in zooms:
+        view = viewport(lat, lng, zoom, 412, 800)
+        markers = [
+            profile for profile in profiles
+            if view[0] <= profile["latitude"] <= view[1] and view[2] <= profile["longitude"] <= view[3]
+        ]
+        _, clusters = index.clusters(*view, zoom)
+        payload = {"zoom": zoom, "clusters": clusters}
+        elapsed = _median_ms(lambda: index.clusters(*view, zoom), repeat)
+        print(
+            f"{zoom:>5} {len(markers):>9} {len(json.dumps(markers)) / 1024:>15.1f} "
+            f"{len(clusters):>7} {len(json.dumps(payload)) / 1024:>11.1f} {elapsed:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Agrupacion de perfiles por zoom")
+    parser.add_argument("--profiles", type=int, default=200000)
+    parser.add_argument("--zooms", default="5,7,9,11,13,15")
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+    main(args.profiles, [int(zoom) for zoom in args.zooms.split(",")], args.repeat)
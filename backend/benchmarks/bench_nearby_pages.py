@@ -0,0 +1,80 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Latencia y bytes por pagina de /profile/nearby segun la
+# profundidad. Compara pedir un limite cada vez mayor y recortar en el
+# cliente (lo que hacia el mapa) con el cursor (distancia, id).
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_nearby_pages --profiles 200000 --page-size 50 --pages 1,10,50,100
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from app.geo_index import GeoGridIndex  # noqa: E402
+from benchmarks.bench_nearby import make_profiles  # noqa: E402
+
+
+def _median_ms(function, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(total: int, page_size: int, depths: list[int], radius_km: float, repeat: int) -> None:
+    index = GeoGridIndex.from_rows(make_profiles(total))
+    lat, lng = 40.4168, -3.7038
+
+    # Claves de inicio de cada pagina, recorriendo con el cursor
+    keys = {1: None}
+    after = None
+    for page_number in range(1, max(depths) + 1):
+        page = index.query(lat, lng, radius_km, page_size, after=after)
+        if not page:
+            break
+        after = (page[-1]["distance_km"], page[-1]["id"])
+        keys[page_number + 1] = after
+
+    print(f"perfiles: {total}, radio {radius_km:g} km, {page_size} por pagina")
+    print(f"{'pagina':>7} {'limite ms':>10} {'cursor ms':>10} {'limite KiB':>11} {'cursor KiB':>11}")
+    for depth in depths:
+        if depth not in keys:
+            print(f"{depth:>7} (no hay tantos resultados en el radio)")
+            continue
+        growing = lambda: index.query(lat, lng, radius_km, depth * page_size)[-page_size:]  # noqa: E731
+        cursor = lambda: index.query(lat, lng, radius_km, page_size, after=keys[depth])  # noqa: E731
+        growing_bytes = len(json.dumps(index.query(lat, lng, radius_km, depth * page_size)))
+        cursor_bytes = len(json.dumps(cursor()))
+        print(
+            f"{depth:>7} {_median_ms(growing, repeat):>10.2f} {_median_ms(cursor, repeat):>10.2f} "
+            f"{growing_bytes / 1024:>11.1f} {cursor_bytes / 1024:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Paginacion de nearby por profundidad")
+    parser.add_argument("--profiles", type=int, default=200000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--pages", default="1,10,50,100")
+    parser.add_argument("--radius-km", type=float, default=100)
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+    main(
+        args.profiles,
+        args.page_size,
+        [int(depth) for depth in args.pages.split(",")],
+        args.radius_km,
+        args.repeat,
+    )
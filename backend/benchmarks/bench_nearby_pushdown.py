@@ -0,0 +1,87 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Lo que descarga la ruta sin indice de /profile/nearby al leer
+# la tabla profiles entera frente a filtrar por el rectangulo del radio en
+# PostgREST. Cuenta filas, bytes JSON y paginas (viajes de ida y vuelta) sobre
+# el backend en memoria, y estima la latencia con un RTT y un ancho de banda.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_nearby_pushdown --profiles 100000 --radii 5,25,100
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+
+from app.geo_index import (  # noqa: E402
+    GEO_INDEX_PAGE_SIZE,
+    NEARBY_COLUMNS,
+    apply_bounding_box,
+    rank_by_distance,
+)
+from app.memory_backend import MemoryBackend  # noqa: E402
+from benchmarks.bench_nearby import make_profiles  # noqa: E402
+
+
+def _download(build_query) -> tuple[list, int, int]:
+    rows, size, pages, start = [], 0, 0, 0
+    while True:
+        page = (
+            build_query().order("id").range(start, start + GEO_INDEX_PAGE_SIZE - 1).execute().data
+            or []
+        )
+        pages += 1
+        size += len(json.dumps(page))
+        rows.extend(page)
+        if len(page) < GEO_INDEX_PAGE_SIZE:
+            return rows, size, pages
+        start += GEO_INDEX_PAGE_SIZE
+
+
+def main(total: int, radii: list[float], rtt_ms: float, mbps: float) -> None:
+    profiles = make_profiles(total)
+    for index, profile in enumerate(profiles):
+        # Un 10% de perfiles sin coordenadas, como los registros sin ciudad
+        if index % 10 == 0:
+            profile["latitude"] = profile["longitude"] = None
+    backend = MemoryBackend()
+    backend.seed_rows("profiles", profiles)
+    client = backend.client()
+    lat, lng = 40.4168, -3.7038
+
+    def estimate(size: int, pages: int) -> float:
+        return pages * rtt_ms + size * 8 / (mbps * 1_000_000) * 1000
+
+    full, full_size, full_pages = _download(lambda: client.table("profiles").select(NEARBY_COLUMNS))
+    print(f"perfiles: {total}, RTT {rtt_ms} ms, {mbps} Mbit/s")
+    print(f"{'consulta':>14} {'filas':>8} {'KiB':>9} {'paginas':>8} {'estimado ms':>12} {'refinado':>9}")
+    print(
+        f"{'tabla entera':>14} {len(full):>8} {full_size / 1024:>9.1f} {full_pages:>8} "
+        f"{estimate(full_size, full_pages):>12.1f} {'-':>9}"
+    )
+    for radius_km in radii:
+        rows, size, pages = _download(
+            lambda: apply_bounding_box(
+                client.table("profiles").select(NEARBY_COLUMNS), lat, lng, radius_km
+            )
+        )
+        inside = len(rank_by_distance(rows, lat, lng, radius_km, len(rows) + 1))
+        print(
+            f"{f'caja {radius_km:g} km':>14} {len(rows):>8} {size / 1024:>9.1f} {pages:>8} "
+            f"{estimate(size, pages):>12.1f} {inside:>9}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Filtro por rectangulo en la consulta nearby")
+    parser.add_argument("--profiles", type=int, default=100000)
+    parser.add_argument("--radii", default="5,25,100")
+    parser.add_argument("--rtt-ms", type=float, default=30)
+    parser.add_argument("--mbps", type=float, default=100)
+    args = parser.parse_args()
+    main(args.profiles, [float(radius) for radius in args.radii.split(",")], args.rtt_ms, args.mbps)
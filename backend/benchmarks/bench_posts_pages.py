@@ -0,0 +1,95 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Coste por pagina de /posts/user/{user_id} segun la profundidad:
+# la lista completa (lo que devolvia la ruta), paginar por offset con range y
+# el cursor (created_at, id). Imprime milisegundos sobre el backend en memoria
+# (que recorre la tabla en todos los casos), KiB de cada pagina y las filas que
+# leeria Postgres con un indice en ese orden.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_posts_pages --posts 5000 --page-size 20 --pages 1,10,50,200
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from app.memory_backend import MemoryBackend  # noqa: E402
+from app.pagination import newest_first_page, query_fingerprint  # noqa: E402
+from benchmarks.bench_profile_posts import make_posts  # noqa: E402
+
+USER_ID = "user-0"
+
+
+def _median(function, repeat: int) -> tuple[float, int]:
+    samples, size = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = function()
+        samples.append((time.perf_counter() - started) * 1000)
+        size = len(json.dumps(rows))
+    return statistics.median(samples), size
+
+
+def main(total: int, page_size: int, depths: list[int], repeat: int) -> None:
+    backend = MemoryBackend()
+    backend.seed_rows("posts", make_posts(USER_ID, total))
+    client = backend.client()
+    fingerprint = query_fingerprint("user-posts", USER_ID)
+
+    def base():
+        return client.table("posts").select("*").eq("user_id", USER_ID)
+
+    # Cursores de inicio de cada pagina
+    cursors = {1: None}
+    cursor = None
+    for page_number in range(1, max(depths)):
+        _, cursor = newest_first_page(base(), page_size, cursor, fingerprint)
+        if cursor is None:
+            break
+        cursors[page_number + 1] = cursor
+
+    everything = lambda: base().order("created_at", desc=True).execute().data  # noqa: E731
+    full_ms, full_bytes = _median(everything, repeat)
+    print(f"publicaciones: {total}, {page_size} por pagina")
+    print(f"lista completa: {full_ms:.2f} ms, {full_bytes / 1024:.0f} KiB")
+    # Con un indice (user_id, created_at desc, id desc) el offset recorre todas
+    # las filas anteriores y el cursor solo las de la pagina (+1)
+    print(
+        f"{'pagina':>7} {'offset ms':>10} {'cursor ms':>10} "
+        f"{'filas offset':>13} {'filas cursor':>13} {'pagina KiB':>11}"
+    )
+    for depth in depths:
+        if depth not in cursors:
+            print(f"{depth:>7} (no hay tantas paginas)")
+            continue
+        start = (depth - 1) * page_size
+        offset = lambda: (  # noqa: E731
+            base().order("created_at", desc=True).order("id", desc=True)
+            .range(start, start + page_size - 1).execute().data
+        )
+        keyset = lambda: newest_first_page(base(), page_size, cursors[depth], fingerprint)[0]  # noqa: E731
+        offset_ms, _ = _median(offset, repeat)
+        cursor_ms, cursor_bytes = _median(keyset, repeat)
+        print(
+            f"{depth:>7} {offset_ms:>10.2f} {cursor_ms:>10.2f} "
+            f"{start + page_size:>13} {page_size + 1:>13} {cursor_bytes / 1024:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Paginas de /posts/user/{user_id}")
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--pages", default="1,10,50,200")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.posts, args.page_size, [int(part) for part in args.pages.split(",")], args.repeat)
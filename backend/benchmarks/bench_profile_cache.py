@@ -0,0 +1,136 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Reproduce las lecturas de perfiles de las rutas (un perfil en
+# /profile/{id} y /profile/me, lotes de autores en notificaciones, reportes y
+# conversaciones) con y sin profile_cache sobre el backend en memoria con
+# latencia por llamada. La popularidad de los perfiles sigue una ley de Zipf y
+# cada cierto numero de peticiones se edita un perfil. Imprime aciertos,
+# consultas por peticion, percentiles y la memoria de los registros.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_profile_cache --requests 1000 --latency-ms 20
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import time
+import tracemalloc
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from app import database  # noqa: E402
+from app.memory_backend import MemoryBackend  # noqa: E402
+from app.profile_cache import PROFILE_FIELDS, CachedProfile, ProfileCache  # noqa: E402
+
+
+def make_rows(total: int) -> list[dict]:
+    return [
+        {
+            "id": f"user-{number}",
+            "email": f"user{number}@petconnect.dev",
+            "username": f"user{number}",
+            "postal_code": "28013",
+            "city": "Madrid",
+            "latitude": 40.4168,
+            "longitude": -3.7038,
+            "pet_name": "Toby",
+            "pet_type": "perro",
+            "pet_gender": "macho",
+            "avatar_url": f"https://cdn.petconnect.dev/avatars/{number}.jpg",
+            "bio": "Paseos por el Retiro",
+            "created_at": "2026-10-18T10:00:00+00:00",
+            "updated_at": "2026-10-18T10:00:00+00:00",
+            "role": "user",
+        }
+        for number in range(total)
+    ]
+
+
+def synthetic_requests(total: int, profiles: int, seed: int = 21) -> list[list[str]]:
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(profiles)]
+    population = [f"user-{number}" for number in range(profiles)]
+    requests = []
+    for _ in range(total):
+        # Mitad lecturas de un perfil, mitad listas con 5 a 30 autores
+        size = 1 if rng.random() < 0.5 else rng.randint(5, 30)
+        requests.append(rng.choices(population, weights=weights, k=size))
+    return requests
+
+
+def replay(backend, requests, cache: ProfileCache, edits_every: int, seed: int = 22) -> list[float]:
+    rng = random.Random(seed)
+    samples = []
+    for number, ids in enumerate(requests):
+        if edits_every and number % edits_every == 0:
+            row = rng.choice(backend.tables["profiles"])
+            row["pet_name"] = f"Pet{number}"
+            cache.apply_profile(row["id"], row)
+        started = time.perf_counter()
+        cache.get_many(ids)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _record_bytes(rows: list[dict]) -> tuple[float, float]:
+    # Bytes por perfil guardado como dict y como registro con __slots__
+    sizes = []
+    for build in (lambda row: {field: row.get(field) for field in PROFILE_FIELDS},
+                  lambda row: CachedProfile(row, 60)):
+        tracemalloc.start()
+        kept = [build(row) for row in rows]
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        sizes.append(used / len(kept))
+    return sizes[0], sizes[1]
+
+
+def main(profiles: int, total: int, latency_ms: float, edits_every: int, cache_size: int) -> None:
+    rows = make_rows(profiles)
+    backend = MemoryBackend(latency=latency_ms / 1000)
+    backend.seed_rows("profiles", rows)
+    database.use_memory_backend(backend)
+    requests = synthetic_requests(total, profiles)
+
+    print(
+        f"perfiles: {profiles}, peticiones: {total}, latencia {latency_ms} ms, "
+        f"una edicion cada {edits_every}, cache de {cache_size}"
+    )
+    print(f"{'modo':>10} {'p50 ms':>8} {'p95 ms':>8} {'consultas/pet.':>15} {'aciertos':>9}")
+    for label, cache in (
+        ("sin cache", ProfileCache(max_size=cache_size, ttl=60, enabled=False)),
+        ("cache", ProfileCache(max_size=cache_size, ttl=60)),
+    ):
+        samples = replay(backend, requests, cache, edits_every)
+        stats = cache.stats()
+        ratio = f"{stats['hit_ratio']:.1%}" if cache.enabled else "-"
+        print(
+            f"{label:>10} {statistics.median(samples):>8.2f} {_percentile(samples, 0.95):>8.2f} "
+            f"{stats['loads'] / total:>15.2f} {ratio:>9}"
+        )
+    database.use_memory_backend(None)
+
+    as_dict, as_slots = _record_bytes(rows)
+    print(f"memoria por perfil: dict {as_dict:.0f} B, __slots__ {as_slots:.0f} B")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cache de perfiles")
+    parser.add_argument("--profiles", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--edits-every", type=int, default=20)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    args = parser.parse_args()
+    main(args.profiles, args.requests, args.latency_ms, args.edits_every, args.cache_size)
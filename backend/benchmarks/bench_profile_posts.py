@@ -0,0 +1,104 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Bytes y latencia de GET /profile/{id} para usuarios con muchas
+# publicaciones: la respuesta anterior (perfil + todas las publicaciones con
+# select("*")) frente a la actual (primera pagina de resumenes + cursor).
+# Usa el backend en memoria con latencia por llamada y serializa con el
+# modelo Profile como hace FastAPI.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_profile_posts --posts 100,1000,5000 --latency-ms 20
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from app import database  # noqa: E402
+from app.memory_backend import MemoryBackend  # noqa: E402
+from app.models import PostResponse, Profile  # noqa: E402
+from app.profile_cache import profile_cache  # noqa: E402
+from app.routers.profile import get_profile  # noqa: E402
+from benchmarks.bench_profile_cache import make_rows  # noqa: E402
+
+
+def make_posts(user_id: str, total: int) -> list[dict]:
+    return [
+        {
+            "id": f"{user_id}-post-{number:05d}",
+            "user_id": user_id,
+            "description": "Paseo de la tarde por el parque con los amigos del barrio " * 3,
+            "image_url": f"https://cdn.petconnect.dev/posts/{user_id}/{number}.jpg",
+            "likes_count": number % 50,
+            "comments_count": number % 7,
+            "created_at": f"2026-{1 + number // 28000 % 12:02d}-{1 + number // 1000 % 28:02d}"
+                          f"T{number // 60 % 24:02d}:{number % 60:02d}:00+00:00",
+            "updated_at": None,
+        }
+        for number in range(total)
+    ]
+
+
+def legacy_profile(user_id: str) -> str:
+    # Lo que hacia la ruta antes: perfil y todas las publicaciones
+    client = database.get_supabase_client()
+    data = client.table("profiles").select("*").eq("id", user_id).single().execute().data
+    posts = (
+        client.table("posts").select("*").eq("user_id", user_id)
+        .order("created_at", desc=True).execute().data
+    )
+    legacy = Profile.model_validate(data).model_dump(mode="json", exclude={"posts_cursor"})
+    legacy["posts"] = [PostResponse.model_validate(post).model_dump(mode="json") for post in posts]
+    return json.dumps(legacy, separators=(",", ":"))
+
+
+def current_profile(user_id: str) -> str:
+    profile_cache.clear()
+    return Profile.model_validate(asyncio.run(get_profile(user_id))).model_dump_json()
+
+
+def _measure(function, user_id: str, repeat: int) -> tuple[float, int]:
+    samples, size = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(function(user_id).encode("utf-8"))
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), size
+
+
+def main(post_counts: list[int], latency_ms: float, repeat: int) -> None:
+    backend = MemoryBackend(latency=latency_ms / 1000)
+    rows = make_rows(len(post_counts))
+    backend.seed_rows("profiles", rows)
+    for row, total in zip(rows, post_counts):
+        backend.seed_rows("posts", make_posts(row["id"], total))
+    database.use_memory_backend(backend)
+
+    print(f"latencia {latency_ms} ms por llamada (sin cache de perfiles)")
+    print(f"{'publicaciones':>13} {'antes ms':>9} {'ahora ms':>9} {'antes KiB':>10} {'ahora KiB':>10}")
+    for row, total in zip(rows, post_counts):
+        before_ms, before_bytes = _measure(legacy_profile, row["id"], repeat)
+        after_ms, after_bytes = _measure(current_profile, row["id"], repeat)
+        print(
+            f"{total:>13} {before_ms:>9.1f} {after_ms:>9.1f} "
+            f"{before_bytes / 1024:>10.1f} {after_bytes / 1024:>10.1f}"
+        )
+    database.use_memory_backend(None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publicaciones en la respuesta del perfil")
+    parser.add_argument("--posts", default="100,1000,5000")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main([int(part) for part in args.posts.split(",")], args.latency_ms, args.repeat)
@@ -0,0 +1,125 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: /profile/search con el indice de trigramas frente a recorrer
+# todos los nombres comparando subcadenas (lo que hace ilike '%q%' sin indice,
+# aqui sin el coste de red ni de la base de datos). Mide construccion,
+# memoria y latencia por tipo de consulta.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_search_index --profiles 100000
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import time
+import tracemalloc
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from app.geocode_cache import normalize_place  # noqa: E402
+from app.search_index import ProfileSearchIndex  # noqa: E402
+
+SYLLABLES = [
+    "ma", "ri", "lu", "na", "to", "by", "co", "ca", "pe", "dro", "sol", "re", "xi",
+    "ne", "la", "mi", "ro", "ki", "ti", "bu", "ño", "ja", "vi", "gó", "an", "el",
+]
+QUERIES = {
+    "1 letra": ["m", "l", "x", "ñ"],
+    "2 letras": ["lu", "ma", "ro", "ki"],
+    "prefijo": ["luna", "toby", "pedro", "marí"],
+    "subcadena": ["anaco", "ropel", "solma"],
+    "con errata": ["pedor", "lunna", "tobi"],
+}
+
+
+def make_names(total: int, seed: int = 13) -> list[dict]:
+    rng = random.Random(seed)
+
+    def word(low: int, high: int) -> str:
+        return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(low, high)))
+
+    rows = []
+    for index in range(total):
+        username = word(2, 4) + (str(rng.randrange(100)) if rng.random() < 0.4 else "")
+        rows.append({
+            "id": f"user-{index}",
+            "username": username,
+            "pet_name": word(1, 3).capitalize() if rng.random() < 0.8 else None,
+            "city": rng.choice(["Madrid", "Sevilla", "Valencia"]),
+        })
+    return rows
+
+
+def _median_ms(function, queries: list[str], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        for query in queries:
+            started = time.perf_counter()
+            function(query)
+            samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(total: int, limit: int, repeat: int) -> None:
+    rows = make_names(total)
+
+    started = time.perf_counter()
+    index = ProfileSearchIndex.from_rows(rows)
+    build_seconds = time.perf_counter() - started
+    # Segunda construccion solo para medir memoria (tracemalloc la ralentiza)
+    del index
+    tracemalloc.start()
+    index = ProfileSearchIndex.from_rows(rows)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    texts = [(normalize_place(row["username"]), normalize_place(row["pet_name"])) for row in rows]
+
+    def scan(query: str) -> list:
+        needle = normalize_place(query)
+        found = []
+        for position, (username, pet_name) in enumerate(texts):
+            if needle in username or needle in pet_name:
+                found.append(position)
+                if len(found) == limit:
+                    break
+        return found
+
+    def scan_all(query: str) -> list:
+        # Para ordenar por calidad hay que ver todas las coincidencias
+        needle = normalize_place(query)
+        return [position for position, (username, pet_name) in enumerate(texts)
+                if needle in username or needle in pet_name]
+
+    print(
+        f"perfiles: {total}, trigramas: {index.gram_count}, construccion {build_seconds:.2f} s, "
+        f"memoria {retained / 2**20:.1f} MiB (listas {index.posting_bytes / 2**20:.1f} MiB)"
+    )
+    print(f"{'consulta':>12} {'recorrido ms':>13} {'recorrido todo ms':>18} {'indice ms':>10}")
+    for label, queries in QUERIES.items():
+        print(
+            f"{label:>12} {_median_ms(scan, queries, repeat):>13.2f} "
+            f"{_median_ms(scan_all, queries, repeat):>18.2f} "
+            f"{_median_ms(lambda query: index.search(query, limit), queries, repeat):>10.2f}"
+        )
+
+    started = time.perf_counter()
+    for position in range(1000):
+        row = rows[position]
+        index.apply(row["id"], {**row, "pet_name": "Renombrado"})
+    print(f"cambio de perfil: {(time.perf_counter() - started) * 1000:.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Indice de trigramas de /profile/search")
+    parser.add_argument("--profiles", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.profiles, args.limit, args.repeat)
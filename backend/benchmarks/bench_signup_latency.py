@@ -0,0 +1,132 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Latencia de /auth/signup con un geocodificador lento. Levanta un
+# servidor HTTP local que imita a Nominatim con el retardo indicado y la app
+# real con uvicorn sobre el backend en memoria. Mide el tiempo de respuesta
+# del signup y cuanto tardan en aparecer las coordenadas del perfil.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_signup_latency --geocoder-delays 0,500,2000
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+GEOCODER_DELAY = {"seconds": 0.0}
+
+
+class SlowGeocoderHandler(BaseHTTPRequestHandler):
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Responde como Nominatim tras esperar GEOCODER_DELAY segundos.
+    """
+
+    def do_GET(self):
+        time.sleep(GEOCODER_DELAY["seconds"])
+        body = json.dumps([{"lat": "40.4168", "lon": "-3.7038"}]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        return
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+geocoder_port = _free_port()
+geocoder = ThreadingHTTPServer(("127.0.0.1", geocoder_port), SlowGeocoderHandler)
+threading.Thread(target=geocoder.serve_forever, daemon=True).start()
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("SUPABASE_USER_BUCKET", "user-content")
+os.environ["SUPABASE_BACKEND"] = "memory"
+os.environ["GEOCODING_BASE_URL"] = f"http://127.0.0.1:{geocoder_port}/search"
+# Sin cache persistente ni limite de ritmo: cada registro llega al geocodificador
+os.environ["GEOCODE_CACHE_PATH"] = ""
+os.environ["GEOCODING_RATE_PER_SECOND"] = "0"
+os.environ["GAZETTEER_PATH"] = ""
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from app.database import get_memory_backend  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def _start_app() -> str:
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def _wait_for_coordinates(user_id: str, timeout: float = 30.0) -> float:
+    backend = get_memory_backend()
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        rows = backend.lookup("profiles", "id", user_id) or []
+        if rows and rows[0].get("latitude") is not None:
+            return time.perf_counter() - started
+        time.sleep(0.005)
+    return float("nan")
+
+
+def main(delays: list[float], iterations: int, latency_ms: float) -> None:
+    get_memory_backend().latency = latency_ms / 1000
+    base_url = _start_app()
+    print(f"latencia backend en memoria: {latency_ms} ms por llamada")
+    print(f"{'geocoder ms':>12} {'signup p50 ms':>14} {'signup max ms':>14} {'coords +ms p50':>15}")
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        for delay in delays:
+            GEOCODER_DELAY["seconds"] = delay / 1000
+            samples = []
+            backfill = []
+            for index in range(iterations):
+                username = f"geo{int(delay)}_{index}"
+                started = time.perf_counter()
+                response = client.post(
+                    "/auth/signup",
+                    json={
+                        "email": f"{username}@petconnect.dev",
+                        "password": "bench-password",
+                        "username": username,
+                        "city": "Madrid",
+                        "postal_code": f"{(int(delay) * iterations + index) % 100000:05d}",
+                    },
+                )
+                samples.append(time.perf_counter() - started)
+                response.raise_for_status()
+                backfill.append(_wait_for_coordinates(response.json()["user"]["id"]))
+            print(
+                f"{delay:>12.0f} {statistics.median(samples) * 1000:>14.2f} "
+                f"{max(samples) * 1000:>14.2f} {statistics.median(backfill) * 1000:>15.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latencia de signup con geocodificador lento")
+    parser.add_argument("--geocoder-delays", default="0,500,2000")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    main([float(delay) for delay in args.geocoder_delays.split(",")], args.iterations, args.latency_ms)
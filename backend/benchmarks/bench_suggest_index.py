@@ -0,0 +1,93 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: /profile/search/suggest con la lista ordenada frente a recorrer
+# todos los nombres buscando los que empiezan por el prefijo (lo que haria
+# ilike 'q%' sin indice, aqui sin el coste de red). Simula la escritura letra a
+# letra y mide latencia por pulsacion, cambios de perfil y memoria.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_suggest_index --profiles 100000
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import os
+import statistics
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from app.geocode_cache import normalize_place  # noqa: E402
+from app.suggest_index import SUGGEST_MEMORY_BUDGET_MB, SuggestIndex  # noqa: E402
+from benchmarks.bench_search_index import make_names  # noqa: E402
+
+TYPED = ["lunamaria", "pedroki", "tobyxi", "sol", "ñoja"]
+
+
+def _keystrokes(words: list[str]) -> list[str]:
+    return [word[:end] for word in words for end in range(1, len(word) + 1)]
+
+
+def _median_us(function, queries: list[str], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        for query in queries:
+            started = time.perf_counter()
+            function(query)
+            samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples)
+
+
+def main(total: int, limit: int, repeat: int) -> None:
+    rows = make_names(total)
+    started = time.perf_counter()
+    index = SuggestIndex.from_rows(rows)
+    build_seconds = time.perf_counter() - started
+
+    counts: dict[str, int] = {}
+    for row in rows:
+        for field in ("username", "pet_name"):
+            term = normalize_place(row[field] or "")
+            if term:
+                counts[term] = counts.get(term, 0) + 1
+
+    def scan(prefix: str) -> list:
+        needle = normalize_place(prefix)
+        matches = [term for term in counts if term.startswith(needle)]
+        return heapq.nsmallest(limit, matches, key=lambda term: (-counts[term], len(term), term))
+
+    short = [word[:1] for word in TYPED] + [word[:2] for word in TYPED]
+    long = [word[:end] for word in TYPED for end in range(3, len(word) + 1)]
+    print(f"perfiles: {total}, terminos: {index.size}, construccion {build_seconds:.2f} s")
+    print(f"{'pulsaciones':>14} {'recorrido us':>13} {'indice us':>10}")
+    for label, queries in (("1-2 letras", short), ("3+ letras", long)):
+        print(
+            f"{label:>14} {_median_us(scan, queries, 1):>13.0f} "
+            f"{_median_us(lambda prefix: index.suggest(prefix, limit), queries, repeat):>10.1f}"
+        )
+    print(f"{len(_keystrokes(TYPED))} pulsaciones x {repeat}: {index.cache_hits} desde resultados "
+          f"guardados, {index.scans} calculadas")
+
+    started = time.perf_counter()
+    for position in range(1000):
+        row = rows[position]
+        index.apply(row["id"], {**row, "pet_name": "Renombrado"})
+    print(f"cambio de perfil: {(time.perf_counter() - started) * 1000:.1f} us")
+    report = index.memory_report()
+    print(
+        "memoria: " + ", ".join(f"{key} {value / 2**20:.1f} MiB" for key, value in report.items())
+        + f" (presupuesto {SUGGEST_MEMORY_BUDGET_MB:.0f} MiB)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Autocompletado de /profile/search/suggest")
+    parser.add_argument("--profiles", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.profiles, args.limit, args.repeat)
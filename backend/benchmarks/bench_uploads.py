@@ -0,0 +1,130 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Memoria por subida de una foto con varias subidas a la vez:
+# POST /posts con la imagen en base64 dentro del JSON frente a POST
+# /posts/upload con multipart leido por trozos. Llama a la app ASGI
+# directamente (cuerpo en trozos de 64 KiB, como uvicorn) y mide el pico de
+# memoria de Python con tracemalloc. Los pixeles decodificados los reserva
+# Pillow fuera de tracemalloc y no cuentan en ninguno de los dos casos.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.bench_uploads --size 4032x3024 --concurrency 1,4,16
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("SUPABASE_USER_BUCKET", "user-content")
+os.environ.setdefault("IMAGE_WORKERS", "0")
+
+from app import database  # noqa: E402
+from app.main import app  # noqa: E402
+from app.memory_backend import MemoryBackend  # noqa: E402
+from app.routers.auth import create_access_token  # noqa: E402
+from benchmarks.bench_images import make_photo  # noqa: E402
+
+USER_ID = "bench-user"
+BOUNDARY = "petconnect-bench"
+CHUNK = 64 * 1024
+
+
+def json_body(photo: bytes) -> tuple[bytes, bytes]:
+    data_uri = "data:image/jpeg;base64," + base64.b64encode(photo).decode()
+    return json.dumps({"image_base64": data_uri}).encode(), b"application/json"
+
+
+def multipart_body(photo: bytes) -> tuple[bytes, bytes]:
+    head = (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"image\"; filename=\"foto.jpg\"\r\n"
+        "Content-Type: image/jpeg\r\n\r\n"
+    ).encode()
+    return head + photo + f"\r\n--{BOUNDARY}--\r\n".encode(), (
+        f"multipart/form-data; boundary={BOUNDARY}".encode()
+    )
+
+
+async def call(path: str, body: bytes, content_type: bytes, token: str) -> int:
+    offsets = iter(range(0, len(body), CHUNK))
+    statuses = []
+
+    async def receive():
+        start = next(offsets, None)
+        if start is None:
+            return {"type": "http.disconnect"}
+        # Cada trozo es una copia nueva, como los que llegan del socket
+        return {"type": "http.request", "body": body[start:start + CHUNK],
+                "more_body": start + CHUNK < len(body)}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "server": ("bench", 80), "client": ("bench", 1),
+        "headers": [
+            (b"content-type", content_type),
+            (b"content-length", str(len(body)).encode()),
+            (b"authorization", f"Bearer {token}".encode()),
+        ],
+    }
+    await app(scope, receive, send)
+    return statuses[0]
+
+
+async def measure(path: str, body: bytes, content_type: bytes, token: str, concurrency: int):
+    await call(path, body, content_type, token)  # calentamiento
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    statuses = await asyncio.gather(
+        *(call(path, body, content_type, token) for _ in range(concurrency))
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    assert set(statuses) == {200}, statuses
+    return peak, elapsed
+
+
+def main(width: int, height: int, levels: list[int]) -> None:
+    backend = MemoryBackend()
+    backend.seed_rows("profiles", [{"id": USER_ID, "username": "bench", "role": "user"}])
+    database.use_memory_backend(backend)
+    token = create_access_token({"sub": USER_ID, "role": "user"})
+    photo = make_photo(width, height)
+    variants = (
+        ("base64 en JSON", "/posts", *json_body(photo)),
+        ("multipart", "/posts/upload", *multipart_body(photo)),
+    )
+    print(f"foto {width}x{height}: {len(photo) / 1024:.0f} KiB")
+    for label, _, body, _ in variants:
+        print(f"  cuerpo {label}: {len(body) / 1024:.0f} KiB")
+    print(f"{'a la vez':>9} " + " ".join(f"{label + ' MiB/subida':>26}" for label, *_ in variants))
+    for concurrency in levels:
+        row = []
+        for _, path, body, content_type in variants:
+            peak, _ = asyncio.run(measure(path, body, content_type, token, concurrency))
+            row.append(peak / concurrency / (1024 * 1024))
+        print(f"{concurrency:>9} " + " ".join(f"{value:>26.2f}" for value in row))
+    database.use_memory_backend(None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memoria por subida: base64 frente a multipart")
+    parser.add_argument("--size", default="4032x3024")
+    parser.add_argument("--concurrency", default="1,4,16")
+    args = parser.parse_args()
+    width, height = (int(part) for part in args.size.split("x"))
+    main(width, height, [int(part) for part in args.concurrency.split(",")])
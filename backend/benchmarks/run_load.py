@@ -0,0 +1,311 @@
+# Autor: Wilbert López Veras
+# Fecha de creación: 18 de Octubre de 2026
+# Descripción: Benchmark de carga por escenarios contra la app real usando el
+# backend en memoria (sin Supabase). Reporta p50/p95/p99 y peticiones por
+# segundo de cada endpoint.
+#
+# Uso (desde backend/):
+#   python -m benchmarks.run_load --latency-ms 5 --concurrency 20 --iterations 200
+#   python -m benchmarks.run_load --scenarios likes,nearby --profiles 20000
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List
+
+# Configuracion del entorno antes de importar la app
+os.environ.setdefault("SUPABASE_URL", "http://memory.local")
+os.environ.setdefault("SUPABASE_KEY", "bench-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("SUPABASE_USER_BUCKET", "user-content")
+os.environ["SUPABASE_BACKEND"] = "memory"
+
+import httpx  # noqa: E402
+
+from app.database import get_memory_backend  # noqa: E402
+from app.main import app  # noqa: E402
+
+# PNG 1x1 transparente
+TINY_PNG_BASE64 = (
+    "data:image/png;base64,"
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+MADRID = (40.4168, -3.7038)
+
+
+class Recorder:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Acumula latencias por endpoint y el tiempo de pared de cada escenario.
+    """
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.wall: Dict[str, float] = defaultdict(float)
+        self.scenario_of: Dict[str, str] = {}
+
+    async def call(
+        self,
+        client: httpx.AsyncClient,
+        scenario: str,
+        label: str,
+        method: str,
+        url: str,
+        **kwargs,
+    ) -> httpx.Response:
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.samples[label].append(time.perf_counter() - started)
+        self.scenario_of[label] = scenario
+        if response.status_code >= 400:
+            self.errors[label] += 1
+        return response
+
+    def report(self) -> None:
+        header = f"{'endpoint':<42} {'n':>6} {'err':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>9}"
+        print(header)
+        print("-" * len(header))
+        for label, samples in self.samples.items():
+            ordered = sorted(samples)
+            wall = self.wall[self.scenario_of[label]] or 1e-9
+            print(
+                f"{label:<42} {len(ordered):>6} {self.errors[label]:>5} "
+                f"{_percentile(ordered, 50) * 1000:>8.2f} "
+                f"{_percentile(ordered, 95) * 1000:>8.2f} "
+                f"{_percentile(ordered, 99) * 1000:>8.2f} "
+                f"{len(ordered) / wall:>9.1f}"
+            )
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    if not ordered:
+        return 0.0
+    if len(ordered) == 1:
+        return ordered[0]
+    return statistics.quantiles(ordered, n=100, method="inclusive")[int(percent) - 1]
+
+
+class Context:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Estado compartido entre escenarios (usuarios, tokens, posts).
+    """
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.users: List[dict] = []
+        self.post_ids: List[str] = []
+        self.conversation_ids: List[str] = []
+
+    def headers(self, user: dict) -> dict:
+        return {"Authorization": f"Bearer {user['token']}"}
+
+    def pick_user(self) -> dict:
+        return self.rng.choice(self.users)
+
+
+async def scenario_signup_login(ctx: Context, index: int) -> None:
+    email = f"bench{index}_{ctx.rng.randrange(1 << 30)}@petconnect.dev"
+    password = "bench-password"
+    signup = await ctx.recorder.call(
+        ctx.client,
+        "signup_login",
+        "POST /auth/signup",
+        "POST",
+        "/auth/signup",
+        json={"email": email, "password": password, "username": email.split("@")[0]},
+    )
+    if signup.status_code != 200:
+        return
+    login = await ctx.recorder.call(
+        ctx.client,
+        "signup_login",
+        "POST /auth/login",
+        "POST",
+        "/auth/login",
+        json={"email": email, "password": password},
+    )
+    if login.status_code == 200:
+        body = login.json()
+        ctx.users.append({"id": body["user"]["id"], "token": body["access_token"]})
+
+
+async def scenario_create_post(ctx: Context, index: int) -> None:
+    user = ctx.pick_user()
+    response = await ctx.recorder.call(
+        ctx.client,
+        "create_post",
+        "POST /posts",
+        "POST",
+        "/posts",
+        json={"image_base64": TINY_PNG_BASE64},
+        headers=ctx.headers(user),
+    )
+    if response.status_code == 200:
+        ctx.post_ids.append(response.json()["id"])
+
+
+async def scenario_likes(ctx: Context, index: int) -> None:
+    if not ctx.post_ids:
+        return
+    user = ctx.pick_user()
+    post_id = ctx.rng.choice(ctx.post_ids)
+    headers = ctx.headers(user)
+    record = ctx.recorder.call
+    await record(ctx.client, "likes", "POST /posts/{id}/like", "POST", f"/posts/{post_id}/like", headers=headers)
+    await record(ctx.client, "likes", "GET /posts/{id}", "GET", f"/posts/{post_id}", headers=headers)
+    await record(ctx.client, "likes", "GET /posts/{id}/likes/count", "GET", f"/posts/{post_id}/likes/count", headers=headers)
+    await record(ctx.client, "likes", "DELETE /posts/{id}/like", "DELETE", f"/posts/{post_id}/like", headers=headers)
+
+
+async def scenario_nearby(ctx: Context, index: int) -> None:
+    user = ctx.pick_user()
+    lat = MADRID[0] + ctx.rng.uniform(-0.2, 0.2)
+    lng = MADRID[1] + ctx.rng.uniform(-0.2, 0.2)
+    await ctx.recorder.call(
+        ctx.client,
+        "nearby",
+        "GET /profile/nearby",
+        "GET",
+        "/profile/nearby",
+        params={"lat": lat, "lng": lng, "radius_km": 25, "limit": 50},
+        headers=ctx.headers(user),
+    )
+
+
+async def scenario_messaging(ctx: Context, index: int) -> None:
+    sender = ctx.pick_user()
+    receiver = ctx.pick_user()
+    if sender["id"] == receiver["id"]:
+        return
+    record = ctx.recorder.call
+    headers = ctx.headers(sender)
+    created = await record(
+        ctx.client, "messaging", "POST /conversations", "POST", "/conversations",
+        json={"target_user_id": receiver["id"]}, headers=headers,
+    )
+    if created.status_code not in (200, 201):
+        return
+    conversation_id = created.json()["id"]
+    await record(
+        ctx.client, "messaging", "POST /conversations/{id}/messages", "POST",
+        f"/conversations/{conversation_id}/messages",
+        json={"content": f"hola {index}"}, headers=headers,
+    )
+    await record(
+        ctx.client, "messaging", "GET /conversations/{id}/messages", "GET",
+        f"/conversations/{conversation_id}/messages", headers=headers,
+    )
+    await record(ctx.client, "messaging", "GET /conversations", "GET", "/conversations", headers=headers)
+
+
+async def scenario_notifications(ctx: Context, index: int) -> None:
+    user = ctx.pick_user()
+    await ctx.recorder.call(
+        ctx.client,
+        "notifications",
+        "GET /notifications",
+        "GET",
+        "/notifications",
+        headers=ctx.headers(user),
+    )
+
+
+SCENARIOS: Dict[str, Callable[[Context, int], Awaitable[None]]] = {
+    "signup_login": scenario_signup_login,
+    "create_post": scenario_create_post,
+    "likes": scenario_likes,
+    "nearby": scenario_nearby,
+    "messaging": scenario_messaging,
+    "notifications": scenario_notifications,
+}
+
+
+def seed_profiles(count: int, rng: random.Random) -> None:
+    """
+    Autor: Wilbert Lopez Veras
+    Fecha: 18-10-2026
+    Descripcion: Siembra perfiles con coordenadas alrededor de Madrid para /nearby.
+    """
+    backend = get_memory_backend()
+    backend.seed_rows(
+        "profiles",
+        [
+            {
+                "username": f"seed{index}",
+                "email": f"seed{index}@petconnect.dev",
+                "pet_name": f"Mascota {index}",
+                "pet_type": rng.choice(["perro", "gato", "otro"]),
+                "latitude": MADRID[0] + rng.gauss(0, 1.0),
+                "longitude": MADRID[1] + rng.gauss(0, 1.0),
+            }
+            for index in range(count)
+        ],
+    )
+
+
+async def run_scenario(ctx: Context, name: str, iterations: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    scenario = SCENARIOS[name]
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            await scenario(ctx, index)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(iterations)))
+    ctx.recorder.wall[name] += time.perf_counter() - started
+
+
+async def main(args: argparse.Namespace) -> None:
+    backend = get_memory_backend()
+    backend.latency = args.latency_ms / 1000
+    backend.jitter = args.jitter_ms / 1000
+    rng = random.Random(args.seed)
+    seed_profiles(args.profiles, rng)
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    recorder = Recorder()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        ctx = Context(client, recorder, rng)
+        # Siempre hacen falta usuarios con token para el resto de escenarios
+        await run_scenario(ctx, "signup_login", args.users, args.concurrency)
+        if "create_post" not in names:
+            await run_scenario(ctx, "create_post", args.users, args.concurrency)
+        for name in names:
+            if name == "signup_login":
+                continue
+            await run_scenario(ctx, name, args.iterations, args.concurrency)
+
+    print(
+        f"latencia inyectada: {args.latency_ms} ms (+/- {args.jitter_ms} ms), "
+        f"concurrencia: {args.concurrency}, iteraciones: {args.iterations}, "
+        f"perfiles sembrados: {args.profiles}"
+    )
+    recorder.report()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de carga con backend en memoria")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter-ms", type=float, default=1.0)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--profiles", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(main(parser.parse_args()))
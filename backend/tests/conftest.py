@@ -0,0 +1,16 @@
+# Variables de entorno comunes a todas las pruebas. Se fijan antes de que
+# los modulos de prueba importen app (las constantes se leen al importar).
+# GEOCODE_CACHE_PATH vacio: la cache de geocodificacion se queda en memoria.
+import os
+
+for name, value in {
+    "SUPABASE_URL": "https://example.supabase.co",
+    "SUPABASE_KEY": "test-key",
+    "SUPABASE_SERVICE_ROLE_KEY": "test-service-key",
+    "JWT_SECRET": "test-secret",
+    "GEOCODE_CACHE_PATH": "",
+    "SUPABASE_PUBLIC_ASSETS": "",
+    "SUPABASE_USER_BUCKET": "",
+    "SUPABASE_USER_FOLDER": "",
+}.items():
+    os.environ.setdefault(name, value)
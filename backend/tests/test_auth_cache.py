@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from app.dependencies import decode_token, token_cache
+from app.routers.auth import create_access_token
+
+
+def test_decode_token_reuses_verified_claims() -> None:
+    # Cache: el segundo decode del mismo token no vuelve a verificarlo.
+    token_cache.clear()
+    token = create_access_token({"sub": "user-1", "role": "moderator"})
+    hits_before = token_cache.hits
+
+    assert decode_token(token) == {"id": "user-1", "role": "moderator"}
+    assert decode_token(token) == {"id": "user-1", "role": "moderator"}
+    assert token_cache.hits == hits_before + 1
+
+
+def test_decode_token_rejects_expired_and_invalid_tokens() -> None:
+    # Cache: tokens caducados o mal firmados nunca devuelven usuario.
+    token_cache.clear()
+    expired = create_access_token({"sub": "user-1"}, expires_delta=timedelta(seconds=-1))
+    assert decode_token(expired) is None
+    assert decode_token("no-es-un-jwt") is None
+    assert token_cache.stats()["size"] == 0
@@ -0,0 +1,24 @@
+from app.gazetteer import Gazetteer, build_gazetteer
+
+ROWS = [
+    ("28013", "Madrid", "Madrid", 40.4180, -3.7080),
+    ("28001", "Madrid", "Madrid", 40.4250, -3.6840),
+    ("29001", "Málaga", "Málaga", 36.7190, -4.4200),
+    ("08001", "Barcelona", "Barcelona", 41.3800, 2.1700),
+    ("08001", "Barcelona", "Barcelona", 41.3820, 2.1720),
+]
+
+
+def test_lookup_by_postal_code_and_city(tmp_path) -> None:
+    # Nomenclator: codigo postal primero, ciudad normalizada como respaldo.
+    path = str(tmp_path / "gazetteer.bin")
+    assert build_gazetteer(ROWS, path) == {"postal_codes": 4, "cities": 3}
+
+    gazetteer = Gazetteer(path)
+    latitude, longitude = gazetteer.lookup(None, "08001")
+    assert abs(latitude - 41.381) < 1e-4 and abs(longitude - 2.171) < 1e-4
+    assert gazetteer.lookup("  MALAGA ", None) is not None
+    latitude, _ = gazetteer.lookup("Madrid", "99999")
+    assert abs(latitude - 40.4215) < 1e-4
+    assert gazetteer.lookup("Atlantis", "ABCDE") is None
+    gazetteer.close()
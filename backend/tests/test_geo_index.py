@@ -0,0 +1,150 @@
+import random
+
+from app.geo_index import GeoGridIndex, haversine_km
+
+
+def _brute_force(rows, lat, lng, radius_km):
+    distances = [
+        (haversine_km(lat, lng, row["latitude"], row["longitude"]), row["id"]) for row in rows
+    ]
+    return sorted(row_id for distance, row_id in distances if distance <= radius_km)
+
+
+def test_grid_query_matches_full_scan() -> None:
+    # Indice: mismos resultados que recorrer todos los perfiles, tambien junto
+    # al antimeridiano y a los polos.
+    rng = random.Random(3)
+    centers = [(40.4, -3.7), (0.0, 179.95), (-10.0, -179.9), (89.9, 20.0), (-89.95, 0.0)]
+    rows = []
+    for index in range(4000):
+        lat, lng = centers[index % len(centers)]
+        latitude = max(-90.0, min(90.0, lat + rng.uniform(-1, 1)))
+        longitude = (lng + rng.uniform(-1, 1) + 180) % 360 - 180
+        rows.append({"id": f"p{index}", "latitude": latitude, "longitude": longitude})
+    index = GeoGridIndex.from_rows(rows, cell_degrees=0.1)
+
+    for lat, lng in centers:
+        for radius_km in (1, 25, 120):
+            found = index.query(lat, lng, radius_km, limit=10_000)
+            assert sorted(row["id"] for row in found) == _brute_force(rows, lat, lng, radius_km)
+            distances = [row["distance_km"] for row in found]
+            assert distances == sorted(distances)
+
+
+def test_bounding_box_query_keeps_every_profile_in_radius() -> None:
+    # Sin indice: el filtro por rectangulo en la consulta no pierde perfiles,
+    # tampoco al cruzar el antimeridiano o cerca de un polo.
+    from app.geo_index import fetch_profiles_near, rank_by_distance
+    from app.memory_backend import MemoryBackend
+
+    rng = random.Random(4)
+    rows = [{"id": "sin-coordenadas", "username": "nadie"}]
+    for index in range(3000):
+        rows.append({
+            "id": f"p{index}",
+            "username": f"user{index}",
+            "latitude": rng.uniform(-90, 90) if index % 3 == 0 else rng.uniform(85, 90),
+            "longitude": rng.uniform(-180, 180) if index % 2 else rng.choice([-1, 1]) * rng.uniform(178, 180),
+        })
+    backend = MemoryBackend()
+    backend.seed_rows("profiles", rows)
+    client = backend.client()
+
+    for lat, lng, radius_km in [(0.0, 179.9, 300), (0.0, -179.9, 300), (88.0, 10.0, 400), (40.4, -3.7, 50)]:
+        pushed = fetch_profiles_near(client, lat, lng, radius_km, page_size=500)
+        assert len(pushed) < len(rows)
+        assert [row["id"] for row in rank_by_distance(pushed, lat, lng, radius_km, 10_000)] == [
+            row["id"] for row in rank_by_distance(rows, lat, lng, radius_km, 10_000)
+        ]
+
+
+def test_index_follows_moves_removals_and_pet_type() -> None:
+    # Indice: cambios de coordenadas, bajas y filtro por tipo de mascota.
+    index = GeoGridIndex.from_rows([
+        {"id": "a", "latitude": 40.4168, "longitude": -3.7038, "pet_type": "Perro"},
+        {"id": "b", "latitude": 40.4200, "longitude": -3.7000, "pet_type": "gato"},
+        {"id": "c", "latitude": 41.3874, "longitude": 2.1686, "pet_type": "perro"},
+    ])
+    assert [row["id"] for row in index.query(40.4168, -3.7038, 10, 10)] == ["a", "b"]
+    assert [row["id"] for row in index.query(40.4168, -3.7038, 10, 10, pet_type="PERRO")] == ["a"]
+
+    index.apply("c", {"id": "c", "latitude": 40.4170, "longitude": -3.7040, "pet_type": "perro"})
+    index.apply("a", None)
+    index.apply("b", {"id": "b", "latitude": None, "longitude": None})
+    assert [row["id"] for row in index.query(40.4168, -3.7038, 10, 10)] == ["c"]
+    assert index.size == 1
+    assert index.query(40.4168, -3.7038, 10, 10, pet_type="loro") == []
+
+
+def test_keyset_pages_cover_every_profile_once() -> None:
+    # Paginacion: recorrer las paginas con (distancia, id) da el mismo orden
+    # que una sola consulta, aunque muchos perfiles compartan coordenadas.
+    from app.geo_index import rank_by_distance
+
+    rng = random.Random(5)
+    centroids = [(40.41 + rng.uniform(-0.1, 0.1), -3.70 + rng.uniform(-0.1, 0.1)) for _ in range(20)]
+    rows = []
+    for number in range(600):
+        latitude, longitude = centroids[number % len(centroids)]
+        rows.append({"id": f"p{rng.randrange(10**6):06d}-{number}", "latitude": latitude, "longitude": longitude})
+    index = GeoGridIndex.from_rows(rows)
+    lat, lng = 40.4168, -3.7038
+    excluded = rows[7]["id"]
+
+    for search in (
+        lambda after: index.query(lat, lng, 25, 37, exclude_id=excluded, after=after),
+        lambda after: rank_by_distance(rows, lat, lng, 25, 37, exclude_id=excluded, after=after),
+    ):
+        pages, after = [], None
+        while True:
+            page = search(after)
+            if not page:
+                break
+            pages.extend(page)
+            after = (page[-1]["distance_km"], page[-1]["id"])
+        full = index.query(lat, lng, 25, 10_000, exclude_id=excluded)
+        assert [(row["distance_km"], row["id"]) for row in pages] == sorted(
+            (row["distance_km"], row["id"]) for row in full
+        )
+        assert len(pages) == len(rows) - 1
+
+
+def test_clusters_count_every_profile_in_view() -> None:
+    # Agrupacion: los grupos suman los perfiles de la vista con su centroide,
+    # con zoom lejano (totales por celda) y cercano (perfiles sueltos).
+    rng = random.Random(6)
+    rows = [
+        {"id": f"p{number}", "latitude": 40.4 + rng.gauss(0, 0.3), "longitude": -3.7 + rng.gauss(0, 0.3)}
+        for number in range(2000)
+    ]
+    rows.append({"id": "isla", "username": "sola", "latitude": 39.0, "longitude": 1.4})
+    index = GeoGridIndex.from_rows(rows)
+
+    cell_degrees, clusters = index.clusters(35, 44, -10, 5, zoom=4)
+    assert cell_degrees >= index.cell_degrees
+    assert sum(cluster["count"] for cluster in clusters) == len(rows)
+    single = [cluster for cluster in clusters if cluster["count"] == 1]
+    assert [cluster["profile"]["username"] for cluster in single] == ["sola"]
+    biggest = max(clusters, key=lambda cluster: cluster["count"])
+    assert abs(biggest["latitude"] - 40.4) < 0.5 and abs(biggest["longitude"] + 3.7) < 0.5
+
+    view = (40.3, 40.5, -3.8, -3.6)
+    inside = [
+        row for row in rows
+        if view[0] <= row["latitude"] <= view[1] and view[2] <= row["longitude"] <= view[3]
+    ]
+    cell_degrees, clusters = index.clusters(*view, zoom=13)
+    assert cell_degrees < index.cell_degrees
+    assert sum(cluster["count"] for cluster in clusters) == len(inside)
+    assert len(clusters) < len(inside)
+
+
+def test_clusters_across_the_antimeridian() -> None:
+    # Agrupacion: una vista con min_lng > max_lng cruza el antimeridiano.
+    index = GeoGridIndex.from_rows([
+        {"id": "este", "latitude": -17.7, "longitude": 179.9},
+        {"id": "oeste", "latitude": -17.7, "longitude": -179.9},
+        {"id": "lejos", "latitude": -17.7, "longitude": 170.0},
+    ])
+    _, clusters = index.clusters(-20, -15, 179, -179, zoom=12)
+    assert sorted(cluster["profile"]["id"] for cluster in clusters) == ["este", "oeste"]
@@ -0,0 +1,42 @@
+import random
+
+import numpy as np
+
+from app.geo_index import keyset_page
+from app.geo_kernel import haversine_batch
+
+
+def _scalar_haversine(lat1, lon1, lat2, lon2):
+    from math import asin, cos, radians, sin, sqrt
+
+    a = sin(radians(lat2 - lat1) / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(
+        radians(lon2 - lon1) / 2
+    ) ** 2
+    return 2 * 6371.0 * asin(sqrt(a))
+
+
+def test_batch_distances_match_scalar_formula() -> None:
+    # Kernel: mismas distancias que la formula escalar.
+    rng = random.Random(1)
+    points = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(500)]
+    latitudes = np.array([point[0] for point in points])
+    longitudes = np.array([point[1] for point in points])
+
+    distances = haversine_batch(40.4168, -3.7038, latitudes, longitudes)
+    expected = [_scalar_haversine(40.4168, -3.7038, lat, lng) for lat, lng in points]
+    assert np.allclose(distances, expected, atol=1e-6)
+
+
+def test_keyset_page_keeps_k_closest_in_order() -> None:
+    # Top-k de /profile/nearby: los k mas cercanos dentro del radio, en orden
+    # (distancia, id), saltando al propio usuario.
+    distances = np.array([9.0, 1.0, 30.0, 4.0, 2.0, 7.0, 2.0])
+
+    def positions(**kwargs):
+        return [position for position, _ in keyset_page(distances, lambda i: f"p{i}", **kwargs)]
+
+    assert positions(radius_km=8, limit=3) == [1, 4, 6]
+    assert positions(radius_km=8, limit=10) == [1, 4, 6, 3, 5]
+    assert positions(radius_km=8, limit=3, exclude_id="p4") == [1, 6, 3]
+    assert positions(radius_km=8, limit=3, after=(2.0, "p4")) == [6, 3, 5]
+    assert positions(radius_km=0.5, limit=3) == []
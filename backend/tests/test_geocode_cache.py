@@ -0,0 +1,82 @@
+from app.geocode_cache import GeocodeCache, normalize_key
+
+
+def test_normalize_key_ignores_case_accents_and_spacing() -> None:
+    # Cache: variantes de la misma direccion comparten clave.
+    assert normalize_key("28 013", " Málaga ", "España") == normalize_key("28013", "malaga", "espana")
+
+
+def test_entries_survive_restart_and_errors_stay_in_memory(tmp_path) -> None:
+    # Cache: positivos y negativos se persisten; los errores de red no.
+    path = str(tmp_path / "geocode.sqlite3")
+    cache = GeocodeCache(path=path)
+    cache.put("found", (40.4, -3.7))
+    cache.put("unknown", (None, None))
+    cache.put("timeout", (None, None), error=True)
+    assert cache.get("timeout") == (None, None)
+    cache.close()
+
+    reopened = GeocodeCache(path=path)
+    assert reopened.get("found") == (40.4, -3.7)
+    assert reopened.get("unknown") == (None, None)
+    assert reopened.get("timeout") is None
+    stats = reopened.stats()
+    assert stats["disk_hits"] == 2
+    assert stats["negative_hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_expired_entries_are_misses(tmp_path, monkeypatch) -> None:
+    # Cache: una entrada caducada obliga a volver a consultar.
+    from app import geocode_cache as module
+
+    cache = GeocodeCache(path=str(tmp_path / "geocode.sqlite3"), ttl=60, negative_ttl=10)
+    cache.put("found", (40.4, -3.7))
+    cache.put("unknown", (None, None))
+    now = module.time.time()
+    monkeypatch.setattr(module.time, "time", lambda: now + 30)
+    assert cache.get("found") == (40.4, -3.7)
+    assert cache.get("unknown") is None
+    assert cache.purge_expired() == 1
+
+
+def test_store_is_opened_on_first_use(tmp_path) -> None:
+    # Cache: crear la cache (al importar la app) no crea el fichero SQLite.
+    path = tmp_path / "geocode.sqlite3"
+    cache = GeocodeCache(path=str(path))
+    assert not path.exists()
+    assert cache.get("found") is None
+    assert path.exists()
+    cache.close()
+
+
+def test_async_access_keeps_sqlite_off_the_event_loop(tmp_path) -> None:
+    # Cache: desde el bucle de eventos la LRU responde en el momento y las
+    # lecturas y escrituras de SQLite se hacen en otro hilo.
+    import asyncio
+    import threading
+
+    cache = GeocodeCache(path=str(tmp_path / "geocode.sqlite3"))
+    threads = []
+    for name in ("_write", "_get_stored"):
+        original = getattr(cache, name)
+
+        def traced(*args, _original=original):
+            threads.append(threading.get_ident())
+            return _original(*args)
+
+        setattr(cache, name, traced)
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        await cache.put_async("found", (40.4, -3.7))
+        assert await cache.get_async("found") == (40.4, -3.7)
+        cache._entries.clear()
+        assert await cache.get_async("found") == (40.4, -3.7)
+        assert await cache.get_async("missing") is None
+        return loop_thread
+
+    loop_thread = asyncio.run(scenario())
+    assert len(threads) == 3 and loop_thread not in threads
+    assert cache.stats()["memory_hits"] == 1 and cache.stats()["disk_hits"] == 1
+    cache.close()
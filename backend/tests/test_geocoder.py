@@ -0,0 +1,55 @@
+import asyncio
+
+import httpx
+
+from app.geocoder import AsyncGeocoder, TokenBucket
+
+
+def _slow_nominatim(calls: list, delay: float) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.params["q"])
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json=[{"lat": "40.4168", "lon": "-3.7038"}])
+
+    return httpx.MockTransport(handler)
+
+
+def test_concurrent_lookups_share_one_request() -> None:
+    # Geocodificador: la misma direccion a la vez produce una sola peticion.
+    calls: list = []
+
+    async def scenario():
+        geocoder = AsyncGeocoder(rate=0, transport=_slow_nominatim(calls, 0.05))
+        results = await asyncio.gather(
+            *[geocoder.lookup("28013|madrid|espana", "28013 Madrid España") for _ in range(5)]
+        )
+        await geocoder.close()
+        return results, geocoder.stats()
+
+    results, stats = asyncio.run(scenario())
+    assert results == [(40.4168, -3.7038)] * 5
+    assert len(calls) == 1
+    assert stats["coalesced"] == 4
+
+
+def test_callers_stop_waiting_at_the_deadline() -> None:
+    # Geocodificador: un Nominatim lento no bloquea mas alla del plazo.
+    calls: list = []
+
+    async def scenario():
+        geocoder = AsyncGeocoder(rate=0, transport=_slow_nominatim(calls, 0.5))
+        result = await geocoder.lookup("slow", "slow", timeout=0.05)
+        await geocoder.close()
+        return result, geocoder.stats()
+
+    result, stats = asyncio.run(scenario())
+    assert result == (None, None)
+    assert stats["deadline_exceeded"] == 1
+
+
+def test_token_bucket_refuses_waits_beyond_the_limit() -> None:
+    # Limitador: con 1 peticion/s la segunda espera un segundo o se descarta.
+    bucket = TokenBucket(rate=1, capacity=1)
+    assert bucket.reserve(max_wait=0) == 0
+    assert bucket.reserve(max_wait=0.5) is None
+    assert 0.9 < bucket.reserve(max_wait=2) <= 1
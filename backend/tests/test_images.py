@@ -0,0 +1,93 @@
+import io
+
+import pytest
+from PIL import Image
+
+from app import images
+from app.images import (
+    AVATAR_RENDITIONS,
+    POST_RENDITIONS,
+    ImagePipeline,
+    process_image,
+    rendition_paths,
+    rendition_urls,
+)
+
+
+def _photo(size=(3000, 2000), orientation=None, fmt="JPEG", mode="RGB") -> bytes:
+    image = Image.new(mode, size, (200, 120, 40) if mode == "RGB" else (200, 120, 40, 128))
+    exif = Image.Exif()
+    exif[0x010F] = "Camara de prueba"
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def _open(data: bytes) -> Image.Image:
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    return image
+
+
+def test_renditions_are_rotated_resized_and_without_metadata() -> None:
+    # Imagenes: cada tamano en WebP, orientado segun el EXIF y sin metadatos.
+    processed = process_image(_photo(orientation=6), POST_RENDITIONS)
+    assert list(processed.renditions) == ["full", "feed", "thumb"]
+    sizes = {name: _open(data).size for name, data in processed.renditions.items()}
+    assert sizes == {"full": (1365, 2048), "feed": (720, 1080), "thumb": (213, 320)}
+    full = _open(processed.renditions["full"])
+    assert full.format == "WEBP"
+    assert not full.getexif() and "icc_profile" not in full.info
+    assert processed.cpu_ms > 0
+    assert processed.sizes()["thumb"] < processed.sizes()["full"] < processed.original_bytes
+
+    small = process_image(_photo((100, 60), fmt="PNG", mode="RGBA"), AVATAR_RENDITIONS)
+    assert {name: _open(data).size for name, data in small.renditions.items()} == {
+        "full": (100, 60), "thumb": (100, 60)
+    }
+    assert _open(small.renditions["thumb"]).mode == "RGBA"
+
+
+def test_rejects_invalid_and_oversized_images(monkeypatch) -> None:
+    # Imagenes: bytes que no son una imagen admitida o con demasiados pixeles.
+    with pytest.raises(ValueError):
+        process_image(b"no es una imagen", POST_RENDITIONS)
+    gif = io.BytesIO()
+    Image.new("RGB", (10, 10)).save(gif, "GIF")
+    with pytest.raises(ValueError):
+        process_image(gif.getvalue(), POST_RENDITIONS)
+    monkeypatch.setattr(images, "IMAGE_MAX_PIXELS", 1000)
+    with pytest.raises(ValueError):
+        process_image(_photo((100, 100)), POST_RENDITIONS)
+
+
+def test_pool_processes_images_and_reports_savings() -> None:
+    # Imagenes: el pool de procesos devuelve los tamanos y cuenta lo ahorrado.
+    pipeline = ImagePipeline(workers=1)
+    try:
+        processed = pipeline.process(_photo(), AVATAR_RENDITIONS, label="prueba")
+    finally:
+        pipeline.shutdown()
+    assert set(processed.renditions) == {"full", "thumb"}
+    stats = pipeline.stats()
+    assert stats["uploads"] == 1
+    assert 0 < stats["avg_bytes_saved"]["full"] < stats["avg_bytes_saved"]["thumb"]
+
+
+def test_rendition_urls_follow_the_full_url() -> None:
+    # Imagenes: las URLs de cada tamano salen de la de "full"; las antiguas no cambian.
+    url = "https://cdn.test/user-content/u1/posts/post_7_full.webp?v=7"
+    assert rendition_urls(url, POST_RENDITIONS) == {
+        "thumb": "https://cdn.test/user-content/u1/posts/post_7_thumb.webp?v=7",
+        "feed": "https://cdn.test/user-content/u1/posts/post_7_feed.webp?v=7",
+        "full": url,
+    }
+    legacy = "https://cdn.test/user-content/u1/posts/post_7.jpg?v=7"
+    assert rendition_urls(legacy, AVATAR_RENDITIONS) == {"thumb": legacy, "full": legacy}
+    assert rendition_urls(None, POST_RENDITIONS) is None
+    assert rendition_paths("u1/avatar_full.webp", AVATAR_RENDITIONS) == [
+        "u1/avatar_thumb.webp", "u1/avatar_full.webp"
+    ]
+    assert rendition_paths("u1/posts/post_7.jpg", POST_RENDITIONS) == ["u1/posts/post_7.jpg"]
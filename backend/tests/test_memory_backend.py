@@ -0,0 +1,598 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import database
+from app.memory_backend import MemoryBackend
+from app.pagination import encode_cursor, query_fingerprint
+from app.routers.auth import verify_access_token
+
+
+@pytest.fixture
+def backend():
+    from app.geo_index import geo_index
+    from app.nearby_cache import nearby_cache
+    from app.profile_cache import profile_cache
+    from app.search_index import search_index
+    from app.suggest_index import suggest_index
+    from app.timeline import timelines
+
+    memory = MemoryBackend()
+    database.use_memory_backend(memory)
+    geo_index.invalidate()
+    search_index.invalidate()
+    suggest_index.invalidate()
+    nearby_cache.clear()
+    profile_cache.clear()
+    timelines.clear()
+    yield memory
+    database.use_memory_backend(None)
+
+
+@pytest.fixture
+def client(backend):
+    from app import main as app_main
+
+    return TestClient(app_main.app)
+
+
+def _signup(client: TestClient, username: str) -> dict:
+    response = client.post(
+        "/auth/signup",
+        json={
+            "email": f"{username}@petconnect.dev",
+            "password": "secret-password",
+            "username": username,
+        },
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _uuid(number: int) -> str:
+    # Ids con forma de UUID; el orden lexicografico sigue al numerico
+    return f"00000000-0000-4000-8000-{number:012d}"
+
+
+def test_query_builder_filters_order_and_embeds(backend) -> None:
+    # Sustituto: filtros, or_, orden y recursos embebidos como PostgREST.
+    service = backend.client()
+    service.table("profiles").insert([
+        {"id": "u1", "username": "Luna", "pet_name": "Toby"},
+        {"id": "u2", "username": "Max", "pet_name": "Lunita"},
+        {"id": "u3", "username": "Kira", "pet_name": "Rex"},
+    ]).execute()
+    service.table("posts").insert({"id": "p1", "user_id": "u2", "image_url": "x"}).execute()
+    service.table("post_comments").insert({"post_id": "p1", "user_id": "u3", "content": "hola"}).execute()
+
+    found = (
+        service.table("profiles")
+        .select("id")
+        .or_("username.ilike.%lun%,pet_name.ilike.%lun%")
+        .order("id", desc=True)
+        .execute()
+    )
+    assert [row["id"] for row in found.data] == ["u2", "u1"]
+
+    comments = (
+        service.table("post_comments")
+        .select("content, profiles(username)")
+        .eq("post_id", "p1")
+        .execute()
+    )
+    assert comments.data == [{"content": "hola", "profiles": {"username": "Kira"}}]
+
+
+def test_single_and_unique_raise_api_errors(backend) -> None:
+    # Sustituto: single() sin filas y claves duplicadas lanzan APIError.
+    from postgrest.exceptions import APIError
+
+    service = backend.client()
+    service.table("profiles").insert({"id": "u1", "username": "luna"}).execute()
+
+    with pytest.raises(APIError) as missing:
+        service.table("profiles").select("*").eq("id", "nope").single().execute()
+    assert missing.value.code == "PGRST116"
+
+    with pytest.raises(APIError) as duplicated:
+        service.table("profiles").insert({"username": "luna"}).execute()
+    assert duplicated.value.code == "23505"
+
+
+def test_like_flow_through_routes(client, backend) -> None:
+    # Ruta de datos: signup, like y lectura del post con liked_by_me.
+    author = _signup(client, "autora")
+    reader = _signup(client, "lector")
+    backend.seed_rows("posts", [{"id": "p1", "user_id": author["user"]["id"], "image_url": "x"}])
+    headers = {"Authorization": f"Bearer {reader['access_token']}"}
+
+    assert client.post("/posts/p1/like", headers=headers).status_code == 204
+    post = client.get("/posts/p1", headers=headers).json()
+    assert post["likes_count"] == 1
+    assert post["liked_by_me"] is True
+
+    assert client.delete("/posts/p1/like", headers=headers).status_code == 204
+    count = client.get("/posts/p1/likes/count", headers=headers).json()
+    assert count == {"likes_count": 0}
+
+
+def test_send_message_notifies_receiver(client, backend) -> None:
+    # Ruta de datos: enviar mensaje crea la notificacion del receptor.
+    sender = _signup(client, "emisor")
+    receiver = _signup(client, "receptor")
+    headers = {"Authorization": f"Bearer {sender['access_token']}"}
+
+    conversation = client.post(
+        "/conversations",
+        json={"target_user_id": receiver["user"]["id"]},
+        headers=headers,
+    ).json()
+    response = client.post(
+        f"/conversations/{conversation['id']}/messages",
+        json={"content": "hola"},
+        headers=headers,
+    )
+    assert response.status_code == 201
+
+    notifications = client.get(
+        "/notifications",
+        headers={"Authorization": f"Bearer {receiver['access_token']}"},
+    ).json()
+    assert notifications[0]["event_type"] == "message"
+    assert notifications[0]["author"]["username"] == "emisor"
+
+    conversations = client.get(
+        "/conversations", headers={"Authorization": f"Bearer {receiver['access_token']}"}
+    ).json()
+    assert conversations[0]["user_a_profile"]["username"] == "emisor"
+    assert conversations[0]["user_b_profile"]["username"] == "receptor"
+
+
+def test_profile_reads_share_the_profile_cache(client, backend) -> None:
+    # Cache de perfiles: lecturas repetidas sin volver a la tabla y
+    # editar el perfil invalida la entrada.
+    from app.routers.auth import create_access_token
+
+    author = _signup(client, "reportada")
+    reporter = _signup(client, "denunciante")
+    author_id = author["user"]["id"]
+    headers = {"Authorization": f"Bearer {reporter['access_token']}"}
+    backend.seed_rows("posts", [{"id": "p1", "user_id": author_id, "image_url": "x"}])
+    assert client.post("/posts/p1/report", json={"reason": "spam"}, headers=headers).status_code == 200
+
+    reads = backend.calls.get("select:profiles", 0)
+    for _ in range(3):
+        assert client.get(f"/profile/{author_id}").json()["username"] == "reportada"
+    assert backend.calls["select:profiles"] == reads + 1
+
+    moderator = {"Authorization": f"Bearer {create_access_token({'sub': 'mod', 'role': 'moderator'})}"}
+    report = client.get("/reports/posts", headers=moderator).json()[0]
+    assert report["reporter"]["username"] == "denunciante"
+    assert report["post"]["profiles"] == {
+        "id": author_id, "username": "reportada", "email": "reportada@petconnect.dev"
+    }
+    assert "reporter_id" not in report
+    assert backend.calls["select:profiles"] == reads + 2
+
+    response = client.put(
+        "/profile/me",
+        json={"pet_name": "Nube"},
+        headers={"Authorization": f"Bearer {author['access_token']}"},
+    )
+    assert response.status_code == 200
+    assert client.get(f"/profile/{author_id}").json()["pet_name"] == "Nube"
+
+
+def test_profile_embeds_the_first_page_of_posts(client, backend) -> None:
+    # Perfil: solo la primera pagina de resumenes y un cursor para el resto,
+    # sin repetir ni saltar publicaciones con la misma fecha.
+    author = _signup(client, "prolifica")
+    author_id = author["user"]["id"]
+    backend.seed_rows("posts", [
+        {
+            "id": _uuid(number),
+            "user_id": author_id,
+            "image_url": f"https://cdn.petconnect.dev/{number}.jpg",
+            "description": "x" * 500,
+            "created_at": f"2026-10-18T10:{number // 3:02d}:00+00:00",
+        }
+        for number in range(30)
+    ])
+    headers = {"Authorization": f"Bearer {author['access_token']}"}
+
+    profile = client.get(f"/profile/{author_id}").json()
+    assert client.get("/profile/me", headers=headers).json() == profile
+    assert len(profile["posts"]) == 12
+    assert set(profile["posts"][0]) == {
+        "id", "image_url", "likes_count", "comments_count", "created_at", "image_renditions"
+    }
+
+    seen = [post["id"] for post in profile["posts"]]
+    cursor = profile["posts_cursor"]
+    while cursor:
+        response = client.get(f"/profile/{author_id}/posts", params={"cursor": cursor, "limit": 7})
+        assert response.status_code == 200
+        seen += [post["id"] for post in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+    assert seen == [_uuid(number) for number in reversed(range(30))]
+
+    other = client.get("/profile/otro/posts", params={"cursor": profile["posts_cursor"]})
+    assert other.status_code == 400
+
+
+def test_posts_and_comments_are_paginated(client, backend) -> None:
+    # Paginacion: publicaciones y comentarios por (created_at, id) con cursor;
+    # un elemento nuevo no desplaza las paginas siguientes.
+    author = _signup(client, "pagina")
+    author_id = author["user"]["id"]
+    headers = {"Authorization": f"Bearer {author['access_token']}"}
+    backend.seed_rows("posts", [
+        {"id": _uuid(number), "user_id": author_id, "image_url": "x",
+         "created_at": f"2026-10-18T10:00:{number // 2:02d}+00:00"}
+        for number in range(25)
+    ])
+    backend.seed_rows("post_comments", [
+        {"id": _uuid(100 + number), "post_id": _uuid(0), "user_id": author_id, "content": "hola",
+         "created_at": f"2026-10-18T11:00:{number // 4:02d}+00:00"}
+        for number in range(9)
+    ])
+
+    newer = {"id": _uuid(999), "post_id": _uuid(0), "user_id": author_id, "image_url": "x",
+             "content": "nuevo", "created_at": "2026-10-18T12:00:00+00:00"}
+    for path, table, limit, expected in (
+        (f"/posts/user/{author_id}", "posts", 10, [_uuid(number) for number in reversed(range(25))]),
+        (f"/posts/{_uuid(0)}/comments", "post_comments", 4, [_uuid(100 + number) for number in reversed(range(9))]),
+    ):
+        seen, cursor, pages = [], None, 0
+        while True:
+            params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+            response = client.get(path, params=params, headers=headers)
+            assert response.status_code == 200
+            seen += [row["id"] for row in response.json()]
+            pages += 1
+            if pages == 1:
+                backend.seed_rows(table, [dict(newer)])
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert seen == expected
+
+    assert client.get(f"/posts/{_uuid(0)}/comments", params={"limit": 0}, headers=headers).status_code == 400
+    first = client.get(f"/posts/user/{author_id}", params={"limit": 1}, headers=headers)
+    wrong = client.get(
+        f"/posts/{_uuid(0)}/comments", params={"cursor": first.headers["X-Next-Cursor"]}, headers=headers
+    )
+    assert wrong.status_code == 400
+
+
+def test_feed_follows_the_accounts_the_user_follows(client, backend) -> None:
+    # Feed: publicaciones propias y de las cuentas seguidas, paginadas, con
+    # autor; seguir, dejar de seguir y borrar se reflejan en la siguiente lectura.
+    reader = _signup(client, "lectora")
+    author = _signup(client, "seguida")
+    other = _signup(client, "ajena")
+    reader_id, author_id = reader["user"]["id"], author["user"]["id"]
+    headers = {"Authorization": f"Bearer {reader['access_token']}"}
+    backend.seed_rows("posts", [
+        {"id": _uuid(number), "user_id": author_id, "image_url": "x",
+         "created_at": f"2026-10-18T10:00:0{number}+00:00"}
+        for number in range(5)
+    ] + [
+        {"id": _uuid(10), "user_id": reader_id, "image_url": "x", "created_at": "2026-10-18T10:00:02+00:00"},
+        {"id": _uuid(11), "user_id": other["user"]["id"], "image_url": "x",
+         "created_at": "2026-10-18T10:00:09+00:00"},
+    ])
+
+    def read_feed():
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/feed", params=params, headers=headers)
+            assert response.status_code == 200
+            seen += [(row["id"], row["author"]["username"]) for row in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return seen
+
+    assert read_feed() == [(_uuid(10), "lectora")]
+    assert client.post(f"/profile/{author_id}/follow", headers=headers).status_code == 200
+    assert [post_id for post_id, _ in read_feed()] == [_uuid(4), _uuid(3), _uuid(10), _uuid(2), _uuid(1), _uuid(0)]
+    assert read_feed()[0] == (_uuid(4), "seguida")
+
+    author_headers = {"Authorization": f"Bearer {author['access_token']}"}
+    assert client.delete(f"/posts/{_uuid(4)}", headers=author_headers).status_code == 204
+    assert [post_id for post_id, _ in read_feed()][:2] == [_uuid(3), _uuid(10)]
+
+    assert client.delete(f"/profile/{author_id}/follow", headers=headers).status_code == 200
+    assert read_feed() == [(_uuid(10), "lectora")]
+    assert client.get("/feed", params={"cursor": "roto"}, headers=headers).status_code == 400
+
+
+def test_post_upload_stores_webp_renditions(client, backend, monkeypatch) -> None:
+    # Imagenes: crear una publicacion sube miniatura, feed y completa en WebP;
+    # la respuesta trae sus URLs y borrarla elimina los tres archivos.
+    import base64
+    import io
+
+    from PIL import Image
+
+    from app.images import image_pipeline
+    from app.routers import posts as posts_router
+
+    monkeypatch.setattr(posts_router, "USER_CONTENT_BUCKET", "user-content")
+    monkeypatch.setattr(image_pipeline, "workers", 0)
+    author = _signup(client, "fotos")
+    headers = {"Authorization": f"Bearer {author['access_token']}"}
+    photo = io.BytesIO()
+    Image.new("RGB", (1600, 1200), (10, 120, 200)).save(photo, "JPEG")
+    encoded = base64.b64encode(photo.getvalue()).decode()
+
+    response = client.post(
+        "/posts", json={"image_base64": f"data:image/jpeg;base64,{encoded}"}, headers=headers
+    )
+    assert response.status_code == 200
+    post = response.json()
+    assert post["image_url"].split("?")[0].endswith("_full.webp")
+    assert set(post["image_renditions"]) == {"thumb", "feed", "full"}
+    files = backend.buckets["user-content"]
+    renditions = {path: data for path, data in files.items() if "/post_" in path}
+    assert sorted(path.rsplit("_", 1)[1] for path in renditions) == [
+        "feed.webp", "full.webp", "thumb.webp"
+    ]
+    assert all(Image.open(io.BytesIO(data)).format == "WEBP" for data in renditions.values())
+
+    invalid = client.post("/posts", json={"image_base64": encoded[:40]}, headers=headers)
+    assert invalid.status_code == 400
+    assert client.delete(f"/posts/{post['id']}", headers=headers).status_code == 204
+    assert not any(path in files for path in renditions)
+
+
+def test_multipart_uploads_for_posts_and_avatars(client, backend, monkeypatch) -> None:
+    # Subidas multipart: publicacion y avatar sin base64; los tipos que no
+    # son imagen se rechazan con 415.
+    import io
+
+    from PIL import Image
+
+    from app.images import image_pipeline
+    from app.routers import posts as posts_router
+    from app.routers import profile as profile_router
+
+    monkeypatch.setattr(posts_router, "USER_CONTENT_BUCKET", "user-content")
+    monkeypatch.setattr(profile_router, "USER_CONTENT_BUCKET", "user-content")
+    monkeypatch.setattr(image_pipeline, "workers", 0)
+    author = _signup(client, "multipart")
+    headers = {"Authorization": f"Bearer {author['access_token']}"}
+    photo = io.BytesIO()
+    Image.new("RGB", (900, 600), (90, 160, 30)).save(photo, "PNG")
+
+    response = client.post(
+        "/posts/upload",
+        files={"image": ("paseo.png", photo.getvalue(), "image/png")},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    post = response.json()
+    assert post["user_id"] == author["user"]["id"]
+    assert post["image_renditions"]["thumb"].split("?")[0].endswith("_thumb.webp")
+
+    response = client.put(
+        "/profile/me/avatar",
+        files={"image": ("yo.png", photo.getvalue(), "image/png")},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    avatar = response.json()
+    assert avatar["avatar_renditions"]["thumb"].split("?")[0].endswith("avatar_thumb.webp")
+    assert client.get("/profile/me", headers=headers).json()["avatar_url"] == avatar["avatar_url"]
+
+    fake = client.post(
+        "/posts/upload", files={"image": ("x.png", b"<svg>" * 10, "image/png")}, headers=headers
+    )
+    assert fake.status_code == 415
+    other = client.put(
+        f"/profile/{author['user']['id']}/avatar", files={"image": ("yo.png", b"x")}, headers=headers
+    )
+    assert other.status_code == 403
+
+
+def test_signup_rejects_emails_registered_with_other_case(client, backend) -> None:
+    # Registro: el correo se normaliza antes de la consulta por igualdad, asi
+    # que Foo@X.com choca con el perfil guardado (en minusculas) como foo@x.com.
+    backend.seed_rows("profiles", [{"id": "antiguo", "username": "antiguo", "email": "foo@x.com"}])
+    payload = {"email": " Foo@X.com ", "password": "secret-password", "username": "nuevo"}
+
+    response = client.post("/auth/signup", json=payload)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Este correo ya está registrado."
+
+
+def test_refresh_rotates_and_revokes_on_reuse(client, backend) -> None:
+    # Sesiones: refresh rota el token y reutilizar uno viejo revoca la sesion.
+    session = _signup(client, "renovable")
+    first = session["refresh_token"]
+
+    renewed = client.post("/auth/refresh", json={"refresh_token": first})
+    assert renewed.status_code == 200
+    second = renewed.json()["refresh_token"]
+    assert second != first
+
+    assert client.post("/auth/refresh", json={"refresh_token": first}).status_code == 401
+    assert client.post("/auth/refresh", json={"refresh_token": second}).status_code == 401
+
+    headers = {"Authorization": f"Bearer {second}"}
+    assert client.get("/notifications", headers=headers).status_code == 401
+
+
+def test_refresh_reads_the_current_role(client, backend) -> None:
+    # Sesiones: el token renovado lleva el rol actual del perfil, no el del
+    # token anterior, y si el perfil ya no existe la sesion se revoca.
+    session = _signup(client, "ascendida")
+    user_id = session["user"]["id"]
+    backend.client().table("profiles").update({"role": "moderator"}).eq("id", user_id).execute()
+
+    renewed = client.post("/auth/refresh", json={"refresh_token": session["refresh_token"]})
+    assert renewed.status_code == 200
+    body = renewed.json()
+    assert body["user"]["role"] == "moderator"
+    assert verify_access_token(body["access_token"])["role"] == "moderator"
+
+    backend.client().table("profiles").delete().eq("id", user_id).execute()
+    third = client.post("/auth/refresh", json={"refresh_token": body["refresh_token"]})
+    assert third.status_code == 401
+    revoked = [row for row in backend.tables["refresh_tokens"] if row["user_id"] == user_id]
+    assert revoked and all(row["revoked_at"] for row in revoked)
+
+
+def test_nearby_returns_closest_profiles_first(client, backend) -> None:
+    # Ruta de datos: /profile/nearby ordena por distancia y excluye al usuario.
+    me = _signup(client, "vecina")
+    backend.seed_rows("profiles", [
+        {"id": "far", "username": "lejos", "latitude": 41.3874, "longitude": 2.1686},
+        {"id": "near", "username": "cerca", "latitude": 40.4200, "longitude": -3.7000},
+        {"id": "next", "username": "al_lado", "latitude": 40.4170, "longitude": -3.7040},
+        {"id": "nowhere", "username": "sin_coordenadas"},
+    ])
+    headers = {"Authorization": f"Bearer {me['access_token']}"}
+
+    response = client.get(
+        "/profile/nearby",
+        params={"lat": 40.4168, "lng": -3.7038, "radius_km": 10},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert [row["id"] for row in response.json()] == ["next", "near"]
+
+
+def test_nearby_pages_follow_the_cursor_header(client, backend) -> None:
+    # Paginacion: X-Next-Cursor enlaza las paginas y un cursor ajeno se rechaza.
+    me = _signup(client, "paginadora")
+    backend.seed_rows("profiles", [
+        {"id": _uuid(index), "username": f"u{index}", "latitude": 40.4168 + index / 1000, "longitude": -3.7038}
+        for index in range(5)
+    ])
+    headers = {"Authorization": f"Bearer {me['access_token']}"}
+    params = {"lat": 40.4168, "lng": -3.7038, "radius_km": 10, "limit": 2}
+
+    seen, cursor = [], None
+    while True:
+        response = client.get(
+            "/profile/nearby", params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers
+        )
+        assert response.status_code == 200
+        seen.extend(row["id"] for row in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == [_uuid(index) for index in range(5)]
+
+    first = client.get("/profile/nearby", params=params, headers=headers).headers["X-Next-Cursor"]
+    moved = {**params, "lat": 41.0, "cursor": first}
+    assert client.get("/profile/nearby", params=moved, headers=headers).status_code == 400
+
+
+def test_malformed_cursor_keys_are_rejected(client, backend) -> None:
+    # Paginacion: el cursor no va firmado; una clave con la huella correcta
+    # pero sin forma de (fecha, UUID) o (distancia, UUID) da 400, no 500.
+    me = _signup(client, "cursores")
+    user_id = me["user"]["id"]
+    headers = {"Authorization": f"Bearer {me['access_token']}"}
+    created_keys = [
+        ["x", _uuid(1)],
+        ["2026-10-18T10:00:00+00:00", "p01"],
+        ["2026-10-18T10:00:00+00:00", "a\\"],
+        ['2026-10-18T10:00:00+00:00",id.gt."0', _uuid(1)],
+        ["2026-10-18T10:00:00+00:00"],
+    ]
+    for path, fingerprint in (
+        (f"/posts/user/{user_id}", query_fingerprint("user-posts", user_id)),
+        (f"/profile/{user_id}/posts", query_fingerprint("profile-posts", user_id)),
+        ("/feed", query_fingerprint("feed", user_id)),
+    ):
+        for key in created_keys:
+            cursor = encode_cursor(key, fingerprint)
+            response = client.get(path, params={"cursor": cursor}, headers=headers)
+            assert response.status_code == 400, (path, key)
+
+    params = {"lat": 40.4168, "lng": -3.7038, "radius_km": 10.0}
+    fingerprint = query_fingerprint(40.4168, -3.7038, 10.0, "", user_id)
+    assert client.get(
+        "/profile/nearby", params={**params, "cursor": encode_cursor((0.5, _uuid(1)), fingerprint)},
+        headers=headers,
+    ).status_code == 200
+    for key in ([-1, _uuid(1)], ["1", _uuid(1)], [True, _uuid(1)], [1.0, "p1"], [1.0]):
+        cursor = encode_cursor(key, fingerprint)
+        response = client.get("/profile/nearby", params={**params, "cursor": cursor}, headers=headers)
+        assert response.status_code == 400, key
+
+
+def test_nearby_clusters_for_the_map_view(client, backend) -> None:
+    # Mapa: /profile/nearby/clusters agrupa los perfiles de la vista.
+    me = _signup(client, "cartografa")
+    backend.seed_rows("profiles", [
+        {"id": f"m{index}", "username": f"m{index}", "latitude": 40.41 + index / 10000, "longitude": -3.70}
+        for index in range(30)
+    ] + [{"id": "bcn", "username": "barcelona", "latitude": 41.3874, "longitude": 2.1686}])
+    headers = {"Authorization": f"Bearer {me['access_token']}"}
+    view = {"min_lat": 36, "max_lat": 44, "min_lng": -9, "max_lng": 4}
+
+    body = client.get("/profile/nearby/clusters", params={**view, "zoom": 6}, headers=headers).json()
+    assert body["total"] == 31
+    assert sorted(cluster["count"] for cluster in body["clusters"]) == [1, 30]
+
+    response = client.get("/profile/nearby/clusters", params={**view, "zoom": 30}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_search_follows_profile_edits(client, backend) -> None:
+    # Busqueda: el indice de trigramas ve los cambios hechos por la API.
+    me = _signup(client, "buscona")
+    other = _signup(client, "peludo")
+    headers = {"Authorization": f"Bearer {me['access_token']}"}
+    assert [row["username"] for row in client.get(
+        "/profile/search", params={"query": "PELU"}, headers=headers
+    ).json()] == ["peludo"]
+
+    response = client.put(
+        "/profile/me",
+        json={"pet_name": "Canelón"},
+        headers={"Authorization": f"Bearer {other['access_token']}"},
+    )
+    assert response.status_code == 200
+    found = client.get("/profile/search", params={"query": "canelon"}, headers=headers).json()
+    assert [row["pet_name"] for row in found] == ["Canelón"]
+    suggestions = client.get("/profile/search/suggest", params={"prefix": "cane"}).json()
+    assert [(item["text"], item["kind"]) for item in suggestions] == [("Canelón", "pet_name")]
+    assert client.get("/profile/search/suggest", params={"prefix": "c", "limit": 0}).status_code == 400
+
+
+def test_profile_changes_reach_the_nearby_index(client, backend, tmp_path) -> None:
+    # Indice en memoria: editar la ciudad mueve al perfil sin recargar la tabla.
+    from app.gazetteer import Gazetteer, build_gazetteer, use_gazetteer
+    from app.geo_index import geo_index
+
+    build_gazetteer([("28013", "Madrid", "Madrid", 40.4170, -3.7040)], str(tmp_path / "es.bin"))
+    use_gazetteer(Gazetteer(str(tmp_path / "es.bin")))
+    me = _signup(client, "buscadora")
+    other = _signup(client, "mudanza")
+    headers = {"Authorization": f"Bearer {me['access_token']}"}
+    params = {"lat": 40.4168, "lng": -3.7038, "radius_km": 10}
+    try:
+        assert client.get("/profile/nearby", params=params, headers=headers).json() == []
+        loads = geo_index.loads
+
+        response = client.put(
+            "/profile/me",
+            json={"city": "Madrid", "postal_code": "28013"},
+            headers={"Authorization": f"Bearer {other['access_token']}"},
+        )
+        assert response.status_code == 200
+        nearby = client.get("/profile/nearby", params=params, headers=headers).json()
+        assert [row["username"] for row in nearby] == ["mudanza"]
+        assert geo_index.loads == loads
+    finally:
+        use_gazetteer(None)
+
+    # Cambios hechos fuera de la API: los corrige el barrido de reconciliacion
+    backend.client().table("profiles").delete().eq("id", other["user"]["id"]).execute()
+    geo_index.reconcile()
+    assert client.get("/profile/nearby", params=params, headers=headers).json() == []
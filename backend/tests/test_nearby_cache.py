@@ -0,0 +1,80 @@
+import random
+
+from app.geo_index import fetch_profiles_near, rank_by_distance
+from app.memory_backend import MemoryBackend
+from app.nearby_cache import NearbyCache, geohash_cell, radius_bucket
+
+
+def _client(rows):
+    backend = MemoryBackend()
+    backend.seed_rows("profiles", rows)
+    return backend.client()
+
+
+def test_geohash_cell_and_radius_bucket() -> None:
+    # Clave: geohash estandar y radio redondeado hacia arriba.
+    cell, (min_lat, max_lat, min_lng, max_lng) = geohash_cell(57.64911, 10.40744, 11)
+    assert cell == "u4pruydqqvj"
+    assert min_lat <= 57.64911 <= max_lat and min_lng <= 10.40744 <= max_lng
+    assert radius_bucket(25) == 25
+    assert radius_bucket(7) == 10
+    assert radius_bucket(500) is None
+
+
+def test_cached_candidates_match_the_direct_query() -> None:
+    # Cache: cualquier punto de la celda recibe lo mismo que sin cache,
+    # ordenado por su distancia exacta y sin el propio usuario.
+    rng = random.Random(8)
+    rows = [
+        {"id": f"p{number}", "latitude": 40.4 + rng.gauss(0, 0.2), "longitude": -3.7 + rng.gauss(0, 0.2)}
+        for number in range(3000)
+    ]
+    client = _client(rows)
+    cache = NearbyCache(max_size=16, ttl=60, precision=6)
+    _, (min_lat, max_lat, min_lng, max_lng) = geohash_cell(40.4168, -3.7038, 6)
+
+    for _ in range(20):
+        lat, lng = rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng)
+        radius_km = rng.choice([3, 10, 25])
+        expected = rank_by_distance(
+            fetch_profiles_near(client, lat, lng, radius_km), lat, lng, radius_km, 10_000, exclude_id="p0"
+        )
+        cached = cache.query(client, lat, lng, radius_km, 10_000, exclude_id="p0")
+        assert [row["id"] for row in cached] == [row["id"] for row in expected]
+    stats = cache.stats()
+    assert stats["misses"] == 3 and stats["hits"] == 17
+
+
+def test_profile_moves_invalidate_affected_entries() -> None:
+    # Cache: un perfil que entra o sale del area de una entrada la invalida.
+    rows = [{"id": "vecino", "latitude": 40.4170, "longitude": -3.7040}]
+    backend = MemoryBackend()
+    backend.seed_rows("profiles", rows)
+    client = backend.client()
+    cache = NearbyCache(max_size=16, ttl=60, precision=6)
+
+    assert [row["id"] for row in cache.query(client, 40.4168, -3.7038, 5, 10)] == ["vecino"]
+    cache.query(client, 41.3874, 2.1686, 5, 10)
+
+    moved = {"id": "nuevo", "latitude": 40.4180, "longitude": -3.7050}
+    backend.client().table("profiles").insert(moved).execute()
+    cache.apply_profile("nuevo", moved)
+    assert cache.stats()["entries"] == 1
+    assert [row["id"] for row in cache.query(client, 40.4168, -3.7038, 5, 10)] == ["vecino", "nuevo"]
+
+    backend.client().table("profiles").update({"latitude": 43.0, "longitude": -8.0}).eq("id", "vecino").execute()
+    cache.apply_profile("vecino", {"id": "vecino", "latitude": 43.0, "longitude": -8.0})
+    assert [row["id"] for row in cache.query(client, 40.4168, -3.7038, 5, 10)] == ["nuevo"]
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_pet_type_filter_is_literal() -> None:
+    # Filtro: el tipo de mascota no distingue mayusculas pero % y _ no son
+    # comodines, asi que no devuelven perfiles de cualquier tipo.
+    client = _client([
+        {"id": "perro", "latitude": 40.4170, "longitude": -3.7040, "pet_type": "perro"},
+        {"id": "gato", "latitude": 40.4171, "longitude": -3.7041, "pet_type": "gato"},
+    ])
+    assert [row["id"] for row in fetch_profiles_near(client, 40.4168, -3.7038, 5, "PERRO")] == ["perro"]
+    for pattern in ("%", "_ato", "*"):
+        assert fetch_profiles_near(client, 40.4168, -3.7038, 5, pattern) == []
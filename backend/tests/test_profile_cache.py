@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from app import database
+from app.memory_backend import MemoryBackend
+from app.profile_cache import ProfileCache
+
+
+@pytest.fixture
+def backend():
+    memory = MemoryBackend()
+    memory.seed_rows("profiles", [
+        {"id": f"u{number}", "username": f"user{number}", "pet_name": f"Pet{number}", "role": "user"}
+        for number in range(5)
+    ])
+    database.use_memory_backend(memory)
+    yield memory
+    database.use_memory_backend(None)
+
+
+def test_misses_are_read_in_one_query(backend) -> None:
+    # Cache de perfiles: los fallos de varios ids van en una sola consulta.
+    cache = ProfileCache(max_size=3, ttl=60)
+    found = cache.get_many(["u0", "u1", "u1", "missing", None], ("id", "username"))
+    assert found == {"u0": {"id": "u0", "username": "user0"}, "u1": {"id": "u1", "username": "user1"}}
+    assert backend.calls["select:profiles"] == 1
+
+    found["u0"]["username"] = "cambiado"
+    assert cache.get("u0")["username"] == "user0"
+    profiles = asyncio.run(cache.get_many_async(["u0", "u1", "u2", "u3"]))
+    assert profiles["u3"]["pet_name"] == "Pet3"
+    assert backend.calls["select:profiles"] == 2
+    # Solo caben tres: u0 fue el menos usado y salio de la cache
+    assert cache.get("u0")["username"] == "user0"
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["loads"]) == (3, 3, 6, 3)
+
+
+def test_writes_and_ttl_invalidate_entries(backend) -> None:
+    # Cache de perfiles: un aviso olvida la entrada y una lectura que
+    # empezo antes del aviso no guarda la fila vieja.
+    cache = ProfileCache(max_size=16, ttl=60)
+    assert cache.get("u1")["pet_name"] == "Pet1"
+    backend.tables["profiles"][1]["pet_name"] = "Nube"
+    assert cache.get("u1")["pet_name"] == "Pet1"
+    cache.apply_profile("u1", {"id": "u1"})
+    assert cache.get("u1")["pet_name"] == "Nube"
+
+    _, missing, generation = cache._lookup(["u2"], None)
+    cache.apply_profile("u2", None)
+    cache._store([{"id": "u2", "username": "vieja"}], generation, {}, None)
+    assert cache.get("u2")["username"] == "user2"
+    assert cache.stats()["invalidations"] == 1
+
+    expiring = ProfileCache(max_size=16, ttl=0)
+    expiring.get("u3")
+    expiring.get("u3")
+    assert expiring.stats()["hits"] == 0
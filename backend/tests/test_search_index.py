@@ -0,0 +1,63 @@
+import random
+import string
+
+from app.geocode_cache import normalize_place
+from app.search_index import ProfileSearchIndex
+
+
+def _usernames(results):
+    return [row["username"] for row in results]
+
+
+def test_results_are_ranked_by_match_quality() -> None:
+    # Busqueda: igual, empieza por, palabra que empieza por y contiene, sin
+    # distinguir mayusculas ni tildes.
+    index = ProfileSearchIndex.from_rows([
+        {"id": "1", "username": "superluna", "pet_name": None},
+        {"id": "2", "username": "Luna", "pet_name": "Toby"},
+        {"id": "3", "username": "ana_luna", "pet_name": None},
+        {"id": "4", "username": "lunatica", "pet_name": None},
+        {"id": "5", "username": "marcos", "pet_name": "Lúna"},
+        {"id": "6", "username": "pedro", "pet_name": "Rex"},
+    ])
+    assert _usernames(index.search("LUNA", 10)) == ["Luna", "marcos", "lunatica", "ana_luna", "superluna"]
+    # A igual calidad, el nombre de usuario va antes que el de la mascota
+    assert _usernames(index.search("lu", 3)) == ["Luna", "lunatica", "marcos"]
+    assert _usernames(index.search("una", 10))[:2] == ["Luna", "ana_luna"]
+    # Con una falta de ortografia se recurre a nombres parecidos
+    assert _usernames(index.search("pedor", 10)) == ["pedro"]
+    assert index.search("zzz", 10) == []
+
+
+def test_search_matches_substring_scan_after_updates() -> None:
+    # Busqueda: mismo conjunto que ilike '%q%' tras altas, cambios y bajas
+    # (incluida la compactacion de las listas).
+    rng = random.Random(9)
+    letters = "abcdeéilnoprstu"
+    profiles = {}
+    index = ProfileSearchIndex()
+    for step in range(6000):
+        profile_id = f"p{rng.randrange(2000)}"
+        if rng.random() < 0.15:
+            profiles.pop(profile_id, None)
+            index.apply(profile_id, None)
+            continue
+        row = {
+            "id": profile_id,
+            "username": "".join(rng.choice(letters) for _ in range(rng.randint(3, 9))),
+            "pet_name": rng.choice([None, "".join(rng.choice(string.ascii_lowercase) for _ in range(5))]),
+        }
+        profiles[profile_id] = row
+        index.apply(profile_id, row)
+
+    assert index.size == len(profiles)
+    for query in ("a", "ne", "é", "tor", "abc", "lúna", "pe"):
+        needle = normalize_place(query)
+        expected = {
+            row["id"] for row in profiles.values()
+            if needle in normalize_place(row["username"]) or needle in normalize_place(row["pet_name"])
+        }
+        found = {row["id"] for row in index.search(query, limit=10_000) if row}
+        assert expected <= found
+        if len(needle) < 3:
+            assert found == expected
@@ -1,21 +1,9 @@
 import importlib
-import os
 
 from fastapi.testclient import TestClient
 
 
-def _set_env_defaults() -> None:
-    os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
-    os.environ.setdefault("SUPABASE_KEY", "test-key")
-    os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-service-key")
-    os.environ.setdefault("JWT_SECRET", "test-secret")
-    os.environ.setdefault("SUPABASE_PUBLIC_ASSETS", "")
-    os.environ.setdefault("SUPABASE_USER_BUCKET", "")
-    os.environ.setdefault("SUPABASE_USER_FOLDER", "")
-
-
 def _get_client() -> TestClient:
-    _set_env_defaults()
     from app import main as app_main
 
     importlib.reload(app_main)
@@ -55,3 +43,10 @@ def test_auth_endpoints_validate_payloads() -> None:
     signup_response = client.post("/auth/signup")
     assert login_response.status_code == 422
     assert signup_response.status_code == 422
+
+
+def test_diagnostics_requires_auth() -> None:
+    # Contrato: diagnosticos protegidos por token.
+    client = _get_client()
+    response = client.get("/diagnostics/clients")
+    assert response.status_code == 401
@@ -0,0 +1,74 @@
+from app import suggest_index as suggest_module
+from app.suggest_index import SuggestIndex
+
+ROWS = [
+    {"id": "1", "username": "lucia", "pet_name": "Luna"},
+    {"id": "2", "username": "marta", "pet_name": "luna"},
+    {"id": "3", "username": "Lúcas", "pet_name": "Toby"},
+    {"id": "4", "username": "pedro", "pet_name": "Lunares"},
+]
+
+
+def _texts(results):
+    return [item["text"] for item in results]
+
+
+def test_completions_ranked_by_use_and_length() -> None:
+    # Autocompletado: los terminos mas usados primero, luego los mas cortos,
+    # sin distinguir mayusculas ni tildes.
+    index = SuggestIndex.from_rows(ROWS)
+    results = index.suggest("LU", 10)
+    assert [(item["text"], item["count"]) for item in results] == [
+        ("Luna", 2), ("Lúcas", 1), ("lucia", 1), ("Lunares", 1)
+    ]
+    assert results[1]["kind"] == "username" and results[1]["profile_id"] == "3"
+    assert results[0]["kind"] == "pet_name" and "profile_id" not in results[0]
+    assert _texts(index.suggest("luc", 1)) == ["Lúcas"]
+    assert index.suggest("x", 5) == []
+
+
+def test_updates_refresh_cached_prefixes(monkeypatch) -> None:
+    # Autocompletado: los cambios de perfil se ven en los prefijos guardados.
+    monkeypatch.setattr(suggest_module, "SUGGEST_SCAN_LIMIT", 0)
+    index = SuggestIndex.from_rows(ROWS)
+    assert _texts(index.suggest("lu", 2)) == ["Luna", "Lúcas"]
+    assert _texts(index.suggest("lu", 2)) == ["Luna", "Lúcas"]
+    assert index.cache_hits == 1
+
+    index.apply("2", {"id": "2", "username": "marta", "pet_name": "Lunares"})
+    index.apply("5", {"id": "5", "username": "lunares_fan", "pet_name": "Lunares"})
+    assert [(item["text"], item["count"]) for item in index.suggest("lu", 3)] == [
+        ("Lunares", 3), ("Luna", 1), ("Lúcas", 1)
+    ]
+    index.apply("3", None)
+    index.apply("1", None)
+    assert _texts(index.suggest("lu", 5)) == ["Lunares", "lunares_fan"]
+    assert index.size == len({"marta", "pedro", "lunares", "lunares_fan"})
+    assert index.memory_report()["total"] > 0
+
+
+def test_search_and_suggest_share_one_profiles_scan() -> None:
+    # Carga conjunta: una sola lectura construye busqueda y autocompletado, y
+    # un cambio de perfil durante la lectura llega a los dos.
+    from app.live_index import LiveIndexGroup
+    from app.search_index import LiveSearchIndex
+
+    search, suggest = LiveSearchIndex(), suggest_module.LiveSuggestIndex()
+    scans = []
+
+    def load_rows():
+        scans.append(1)
+        for index in (search, suggest):
+            index.apply_profile("5", {"id": "5", "username": "lupe", "pet_name": "Kira"})
+        return [dict(row, city=None, postal_code=None) for row in ROWS]
+
+    group = LiveIndexGroup([search, suggest], load_rows, "de prueba")
+    group.get()
+    group.get()
+    assert len(scans) == 1
+    assert search.loads == suggest.loads == 1
+    assert "lupe" in _texts(suggest.get().suggest("lu", 10))
+    assert [row["id"] for row in search.get().search("lupe")] == ["5"]
+
+    group.reconcile()
+    assert len(scans) == 2 and search.loads == suggest.loads == 2
@@ -0,0 +1,74 @@
+from app.memory_backend import MemoryBackend
+from app.timeline import TimelineStore
+
+
+def _uuid(number: int) -> str:
+    return f"00000000-0000-4000-8000-{number:012d}"
+
+
+def _post(number: int, user_id: str) -> dict:
+    return {"id": _uuid(number), "user_id": user_id, "image_url": "x",
+            "created_at": f"2026-10-18T10:{number // 60:02d}:{number % 60:02d}+00:00"}
+
+
+def _backend(followers: dict, posts: list) -> MemoryBackend:
+    backend = MemoryBackend()
+    backend.seed_rows("user_follows", [
+        {"follower_id": follower, "followed_id": followed}
+        for followed, ids in followers.items()
+        for follower in ids
+    ])
+    backend.seed_rows("posts", posts)
+    return backend
+
+
+def _ids(keys) -> list:
+    return [post_id for _, post_id in keys]
+
+
+def test_fan_out_reaches_loaded_timelines_and_skips_big_accounts() -> None:
+    # Timeline: una publicacion nueva entra sin consultas en los timelines
+    # cargados; la de una cuenta grande se lee al pedir el feed.
+    backend = _backend({"autora": ["ana", "beto"], "famosa": ["ana"]}, [_post(1, "autora")])
+    client = backend.client()
+    store = TimelineStore(size=10, fanout_limit=2)
+    assert _ids(store.page(client, "ana", 5)) == [_uuid(1)]
+
+    post = _post(2, "autora")
+    backend.seed_rows("posts", [post])
+    assert store.fan_out("autora", post, ["ana", "beto"]) == 1
+    reads = backend.calls["select:posts"]
+    assert _ids(store.page(client, "ana", 5)) == [_uuid(2), _uuid(1)]
+    assert backend.calls["select:posts"] == reads
+
+    big = _post(3, "famosa")
+    backend.seed_rows("posts", [big])
+    store.fan_out("famosa", big, ["ana", "beto", "carla"])
+    assert _ids(store.page(client, "ana", 5)) == [_uuid(3), _uuid(2), _uuid(1)]
+    assert _ids(store.page(client, "ana", 5, (big["created_at"], big["id"]))) == [_uuid(2), _uuid(1)]
+
+    assert store.remove(_uuid(2), post["created_at"]) == 1
+    assert _ids(store.page(client, "ana", 5)) == [_uuid(3), _uuid(1)]
+    stats = store.stats()
+    assert stats["skipped_fanouts"] == 1 and stats["big_authors"] == 1
+
+
+def test_truncated_timeline_reads_older_pages_from_the_database() -> None:
+    # Timeline: pasado el tamano maximo las paginas antiguas salen de la base
+    # de datos, sin huecos ni repetidos.
+    backend = _backend({"autora": ["ana"]}, [_post(number, "autora") for number in range(12)])
+    client = backend.client()
+    store = TimelineStore(size=5)
+
+    seen, after = [], None
+    while True:
+        keys = store.page(client, "ana", 4, after)
+        if not keys:
+            break
+        seen += _ids(keys)
+        after = keys[-1]
+    assert seen == [_uuid(number) for number in reversed(range(12))]
+    assert store.stats()["read_fallbacks"] >= 1
+
+    store.invalidate("ana")
+    assert store.stats()["timelines"] == 0
@@ -0,0 +1,99 @@
+import asyncio
+import os
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.uploads import UploadBuffer, receive_image, sniff_image
+
+BOUNDARY = "limite"
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 200
+
+
+def _form(image: bytes, description: str = "hola") -> bytes:
+    return (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"description\"\r\n\r\n"
+        f"{description}\r\n--{BOUNDARY}\r\n"
+        "Content-Disposition: form-data; name=\"image\"; filename=\"foto\"\r\n"
+        "Content-Type: image/jpeg\r\n\r\n"
+    ).encode() + image + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def _receive(body: bytes, consumed: list, chunk: int = 64, declared: bool = True, **kwargs):
+    chunks = [body[start:start + chunk] for start in range(0, len(body), chunk)]
+
+    async def receive():
+        consumed.append(chunks[len(consumed)])
+        return {"type": "http.request", "body": consumed[-1], "more_body": len(consumed) < len(chunks)}
+
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]
+    if declared:
+        headers.append((b"content-length", str(len(body)).encode()))
+    request = Request({"type": "http", "method": "POST", "headers": headers}, receive)
+    return asyncio.run(receive_image(request, **kwargs))
+
+
+def _rejected(body: bytes, consumed: list, **kwargs) -> int:
+    with pytest.raises(HTTPException) as error:
+        _receive(body, consumed, **kwargs)
+    return error.value.status_code
+
+
+def test_sniff_image_by_magic_bytes() -> None:
+    # Subidas: el tipo sale de los primeros bytes, no del content-type declarado.
+    assert sniff_image(b"\xff\xd8\xff\xe0" + b"\x00" * 8) == "image/jpeg"
+    assert sniff_image(PNG[:12]) == "image/png"
+    assert sniff_image(b"RIFF\x00\x00\x00\x00WEBP") == "image/webp"
+    assert sniff_image(b"GIF89a......") is None
+
+
+def test_receive_image_streams_fields_and_image() -> None:
+    # Subidas: el formulario se lee por trozos; la imagen queda en el buffer.
+    body, consumed = _form(PNG), []
+    upload = _receive(body, consumed)
+    try:
+        assert upload.fields == {"description": "hola"}
+        assert upload.content_type == "image/png"
+        assert upload.buffer.source() == PNG
+        assert b"".join(consumed) == body
+    finally:
+        upload.close()
+
+
+def test_receive_image_rejects_early() -> None:
+    # Subidas: tipo no admitido o imagen demasiado grande se rechazan sin
+    # leer el resto del cuerpo; el tamano declarado, sin leer nada.
+    consumed = []
+    assert _rejected(_form(b"<html>" + b"x" * 50_000), consumed, chunk=1024) == 415
+    assert len(consumed) == 1
+
+    consumed = []
+    big = _form(PNG + b"\x00" * 50_000)
+    assert _rejected(big, consumed, chunk=1024, declared=False, max_bytes=4096) == 413
+    assert 4096 < sum(map(len, consumed)) < 8192
+
+    consumed = []
+    huge = _form(PNG + b"\x00" * 100_000)
+    assert _rejected(huge, consumed, max_bytes=4096) == 413
+    assert consumed == []
+
+    assert _rejected(f"--{BOUNDARY}--\r\n".encode(), []) == 400
+
+
+def test_upload_buffer_spills_to_a_temporary_file() -> None:
+    # Subidas: mas alla del limite en memoria la imagen pasa a un archivo temporal.
+    buffer = UploadBuffer(spool_bytes=10)
+
+    async def fill():
+        await buffer.write(b"12345")
+        assert buffer.source() == b"12345"
+        await buffer.write(b"67890abc")
+
+    asyncio.run(fill())
+    path = buffer.source()
+    assert isinstance(path, str)
+    with open(path, "rb") as stored:
+        assert stored.read() == b"1234567890abc"
+    buffer.close()
+    assert not os.path.exists(path)
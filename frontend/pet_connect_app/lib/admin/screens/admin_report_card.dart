@@ -4,6 +4,7 @@
 /// Tarjeta reutilizable para mostrar información de reportes con acciones.
 
 import 'package:flutter/material.dart';
+import 'package:pet_connect_app/lib/services/image_renditions.dart';
 
 class AdminReportCard extends StatelessWidget {
   final String? imageUrl;
@@ -29,7 +30,7 @@ class AdminReportCard extends StatelessWidget {
         children: [
           if (imageUrl != null && imageUrl!.isNotEmpty)
             Image.network(
-              imageUrl!,
+              imageRendition(imageUrl!, 'feed'),
               height: 220,
               width: double.infinity,
               fit: BoxFit.cover,
@@ -7,6 +7,7 @@ import 'dart:async';
 
 import 'package:flutter/material.dart';
 import 'package:pet_connect_app/lib/config/api_config.dart';
+import 'package:pet_connect_app/lib/services/image_renditions.dart';
 import 'package:pet_connect_app/lib/services/auth_service.dart';
 import 'package:pet_connect_app/lib/services/profile_service.dart';
 import 'package:pet_connect_app/shared/profile/edit_profile_screen.dart';
@@ -142,7 +143,8 @@ class _AdminUserListScreenState extends State<AdminUserListScreen> {
                               return ListTile(
                                 leading: CircleAvatar(
                                   backgroundImage: avatar.isNotEmpty
-                                      ? NetworkImage(avatar)
+                                      ? NetworkImage(
+                                          imageRendition(avatar, 'thumb'))
                                       : const NetworkImage(
                                           'https://placehold.co/50'),
                                 ),
@@ -33,6 +33,7 @@ class AuthService {
         // Guardar token
         final token = data['access_token'] as String;
         await _storage.write(key: 'access_token', value: token);
+        await _saveRefreshToken(data['refresh_token'] as String?);
 
         // Guardar rol
         final role = data['user']['role'] as String;
@@ -91,6 +92,7 @@ class AuthService {
         // Guardar token
         final token = data['access_token'] as String;
         await _storage.write(key: 'access_token', value: token);
+        await _saveRefreshToken(data['refresh_token'] as String?);
 
         // Guardar rol
         final role = data['user']['role'] as String;
@@ -114,7 +116,58 @@ class AuthService {
   /// Fecha: 02-11-2025
   /// Descripción: Elimina el token almacenado para cerrar sesión localmente.
   Future<void> logout() async {
+    final refreshToken = await _storage.read(key: 'refresh_token');
+    if (refreshToken != null) {
+      try {
+        await http.post(
+          Uri.parse('${ApiConfig.baseUrl}/auth/logout'),
+          headers: {'Content-Type': 'application/json'},
+          body: jsonEncode({'refresh_token': refreshToken}),
+        );
+      } catch (_) {
+        // Sin red la sesión se cierra igualmente en el dispositivo
+      }
+    }
     await _storage.delete(key: 'access_token');
+    await _storage.delete(key: 'refresh_token');
+  }
+
+  /// Autor: Wilbert López Veras
+  /// Fecha: 18-10-2026
+  /// Descripción: Renueva el access token con el refresh token guardado, sin
+  /// volver a iniciar sesión. Retorna el token nuevo o null si hay que hacer login.
+  Future<String?> refreshSession() async {
+    final refreshToken = await _storage.read(key: 'refresh_token');
+    if (refreshToken == null) return null;
+
+    try {
+      final res = await http.post(
+        Uri.parse('${ApiConfig.baseUrl}/auth/refresh'),
+        headers: {'Content-Type': 'application/json'},
+        body: jsonEncode({'refresh_token': refreshToken}),
+      );
+
+      if (res.statusCode != 200) {
+        await _storage.delete(key: 'refresh_token');
+        return null;
+      }
+
+      final data = jsonDecode(res.body);
+      final token = data['access_token'] as String;
+      await _storage.write(key: 'access_token', value: token);
+      await _saveRefreshToken(data['refresh_token'] as String?);
+      return token;
+    } catch (e) {
+      return null;
+    }
+  }
+
+  /// Autor: Wilbert López Veras
+  /// Fecha: 18-10-2026
+  /// Descripción: Guarda el refresh token emitido por el backend, si lo hay.
+  Future<void> _saveRefreshToken(String? refreshToken) async {
+    if (refreshToken == null) return;
+    await _storage.write(key: 'refresh_token', value: refreshToken);
   }
 
   /// Autor: Wilbert López Veras
@@ -0,0 +1,27 @@
+// Autor: Wilbert López Veras
+// Fecha de creación: 18 de Octubre de 2026
+// Descripción: Página de resultados de los endpoints paginados por cursor.
+
+import 'dart:convert';
+
+import 'package:http/http.dart' as http;
+
+class CursorPage {
+  final List<Map<String, dynamic>> items;
+
+  /// Cursor de la página siguiente; null en la última.
+  final String? nextCursor;
+
+  const CursorPage(this.items, this.nextCursor);
+
+  /// Autor: Wilbert López Veras
+  /// Fecha: 18-10-2026
+  /// Descripción: Lee la lista del cuerpo y el cursor de la cabecera X-Next-Cursor.
+  factory CursorPage.fromResponse(http.Response response) {
+    final List<dynamic> data = json.decode(response.body);
+    return CursorPage(
+      data.cast<Map<String, dynamic>>(),
+      response.headers['x-next-cursor'],
+    );
+  }
+}
@@ -0,0 +1,20 @@
+// Autor: Wilbert López Veras
+// Fecha de creación: 18 de Octubre de 2026
+// Descripción: URLs de los tamaños (thumb, feed, full) de las imágenes que
+// procesa el backend. Los archivos se llaman <base>_<tamaño>.webp, así que
+// cada tamaño sale de la URL de "full" que guardan posts y perfiles.
+
+const _fullSuffix = '_full.webp';
+
+/// Autor: Wilbert López Veras
+/// Fecha: 18-10-2026
+/// Descripción: URL del tamaño [rendition] de la imagen. Las imágenes subidas
+/// antes del procesado solo tienen el original y se devuelven sin cambios.
+String imageRendition(String url, String rendition) {
+  final queryStart = url.indexOf('?');
+  final path = queryStart == -1 ? url : url.substring(0, queryStart);
+  if (!path.endsWith(_fullSuffix)) return url;
+  final query = queryStart == -1 ? '' : url.substring(queryStart);
+  final base = path.substring(0, path.length - _fullSuffix.length);
+  return '${base}_$rendition.webp$query';
+}
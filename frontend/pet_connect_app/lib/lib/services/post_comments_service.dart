@@ -7,6 +7,7 @@ import 'dart:convert';
 import 'package:http/http.dart' as http;
 import 'package:pet_connect_app/lib/config/api_config.dart';
 import 'package:pet_connect_app/lib/services/auth_service.dart';
+import 'package:pet_connect_app/lib/services/cursor_page.dart';
 
 class PostCommentsService {
   PostCommentsService._();
@@ -24,11 +25,14 @@ class PostCommentsService {
 
   /// Autor: Wilbert López Veras
   /// Fecha: 06-12-2025
-  /// Descripción: Obtiene los comentarios asociados al post indicado.
-  static Future<List<Map<String, dynamic>>> getComments(String postId) async {
+  /// Descripción: Obtiene una página de comentarios del post indicado, del
+  /// más reciente al más antiguo.
+  static Future<CursorPage> getComments(String postId, {String? cursor}) async {
     final headers = await _headers();
     final response = await http.get(
-      Uri.parse('${ApiConfig.baseUrl}/posts/$postId/comments'),
+      Uri.parse('${ApiConfig.baseUrl}/posts/$postId/comments').replace(
+        queryParameters: cursor == null ? null : {'cursor': cursor},
+      ),
       headers: headers,
     );
 
@@ -36,8 +40,7 @@ class PostCommentsService {
       throw Exception('No se pudieron obtener los comentarios');
     }
 
-    final List<dynamic> data = json.decode(response.body);
-    return data.cast<Map<String, dynamic>>();
+    return CursorPage.fromResponse(response);
   }
 
   /// Autor: Wilbert López Veras
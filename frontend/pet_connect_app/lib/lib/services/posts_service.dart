@@ -7,6 +7,7 @@ import 'dart:convert';
 import 'package:http/http.dart' as http;
 import 'package:pet_connect_app/lib/config/api_config.dart';
 import 'package:pet_connect_app/lib/services/auth_service.dart';
+import 'package:pet_connect_app/lib/services/cursor_page.dart';
 
 class PostsService {
   PostsService._();
@@ -24,11 +25,14 @@ class PostsService {
 
   /// Autor: Wilbert López Veras
   /// Fecha: 06-12-2025
-  /// Descripción: Obtiene todas las publicaciones asociadas a un usuario.
-  static Future<List<Map<String, dynamic>>> getUserPosts(String userId) async {
+  /// Descripción: Obtiene una página de publicaciones de un usuario; el
+  /// cursor de la respuesta pide la siguiente.
+  static Future<CursorPage> getUserPosts(String userId, {String? cursor}) async {
     final headers = await _buildHeaders();
     final response = await http.get(
-      Uri.parse('${ApiConfig.baseUrl}/posts/user/$userId'),
+      Uri.parse('${ApiConfig.baseUrl}/posts/user/$userId').replace(
+        queryParameters: cursor == null ? null : {'cursor': cursor},
+      ),
       headers: headers,
     );
 
@@ -36,27 +40,45 @@ class PostsService {
       throw Exception('Error obteniendo posts');
     }
 
-    final List<dynamic> data = json.decode(response.body);
-    return data.cast<Map<String, dynamic>>();
+    return CursorPage.fromResponse(response);
   }
 
   /// Autor: Wilbert López Veras
-  /// Fecha: 06-12-2025
-  /// Descripción: Crea una publicación subiendo la imagen codificada y enviando la descripción.
-  static Future<Map<String, dynamic>> createPost(
-      String description, String imageBase64) async {
+  /// Fecha: 18-10-2026
+  /// Descripción: Siguiente página de la cuadrícula del perfil a partir del
+  /// cursor `posts_cursor` del perfil o de la página anterior.
+  static Future<CursorPage> getProfilePosts(String userId, String cursor) async {
     final headers = await _buildHeaders();
-    final body = json.encode({
-      'description': description,
-      'image_base64': imageBase64,
-    });
-
-    final response = await http.post(
-      Uri.parse('${ApiConfig.baseUrl}/posts'),
+    final response = await http.get(
+      Uri.parse('${ApiConfig.baseUrl}/profile/$userId/posts')
+          .replace(queryParameters: {'cursor': cursor}),
       headers: headers,
-      body: body,
     );
 
+    if (response.statusCode != 200) {
+      throw Exception('Error obteniendo posts');
+    }
+
+    return CursorPage.fromResponse(response);
+  }
+
+  /// Autor: Wilbert López Veras
+  /// Fecha: 06-12-2025
+  /// Descripción: Crea una publicación enviando la imagen como archivo de un
+  /// formulario multipart (sin base64) junto con la descripción.
+  static Future<Map<String, dynamic>> createPost(
+      String description, String imagePath) async {
+    final headers = await _buildHeaders();
+    final request = http.MultipartRequest(
+      'POST',
+      Uri.parse('${ApiConfig.baseUrl}/posts/upload'),
+    )
+      ..headers['Authorization'] = headers['Authorization']!
+      ..fields['description'] = description
+      ..files.add(await http.MultipartFile.fromPath('image', imagePath));
+
+    final response = await http.Response.fromStream(await request.send());
+
     if (response.statusCode != 200) {
       try {
         final Map<String, dynamic> payload =
@@ -98,6 +98,39 @@ class ProfileService {
     return json.decode(response.body);
   }
 
+  /// Autor: Wilbert López Veras
+  /// Fecha: 18-10-2026
+  /// Descripción: Sube un avatar nuevo como archivo de un formulario multipart.
+  /// Sin [userId] cambia el propio; con él, el de otro usuario (moderadores).
+  Future<Map<String, dynamic>> uploadAvatar(String imagePath,
+      {String? userId}) async {
+    final request = http.MultipartRequest(
+      'PUT',
+      Uri.parse('$baseUrl/profile/${userId ?? 'me'}/avatar'),
+    )
+      ..headers['Authorization'] = 'Bearer $token'
+      ..files.add(await http.MultipartFile.fromPath('image', imagePath));
+
+    final response = await http.Response.fromStream(await request.send());
+
+    if (response.statusCode == 400 ||
+        response.statusCode == 413 ||
+        response.statusCode == 415) {
+      final body = json.decode(response.body);
+      throw Exception(body['detail'] ?? 'No se pudo subir la imagen');
+    }
+
+    if (response.statusCode == 403) {
+      throw Exception('No tienes permisos para editar este perfil');
+    }
+
+    if (response.statusCode != 200) {
+      throw Exception('Error actualizando la imagen de perfil');
+    }
+
+    return json.decode(response.body);
+  }
+
   /// Autor: Wilbert López Veras
   /// Fecha: 18-11-2025
   /// Descripción: Solicita al backend la eliminación de un perfil específico.
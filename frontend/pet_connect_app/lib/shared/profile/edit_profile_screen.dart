@@ -1,7 +1,6 @@
 // Autor: Wilbert López Veras
 // Fecha de creación: 19 de Diciembre de 2025
 // Descripción: Pantalla para editar el perfil del usuario.
-import 'dart:convert';
 import 'dart:io';
 
 import 'package:flutter/material.dart';
@@ -31,7 +30,6 @@ class _EditProfileScreenState extends State<EditProfileScreen> {
   String? _selectedPetType;
   String? _selectedPetGender;
   String? _currentAvatarUrl;
-  String? _avatarBase64;
   File? _avatarFile;
   String? _editingUserId;
   bool _editingOwnProfile = true;
@@ -89,7 +87,6 @@ class _EditProfileScreenState extends State<EditProfileScreen> {
       _selectedPetGender = profile['pet_gender'];
       _currentAvatarUrl = profile['avatar_url'];
       _bioController.text = profile['bio'] ?? '';
-      _avatarBase64 = null;
       _avatarFile = null;
 
       setState(() {
@@ -124,7 +121,6 @@ class _EditProfileScreenState extends State<EditProfileScreen> {
       'pet_name': _nullable(_petNameController.text),
       'pet_type': _selectedPetType,
       'pet_gender': _selectedPetGender,
-      'avatar_base64': _avatarBase64,
       'bio': _nullable(_bioController.text),
     };
     payload.removeWhere((key, value) => value == null);
@@ -132,8 +128,17 @@ class _EditProfileScreenState extends State<EditProfileScreen> {
     try {
       if (_editingOwnProfile || _editingUserId == null) {
         await _profileService!.updateMyProfile(payload);
+        if (_avatarFile != null) {
+          await _profileService!.uploadAvatar(_avatarFile!.path);
+        }
       } else {
         await _profileService!.updateProfileById(_editingUserId!, payload);
+        if (_avatarFile != null) {
+          await _profileService!.uploadAvatar(
+            _avatarFile!.path,
+            userId: _editingUserId,
+          );
+        }
       }
       if (!mounted) return;
       ScaffoldMessenger.of(context).showSnackBar(
@@ -173,13 +178,8 @@ class _EditProfileScreenState extends State<EditProfileScreen> {
     try {
       final picked = await _picker.pickImage(source: source, imageQuality: 85);
       if (picked == null) return;
-      final file = File(picked.path);
-      final bytes = await file.readAsBytes();
-      final mime = picked.mimeType ?? 'image/jpeg';
-
       setState(() {
-        _avatarFile = file;
-        _avatarBase64 = 'data:$mime;base64,${base64Encode(bytes)}';
+        _avatarFile = File(picked.path);
       });
     } catch (e) {
       if (!mounted) return;
@@ -4,24 +4,98 @@
 /// Grid reutilizable que muestra las publicaciones del perfil.
 
 import 'package:flutter/material.dart';
+import 'package:pet_connect_app/lib/services/image_renditions.dart';
+import 'package:pet_connect_app/lib/services/posts_service.dart';
 import 'package:pet_connect_app/user/screens/posts/view_post_screen.dart';
 
-class ProfilePostsGrid extends StatelessWidget {
+class ProfilePostsGrid extends StatefulWidget {
+  final String? userId;
   final List<dynamic> posts;
+
+  /// Cursor `posts_cursor` del perfil; null si no hay más publicaciones.
+  final String? nextCursor;
   final bool isOwner;
 
   const ProfilePostsGrid({
     super.key,
+    required this.userId,
     required this.posts,
+    required this.nextCursor,
     required this.isOwner,
   });
 
+  @override
+  State<ProfilePostsGrid> createState() => _ProfilePostsGridState();
+}
+
+class _ProfilePostsGridState extends State<ProfilePostsGrid> {
+  late List<dynamic> _posts;
+  String? _nextCursor;
+  bool _loadingMore = false;
+
+  @override
+  void initState() {
+    super.initState();
+    _reset();
+  }
+
+  @override
+  void didUpdateWidget(covariant ProfilePostsGrid oldWidget) {
+    super.didUpdateWidget(oldWidget);
+    if (oldWidget.posts != widget.posts) {
+      _reset();
+    }
+  }
+
+  void _reset() {
+    _posts = List<dynamic>.of(widget.posts);
+    _nextCursor = widget.nextCursor;
+  }
+
+  /// Autor: Wilbert López Veras
+  /// Fecha: 18-10-2026
+  /// Descripción: Pide la página siguiente cuando el scroll se acerca al final.
+  Future<void> _loadMore() async {
+    final cursor = _nextCursor;
+    final userId = widget.userId;
+    if (_loadingMore || cursor == null || userId == null) return;
+    setState(() => _loadingMore = true);
+    try {
+      final page = await PostsService.getProfilePosts(userId, cursor);
+      if (!mounted) return;
+      setState(() {
+        _posts.addAll(page.items);
+        _nextCursor = page.nextCursor;
+      });
+    } catch (_) {
+      // Se reintenta con el siguiente movimiento del scroll
+    } finally {
+      if (mounted) {
+        setState(() => _loadingMore = false);
+      }
+    }
+  }
+
   @override
   Widget build(BuildContext context) {
+    final posts = _posts;
+    final isOwner = widget.isOwner;
     if (posts.isEmpty) {
       return const Center(child: Text('Aún no ha publicado nada'));
     }
 
+    return NotificationListener<ScrollNotification>(
+      onNotification: (notification) {
+        if (notification.metrics.extentAfter < 400) {
+          _loadMore();
+        }
+        return false;
+      },
+      child: _buildGrid(posts, isOwner),
+    );
+  }
+
+  Widget _buildGrid(List<dynamic> posts, bool isOwner) {
     return GridView.builder(
       padding: const EdgeInsets.all(4),
       gridDelegate: const SliverGridDelegateWithFixedCrossAxisCount(
@@ -47,8 +121,9 @@ class ProfilePostsGrid extends StatelessWidget {
             );
           },
           child: Image.network(
-            post['image_url'] ??
-                'https://placehold.co/400x400/e0f2fe/0ea5e9?text=Pet+${index + 1}',
+            post['image_url'] != null
+                ? imageRendition(post['image_url'], 'thumb')
+                : 'https://placehold.co/400x400/e0f2fe/0ea5e9?text=Pet+${index + 1}',
             fit: BoxFit.cover,
           ),
         );
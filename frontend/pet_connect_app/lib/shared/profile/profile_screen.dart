@@ -336,7 +336,9 @@ class _ProfileScreenState extends State<ProfileScreen> {
           const ProfilePostsHeader(),
         ],
         body: ProfilePostsGrid(
+          userId: profile!['id']?.toString(),
           posts: posts,
+          nextCursor: profile!['posts_cursor'] as String?,
           isOwner: widget.isOwner,
         ),
       ),
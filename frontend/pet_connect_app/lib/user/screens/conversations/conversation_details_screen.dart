@@ -7,6 +7,7 @@
 import 'dart:async';
 import 'package:flutter/material.dart';
 import 'package:pet_connect_app/lib/services/conversations_service.dart';
+import 'package:pet_connect_app/lib/services/image_renditions.dart';
 import 'package:pet_connect_app/lib/services/auth_service.dart';
 import 'package:pet_connect_app/user/screens/conversations/conversation_bubble.dart';
 import 'package:pet_connect_app/user/screens/conversations/conversation_input.dart';
@@ -158,8 +159,9 @@ class _ConversationDetailsScreenState extends State<ConversationDetailsScreen> {
             CircleAvatar(
               radius: 18,
               backgroundImage: NetworkImage(
-                _otherUserAvatar ??
-                    'https://placehold.co/50x50/34d399/white?text=A',
+                _otherUserAvatar != null
+                    ? imageRendition(_otherUserAvatar!, 'thumb')
+                    : 'https://placehold.co/50x50/34d399/white?text=A',
               ),
             ),
             const SizedBox(width: 12),
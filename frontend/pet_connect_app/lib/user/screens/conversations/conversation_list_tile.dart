@@ -4,6 +4,7 @@
 /// Tarjeta reutilizable para mostrar una conversación dentro de la lista.
 
 import 'package:flutter/material.dart';
+import 'package:pet_connect_app/lib/services/image_renditions.dart';
 
 class ConversationListTile extends StatelessWidget {
   final String name;
@@ -22,7 +23,9 @@ class ConversationListTile extends StatelessWidget {
   @override
   Widget build(BuildContext context) {
     return ListTile(
-      leading: CircleAvatar(backgroundImage: NetworkImage(avatarUrl)),
+      leading: CircleAvatar(
+        backgroundImage: NetworkImage(imageRendition(avatarUrl, 'thumb')),
+      ),
       title: Text(name, style: const TextStyle(fontWeight: FontWeight.bold)),
       subtitle: Text(message, maxLines: 1, overflow: TextOverflow.ellipsis),
       trailing: const Icon(Icons.chevron_right),
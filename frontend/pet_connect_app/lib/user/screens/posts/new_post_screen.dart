@@ -55,14 +55,9 @@ class _NewPostScreenState extends State<NewPostScreen> {
     setState(() => _isSubmitting = true);
 
     try {
-      final mimeType = _selectedImage!.mimeType ?? _mimeFromPath(_selectedImage!.path);
-      final bytes = await File(_selectedImage!.path).readAsBytes();
-      final base64Image = base64Encode(bytes);
-      final dataUri = 'data:$mimeType;base64,$base64Image';
-
       final description = _descriptionController.text.trim();
 
-      await PostsService.createPost(description, dataUri);
+      await PostsService.createPost(description, _selectedImage!.path);
 
       if (!mounted) return;
       ScaffoldMessenger.of(context).showSnackBar(
@@ -103,24 +98,6 @@ class _NewPostScreenState extends State<NewPostScreen> {
     return raw.replaceFirst('Exception: ', '');
   }
 
-  // Autor: Wilbert López Veras
-  // Fecha de creación: 6 de Diciembre de 2025
-  // Descripción:
-  // Obtiene el MIME type basado en la extensión del archivo.
-  String _mimeFromPath(String path) {
-    final extension = path.split('.').last.toLowerCase();
-    switch (extension) {
-      case 'png':
-        return 'image/png';
-      case 'webp':
-        return 'image/webp';
-      case 'heic':
-        return 'image/heic';
-      default:
-        return 'image/jpeg';
-    }
-  }
-
   @override
   Widget build(BuildContext context) {
     final imagePlaceholder = Container(
@@ -4,6 +4,7 @@
 /// Lista de comentarios de un post con acciones de eliminar o reportar.
 
 import 'package:flutter/material.dart';
+import 'package:pet_connect_app/lib/services/image_renditions.dart';
 
 typedef CommentDeleteCallback = void Function(String commentId);
 typedef CommentReportCallback = void Function(String commentId);
@@ -51,7 +52,7 @@ class ViewPostComments extends StatelessWidget {
         return ListTile(
           leading: CircleAvatar(
             backgroundImage: profile?['avatar_url'] != null
-                ? NetworkImage(profile!['avatar_url'])
+                ? NetworkImage(imageRendition(profile!['avatar_url'], 'thumb'))
                 : const NetworkImage('https://placehold.co/50'),
           ),
           title: Text(profile?['username'] ?? 'Usuario'),
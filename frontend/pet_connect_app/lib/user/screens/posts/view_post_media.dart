@@ -4,6 +4,7 @@
 /// Tarjeta que muestra la imagen del post, descripción y acción de "me gusta".
 
 import 'package:flutter/material.dart';
+import 'package:pet_connect_app/lib/services/image_renditions.dart';
 
 /// Componente reutilizable para renderizar la sección principal de la publicación.
 class ViewPostMedia extends StatelessWidget {
@@ -39,7 +40,7 @@ class ViewPostMedia extends StatelessWidget {
               child: ClipRRect(
                 borderRadius: BorderRadius.circular(12),
                 child: Image.network(
-                  imageUrl,
+                  imageRendition(imageUrl, 'feed'),
                   fit: BoxFit.cover,
                   errorBuilder: (_, __, ___) =>
                       const Center(child: Text('Sin imagen')),
@@ -31,6 +31,8 @@ class ViewPostScreen extends StatefulWidget {
 class _ViewPostScreenState extends State<ViewPostScreen> {
   Map<String, dynamic>? _post;
   List<Map<String, dynamic>> _comments = [];
+  String? _commentsCursor;
+  bool _loadingMoreComments = false;
   bool _loading = true;
   bool _deleting = false;
   bool _liking = false;
@@ -75,15 +77,45 @@ class _ViewPostScreenState extends State<ViewPostScreen> {
 
   Future<void> _loadComments() async {
     try {
-      final comments = await PostCommentsService.getComments(widget.postId);
+      final page = await PostCommentsService.getComments(widget.postId);
       if (!mounted) return;
-      setState(() => _comments = comments);
+      setState(() {
+        _comments = page.items;
+        _commentsCursor = page.nextCursor;
+      });
     } catch (e) {
       if (!mounted) return;
       setState(() => _error = _formatError(e));
     }
   }
 
+  Future<void> _loadMoreComments() async {
+    final cursor = _commentsCursor;
+    if (cursor == null || _loadingMoreComments) return;
+    setState(() => _loadingMoreComments = true);
+    try {
+      final page =
+          await PostCommentsService.getComments(widget.postId, cursor: cursor);
+      if (!mounted) return;
+      final known = _comments.map((comment) => comment['id']).toSet();
+      setState(() {
+        // Los comentarios enviados desde esta pantalla ya estan en la lista
+        _comments.addAll(
+            page.items.where((comment) => !known.contains(comment['id'])));
+        _commentsCursor = page.nextCursor;
+      });
+    } catch (e) {
+      if (!mounted) return;
+      ScaffoldMessenger.of(context).showSnackBar(
+        SnackBar(content: Text(_formatError(e))),
+      );
+    } finally {
+      if (mounted) {
+        setState(() => _loadingMoreComments = false);
+      }
+    }
+  }
+
   Future<void> _loadCurrentUser() async {
     final id = await AuthService.instance.getUserId();
     if (!mounted) return;
@@ -309,6 +341,19 @@ class _ViewPostScreenState extends State<ViewPostScreen> {
                 onDelete: _confirmDeleteComment,
                 onReport: (id) => showReportCommentSheet(context, id),
               ),
+              if (_commentsCursor != null)
+                Center(
+                  child: TextButton(
+                    onPressed: _loadingMoreComments ? null : _loadMoreComments,
+                    child: _loadingMoreComments
+                        ? const SizedBox(
+                            width: 18,
+                            height: 18,
+                            child: CircularProgressIndicator(strokeWidth: 2),
+                          )
+                        : const Text('Ver más comentarios'),
+                  ),
+                ),
               Padding(
                 padding: const EdgeInsets.all(16.0),
                 child: NewCommentInput(
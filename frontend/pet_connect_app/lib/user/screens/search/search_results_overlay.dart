@@ -4,6 +4,7 @@
 /// Widget que encapsula el campo de búsqueda y la lista desplegable de resultados.
 
 import 'package:flutter/material.dart';
+import 'package:pet_connect_app/lib/services/image_renditions.dart';
 
 typedef ProfileTapCallback = void Function(String profileId);
 
@@ -125,7 +126,7 @@ class SearchResultsOverlay extends StatelessWidget {
         return ListTile(
           leading: CircleAvatar(
             backgroundImage: avatar.isNotEmpty
-                ? NetworkImage(avatar)
+                ? NetworkImage(imageRendition(avatar, 'thumb'))
                 : const NetworkImage('https://placehold.co/60x60'),
           ),
           title: Text(user['username'] ?? 'usuario'),
@@ -11,6 +11,7 @@ import 'package:flutter_map/flutter_map.dart';
 import 'package:latlong2/latlong.dart';
 import 'package:pet_connect_app/lib/config/api_config.dart';
 import 'package:pet_connect_app/lib/services/auth_service.dart';
+import 'package:pet_connect_app/lib/services/image_renditions.dart';
 import 'package:pet_connect_app/lib/services/profile_service.dart';
 import 'package:pet_connect_app/shared/profile/profile_screen.dart';
 import 'package:pet_connect_app/widgets/search_map.dart';
@@ -352,7 +353,7 @@ class _SearchScreenState extends State<SearchScreen> {
                     child: ClipOval(
                       child: avatarUrl.isNotEmpty
                           ? Image.network(
-                              avatarUrl,
+                              imageRendition(avatarUrl, 'thumb'),
                               fit: BoxFit.cover,
                               width: 36,
                               height: 36,